@@ -1,12 +1,19 @@
 import json
 import os
-import pandas as pd
 from pathlib import Path
 import argparse
 import logging
-from read_solution import read_spot_solution
 from clear_spot_solution_json import clear_spot_solution_json
+from solution_analysis import (
+    FULL_SCORE_THRESHOLD,
+    analyze_spot_solution,
+    parse_solution_path,
+    scenario_metadata,
+)
 from poker_table_visualizer import PokerTableVisualizer
+from poker_viz import RENDERER_VERSION
+from build_manifest import BuildManifest, file_sha256, make_signature, params_hash
+from solution_scanner import scan_files
 import random
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
@@ -18,9 +25,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Strategy percentage at which an action receives full score
-FULL_SCORE_THRESHOLD = 30.0  # percent
-
 
 def create_single_visualization(args):
     """Create a single visualization - standalone function for multiprocessing"""
@@ -94,6 +98,7 @@ class BatchVisualizer:
         depth=None,
         position=None,
         exclude_poor_actions=False,
+        force=False,
     ):
         """
         Initialize the batch visualizer
@@ -108,6 +113,7 @@ class BatchVisualizer:
         position (str, optional): Filter by specific position
         num_hands (int, optional): Number of hardest hands to extract per file
         exclude_poor_actions (bool, optional): Exclude hands where all non-fold actions have EV < -0.03
+        force (bool, optional): Re-render every image even if the build manifest says it is up to date
         Each hand will also include a score per action from 0-10 reflecting
         how often that action should be chosen.
         """
@@ -120,10 +126,24 @@ class BatchVisualizer:
         self.depth = depth
         self.position = position
         self.exclude_poor_actions = exclude_poor_actions
+        self.force = force
 
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
 
+        # Build manifest used to skip images whose inputs did not change
+        self.manifest = BuildManifest(self.output_dir)
+        self.params_digest = params_hash(
+            {
+                "min_threshold": self.min_threshold,
+                "max_threshold": self.max_threshold,
+                "num_hands": self.num_hands,
+                "exclude_poor_actions": self.exclude_poor_actions,
+                "full_score_threshold": FULL_SCORE_THRESHOLD,
+                "scale_factor": 1,
+            }
+        )
+
         # Track stats
         self.stats = {
             "total_files": 0,
@@ -131,6 +151,9 @@ class BatchVisualizer:
             "skipped_files": 0,
             "total_hands": 0,
             "filtered_hands": 0,
+            "rendered_images": 0,
+            "up_to_date_images": 0,
+            "removed_images": 0,
         }
 
         # Function to convert hand notation to card notation
@@ -191,36 +214,15 @@ class BatchVisualizer:
 
     def get_solution_files(self):
         """Get all solution JSON files, optionally filtered by criteria"""
-        pattern = "**/*.json"
-        all_files = list(self.solutions_dir.glob(pattern))
-
-        # Apply filters if specified
-        filtered_files = []
-        for file_path in all_files:
-            relative_path = file_path.relative_to(self.solutions_dir)
-            parts = relative_path.parts
-
-            # Apply game type filter
-            if self.game_type and (len(parts) < 1 or parts[0] != self.game_type):
-                continue
-
-            # Apply depth filter
-            if self.depth and (len(parts) < 2 or f"depth_{self.depth}" not in parts[1]):
-                continue
-
-            # Apply position filter
-            if self.position:
-                position_found = False
-                for part in parts:
-                    if part == self.position:
-                        position_found = True
-                        break
-                if not position_found:
-                    continue
-
-            filtered_files.append(file_path)
-
-        return filtered_files
+        # Filtered-out game types and depths are never entered
+        return list(
+            scan_files(
+                self.solutions_dir,
+                game_type=self.game_type,
+                depth=self.depth,
+                position=self.position,
+            )
+        )
 
     def create_metadata_csv(
         self, game_type, depth, street, action_seq, position, output_dir
@@ -241,43 +243,12 @@ class BatchVisualizer:
                 f"Creating metadata CSV for: game_type={game_type}, depth={depth}, position={position}"
             )
 
-            # Extract mode (icm or chipev)
-            mode = "icm" if "ICM" in game_type.upper() else "chipev"
-
-            # Extract field size (200 or 1000)
-            field_size = 1000
-            if "200" in game_type:
-                field_size = 200
-
-            # Extract field left
-            field_left = "100%"  # Default
-            if "START" in game_type:
-                field_left = "100%"
-            elif "PCT75" in game_type:
-                field_left = "75%"
-            elif "PCT50" in game_type:
-                field_left = "50%"
-            elif "PCT37" in game_type:
-                field_left = "37%"
-            elif "PCT25" in game_type:
-                field_left = "25%"
-            elif "BUBBLE" in game_type:
-                field_left = "bubble"
-            elif "3TL" in game_type:
-                field_left = "3 tables left"
-            elif "2TL" in game_type:
-                field_left = "2 tables left"
-            elif "FT" in game_type:
-                field_left = "final table"
-
-            # Process position (utg, utg+1, mp, hj, lj, co, btn, sb, bb)
-            pos = position.lower()
-
-            # Process action (default is "rfi")
-            action = "rfi"
-            if "pf_" in action_seq.lower():
-                action = "rfi"
-            # Add more action type detections as needed
+            metadata = scenario_metadata(game_type, depth, action_seq, position)
+            mode = metadata["mode"]
+            field_size = metadata["field_size"]
+            field_left = metadata["field_left"]
+            pos = metadata["position"]
+            action = metadata["action"]
 
             # Log the extracted values
             logger.info(
@@ -305,18 +276,14 @@ class BatchVisualizer:
         try:
             # Extract metadata from the file path
             relative_path = file_path.relative_to(self.solutions_dir)
-            path_parts = relative_path.parts
 
             # Extract key information from path
-            game_type = path_parts[0] if len(path_parts) > 0 else "unknown"
-            depth = (
-                path_parts[1].replace("depth_", "")
-                if len(path_parts) > 1
-                else "unknown"
-            )
-            street = path_parts[2] if len(path_parts) > 2 else "unknown"
-            action_seq = path_parts[3] if len(path_parts) > 3 else "unknown"
-            position = path_parts[4] if len(path_parts) > 4 else "unknown"
+            scenario = parse_solution_path(relative_path)
+            game_type = scenario["game_type"]
+            depth = scenario["depth"]
+            street = scenario["street"]
+            action_seq = scenario["action_seq"]
+            position = scenario["position"]
 
             # Create output directory that mirrors input structure
             output_subdir = (
@@ -327,120 +294,35 @@ class BatchVisualizer:
             json_text = clear_spot_solution_json(str(file_path))
             clean_json = json.loads(json_text)
 
-            # Read the spot solution
-            df_solutions = read_spot_solution(clean_json)
-
-            # Dynamically gather all action codes from the dataframe columns
-            action_codes = [
-                col[:-6] for col in df_solutions.columns if col.endswith("_strat")
-            ]
-
-            # Compute best EV for each row
-            df_solutions["best_ev"] = df_solutions.apply(
-                lambda row: row[f"{row['best_action']}_ev"], axis=1
+            # Filter, rank and score the hands
+            analysis = analyze_spot_solution(
+                clean_json,
+                min_threshold=self.min_threshold,
+                max_threshold=self.max_threshold,
+                num_hands=self.num_hands,
+                exclude_poor_actions=self.exclude_poor_actions,
             )
 
-            # Optional EV filtering if thresholds are specified
-            filtered_df = df_solutions
-            if self.min_threshold is not None:
-                filtered_df = filtered_df[filtered_df["best_ev"] >= self.min_threshold]
-            if self.max_threshold is not None:
-                filtered_df = filtered_df[filtered_df["best_ev"] <= self.max_threshold]
-
-            # Filter out hands where all non-fold actions have EV < -0.05
-            if self.exclude_poor_actions:
-
-                def has_viable_non_fold_action(row):
-                    non_fold_evs = [
-                        row[f"{code}_ev"]
-                        for code in action_codes
-                        if code != "F" and f"{code}_ev" in row
-                    ]
-
-                    return (
-                        any(ev >= -0.05 for ev in non_fold_evs)
-                        if non_fold_evs
-                        else True
-                    )
-
-                filtered_df = filtered_df[
-                    filtered_df.apply(has_viable_non_fold_action, axis=1)
-                ]
-
-            filtered_df = filtered_df.copy()
-
             # Update stats
-            self.stats["total_hands"] += len(df_solutions)
-            self.stats["filtered_hands"] += len(filtered_df)
+            self.stats["total_hands"] += analysis.total_hands
+            self.stats["filtered_hands"] += analysis.filtered_hands
 
-            if filtered_df.empty:
+            if analysis.result_df.empty:
                 if self.min_threshold is not None or self.max_threshold is not None:
                     logger.info(
                         f"No hands found after applying EV thresholds {self.min_threshold} to {self.max_threshold}"
                     )
                 else:
                     logger.info("No hands found in solution")
+                # Images from an earlier run of this scenario are now stale
+                self.stats["removed_images"] += self.manifest.remove_stale(
+                    self.manifest.key_for(output_subdir), []
+                )
+                self.manifest.save()
                 self.stats["skipped_files"] += 1
                 return
 
-            # Calculate difficulty score for each hand
-            def calc_difficulty(row):
-                best_action = row["best_action"]
-                best_ev = row["best_ev"]
-                alt_evs = [
-                    row[f"{code}_ev"]
-                    for code in action_codes
-                    if code != best_action and f"{code}_ev" in row
-                ]
-                alt_max_ev = max(alt_evs) if alt_evs else None
-
-                if best_action == "F":
-                    return abs(alt_max_ev) if alt_max_ev is not None else 0
-                elif best_action.startswith("R"):
-                    return best_ev
-                else:
-                    if alt_max_ev is None:
-                        return abs(best_ev)
-                    return abs(best_ev - alt_max_ev)
-
-            filtered_df["difficulty"] = filtered_df.apply(calc_difficulty, axis=1)
-
-            # Sort by difficulty and take the hardest hands
-            filtered_df = filtered_df.sort_values("difficulty").head(self.num_hands)
-
-            # Compute score for each action based on its strategy percentage
-            def compute_scores(row):
-                scores = {}
-                for code in action_codes:
-                    strat = row.get(f"{code}_strat", 0)
-                    score = 10 * min(1.0, strat / FULL_SCORE_THRESHOLD)
-                    scores[f"{code}_score"] = score
-
-                max_score = max(scores.values()) if scores else 0
-                if 0 < max_score < 10:
-                    factor = 10.0 / max_score
-                    scores = {c: s * factor for c, s in scores.items()}
-                elif max_score == 0 and action_codes:
-                    best = row["best_action"]
-                    scores = {
-                        f"{c}_score": (10 if c == best else 0) for c in action_codes
-                    }
-                return pd.Series(scores)
-
-            score_df = filtered_df.apply(compute_scores, axis=1)
-            filtered_df = pd.concat([filtered_df, score_df], axis=1)
-
-            # Prepare columns for the result dataframe
-            result_columns = ["hand"]
-            for code in action_codes:
-                result_columns.append(f"{code}_strat")
-                result_columns.append(f"{code}_ev")
-                result_columns.append(f"{code}_score")
-
-            result_columns.extend(["best_action", "best_ev", "difficulty"])
-
-            # Create the result dataframe with all strategies and EVs
-            result_df = filtered_df[result_columns].copy()
+            result_df = analysis.result_df
 
             # Save filtered results to CSV
             csv_filename = output_subdir / f"actions.csv"
@@ -457,39 +339,76 @@ class BatchVisualizer:
             except Exception as e:
                 logger.error(f"Failed to create metadata CSV: {e}", exc_info=True)
 
+            # Compare every expected image against the build manifest so only
+            # images whose inputs changed are rendered again
+            source = relative_path.as_posix()
+            source_hash = file_sha256(file_path)
+            expected_keys = []
+            pending = []
+            for i, row in result_df.iterrows():
+                hand = row["hand"]
+                output_path = (
+                    output_subdir / f"{hand}_{row['best_action']}_{row['best_ev']:.6f}.png"
+                )
+                key = self.manifest.key_for(output_path)
+                expected_keys.append(key)
+
+                # Keep the suits of a previous build so the image stays identical
+                previous = self.manifest.get(key)
+                if previous and previous.get("cards"):
+                    cards = tuple(previous["cards"])
+                else:
+                    cards = self.hand_to_cards(hand)
+
+                signature = make_signature(
+                    source_hash, self.params_digest, cards, RENDERER_VERSION
+                )
+                if not self.force and self.manifest.is_current(key, signature):
+                    self.stats["up_to_date_images"] += 1
+                    continue
+                pending.append(((i, row), key, signature, cards))
+
+            removed = self.manifest.remove_stale(
+                self.manifest.key_for(output_subdir), expected_keys
+            )
+            self.stats["removed_images"] += removed
+            logger.info(
+                f"{len(pending)} images to render, "
+                f"{len(expected_keys) - len(pending)} up to date, {removed} stale removed"
+            )
+
             # Process each hand in parallel
             # Use ProcessPoolExecutor for parallel processing
-            with ProcessPoolExecutor() as executor:
-                # Prepare arguments for each visualization task
-                visualization_args = [
-                    (
-                        (i, row),
-                        clean_json,
-                        output_subdir,
-                        file_path,
-                        self.hand_to_cards_map,
-                    )
-                    for i, row in result_df.iterrows()
-                ]
-
-                # Submit all visualization tasks
-                future_to_hand = {
-                    executor.submit(create_single_visualization, args): args[0]
-                    for args in visualization_args
-                }
-
-                # Process completed tasks as they finish
-                for future in as_completed(future_to_hand):
-                    try:
-                        result_message = future.result()
-                        logger.info(result_message)
-                    except Exception as e:
-                        i, row = future_to_hand[future]
-                        hand = row["hand"]
-                        logger.error(
-                            f"Error creating visualization for {hand}: {e}",
-                            exc_info=True,
+            if pending:
+                with ProcessPoolExecutor() as executor:
+                    # Submit all visualization tasks
+                    future_to_task = {}
+                    for row_data, key, signature, cards in pending:
+                        args = (
+                            row_data,
+                            clean_json,
+                            output_subdir,
+                            file_path,
+                            {row_data[1]["hand"]: cards},
                         )
+                        future = executor.submit(create_single_visualization, args)
+                        future_to_task[future] = (row_data, key, signature)
+
+                    # Process completed tasks as they finish
+                    for future in as_completed(future_to_task):
+                        (i, row), key, signature = future_to_task[future]
+                        try:
+                            result_message = future.result()
+                            logger.info(result_message)
+                            self.manifest.record(key, signature, source=source)
+                            self.stats["rendered_images"] += 1
+                        except Exception as e:
+                            hand = row["hand"]
+                            logger.error(
+                                f"Error creating visualization for {hand}: {e}",
+                                exc_info=True,
+                            )
+            self.manifest.save()
 
             # Update stats
             self.stats["processed_files"] += 1
@@ -497,8 +416,8 @@ class BatchVisualizer:
             # Create a summary file
             with open(output_subdir / "summary.txt", "w") as f:
                 f.write(f"Solution: {scenario_name}\n")
-                f.write(f"Total hands: {len(df_solutions)}\n")
-                f.write(f"Filtered hands: {len(filtered_df)}\n")
+                f.write(f"Total hands: {analysis.total_hands}\n")
+                f.write(f"Filtered hands: {len(result_df)}\n")
                 if self.min_threshold is not None or self.max_threshold is not None:
                     f.write(f"EV range: {self.min_threshold} to {self.max_threshold}\n")
                 f.write(f"Top {self.num_hands} hardest hands\n\n")
@@ -508,7 +427,7 @@ class BatchVisualizer:
                 for action, count in action_counts.items():
                     f.write(f"  {action}: {count} hands\n")
 
-            return len(filtered_df)
+            return len(result_df)
 
         except Exception as e:
             logger.error(f"Error processing {file_path}: {e}", exc_info=True)
@@ -527,6 +446,10 @@ class BatchVisualizer:
         for file_path in solution_files:
             self.process_solution_file(file_path)
 
+        # Outputs whose solution file disappeared are stale as well
+        self.stats["removed_images"] += self.manifest.remove_orphans(self.solutions_dir)
+        self.manifest.save()
+
         # Print final stats
         logger.info(f"\nProcessing complete!")
         logger.info(f"Total files: {self.stats['total_files']}")
@@ -534,6 +457,9 @@ class BatchVisualizer:
         logger.info(f"Skipped files: {self.stats['skipped_files']}")
         logger.info(f"Total hands: {self.stats['total_hands']}")
         logger.info(f"Filtered hands: {self.stats['filtered_hands']}")
+        logger.info(f"Rendered images: {self.stats['rendered_images']}")
+        logger.info(f"Up-to-date images: {self.stats['up_to_date_images']}")
+        logger.info(f"Removed stale images: {self.stats['removed_images']}")
         logger.info(f"Visualizations saved to: {self.output_dir}")
 
 
@@ -575,6 +501,11 @@ def main():
         action="store_true",
         help="Exclude hands where all non-fold actions have EV < -0.03",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every image, ignoring the build manifest",
+    )
 
     args = parser.parse_args()
 
@@ -589,6 +520,7 @@ def main():
         depth=args.depth,
         position=args.position,
         exclude_poor_actions=args.exclude_poor_actions,
+        force=args.force,
     )
 
     visualizer.run()
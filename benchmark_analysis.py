@@ -0,0 +1,293 @@
+"""
+Benchmark the analysis stages on a solution corpus.
+
+Meant for corpora generated with synthetic_corpus.py, which can be far larger
+than poker_solutions/. Every stage runs in a fresh process, so its peak memory
+is its own:
+
+- discover/batch_visualizer: BatchVisualizer.get_solution_files
+- discover/separator: SolutionSeparator.get_solution_files
+- discover/filtered: solution_scanner.scan_files with the game type, depth and
+  position filters of --game-type, --depth and --position, timed to the first
+  file and to the last
+- list/solution_manager: solution_manager.list_solutions (output discarded)
+- load: clear_spot_solution_json and json.loads of every file
+- read_spot_solution: read_spot_solution of every loaded file
+- analyze: analyze_spot_solution of every loaded file, the analysis step of
+  BatchVisualizer
+- separate: SolutionSeparator.process_solution_file of every file, writing
+  hand packs to a scratch directory
+- inspect/solution_manager: solution_manager.analyze_solution of every file
+  (output discarded)
+
+Per-file stages load the files outside their timed part where they need them
+(read_spot_solution, analyze), so each stage is timed on its own work. Stages
+report files per second and the peak resident memory of their process (VmHWM),
+along with its growth over the memory after the imports. Per-file stages can be
+limited to an evenly spread sample with --max-files, since analyzing 100k
+files takes a long time.
+
+Stage processes run in a scratch directory, so the logs and the
+hand_solutions.csv that some stages write stay out of the working tree.
+
+Example:
+    python synthetic_corpus.py --files 10000 --output-dir synthetic_solutions
+    python benchmark_analysis.py --solutions-dir synthetic_solutions --output analysis_benchmark.json
+    python benchmark_analysis.py --solutions-dir synthetic_solutions --stages load analyze --max-files 2000
+    python benchmark_analysis.py --solutions-dir synthetic_solutions --stages discover/filtered --game-type MTTGeneral_ICM8m200PTPCT75 --depth 20
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+REPO_DIR = Path(__file__).resolve().parent
+
+STAGES = [
+    "discover/batch_visualizer",
+    "discover/separator",
+    "discover/filtered",
+    "list/solution_manager",
+    "load",
+    "read_spot_solution",
+    "analyze",
+    "separate",
+    "inspect/solution_manager",
+]
+
+# Stages that process the files one by one, and can run on a sample
+PER_FILE_STAGES = {"load", "read_spot_solution", "analyze", "separate", "inspect/solution_manager"}
+
+
+def memory_mb(field):
+    """A VmRSS or VmHWM line of /proc/self/status, in MB"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def corpus_files(solutions_dir):
+    """
+    List the solution files of a corpus
+
+    Parameters:
+    solutions_dir (str): Corpus directory
+
+    Returns:
+    tuple: (sorted paths, total bytes)
+    """
+    from solution_scanner import scan_files
+
+    files = [str(path) for path in scan_files(solutions_dir)]
+    return files, sum(os.path.getsize(path) for path in files)
+
+
+def sample(files, max_files):
+    """At most max_files paths, spread evenly over the list"""
+    if not max_files or len(files) <= max_files:
+        return files
+    step = len(files) / max_files
+    return [files[int(i * step)] for i in range(max_files)]
+
+
+def load(path):
+    """Load a solution the way the analysis scripts do"""
+    from clear_spot_solution_json import clear_spot_solution_json
+
+    return json.loads(clear_spot_solution_json(path))
+
+
+def run_stage(stage, solutions_dir, files, scratch_dir, filters=None):
+    """
+    Run one stage in the current process
+
+    Parameters:
+    stage (str): Name of the stage
+    solutions_dir (str): Absolute path of the corpus
+    files (list): Absolute paths of the files of per-file stages
+    scratch_dir (str): Directory for everything the stage writes
+    filters (dict, optional): game_type, depth and position of discover/filtered
+
+    Returns:
+    dict: Files, seconds, files per second and memory of the stage
+    """
+    # The repository stays importable from the scratch directory
+    sys.path.insert(0, str(REPO_DIR))
+    os.chdir(scratch_dir)
+    devnull = open(os.devnull, "w")
+
+    # Imports are not timed; the scripts set up logging to files in the scratch directory
+    from batch_visualizer import BatchVisualizer
+    from read_solution import read_spot_solution
+    from separate_solutions_by_hand import SolutionSeparator
+    from solution_analysis import analyze_spot_solution
+    from solution_scanner import scan_files
+    import solution_manager
+
+    logging.getLogger().setLevel(logging.WARNING)
+    baseline_mb = memory_mb("VmRSS")
+
+    seconds = 0.0
+    first_seconds = None
+    count = len(files)
+    with contextlib.redirect_stdout(devnull):
+        if stage == "discover/batch_visualizer":
+            visualizer = BatchVisualizer(solutions_dir=solutions_dir, output_dir=os.path.join(scratch_dir, "vis"))
+            start = time.perf_counter()
+            count = len(visualizer.get_solution_files())
+            seconds = time.perf_counter() - start
+        elif stage == "discover/separator":
+            separator = SolutionSeparator(solutions_dir=solutions_dir, output_dir=os.path.join(scratch_dir, "sep"))
+            start = time.perf_counter()
+            count = len(separator.get_solution_files())
+            seconds = time.perf_counter() - start
+        elif stage == "discover/filtered":
+            count = 0
+            start = time.perf_counter()
+            for _ in scan_files(solutions_dir, **(filters or {})):
+                if first_seconds is None:
+                    first_seconds = time.perf_counter() - start
+                count += 1
+            seconds = time.perf_counter() - start
+        elif stage == "list/solution_manager":
+            start = time.perf_counter()
+            solution_manager.list_solutions(solutions_dir)
+            seconds = time.perf_counter() - start
+            count = None
+        elif stage == "load":
+            start = time.perf_counter()
+            for path in files:
+                load(path)
+            seconds = time.perf_counter() - start
+        elif stage == "read_spot_solution":
+            for path in files:
+                solution = load(path)
+                start = time.perf_counter()
+                read_spot_solution(solution, output_csv=None, verbose=False)
+                seconds += time.perf_counter() - start
+        elif stage == "analyze":
+            for path in files:
+                solution = load(path)
+                start = time.perf_counter()
+                analyze_spot_solution(solution, verbose=False)
+                seconds += time.perf_counter() - start
+        elif stage == "separate":
+            separator = SolutionSeparator(
+                solutions_dir=solutions_dir, output_dir=os.path.join(scratch_dir, "sep"), packed=True
+            )
+            start = time.perf_counter()
+            for path in files:
+                separator.process_solution_file(Path(path))
+            seconds = time.perf_counter() - start
+        elif stage == "inspect/solution_manager":
+            start = time.perf_counter()
+            for path in files:
+                solution_manager.analyze_solution(path)
+            seconds = time.perf_counter() - start
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+    devnull.close()
+
+    peak_mb = memory_mb("VmHWM")
+    result = {
+        "files": count,
+        "seconds": round(seconds, 3),
+        "files_per_second": round(count / seconds, 1) if count and seconds else None,
+        "baseline_rss_mb": round(baseline_mb, 1),
+        "peak_rss_mb": round(peak_mb, 1),
+        "peak_growth_mb": round(peak_mb - baseline_mb, 1),
+    }
+    if first_seconds is not None:
+        result["first_file_seconds"] = round(first_seconds, 4)
+    return result
+
+
+def run_isolated(stage, solutions_dir, files, scratch_dir, filters=None):
+    """Run a stage in a freshly spawned process, so its peak memory is its own"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_stage, stage, solutions_dir, files, scratch_dir, filters).result()
+
+
+def print_results(stages):
+    """Print files per second and memory of every stage as a table"""
+    header = f"{'stage':<28}{'files':>9}{'seconds':>10}{'files/s':>10}{'peak MB':>10}{'growth MB':>11}"
+    print(header)
+    print("-" * len(header))
+    for stage, result in stages.items():
+        files = "" if result["files"] is None else result["files"]
+        rate = "" if result["files_per_second"] is None else f"{result['files_per_second']:.1f}"
+        print(
+            f"{stage:<28}{files:>9}{result['seconds']:>10.2f}{rate:>10}"
+            f"{result['peak_rss_mb']:>10.1f}{result['peak_growth_mb']:>11.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the analysis stages on a solution corpus")
+    parser.add_argument("--solutions-dir", default="synthetic_solutions", help="Corpus directory")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Stages to run (default: all)")
+    parser.add_argument("--max-files", type=int, help="Sample size of the per-file stages (default: every file)")
+    parser.add_argument("--game-type", help="Game type filter of discover/filtered")
+    parser.add_argument("--depth", help="Depth filter of discover/filtered, e.g. 20")
+    parser.add_argument("--position", help="Position filter of discover/filtered")
+    parser.add_argument("--scratch-dir", help="Directory for stage output (default: a temporary directory)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    solutions_dir = os.path.abspath(args.solutions_dir)
+    files, total_bytes = corpus_files(solutions_dir)
+    if not files:
+        logger.error(f"No solutions found in {args.solutions_dir}")
+        return 1
+    logger.info(f"Corpus: {len(files)} files, {total_bytes / 2**20:.0f} MB")
+    per_file = sample(files, args.max_files)
+    filters = {"game_type": args.game_type, "depth": args.depth, "position": args.position}
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"dir": solutions_dir, "files": len(files), "bytes": total_bytes},
+        "max_files": args.max_files,
+        "filters": filters,
+        "stages": {},
+    }
+    if args.scratch_dir:
+        os.makedirs(args.scratch_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=args.scratch_dir) as scratch_dir:
+        for stage in args.stages:
+            stage_files = per_file if stage in PER_FILE_STAGES else []
+            logger.info(f"Running {stage}")
+            result = run_isolated(stage, solutions_dir, stage_files, scratch_dir, filters)
+            results["stages"][stage] = result
+            logger.info(f"{stage}: {result['seconds']:.2f} s, peak {result['peak_rss_mb']:.0f} MB")
+            if "first_file_seconds" in result:
+                logger.info(f"{stage}: first file after {result['first_file_seconds'] * 1000:.1f} ms")
+
+    print()
+    print_results(results["stages"])
+    print("\nPeak is the peak RSS of the stage's process; growth is over the RSS after its imports.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
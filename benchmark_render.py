@@ -0,0 +1,318 @@
+"""
+Render-pipeline benchmark for poker_viz.
+
+Times every stage of PokerTableVisualizer (template build, villain cards, hero
+cards, rectangle overlay, player text, chips, table text, resize and PNG
+encode) across player counts, scale factors, output tiers and a few
+representative solutions. Tables with fewer players than the source solution keep the
+positions a table of that size has (see GameDataProcessor.get_position_mapping).
+
+The template is built once per configuration, on the first render. The other
+stages are timed over repeated renders of random hands on that warm
+visualizer, the way generate_hand_images.py reuses visualizers.
+
+Results are written as JSON (median, mean and minimum milliseconds per stage).
+Given a baseline produced by an earlier run, the benchmark reports stages whose
+median got slower than the threshold allows and exits with status 1.
+render_baseline.json holds the results of the default run on the development
+machine; timings only compare on the same machine, so regenerate it with
+--output before comparing elsewhere.
+
+Example:
+    python benchmark_render.py --output render_benchmark.json
+    python benchmark_render.py --baseline render_baseline.json --threshold 0.25
+    python benchmark_render.py --players 9 --scales 2 --repeat 10
+    python benchmark_render.py --players 9 --scales 1 --tiers thumbnail preview full
+"""
+
+import argparse
+import copy
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import PIL
+
+from clear_spot_solution_json import clear_spot_solution_json
+from poker_viz import DEFAULT_TIER, RENDERER_VERSION, RESOLUTION_TIERS, PokerTableVisualizer
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+STAGES = [
+    "template",
+    "villain_cards",
+    "hero_cards",
+    "rectangles",
+    "player_text",
+    "chips",
+    "table_text",
+    "resize",
+    "encode",
+    "total",
+]
+
+POSITIONS_BY_COUNT = {
+    9: ["UTG", "UTG+1", "UTG+2", "LJ", "HJ", "CO", "BTN", "SB", "BB"],
+    8: ["UTG", "UTG+1", "LJ", "HJ", "CO", "BTN", "SB", "BB"],
+    7: ["UTG", "LJ", "HJ", "CO", "BTN", "SB", "BB"],
+    6: ["LJ", "HJ", "CO", "BTN", "SB", "BB"],
+    5: ["HJ", "CO", "BTN", "SB", "BB"],
+    4: ["CO", "BTN", "SB", "BB"],
+    3: ["BTN", "SB", "BB"],
+    2: ["SB", "BB"],
+}
+
+RANKS = "AKQJT98765432"
+SUITS = "hdcs"
+
+
+def representative_solutions(solutions_dir, count):
+    """
+    Pick one solution per game type, preferring game types with 9 players
+
+    Parameters:
+    solutions_dir (str): Directory with solution JSON files
+    count (int): Number of solutions to pick
+
+    Returns:
+    list: Paths of the chosen solution files
+    """
+    chosen = []
+    for game_dir in sorted(Path(solutions_dir).iterdir()):
+        if game_dir.is_dir():
+            files = sorted(game_dir.rglob("*.json"))
+            if files:
+                chosen.append(str(files[0]))
+    # 9-max solutions first, so every player count can be built from them
+    chosen.sort(key=lambda path: "9m" not in Path(path).parts[-6])
+    return chosen[:count]
+
+
+def table_with_players(solution, num_players):
+    """
+    Reduce a solution to a table of num_players seats
+
+    Parameters:
+    solution (dict): Parsed solution JSON
+    num_players (int): Seats of the table (2-9)
+
+    Returns:
+    dict: Copy of the solution with the players of the smaller table, or None
+    if the solution has fewer players
+    """
+    players = solution["game"]["players"]
+    if len(players) < num_players:
+        return None
+    positions = POSITIONS_BY_COUNT[num_players]
+    kept = [copy.deepcopy(p) for p in players if p.get("position") in positions]
+    if len(kept) != num_players:
+        return None
+    if not any(p.get("is_hero") for p in kept):
+        # The hero was dropped with its seat; seat the hero on the first active player
+        kept[0]["is_hero"] = True
+        kept[0]["is_folded"] = False
+        kept[0]["is_active"] = True
+    table = copy.copy(solution)
+    table["game"] = dict(solution["game"], players=kept)
+    return table
+
+
+def random_cards(rng):
+    """Two distinct random cards"""
+    deck = [rank + suit for rank in RANKS for suit in SUITS]
+    return rng.sample(deck, 2)
+
+
+def benchmark_case(solution, solution_path, scale_factor, repeat, rng, tier=DEFAULT_TIER):
+    """
+    Build the template of one table configuration, then render hands on it
+    repeatedly and time every stage
+
+    Parameters:
+    solution (dict): Table to render
+    solution_path (str): Path of the source solution
+    scale_factor (int): Render scale factor
+    repeat (int): Number of warm renders
+    rng (random.Random): Source of the hero cards
+    tier (str): Output tier
+
+    Returns:
+    dict: Per stage, the median, mean and minimum milliseconds; "total" is
+    the wall time of a warm render
+    """
+    samples = defaultdict(list)
+    timings = defaultdict(float)
+
+    def record(stage, seconds):
+        timings[stage] += seconds
+
+    card1, card2 = random_cards(rng)
+    visualizer = PokerTableVisualizer(
+        solution,
+        card1,
+        card2,
+        solution_path=solution_path,
+        scale_factor=scale_factor,
+        stage_timer=record,
+        tier=tier,
+    )
+    # The first render builds the template; only its template time is kept
+    visualizer.render_png_bytes()
+    samples["template"].append(timings["template"] * 1000)
+
+    for _ in range(repeat):
+        timings.clear()
+        visualizer.card1, visualizer.card2 = random_cards(rng)
+        start = time.perf_counter()
+        visualizer.render_png_bytes()
+        timings["total"] = time.perf_counter() - start
+        for stage, seconds in timings.items():
+            samples[stage].append(seconds * 1000)
+
+    return {
+        stage: {
+            "median_ms": round(statistics.median(values), 3),
+            "mean_ms": round(statistics.mean(values), 3),
+            "min_ms": round(min(values), 3),
+        }
+        for stage, values in samples.items()
+    }
+
+
+def compare_to_baseline(results, baseline, threshold, min_delta_ms):
+    """
+    Find stages whose median got slower than allowed
+
+    Parameters:
+    results (dict): Results of this run
+    baseline (dict): Results of the baseline run
+    threshold (float): Allowed relative slowdown (0.2 = 20%)
+    min_delta_ms (float): Slowdowns below this many milliseconds are noise
+
+    Returns:
+    list: (case, stage, baseline ms, current ms) for every regression
+    """
+    regressions = []
+    for case, stages in results["cases"].items():
+        baseline_stages = baseline.get("cases", {}).get(case)
+        if not baseline_stages:
+            continue
+        for stage, stats in stages.items():
+            if stage not in baseline_stages:
+                continue
+            before = baseline_stages[stage]["median_ms"]
+            after = stats["median_ms"]
+            if after > before * (1 + threshold) and after - before > min_delta_ms:
+                regressions.append((case, stage, before, after))
+    return regressions
+
+
+def print_results(results):
+    """Print the median of every stage as a table"""
+    stages = [s for s in STAGES if any(s in case for case in results["cases"].values())]
+    header = f"{'case':<44}" + "".join(f"{s[:11]:>12}" for s in stages)
+    print(header)
+    print("-" * len(header))
+    for case, case_stages in results["cases"].items():
+        print(
+            f"{case[:43]:<44}"
+            + "".join(
+                f"{case_stages[s]['median_ms']:>12.1f}" if s in case_stages else f"{'-':>12}"
+                for s in stages
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the stages of the poker table renderer")
+    parser.add_argument("--solutions-dir", default="poker_solutions", help="Directory with solution JSON files")
+    parser.add_argument("--solutions", nargs="+", help="Solution files to render (default: one per game type)")
+    parser.add_argument("--num-solutions", type=int, default=1, help="Representative solutions to pick")
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=list(range(2, 10)), help="Player counts (default: 2-9)"
+    )
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[1, 2, 3], help="Scale factors (default: 1 2 3)"
+    )
+    parser.add_argument(
+        "--tiers",
+        nargs="+",
+        choices=list(RESOLUTION_TIERS),
+        default=[DEFAULT_TIER],
+        help="Output tiers (default: full)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Warm renders per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the hero cards")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Baseline JSON from an earlier run to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown of a stage median (default: 0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this (default: 1 ms)"
+    )
+    args = parser.parse_args()
+
+    solution_files = args.solutions or representative_solutions(args.solutions_dir, args.num_solutions)
+    if not solution_files:
+        logger.error(f"No solutions found in {args.solutions_dir}")
+        return 1
+
+    rng = random.Random(args.seed)
+    results = {
+        "renderer_version": RENDERER_VERSION,
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "cases": {},
+    }
+    for solution_file in solution_files:
+        solution = json.loads(clear_spot_solution_json(solution_file))
+        solution_name = Path(solution_file).parts[-6] if len(Path(solution_file).parts) >= 6 else Path(solution_file).stem
+        for num_players in args.players:
+            table = table_with_players(solution, num_players)
+            if table is None:
+                logger.warning(f"{solution_file} has no {num_players}-player table, skipping")
+                continue
+            for scale_factor in args.scales:
+                for tier in args.tiers:
+                    case = f"{solution_name}/{num_players}p/x{scale_factor}"
+                    # Full-tier cases keep their names, so older baselines still compare
+                    if tier != DEFAULT_TIER:
+                        case += f"/{tier}"
+                    logger.info(f"Benchmarking {case}")
+                    results["cases"][case] = benchmark_case(
+                        table, solution_file, scale_factor, args.repeat, rng, tier=tier
+                    )
+
+    print()
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}:")
+            for case, stage, before, after in regressions:
+                print(f"  {case} {stage}: {before:.1f} ms -> {after:.1f} ms ({after / before - 1:+.0%})")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Compare the SVG backend of poker_viz with PNG rendering.
+
+For every table configuration (player count of a representative solution),
+measures the time to render a hand and the size of the result:
+
+- PNG: PokerTableVisualizer.render_png_bytes on a visualizer whose template is
+  already built, as the hand image server renders from its cache
+- SVG: SvgTableRenderer.render on a built scene, as the server renders from its
+  scene cache, with the sprites linked and with the sprites embedded
+
+Cold times (template build, scene build) are reported separately. SVG sizes are
+also given gzip-compressed, as a web server would send them.
+
+Example:
+    python benchmark_svg.py
+    python benchmark_svg.py --players 8 9 --repeat 5 --output svg_benchmark.json
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from benchmark_render import random_cards, representative_solutions, table_with_players
+from clear_spot_solution_json import clear_spot_solution_json
+from poker_viz import PokerTableVisualizer
+from poker_viz.svg_renderer import SvgTableRenderer
+
+logger = logging.getLogger(__name__)
+
+
+def time_calls(func, repeat):
+    """
+    Call func repeatedly
+
+    Parameters:
+    func (callable): Function without arguments
+    repeat (int): Number of calls
+
+    Returns:
+    tuple: (median milliseconds per call, result of the last call)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def benchmark_case(table, solution_path, scale_factor, repeat, svg_repeat, rng):
+    """
+    Render hands of one table configuration with both backends
+
+    Parameters:
+    table (dict): Table to render
+    solution_path (str): Path of the source solution
+    scale_factor (int): Scale factor of the PNG renderer
+    repeat (int): Warm PNG renders
+    svg_repeat (int): Warm SVG renders
+    rng (random.Random): Source of the hero cards
+
+    Returns:
+    dict: Cold and warm milliseconds and output bytes of both backends
+    """
+    card1, card2 = random_cards(rng)
+    visualizer = PokerTableVisualizer(
+        table, card1, card2, solution_path=solution_path, scale_factor=scale_factor
+    )
+    start = time.perf_counter()
+    visualizer.render_png_bytes()
+    png_cold_ms = (time.perf_counter() - start) * 1000
+
+    def render_png():
+        visualizer.card1, visualizer.card2 = random_cards(rng)
+        return visualizer.render_png_bytes()
+
+    png_ms, png = time_calls(render_png, repeat)
+
+    result = {
+        "png": {"cold_ms": round(png_cold_ms, 3), "warm_ms": round(png_ms, 3), "bytes": len(png)},
+    }
+    for name, embed_assets in (("svg", False), ("svg_embedded", True)):
+        renderer = SvgTableRenderer(table, solution_path=solution_path, embed_assets=embed_assets)
+        start = time.perf_counter()
+        renderer.build_scene()
+        cold_ms = (time.perf_counter() - start) * 1000
+        svg_ms, svg = time_calls(lambda: renderer.render_bytes(*random_cards(rng)), svg_repeat)
+        result[name] = {
+            "cold_ms": round(cold_ms, 3),
+            "warm_ms": round(svg_ms, 4),
+            "bytes": len(svg),
+            "gzip_bytes": len(gzip.compress(svg)),
+        }
+    return result
+
+
+def print_results(cases):
+    """Print warm render time and bytes of every backend as a table"""
+    header = (
+        f"{'case':<34}{'png ms':>9}{'png KB':>9}{'svg ms':>9}{'svg KB':>9}{'gzip KB':>9}"
+        f"{'embed KB':>10}{'speedup':>10}{'smaller':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for case, result in cases.items():
+        png, svg, embedded = result["png"], result["svg"], result["svg_embedded"]
+        print(
+            f"{case[:33]:<34}{png['warm_ms']:>9.1f}{png['bytes'] / 1024:>9.1f}"
+            f"{svg['warm_ms']:>9.3f}{svg['bytes'] / 1024:>9.1f}{svg['gzip_bytes'] / 1024:>9.1f}"
+            f"{embedded['bytes'] / 1024:>10.1f}{png['warm_ms'] / svg['warm_ms']:>9.0f}x"
+            f"{png['bytes'] / svg['gzip_bytes']:>8.0f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SVG and PNG rendering of poker tables")
+    parser.add_argument("--solutions-dir", default="poker_solutions", help="Directory with solution JSON files")
+    parser.add_argument("--solutions", nargs="+", help="Solution files to render (default: one per game type)")
+    parser.add_argument("--num-solutions", type=int, default=1, help="Representative solutions to pick")
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=list(range(2, 10)), help="Player counts (default: 2-9)"
+    )
+    parser.add_argument("--scale", type=int, default=1, help="Scale factor of the PNG renderer (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Warm PNG renders per configuration")
+    parser.add_argument("--svg-repeat", type=int, default=200, help="Warm SVG renders per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the hero cards")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    solution_files = args.solutions or representative_solutions(args.solutions_dir, args.num_solutions)
+    if not solution_files:
+        logger.error(f"No solutions found in {args.solutions_dir}")
+        return 1
+
+    rng = random.Random(args.seed)
+    cases = {}
+    for solution_file in solution_files:
+        solution = json.loads(clear_spot_solution_json(solution_file))
+        parts = Path(solution_file).parts
+        solution_name = parts[-6] if len(parts) >= 6 else Path(solution_file).stem
+        for num_players in args.players:
+            table = table_with_players(solution, num_players)
+            if table is None:
+                logger.warning(f"{solution_file} has no {num_players}-player table, skipping")
+                continue
+            case = f"{solution_name}/{num_players}p"
+            logger.info(f"Benchmarking {case}")
+            cases[case] = benchmark_case(
+                table, solution_file, args.scale, args.repeat, args.svg_repeat, rng
+            )
+
+    print()
+    print_results(cases)
+    print("\nWarm renders reuse the PNG template or SVG scene; 'smaller' compares PNG with gzipped SVG.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"scale_factor": args.scale, "cases": cases}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
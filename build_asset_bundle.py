@@ -0,0 +1,46 @@
+"""
+Build the pre-decoded asset bundle of poker_viz (see poker_viz/assets.py).
+
+The renderer memory-maps assets.bundle when it exists, so all server workers
+and batch processes share one decoded copy of the card images, the avatar and
+the table logo. Rebuild it after changing any of these images; until then the
+changed images are decoded from disk.
+
+Example:
+    python build_asset_bundle.py
+    python build_asset_bundle.py --output /srv/assets.bundle
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from poker_viz.assets import DEFAULT_BUNDLE_PATH, build_bundle
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-decoded poker_viz asset bundle")
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_BUNDLE_PATH,
+        help="Bundle file (default: assets.bundle; point POKER_VIZ_ASSETS at any other path)",
+    )
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    index = build_bundle(args.output)
+    size_mb = os.path.getsize(args.output) / 2**20
+    logger.info(
+        f"Wrote {len(index['assets'])} assets ({size_mb:.1f} MB) to {args.output} "
+        f"in {time.perf_counter() - start_time:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
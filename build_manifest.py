@@ -0,0 +1,183 @@
+"""
+Build manifest for incremental visualization rebuilds.
+
+The manifest lives next to the generated images (``.build_manifest.json`` in the
+output directory) and records, for every output file, the inputs it was built
+from: a hash of the source solution, a hash of the filter parameters, the card
+assignment and the renderer version. A rerun compares those signatures and only
+renders outputs whose inputs changed.
+
+Entries are only recorded after the image has been written, and the manifest is
+saved atomically, so an interrupted run simply resumes: anything not recorded is
+rendered again on the next run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".build_manifest.json"
+MANIFEST_FORMAT = 1
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def params_hash(params):
+    """Return a stable hash for a dictionary of build parameters."""
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def make_signature(source_hash, params_digest, cards, renderer_version):
+    """Build the signature that decides whether an output is up to date."""
+    return {
+        "source_hash": source_hash,
+        "params_hash": params_digest,
+        "cards": list(cards) if cards else None,
+        "renderer": renderer_version,
+    }
+
+
+class BuildManifest:
+    """Track the inputs of every generated output under an output directory."""
+
+    def __init__(self, output_dir, filename=MANIFEST_FILENAME, save_every=25):
+        """
+        Initialize the manifest
+
+        Parameters:
+        output_dir (str): Directory holding the generated outputs
+        filename (str, optional): Manifest file name inside output_dir
+        save_every (int, optional): Save automatically after this many records
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / filename
+        self.save_every = save_every
+        self.entries = {}
+        self._by_source = {}
+        self._dirty = 0
+        self.load()
+
+    def load(self):
+        """Load the manifest from disk, starting empty if it is missing or corrupt."""
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("format") == MANIFEST_FORMAT:
+                    self.entries = data.get("outputs", {})
+                else:
+                    logger.warning(
+                        f"Ignoring manifest {self.path} with unknown format {data.get('format')}"
+                    )
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read manifest {self.path}, starting fresh: {e}")
+        self._by_source = {
+            entry["source"]: key
+            for key, entry in self.entries.items()
+            if entry.get("source")
+        }
+
+    def save(self):
+        """Write the manifest atomically so a crash never leaves it half-written."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"format": MANIFEST_FORMAT, "outputs": self.entries},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
+
+    def key_for(self, output_path):
+        """Return the manifest key (POSIX path relative to output_dir) for an output."""
+        return Path(output_path).relative_to(self.output_dir).as_posix()
+
+    def get(self, key):
+        """Return the entry recorded for an output key, if any."""
+        return self.entries.get(key)
+
+    def find_by_source(self, source):
+        """Return (key, entry) for the output last built from a source, if any."""
+        key = self._by_source.get(source)
+        if key is None:
+            return None, None
+        return key, self.entries.get(key)
+
+    def is_current(self, key, signature):
+        """Check whether an output exists and was built from the given inputs."""
+        entry = self.entries.get(key)
+        if not entry:
+            return False
+        if any(entry.get(field) != value for field, value in signature.items()):
+            return False
+        return (self.output_dir / key).exists()
+
+    def record(self, key, signature, source=None):
+        """Record a freshly written output."""
+        entry = dict(signature)
+        if source is not None:
+            entry["source"] = source
+            previous = self._by_source.get(source)
+            if previous is not None and previous != key:
+                self._by_source.pop(source, None)
+            self._by_source[source] = key
+        self.entries[key] = entry
+        self._dirty += 1
+        if self.save_every and self._dirty >= self.save_every:
+            self.save()
+
+    def remove(self, key, delete_file=True):
+        """Forget an output and optionally delete the file it points to."""
+        entry = self.entries.pop(key, None)
+        if entry and entry.get("source") and self._by_source.get(entry["source"]) == key:
+            del self._by_source[entry["source"]]
+        if delete_file:
+            try:
+                (self.output_dir / key).unlink()
+                logger.info(f"Removed stale output: {key}")
+            except FileNotFoundError:
+                pass
+        self._dirty += 1
+
+    def keys_under(self, prefix):
+        """Return all output keys located under a directory prefix."""
+        prefix = prefix.rstrip("/") + "/"
+        return [key for key in self.entries if key.startswith(prefix)]
+
+    def remove_stale(self, prefix, expected_keys):
+        """Remove outputs under prefix that are no longer expected. Returns the count."""
+        expected = set(expected_keys)
+        stale = [key for key in self.keys_under(prefix) if key not in expected]
+        for key in stale:
+            self.remove(key)
+        return len(stale)
+
+    def remove_orphans(self, source_root):
+        """Remove outputs whose recorded source file no longer exists."""
+        source_root = Path(source_root)
+        # Sources inside a hand pack are recorded as "hands.pack#AKs"
+        orphans = [
+            key
+            for key, entry in self.entries.items()
+            if entry.get("source")
+            and not (source_root / entry["source"].split("#")[0]).exists()
+        ]
+        for key in orphans:
+            self.remove(key)
+        return len(orphans)
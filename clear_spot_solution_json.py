@@ -3,17 +3,15 @@ import os
 from datetime import datetime
 
 
-def clear_spot_solution_json(input_file):
+def clean_spot_solution_data(data):
     """
-    Clean a JSON file by removing specified keys from the players_info section.
-    Formats 'strategy' and 'evs' arrays to have 13 elements per line in the JSON output.
+    Remove the bulky analysis keys from already parsed spot solution data.
 
     Args:
-        input_file (str): Path to the input JSON file
-        output_file (str, optional): Path to the output JSON file. If None, a default name will be created.
+        data (dict): Parsed spot solution, modified in place
 
     Returns:
-        str: Path to the created output file
+        dict: The cleaned data
     """
 
     # Keys to remove from each player in players_info
@@ -28,37 +26,54 @@ def clear_spot_solution_json(input_file):
     # Player field to remove
     player_field_to_remove = "relative_postflop_position"
 
+    # Clean action_solutions
+    if "action_solutions" in data:
+        for action in data["action_solutions"]:
+            if "equity_buckets" in action:
+                action["equity_buckets"] = []
+            if "equity_buckets_advanced" in action:
+                action["equity_buckets_advanced"] = []
+            if "hand_categories" in action:
+                action["hand_categories"] = []
+            if "draw_categories" in action:
+                action["draw_categories"] = []
+
+    # Clean players_info
+    if "players_info" in data:
+        for player_info in data["players_info"]:
+            # Remove specified keys
+            for key in keys_to_remove:
+                if key in player_info:
+                    del player_info[key]
+
+            # Remove the field from player object
+            if (
+                "player" in player_info
+                and player_field_to_remove in player_info["player"]
+            ):
+                del player_info["player"][player_field_to_remove]
+
+    return data
+
+
+def clear_spot_solution_json(input_file):
+    """
+    Clean a JSON file by removing specified keys from the players_info section.
+    Formats 'strategy' and 'evs' arrays to have 13 elements per line in the JSON output.
+
+    Args:
+        input_file (str): Path to the input JSON file
+        output_file (str, optional): Path to the output JSON file. If None, a default name will be created.
+
+    Returns:
+        str: Path to the created output file
+    """
     try:
         # Load the JSON data
         with open(input_file, "r") as f:
             data = json.load(f)
 
-        # Clean action_solutions
-        if "action_solutions" in data:
-            for action in data["action_solutions"]:
-                if "equity_buckets" in action:
-                    action["equity_buckets"] = []
-                if "equity_buckets_advanced" in action:
-                    action["equity_buckets_advanced"] = []
-                if "hand_categories" in action:
-                    action["hand_categories"] = []
-                if "draw_categories" in action:
-                    action["draw_categories"] = []
-
-        # Clean players_info
-        if "players_info" in data:
-            for player_info in data["players_info"]:
-                # Remove specified keys
-                for key in keys_to_remove:
-                    if key in player_info:
-                        del player_info[key]
-
-                # Remove the field from player object
-                if (
-                    "player" in player_info
-                    and player_field_to_remove in player_info["player"]
-                ):
-                    del player_info["player"][player_field_to_remove]
+        clean_spot_solution_data(data)
 
         formatted_json = custom_json_format(data)
         return formatted_json
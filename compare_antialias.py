@@ -0,0 +1,349 @@
+"""
+Compare native-resolution anti-aliasing with supersampled rendering.
+
+Renders the same hands in three modes:
+
+- x2 supersample: drawn at twice the size and scaled down (the reference)
+- x1 supersample: drawn at the output size with blurred shape masks
+- x1 native: drawn at the output size with coverage-mask anti-aliasing (see
+  poker_viz/antialias.py)
+
+Quality is measured against the reference: PSNR over the whole image, PSNR
+over the pixels near edges of the reference (where aliasing shows), and the
+mean SSIM of the luminance. Both x1 modes also differ from the reference by
+sub-pixel placement and glyph rendering, which these scores include, so the
+edges of the seat shapes are also compared on their own: each mode's mask of a
+shape against its exact coverage, computed with EXACT_SAMPLES subsamples.
+Throughput is the template build time and the median time of warm renders,
+encode excluded.
+
+Example:
+    python compare_antialias.py
+    python compare_antialias.py --players 9 --repeat 10 --save-dir aa_compare --output aa_compare.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from benchmark_render import random_cards, representative_solutions, table_with_players
+from clear_spot_solution_json import clear_spot_solution_json
+from poker_viz import PokerTableVisualizer
+from poker_viz.antialias import shape_mask
+
+logger = logging.getLogger(__name__)
+
+# (name, scale factor, antialias mode); the first one is the reference
+MODES = [
+    ("x2_supersample", 2, "supersample"),
+    ("x1_supersample", 1, "supersample"),
+    ("x1_native", 1, "native"),
+]
+
+# Side of the square SSIM window, in pixels
+SSIM_WINDOW = 7
+
+# Subsamples per pixel of the exact shape coverage
+EXACT_SAMPLES = 16
+
+# Seat shapes at x1 as (name, shape, bbox, radius, outline width, mask blur
+# per scale factor of the supersample mode), at fractional positions
+SEAT_SHAPES = [
+    ("circle", "ellipse", (10.3, 10.6, 148.9, 149.2), 0, 0, 0.5),
+    ("circle border", "ellipse", (10.3, 10.6, 148.9, 149.2), 0, 2, 0.3),
+    ("rectangle", "rounded_rectangle", (10.5, 10.2, 136.5, 94.2), 25.2, 0, 0.3),
+    ("rectangle border", "rounded_rectangle", (10.5, 10.2, 136.5, 94.2), 25.2, 2, 0.3),
+    ("dealer button", "ellipse", (10.4, 10.7, 34.4, 34.7), 0, 0, 0),
+]
+
+
+def psnr(reference, image, mask=None):
+    """
+    Peak signal-to-noise ratio of two RGB arrays
+
+    Parameters:
+    reference (numpy.ndarray): Reference pixels, height x width x 3
+    image (numpy.ndarray): Compared pixels, same shape
+    mask (numpy.ndarray): Boolean height x width array of the pixels to compare (optional)
+
+    Returns:
+    float: PSNR in dB (infinite for identical pixels)
+    """
+    error = (reference.astype(np.float64) - image.astype(np.float64)) ** 2
+    if mask is not None:
+        error = error[mask]
+    mse = error.mean()
+    return math.inf if mse == 0 else 10 * math.log10(255**2 / mse)
+
+
+def _box_mean(values, size):
+    """Mean over a size x size window around every pixel, edges repeated"""
+    pad = size // 2
+    padded = np.pad(values, pad, mode="edge")
+    sums = np.pad(padded.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    window = sums[size:, size:] - sums[:-size, size:] - sums[size:, :-size] + sums[:-size, :-size]
+    return window / (size * size)
+
+
+def ssim(reference, image, size=SSIM_WINDOW):
+    """
+    Mean structural similarity of two grayscale arrays
+
+    Parameters:
+    reference (numpy.ndarray): Reference luminance, height x width
+    image (numpy.ndarray): Compared luminance, same shape
+    size (int): Side of the square window
+
+    Returns:
+    float: Mean SSIM, 1.0 for identical images
+    """
+    x = reference.astype(np.float64)
+    y = image.astype(np.float64)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_x, mu_y = _box_mean(x, size), _box_mean(y, size)
+    var_x = _box_mean(x * x, size) - mu_x**2
+    var_y = _box_mean(y * y, size) - mu_y**2
+    covariance = _box_mean(x * y, size) - mu_x * mu_y
+    index = ((2 * mu_x * mu_y + c1) * (2 * covariance + c2)) / (
+        (mu_x**2 + mu_y**2 + c1) * (var_x + var_y + c2)
+    )
+    return float(index.mean())
+
+
+def edge_mask(image):
+    """
+    Pixels on or next to an edge of an image
+
+    Parameters:
+    image (PIL.Image.Image): RGB image
+
+    Returns:
+    numpy.ndarray: Boolean height x width array
+    """
+    edges = image.convert("L").filter(ImageFilter.FIND_EDGES).point(lambda v: 255 if v > 32 else 0)
+    return np.asarray(edges.filter(ImageFilter.MaxFilter(3))) > 0
+
+
+def _placed_mask(canvas_size, shape, bbox, radius, width, samples):
+    """Coverage mask of a shape on a canvas of canvas_size"""
+    position, mask = shape_mask(shape, bbox, radius=radius, width=width, samples=samples)
+    canvas = Image.new("L", canvas_size, 0)
+    canvas.paste(mask, position)
+    return canvas
+
+
+def _supersampled_mask(canvas_size, shape, bbox, radius, width, blur, scale_factor):
+    """Mask of a shape as the supersample mode draws it: aliased, blurred, scaled down"""
+    canvas = Image.new("L", (canvas_size[0] * scale_factor, canvas_size[1] * scale_factor), 0)
+    draw = ImageDraw.Draw(canvas)
+    scaled = [v * scale_factor for v in bbox]
+    style = {"outline": 255, "width": width * scale_factor} if width else {"fill": 255}
+    if shape == "ellipse":
+        draw.ellipse(scaled, **style)
+    else:
+        draw.rounded_rectangle(scaled, radius=radius * scale_factor, **style)
+    if blur:
+        canvas = canvas.filter(ImageFilter.GaussianBlur(radius=blur * scale_factor))
+    if scale_factor > 1:
+        canvas = canvas.resize(canvas_size, Image.BICUBIC)
+    return canvas
+
+
+def compare_shapes():
+    """
+    Compare each mode's mask of the seat shapes with their exact coverage
+
+    Returns:
+    dict: Per shape and mode, the PSNR of the mask in dB
+    """
+    results = {}
+    for name, shape, bbox, radius, width, blur in SEAT_SHAPES:
+        canvas_size = (int(bbox[2]) + 12, int(bbox[3]) + 12)
+        exact = np.asarray(_placed_mask(canvas_size, shape, bbox, radius, width, EXACT_SAMPLES))
+        masks = {
+            mode: (
+                _placed_mask(canvas_size, shape, bbox, radius, width, samples=4)
+                if antialias == "native"
+                else _supersampled_mask(canvas_size, shape, bbox, radius, width, blur, scale_factor)
+            )
+            for mode, scale_factor, antialias in MODES
+        }
+        results[name] = {
+            mode: round(psnr(exact[..., None], np.asarray(mask)[..., None]), 2)
+            for mode, mask in masks.items()
+        }
+    return results
+
+
+def render_mode(table, solution_path, cards, scale_factor, antialias, repeat):
+    """
+    Render hands in one mode
+
+    Parameters:
+    table (dict): Table to render
+    solution_path (str): Path of the source solution
+    cards (list): (card1, card2) per hand; the first hand is the one compared
+    scale_factor (int): Render scale factor
+    antialias (str): Anti-aliasing mode
+    repeat (int): Warm renders to time
+
+    Returns:
+    tuple: (RGB image of the first hand, template ms, median warm render ms)
+    """
+    visualizer = PokerTableVisualizer(
+        table, *cards[0], solution_path=solution_path, scale_factor=scale_factor, antialias=antialias
+    )
+    start = time.perf_counter()
+    visualizer.create_template()
+    template_ms = (time.perf_counter() - start) * 1000
+    image = visualizer.render().convert("RGB")
+
+    timings = []
+    for i in range(repeat):
+        visualizer.card1, visualizer.card2 = cards[1 + i % (len(cards) - 1)]
+        start = time.perf_counter()
+        visualizer.render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return image, template_ms, statistics.median(timings)
+
+
+def compare_case(table, solution_path, repeat, rng, save_prefix=None):
+    """
+    Render one table in every mode and compare the results with the reference
+
+    Parameters:
+    table (dict): Table to render
+    solution_path (str): Path of the source solution
+    repeat (int): Warm renders per mode
+    rng (random.Random): Source of the hero cards
+    save_prefix (str): Write each mode's image to <save_prefix>_<mode>.png (optional)
+
+    Returns:
+    dict: Per mode, the template and warm render milliseconds, renders per
+    second and the quality metrics against the reference
+    """
+    cards = [random_cards(rng) for _ in range(repeat + 1)]
+    results = {}
+    reference = None
+    for name, scale_factor, antialias in MODES:
+        image, template_ms, render_ms = render_mode(
+            table, solution_path, cards, scale_factor, antialias, repeat
+        )
+        if save_prefix:
+            image.save(f"{save_prefix}_{name}.png")
+        result = {
+            "template_ms": round(template_ms, 1),
+            "render_ms": round(render_ms, 1),
+            "renders_per_second": round(1000 / render_ms, 2),
+        }
+        if reference is None:
+            reference = np.asarray(image)
+            reference_edges = edge_mask(image)
+            reference_luma = np.asarray(image.convert("L"))
+        else:
+            pixels = np.asarray(image)
+            result["psnr_db"] = round(psnr(reference, pixels), 2)
+            result["edge_psnr_db"] = round(psnr(reference, pixels, reference_edges), 2)
+            result["ssim"] = round(ssim(reference_luma, np.asarray(image.convert("L"))), 4)
+        results[name] = result
+    return results
+
+
+def print_results(cases):
+    """Print every mode of every case as a table"""
+    header = (
+        f"{'case':<34}{'mode':<16}{'template ms':>12}{'render ms':>11}{'renders/s':>11}"
+        f"{'PSNR dB':>9}{'edge dB':>9}{'SSIM':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for case, modes in cases.items():
+        for name, result in modes.items():
+            quality = (
+                f"{result['psnr_db']:>9.2f}{result['edge_psnr_db']:>9.2f}{result['ssim']:>8.4f}"
+                if "psnr_db" in result
+                else f"{'ref':>9}{'ref':>9}{'ref':>8}"
+            )
+            print(
+                f"{case[:33]:<34}{name:<16}{result['template_ms']:>12.0f}{result['render_ms']:>11.1f}"
+                f"{result['renders_per_second']:>11.2f}{quality}"
+            )
+
+
+def print_shapes(shapes):
+    """Print the mask PSNR of every seat shape and mode as a table"""
+    header = f"{'shape':<20}" + "".join(f"{mode:>16}" for mode, _, _ in MODES)
+    print(header)
+    print("-" * len(header))
+    for name, modes in shapes.items():
+        print(f"{name:<20}" + "".join(f"{modes[mode]:>16.2f}" for mode, _, _ in MODES))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare native anti-aliasing with supersampled rendering"
+    )
+    parser.add_argument("--solutions-dir", default="poker_solutions", help="Directory with solution JSON files")
+    parser.add_argument("--solutions", nargs="+", help="Solution files to render (default: one per game type)")
+    parser.add_argument("--num-solutions", type=int, default=1, help="Representative solutions to pick")
+    parser.add_argument("--players", type=int, nargs="+", default=[6, 9], help="Player counts (default: 6 9)")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm renders per mode")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the hero cards")
+    parser.add_argument("--save-dir", help="Write the image of every case and mode to this directory")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    solution_files = args.solutions or representative_solutions(args.solutions_dir, args.num_solutions)
+    if not solution_files:
+        logger.error(f"No solutions found in {args.solutions_dir}")
+        return 1
+    if args.save_dir:
+        os.makedirs(args.save_dir, exist_ok=True)
+
+    rng = random.Random(args.seed)
+    cases = {}
+    for solution_file in solution_files:
+        solution = json.loads(clear_spot_solution_json(solution_file))
+        parts = Path(solution_file).parts
+        solution_name = parts[-6] if len(parts) >= 6 else Path(solution_file).stem
+        for num_players in args.players:
+            table = table_with_players(solution, num_players)
+            if table is None:
+                logger.warning(f"{solution_file} has no {num_players}-player table, skipping")
+                continue
+            case = f"{solution_name}/{num_players}p"
+            logger.info(f"Comparing {case}")
+            save_prefix = (
+                os.path.join(args.save_dir, f"{solution_name}_{num_players}p") if args.save_dir else None
+            )
+            cases[case] = compare_case(table, solution_file, args.repeat, rng, save_prefix)
+
+    shapes = compare_shapes()
+
+    print()
+    print_results(cases)
+    print("\nQuality is measured against x2_supersample; warm render times exclude PNG encoding.")
+    print("\nPSNR (dB) of seat shape masks against their exact coverage:\n")
+    print_shapes(shapes)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"modes": [name for name, _, _ in MODES], "cases": cases, "shapes": shapes}, f, indent=2
+            )
+        logger.info(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
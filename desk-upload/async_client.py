@@ -0,0 +1,250 @@
+"""
+Asyncio client for the Flow Poker API, shared by the async upload engine and
+the deletion script.
+
+All requests go through one aiohttp session and an AdaptiveRateLimiter.
+Throttled (429/5xx) and failed requests are retried with jittered exponential
+backoff (drill creation only when the server cannot have acted on it), and an expired session is refreshed through flow_auth (JSESSIONID
+cookie, single-flight re-login). Request payloads come from create_drill.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import aiohttp
+
+import flow_auth
+from create_drill import (
+    build_answer_payload,
+    build_drill_payload,
+    build_promote_payload,
+    build_wizard_rule_payload,
+)
+from rate_limit import AdaptiveRateLimiter, backoff_delay, is_throttle_status, parse_retry_after
+
+logger = logging.getLogger("async_client")
+
+# Headers aiohttp manages itself (and brotli/zstd it may not decode)
+_MANAGED_HEADERS = {"host", "connection", "accept-encoding"}
+
+
+class FlowPokerError(Exception):
+    """A request that failed with a non-retryable status"""
+
+    def __init__(self, status: int, text: str, endpoint: str):
+        super().__init__(f"{endpoint} failed: {status} - {text[:200]}")
+        self.status = status
+        self.text = text
+
+
+class AsyncFlowPokerClient:
+    """
+    Flow Poker API client for asyncio with shared rate limiting
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        limiter: AdaptiveRateLimiter,
+        max_retries: int = 5,
+        base_url: str = flow_auth.BASE_URL,
+    ):
+        """
+        Initialize the client
+
+        Args:
+            session: aiohttp session shared by all requests
+            limiter: Rate limiter shared by all requests
+            max_retries: Attempts per request
+            base_url: Flow Poker base URL
+        """
+        self.session = session
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.base_url = base_url
+        self.headers = {
+            key: value
+            for key, value in flow_auth.DEFAULT_HEADERS.items()
+            if key not in _MANAGED_HEADERS
+        }
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        form_factory=None,
+        idempotent: bool = True,
+    ) -> Any:
+        """
+        Send a request, retrying throttled, failed and unauthorized attempts
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without the base URL)
+            json_data: JSON body
+            form_factory: Callable returning a fresh aiohttp.FormData per attempt
+            idempotent: Whether repeating the request is safe. If not, it is
+                only retried when the server cannot have acted on it (429,
+                401/403, or a connection that failed before sending), and
+                other failures are raised instead of resending it.
+
+        Returns:
+            The decoded JSON response (None for an empty body)
+        """
+        url = f"{self.base_url}/{endpoint}"
+        last_error = "no attempt made"
+
+        for attempt in range(self.max_retries):
+            await self.limiter.acquire_async()
+            jsessionid = flow_auth.session_cookies.get("JSESSIONID")
+            headers = dict(self.headers)
+            if jsessionid:
+                headers["cookie"] = f"JSESSIONID={jsessionid}"
+
+            start_time = time.monotonic()
+            try:
+                async with self.session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    json=json_data,
+                    data=form_factory() if form_factory else None,
+                ) as response:
+                    status = response.status
+                    text = await response.text()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not idempotent and not isinstance(e, aiohttp.ClientConnectorError):
+                    # The request may have reached the server
+                    raise
+                last_error = f"{type(e).__name__}: {e}"
+                delay = backoff_delay(attempt)
+                logger.warning(f"{method} {endpoint} failed ({last_error}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if status in (401, 403):
+                logger.info("Session expired or unauthorized. Re-authenticating...")
+                last_error = f"HTTP {status}"
+                # Blocking login in a thread; concurrent callers share one login
+                if not await asyncio.to_thread(flow_auth.refresh_session, jsessionid):
+                    raise FlowPokerError(status, text, endpoint)
+                continue
+
+            if is_throttle_status(status):
+                self.limiter.on_throttle(retry_after)
+                if not idempotent and status != 429:
+                    # A 5xx may come after the server acted on the request
+                    raise FlowPokerError(status, text, endpoint)
+                last_error = f"HTTP {status}"
+                delay = max(retry_after or 0, backoff_delay(attempt))
+                logger.warning(
+                    f"{method} {endpoint} throttled ({status}), rate now {self.limiter.rate:.2f}/s, "
+                    f"retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.limiter.on_success(time.monotonic() - start_time)
+            if status != 200:
+                raise FlowPokerError(status, text, endpoint)
+            return json.loads(text) if text else None
+
+        raise Exception(f"{method} {endpoint} failed after {self.max_retries} attempts: {last_error}")
+
+    async def create_drill(
+        self, name: str, description: str, answers: List[str], tags: Dict[str, str]
+    ) -> int:
+        """Create a drill and return its ID"""
+        # Not idempotent: a resent POST after an ambiguous failure can leave a
+        # duplicate drill behind
+        data = await self.request(
+            "POST",
+            "resource/training-wizard",
+            json_data=build_drill_payload(name, description, answers, tags),
+            idempotent=False,
+        )
+        return data.get("id")
+
+    async def upload_image_bytes(self, drill_id: int, filename: str, image_data: bytes) -> int:
+        """Upload one image and return its media ID"""
+
+        def form():
+            form_data = aiohttp.FormData()
+            form_data.add_field("file", image_data, filename=filename, content_type="image/png")
+            form_data.add_field("trainingWizard", str(drill_id))
+            return form_data
+
+        data = await self.request("POST", "resource/stage-media/upload", form_factory=form)
+        return data.get("id")
+
+    async def finish_uploading(self, drill_id: int):
+        await self.request("POST", f"resource/training-wizard/{drill_id}/finish-uploading")
+
+    async def get_questions(self, drill_id: int) -> List[Dict]:
+        """Return the questions of a drill (the API may only return the first)"""
+        data = await self.request("GET", f"resource/training-wizard/{drill_id}/question")
+        if isinstance(data, str):
+            data = json.loads(data)
+        if isinstance(data, dict) and "id" in data:
+            return [data]
+        return data if isinstance(data, list) else []
+
+    async def score_answer(
+        self,
+        drill_id: int,
+        question_id: int,
+        media_id: int,
+        answers_scores: List[Dict[str, Union[str, int]]],
+        tags: Dict[str, str],
+        current: int,
+        total: int,
+    ):
+        await self.request(
+            "POST",
+            f"resource/training-wizard/{drill_id}/answer",
+            json_data=build_answer_payload(question_id, media_id, answers_scores, tags, current, total),
+        )
+
+    async def get_drill_info(self, drill_id: int) -> Dict:
+        return await self.request("GET", f"resource/training-wizard/{drill_id}")
+
+    async def set_wizard_rules(self, drill_id: int, amount: int):
+        drill_info = await self.get_drill_info(drill_id)
+        await self.request(
+            "POST",
+            f"resource/training-wizard/{drill_id}/wizard-rule",
+            json_data=build_wizard_rule_payload(drill_id, drill_info.get("tags", []), amount),
+        )
+
+    async def promote_drill(self, drill_id: int):
+        """Promote a drill, setting a wizard rule first if it has none"""
+        drill_info = await self.get_drill_info(drill_id)
+        rules = drill_info.get("rules", [])
+        if not rules:
+            try:
+                await self.set_wizard_rules(drill_id, 1)
+                rules = (await self.get_drill_info(drill_id)).get("rules", [])
+            except Exception as e:
+                logger.warning(f"Failed to set wizard rules before promotion: {str(e)}")
+
+        try:
+            await self.request(
+                "POST",
+                f"resource/training-wizard/{drill_id}/promote",
+                json_data=build_promote_payload(rules),
+            )
+        except FlowPokerError as e:
+            # Same as FlowPokerDrillCreator.promote_drill
+            if "Nenhuma regra adicionada" in e.text:
+                logger.info("Promotion failed due to missing rules. This is expected for some drill types.")
+                return
+            raise
+
+    async def delete_question(self, question_id: int):
+        """Delete a question (and its image)"""
+        await self.request("DELETE", f"resource/question/{question_id}")
@@ -0,0 +1,223 @@
+"""
+Asyncio upload engine for batch_visualizations_upload.py (--async-upload).
+
+All scenarios share one aiohttp session and one AdaptiveRateLimiter, so the
+server sees a steady request rate that follows what it can sustain: the rate
+grows while requests succeed and drops on 429/5xx responses, and failed
+requests are retried with jittered exponential backoff. Several scenarios are
+processed at the same time instead of one after another with fixed sleeps,
+and the questions of a drill are scored a few at a time. Completed steps are
+recorded in the upload journal like in the threaded path.
+
+Requests, retries and authentication are handled by async_client.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+import flow_auth
+from async_client import AsyncFlowPokerClient
+from batch_visualizations_upload import (
+    ScenarioPlan,
+    parse_hand_from_filename,
+    prepare_scenario,
+    scoring_order,
+)
+from drill_content import get_answer_scores_for_hand
+from rate_limit import AdaptiveRateLimiter
+from upload_journal import JOURNAL_FILENAME, ScenarioJournal, UploadJournal
+
+logger = logging.getLogger("async_upload")
+
+
+async def upload_scenario_images(
+    client: AsyncFlowPokerClient,
+    drill_id: int,
+    image_files: List[str],
+    concurrency: int,
+    progress: ScenarioJournal,
+) -> Dict[str, int]:
+    """
+    Upload every image of a scenario that the journal has no media ID for
+
+    Returns:
+        Mapping of hand to media ID; raises if any image could not be uploaded
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(image_file):
+        async with semaphore:
+            with open(image_file, "rb") as f:
+                image_data = f.read()
+            media_id = await client.upload_image_bytes(
+                drill_id, os.path.basename(image_file), image_data
+            )
+            progress.add_media(image_file, media_id)
+
+    missing_images = progress.missing_images(image_files)
+    results = await asyncio.gather(*(upload(f) for f in missing_images), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        raise Exception(f"{len(failures)}/{len(missing_images)} uploads failed: {failures[0]}")
+
+    hand_to_media_map = {}
+    for image_name, media_id in progress.media.items():
+        hand = parse_hand_from_filename(image_name)
+        if hand:
+            hand_to_media_map[hand] = media_id
+    return hand_to_media_map
+
+
+async def process_scenario_async(
+    client: AsyncFlowPokerClient,
+    plan: ScenarioPlan,
+    upload_concurrency: int,
+    score_concurrency: int = 4,
+    journal: Optional[UploadJournal] = None,
+) -> int:
+    """
+    Create, fill, score and promote the drill of one scenario
+
+    Returns:
+        The drill ID
+    """
+    start_time = time.monotonic()
+    if journal is None:
+        journal = UploadJournal(os.path.join(plan.directory, JOURNAL_FILENAME))
+    progress = journal.scenario(plan.directory, plan.image_files)
+    if progress.get("promoted"):
+        logger.info(f"Drill {progress.drill_id} of {plan.directory} is already promoted, skipping")
+        return progress.drill_id
+    if progress.resumed:
+        drill_id = progress.drill_id
+        logger.info(f"Reusing drill {drill_id} from journal: {plan.name}")
+    else:
+        drill_id = await client.create_drill(plan.name, plan.description, plan.answers, plan.tags)
+        progress.update(drill_id=drill_id)
+        logger.info(f"Created drill {drill_id}: {plan.name}")
+
+    hand_to_media_map = await upload_scenario_images(
+        client, drill_id, plan.image_files, upload_concurrency, progress
+    )
+    logger.info(f"Drill {drill_id}: uploaded {len(hand_to_media_map)} images")
+
+    if not progress.get("uploads_finished"):
+        await client.finish_uploading(drill_id)
+        progress.update(uploads_finished=True)
+
+    first_question_id = progress.get("first_question_id")
+    if first_question_id is None:
+        questions = await client.get_questions(drill_id)
+        first_question_id = questions[0].get("id") if questions else 1
+        progress.update(first_question_id=first_question_id)
+
+    hands = scoring_order(list(hand_to_media_map), plan.actions_data)
+    num_images = len(plan.image_files)
+    semaphore = asyncio.Semaphore(score_concurrency)
+    scoring_start = time.monotonic()
+
+    async def score(i, hand):
+        async with semaphore:
+            answer_scores = get_answer_scores_for_hand(hand, plan.actions_data, plan.available_actions)
+            await client.score_answer(
+                drill_id,
+                first_question_id + i,
+                hand_to_media_map[hand],
+                answer_scores,
+                plan.tags,
+                current=i + 1,
+                total=num_images,
+            )
+            progress.mark_scored(hand, first_question_id + i)
+
+    pending = [(i, hand) for i, hand in enumerate(hands) if not progress.is_scored(hand)]
+    results = await asyncio.gather(*(score(i, hand) for i, hand in pending), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        raise Exception(f"{len(failures)}/{len(pending)} questions could not be scored: {failures[0]}")
+    scoring_time = time.monotonic() - scoring_start
+    logger.info(f"Drill {drill_id}: scored {len(pending)} questions in {scoring_time:.1f}s")
+
+    if not progress.get("rules_set"):
+        await client.set_wizard_rules(drill_id, num_images)
+        progress.update(rules_set=True)
+    await client.promote_drill(drill_id)
+    progress.update(promoted=True)
+    logger.info(
+        f"Successfully created and promoted drill with ID: {drill_id} "
+        f"in {time.monotonic() - start_time:.1f}s"
+    )
+    return drill_id
+
+
+async def run_batch_async(
+    metadata_files: List[str],
+    max_workers: int = 5,
+    concurrent_scenarios: int = 2,
+    rate: float = 5.0,
+    max_rate: Optional[float] = None,
+    max_retries: int = 5,
+    score_workers: int = 4,
+    latency_target: Optional[float] = None,
+    journal: Optional[UploadJournal] = None,
+) -> Dict[str, Any]:
+    """
+    Process scenarios concurrently through one rate-limited session
+
+    Args:
+        metadata_files: metadata.csv files of the scenarios
+        max_workers: Concurrent image uploads per scenario (and connections per scenario)
+        concurrent_scenarios: Scenarios processed at the same time
+        rate: Initial requests per second, shared by all scenarios
+        max_rate: Highest requests per second the limiter may probe
+        max_retries: Attempts per request
+        score_workers: Questions scored at the same time per scenario
+        latency_target: Response time above which the limiter slows down
+        journal: Upload journal shared by all scenarios
+
+    Returns:
+        Summary with created drill IDs, failures and limiter statistics
+    """
+    if not flow_auth.ensure_session():
+        raise Exception("Login failed. Cannot proceed.")
+
+    start_time = time.time()
+    limiter = AdaptiveRateLimiter(rate=rate, max_rate=max_rate, latency_target=latency_target)
+    scenario_slots = asyncio.Semaphore(concurrent_scenarios)
+    connector = aiohttp.TCPConnector(limit=max_workers * concurrent_scenarios, ssl=False)
+    timeout = aiohttp.ClientTimeout(total=60)
+    summary = {"drills": [], "failed": []}
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, cookie_jar=aiohttp.DummyCookieJar()
+    ) as session:
+        client = AsyncFlowPokerClient(session, limiter, max_retries=max_retries)
+
+        async def run(metadata_file):
+            async with scenario_slots:
+                plan = await asyncio.to_thread(prepare_scenario, metadata_file)
+                if plan is None:
+                    return
+                try:
+                    drill_id = await process_scenario_async(client, plan, max_workers, score_workers, journal)
+                    summary["drills"].append(drill_id)
+                except Exception as e:
+                    logger.error(f"Failed to create drill for {plan.directory}: {str(e)}")
+                    summary["failed"].append(plan.directory)
+
+        await asyncio.gather(*(run(f) for f in metadata_files))
+
+    summary["elapsed_seconds"] = round(time.time() - start_time, 2)
+    summary["final_rate"] = round(limiter.rate, 2)
+    summary.update(limiter.stats)
+    logger.info(
+        f"Async batch completed: {len(summary['drills'])} drills created, {len(summary['failed'])} failed, "
+        f"{limiter.stats['acquired']} requests in {summary['elapsed_seconds']}s "
+        f"({limiter.stats['throttled']} throttled, final rate {summary['final_rate']}/s)"
+    )
+    return summary
@@ -2,8 +2,9 @@ import os
 import csv
 import argparse
 import logging
-from typing import List, Dict, Union, Any
+from typing import List, Dict, Union, Any, Optional
 from create_drill import FlowPokerDrillCreator
+from drill_factory import DrillFactory, DrillJob
 import config
 
 # Set up logging
@@ -110,7 +111,45 @@ def create_drill_from_image(
         return None
 
 
-def process_csv_file(csv_path: str, image_dir: str = None) -> None:
+def create_drills(
+    creator: FlowPokerDrillCreator,
+    jobs: List[DrillJob],
+    tags: Dict[str, str],
+    factory: Optional[DrillFactory] = None,
+) -> None:
+    """
+    Create one drill per job, one after another or with the parallel factory
+
+    Args:
+        creator: FlowPokerDrillCreator instance
+        jobs: Drills to create
+        tags: Dictionary of tags
+        factory: Parallel drill factory (optional)
+    """
+    if factory:
+        factory.run(creator, jobs, tags)
+        return
+
+    for job in jobs:
+        drill_id = create_drill_from_image(
+            creator=creator,
+            image_path=job.image_path,
+            name=job.name,
+            description=job.description,
+            answers=job.answers,
+            tags=tags,
+            answer_scores=job.answer_scores,
+        )
+
+        if drill_id:
+            print(f"Successfully created drill '{job.name}' with ID {drill_id}")
+        else:
+            print(f"Failed to create drill '{job.name}'")
+
+
+def process_csv_file(
+    csv_path: str, image_dir: str = None, factory: Optional[DrillFactory] = None
+) -> None:
     """
     Process a CSV file containing drill definitions
 
@@ -120,8 +159,10 @@ def process_csv_file(csv_path: str, image_dir: str = None) -> None:
     Args:
         csv_path: Path to the CSV file
         image_dir: Directory containing images (optional)
+        factory: Parallel drill factory (optional)
     """
     creator = FlowPokerDrillCreator()
+    jobs = []
 
     # Get common tags from user
     tags = get_tags_from_user()
@@ -161,30 +202,23 @@ def process_csv_file(csv_path: str, image_dir: str = None) -> None:
             for i, (answer, score) in enumerate(zip(answers, scores)):
                 answer_scores.append({"points": score, "text": answer, "weight": 0})
 
-            # Create the drill
-            drill_id = create_drill_from_image(
-                creator=creator,
-                image_path=image_path,
-                name=drill_name,
-                description=description,
-                answers=answers,
-                tags=tags,
-                answer_scores=answer_scores,
+            jobs.append(
+                DrillJob(image_path, drill_name, description, answers, answer_scores)
             )
 
-            if drill_id:
-                print(f"Successfully created drill '{drill_name}' with ID {drill_id}")
-            else:
-                print(f"Failed to create drill '{drill_name}'")
+    create_drills(creator, jobs, tags, factory)
 
 
-def process_image_folder(folder_path: str, base_name: str = "Poker Drill") -> None:
+def process_image_folder(
+    folder_path: str, base_name: str = "Poker Drill", factory: Optional[DrillFactory] = None
+) -> None:
     """
     Process a folder of images to create drills
 
     Args:
         folder_path: Path to the folder containing images
         base_name: Base name for drills
+        factory: Parallel drill factory (optional)
     """
     creator = FlowPokerDrillCreator()
 
@@ -218,6 +252,7 @@ def process_image_folder(folder_path: str, base_name: str = "Poker Drill") -> No
                 print("Please enter a valid score")
 
     # Process each image in the folder
+    jobs = []
     for filename in os.listdir(folder_path):
         if filename.lower().endswith((".png", ".jpg", ".jpeg")):
             image_path = os.path.join(folder_path, filename)
@@ -227,21 +262,11 @@ def process_image_folder(folder_path: str, base_name: str = "Poker Drill") -> No
             drill_name = f"{base_name} - {name_base}"
             description = f"Automatically created drill for {name_base}"
 
-            # Create the drill
-            drill_id = create_drill_from_image(
-                creator=creator,
-                image_path=image_path,
-                name=drill_name,
-                description=description,
-                answers=answers,
-                tags=tags,
-                answer_scores=answer_scores,
+            jobs.append(
+                DrillJob(image_path, drill_name, description, answers, answer_scores)
             )
 
-            if drill_id:
-                print(f"Successfully created drill '{drill_name}' with ID {drill_id}")
-            else:
-                print(f"Failed to create drill '{drill_name}'")
+    create_drills(creator, jobs, tags, factory)
 
 
 def main():
@@ -256,16 +281,54 @@ def main():
     parser.add_argument(
         "--base-name", default="Poker Drill", help="Base name for drills"
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=0,
+        help="Create this many drills at once (default: one after another)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=5.0,
+        help="Initial requests per second shared by all parallel drills (default: 5)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Highest requests per second for parallel drills (default: 4 x --rate)",
+    )
+    parser.add_argument(
+        "--results",
+        default="drill_results.csv",
+        help="CSV file for the results of parallel drills (default: drill_results.csv)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip images the results file records as created",
+    )
 
     # Parse arguments
     args = parser.parse_args()
 
+    factory = None
+    if args.parallel > 0:
+        factory = DrillFactory(
+            parallel=args.parallel,
+            rate=args.rate,
+            max_rate=args.max_rate,
+            results_file=args.results,
+            resume=args.resume,
+        )
+
     if args.csv:
         # Process CSV file
-        process_csv_file(args.csv, args.image_dir)
+        process_csv_file(args.csv, args.image_dir, factory)
     elif args.image_dir:
         # Process folder of images
-        process_image_folder(args.image_dir, args.base_name)
+        process_image_folder(args.image_dir, args.base_name, factory)
     else:
         print("Please provide either a CSV file or an image directory")
         parser.print_help()
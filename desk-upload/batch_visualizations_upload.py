@@ -7,9 +7,17 @@ This script dynamically creates poker drills from visualization directories by:
 2. Dynamically detecting available actions from actions.csv headers
    (supports both _score and _ev column formats)
 3. Uploading images in parallel with retry logic
-4. Creating drill questions with hand-specific scoring
+4. Creating drill questions with hand-specific scoring, several at a time
+   under an adaptive rate limit
 5. Promoting completed drills
 
+With --overlap-drills, several scenarios are in flight at once and share one
+budget of concurrent requests (see drill_scheduler.py).
+
+Every completed step is recorded in an SQLite journal (upload_journal.py), so
+an interrupted drill resumes at the first missing upload or unscored question
+on the next run, and promoted scenarios are skipped.
+
 The script automatically adapts to different action sets like:
 - Fold, Raise 2BBs, Raise 10BBs, Raise 15BBs
 - Fold, Raise 2.6BBs, All In
@@ -23,7 +31,7 @@ import os
 import csv
 import logging
 import argparse
-from typing import List, Dict, Union, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import sys
 import glob
 import re
@@ -32,6 +40,20 @@ import threading
 import concurrent.futures
 from dataclasses import dataclass
 from create_drill import FlowPokerDrillCreator
+from flow_auth import configure_pool
+from rate_limit import AdaptiveRateLimiter, backoff_delay
+from upload_journal import JOURNAL_FILENAME, ScenarioJournal, UploadJournal
+from drill_content import (
+    DEFAULT_ACTIONS,
+    actions_from_columns,
+    drill_name_and_description,
+    find_image_files,
+    find_metadata_files,
+    get_answer_scores_for_hand,
+    get_answers_from_actions,
+    scores_from_row,
+    tags_from_metadata,
+)
 
 # Set up logging
 logging.basicConfig(
@@ -49,6 +71,9 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("flow_auth").setLevel(logging.WARNING)
 logging.getLogger("drill_creator").setLevel(logging.DEBUG)
 
+# Scoring responses slower than this (seconds) make the rate limiter back off
+DEFAULT_LATENCY_TARGET = 2.0
+
 
 @dataclass
 class UploadResult:
@@ -78,25 +103,7 @@ def read_metadata(metadata_file: str) -> Dict[str, str]:
         with open(metadata_file, "r") as f:
             reader = csv.DictReader(f)
             for row in reader:
-                for key, value in row.items():
-                    if value:  # Only add non-empty values
-                        # Convert field_left format from "100%" to "100"
-                        if key == "field_left" and "%" in value:
-                            value = value.replace("%", "")
-                        elif key == "stack_depth" and "_" in value:
-                            value = value.split("_")[
-                                0
-                            ]  # Handle stack depth format like "20_30" to just "20"
-                        # Map CSV keys to Flow Poker tags
-                        tag_key = {
-                            "mode": "mode",
-                            "field_size": "field_size",
-                            "field_left": "field_left",
-                            "position": "position",
-                            "stack_depth": "stack_depth",
-                            "action": "action",
-                        }.get(key, key)
-                        tags[tag_key] = value
+                tags = tags_from_metadata(row)
                 break  # Only read first row
     except Exception as e:
         logger.error(f"Error reading metadata file {metadata_file}: {str(e)}")
@@ -104,61 +111,6 @@ def read_metadata(metadata_file: str) -> Dict[str, str]:
     return tags
 
 
-def find_image_files(directory: str) -> List[str]:
-    """
-    Find image files in a directory
-
-    Args:
-        directory: Directory to search for images
-
-    Returns:
-        List of image file paths
-    """
-    image_files = []
-    for file in os.listdir(directory):
-        if (
-            file.lower().endswith((".png", ".jpg", ".jpeg"))
-            and "metadata" not in file.lower()
-        ):
-            image_files.append(os.path.join(directory, file))
-    return sorted(image_files)
-
-
-def parse_action_name_from_column(column_name: str) -> Optional[str]:
-    """
-    Parse action name from CSV column header
-
-    Args:
-        column_name: Column name like "F_score", "R2_score", "RAI_score", "F_ev", "R2_ev", etc.
-
-    Returns:
-        Human-readable action name or None if not an action column
-    """
-    # Support both _score and _ev column formats
-    if column_name.endswith("_score"):
-        action_code = column_name.replace("_score", "")
-    elif column_name.endswith("_ev"):
-        action_code = column_name.replace("_ev", "")
-    else:
-        return None
-
-    # Map action codes to display names
-    if action_code == "F":
-        return "Fold"
-    elif action_code == "RAI":
-        return "All In"
-    elif action_code.startswith("R"):
-        # Extract raise amount, handle various formats like R2, R2.6, R10, R15
-        raise_amount = action_code[1:]  # Remove 'R' prefix
-        if raise_amount.replace(".", "").isdigit():
-            if "." in raise_amount:
-                return f"Raise {raise_amount}BBs"
-            else:
-                return f"Raise {raise_amount}BBs"
-
-    return None
-
-
 def get_available_actions_from_file(
     actions_file: str,
 ) -> Tuple[List[str], Dict[str, str], str]:
@@ -176,45 +128,19 @@ def get_available_actions_from_file(
     """
     if not os.path.exists(actions_file):
         # Return default if file doesn't exist
-        return (
-            ["Fold", "Raise 2.6BBs", "All In"],
-            {"Fold": "F", "Raise 2.6BBs": "R2.6", "All In": "RAI"},
-            "_score",
-        )
+        return DEFAULT_ACTIONS
 
     try:
         with open(actions_file, "r") as f:
             reader = csv.reader(f)
             header = next(reader)  # Read just the header
 
-        action_names = []
-        column_mapping = {}
-        score_suffix = "_score"  # Default
-
-        # First, determine what suffix is being used - prefer _score over _ev
-        if any(col.endswith("_score") for col in header):
-            score_suffix = "_score"
-        elif any(col.endswith("_ev") for col in header):
-            score_suffix = "_ev"
-
-        # Only process columns with the chosen suffix to avoid duplicates
-        for column in header:
-            if column.endswith(score_suffix):
-                action_name = parse_action_name_from_column(column)
-                if action_name and action_name not in action_names:  # Avoid duplicates
-                    action_names.append(action_name)
-                    # Store the column prefix for later use
-                    column_prefix = column.replace(score_suffix, "")
-                    column_mapping[action_name] = column_prefix
+        action_names, column_mapping, score_suffix = actions_from_columns(header)
 
         if not action_names:
             # Fallback to defaults if no actions found
             logger.warning(f"No action columns found in {actions_file}, using defaults")
-            return (
-                ["Fold", "Raise 2.6BBs", "All In"],
-                {"Fold": "F", "Raise 2.6BBs": "R2.6", "All In": "RAI"},
-                "_score",
-            )
+            return DEFAULT_ACTIONS
 
         logger.info(
             f"Found {len(action_names)} actions: {action_names} (using {score_suffix} columns)"
@@ -224,11 +150,7 @@ def get_available_actions_from_file(
     except Exception as e:
         logger.error(f"Error reading actions file header {actions_file}: {str(e)}")
         # Return defaults on error
-        return (
-            ["Fold", "Raise 2.6BBs", "All In"],
-            {"Fold": "F", "Raise 2.6BBs": "R2.6", "All In": "RAI"},
-            "_score",
-        )
+        return DEFAULT_ACTIONS
 
 
 def read_actions_file(
@@ -264,25 +186,7 @@ def read_actions_file(
                     continue
 
                 # Dynamically extract scores based on available actions
-                hand_scores = {}
-                for action_name, column_prefix in column_mapping.items():
-                    score_column = f"{column_prefix}{score_suffix}"
-                    score_value = row.get(score_column, 0)
-
-                    # Handle both numeric scores and strategy percentages
-                    if score_suffix == "_ev":
-                        # For _ev columns, use the EV value directly and scale it for scoring
-                        # Convert EV to a score (multiply by 100 and round)
-                        score = round(float(score_value) * 100) if score_value else 0
-                    else:
-                        # For _score columns, use as-is
-                        score = round(float(score_value)) if score_value else 0
-
-                    hand_scores[action_name] = score
-
-                # Also store best action and other metadata
-                hand_scores["best_action"] = row.get("best_action", "")
-                actions_data[hand] = hand_scores
+                actions_data[hand] = scores_from_row(row, column_mapping, score_suffix)
 
         logger.info(
             f"Read actions data for {len(actions_data)} hands with {len(available_actions)} actions"
@@ -369,12 +273,12 @@ def upload_single_image_with_retry(
         except Exception as e:
             result.error = str(e)
             if attempt < max_retries - 1:
-                # Wait before retry with exponential backoff
-                wait_time = (attempt + 1) * 2
+                # Wait before retry with jittered exponential backoff
+                wait_time = backoff_delay(attempt, base=2.0)
                 if lock:
                     with lock:
                         logger.warning(
-                            f"Upload failed for image {index}, retrying in {wait_time}s: {str(e)[:100]}"
+                            f"Upload failed for image {index}, retrying in {wait_time:.1f}s: {str(e)[:100]}"
                         )
                 time.sleep(wait_time)
             else:
@@ -392,6 +296,8 @@ def upload_images_parallel(
     image_files: List[str],
     max_workers: int = 5,
     max_retries: int = 3,
+    executor: Optional[concurrent.futures.Executor] = None,
+    on_uploaded: Optional[Callable[[str, str], None]] = None,
 ) -> Tuple[Dict[int, str], Dict[int, str], bool]:
     """
     Upload images in parallel with retry logic
@@ -401,6 +307,10 @@ def upload_images_parallel(
         image_files: List of image file paths
         max_workers: Maximum number of parallel workers
         max_retries: Maximum retry attempts per image
+        executor: Worker pool shared with other drills (default: a new pool
+            of max_workers threads)
+        on_uploaded: Called with (image_file, media_id) as soon as each image
+            is uploaded, e.g. to record it in the upload journal
 
     Returns:
         Tuple of (media_map, hand_map, success_flag)
@@ -415,58 +325,73 @@ def upload_images_parallel(
     lock = threading.Lock()
     failed_uploads = []
 
-    # Create a thread pool executor
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all upload tasks
+    # Create a thread pool executor, unless one is shared with other drills
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # A shared pool is fed at most max_workers uploads at a time, so the
+        # other drills' requests are not queued behind all of this drill's
+        # images. Results are collected while the rest are submitted.
+        pending_images = list(enumerate(image_files, start=1))
         future_to_index = {}
-        for i, image_file in enumerate(image_files, start=1):
-            future = executor.submit(
-                upload_single_image_with_retry,
-                creator,
-                image_file,
-                i,
-                max_retries,
-                lock,
-            )
-            future_to_index[future] = i
-
-        # Collect results as they complete
         completed = 0
-        for future in concurrent.futures.as_completed(future_to_index):
-            completed += 1
-            try:
-                result = future.result()
+        while pending_images or future_to_index:
+            while pending_images and len(future_to_index) < max_workers:
+                i, image_file = pending_images.pop(0)
+                future = executor.submit(
+                    upload_single_image_with_retry,
+                    creator,
+                    image_file,
+                    i,
+                    max_retries,
+                    lock,
+                )
+                future_to_index[future] = i
 
-                if result.success:
-                    media_map[result.index] = result.media_id
-                    hand_map[result.index] = result.hand
-                    with lock:
-                        logger.info(
-                            f"Progress: {completed}/{num_images} uploads completed"
-                        )
-                else:
-                    failed_uploads.append(result)
+            done, _ = concurrent.futures.wait(
+                future_to_index, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                index = future_to_index.pop(future)
+                completed += 1
+                try:
+                    result = future.result()
+
+                    if result.success:
+                        media_map[result.index] = result.media_id
+                        hand_map[result.index] = result.hand
+                        if on_uploaded is not None:
+                            on_uploaded(result.image_file, result.media_id)
+                        with lock:
+                            logger.info(
+                                f"Progress: {completed}/{num_images} uploads completed"
+                            )
+                    else:
+                        failed_uploads.append(result)
+                        with lock:
+                            logger.error(
+                                f"Upload failed permanently for image {result.index}: {result.image_file}"
+                            )
+
+                except Exception as e:
                     with lock:
-                        logger.error(
-                            f"Upload failed permanently for image {result.index}: {result.image_file}"
+                        logger.error(f"Unexpected error processing image {index}: {str(e)}")
+                    failed_uploads.append(
+                        UploadResult(
+                            index=index,
+                            image_file=(
+                                image_files[index - 1]
+                                if index <= len(image_files)
+                                else "unknown"
+                            ),
+                            hand=None,
+                            error=str(e),
                         )
-
-            except Exception as e:
-                index = future_to_index[future]
-                with lock:
-                    logger.error(f"Unexpected error processing image {index}: {str(e)}")
-                failed_uploads.append(
-                    UploadResult(
-                        index=index,
-                        image_file=(
-                            image_files[index - 1]
-                            if index <= len(image_files)
-                            else "unknown"
-                        ),
-                        hand=None,
-                        error=str(e),
                     )
-                )
+    finally:
+        if own_executor:
+            executor.shutdown()
 
     # Report final results
     successful_uploads = len(media_map)
@@ -487,35 +412,6 @@ def upload_images_parallel(
     return media_map, hand_map, all_successful
 
 
-def get_answer_scores_for_hand(
-    hand: str, actions_data: Dict[str, Dict[str, int]], available_actions: List[str]
-) -> List[Dict[str, Union[str, int]]]:
-    """
-    Get scores for a specific hand based on actions data
-
-    Args:
-        hand: Hand identifier (e.g., "52s", "K4o")
-        actions_data: Actions data from actions.csv
-        available_actions: List of available action names
-
-    Returns:
-        List of answer score objects
-    """
-    answer_scores = []
-
-    for action_name in available_actions:
-        if hand and actions_data and hand in actions_data:
-            # Get the score for this hand and action
-            score = actions_data[hand].get(action_name, 0)
-        else:
-            # Default score if hand not found
-            score = 0
-
-        answer_scores.append({"points": str(score), "text": action_name, "weight": 0})
-
-    return answer_scores
-
-
 def generate_drill_name(tags: Dict[str, str], hand_info: Optional[str] = None) -> str:
     """
     Generate a drill name based on tags and hand info
@@ -633,45 +529,29 @@ def generate_drill_description(
     return " ".join(description_parts)
 
 
-def get_answers_from_actions(
-    available_actions: List[str],
-) -> Tuple[List[str], List[Dict[str, Union[str, int]]]]:
-    """
-    Get answers for drill creation based on available actions
-
-    Args:
-        available_actions: List of available action names from actions.csv
-
-    Returns:
-        Tuple of (answers, answer_scores_template)
-    """
-    answers = available_actions.copy()
-    answer_scores_template = []
-
-    for action_name in available_actions:
-        answer_scores_template.append(
-            {
-                "points": "0",  # Will be overridden per hand
-                "text": action_name,
-                "weight": 0,
-            }
-        )
+@dataclass
+class ScenarioPlan:
+    """Everything needed to create the drill of one scenario directory"""
 
-    return answers, answer_scores_template
+    directory: str
+    tags: Dict[str, str]
+    image_files: List[str]
+    actions_data: Dict[str, Dict[str, int]]
+    available_actions: List[str]
+    answers: List[str]
+    name: str
+    description: str
 
 
-def process_scenario(
-    metadata_file: str,
-    creator: FlowPokerDrillCreator,
-    max_workers: int = 5,
-    upload_retries: int = 3,
-) -> None:
+def prepare_scenario(metadata_file: str) -> Optional[ScenarioPlan]:
     """
-    Process a scenario by reading metadata and creating a single drill with multiple questions
+    Read the metadata, images and actions of a scenario directory
 
     Args:
         metadata_file: Path to metadata.csv file
-        creator: FlowPokerDrillCreator instance
+
+    Returns:
+        ScenarioPlan, or None if the scenario has no tags or no images
     """
     directory = os.path.dirname(metadata_file)
     logger.info(f"Processing scenario in directory: {directory}")
@@ -680,7 +560,7 @@ def process_scenario(
     tags = read_metadata(metadata_file)
     if not tags:
         logger.warning(f"No tags found in {metadata_file}, skipping")
-        return
+        return None
 
     # More concise tag logging - just show the most important ones
     important_tags = {
@@ -694,10 +574,9 @@ def process_scenario(
     image_files = find_image_files(directory)
     if not image_files:
         logger.warning(f"No image files found in {directory}, skipping")
-        return
+        return None
 
-    num_images = len(image_files)
-    logger.info(f"Found {num_images} image files")
+    logger.info(f"Found {len(image_files)} image files")
 
     # Read actions.csv for hand-specific scores and available actions
     actions_data, available_actions, column_mapping = read_actions_file(directory)
@@ -706,237 +585,273 @@ def process_scenario(
     answers, _ = get_answers_from_actions(available_actions)
 
     # Generate a general drill name and description for the whole scenario
-    scenario_name = os.path.basename(os.path.dirname(directory))
-    position = tags.get("position", "").upper()
-    action_type = tags.get("action", "").upper()
-    field_left = tags.get("field_left", "")
-    mode = tags.get("mode", "").upper()
-    stack_depth = tags.get("stack_depth", "")
-    if stack_depth and "_" in stack_depth:
-        stack_depth = stack_depth.split("_")[0]
-
-    # Generate dynamic drill name based on field_left value
-    if field_left and field_left.lower() == "final table":
-        field_info = "Final Table"
-    elif field_left and field_left.lower() == "3 tables":
-        field_info = "3 Tables Left"
-    elif field_left and field_left.lower() == "2 tables":
-        field_info = "2 Tables Left"
-    elif field_left and field_left.lower() == "bubble":
-        field_info = "Bolha do ITM"
-    else:
-        # For numeric values, maintain the percentage format
-        field_info = f"{field_left}% Field Left"
+    name, description = drill_name_and_description(tags)
+
+    return ScenarioPlan(
+        directory=directory,
+        tags=tags,
+        image_files=image_files,
+        actions_data=actions_data,
+        available_actions=available_actions,
+        answers=answers,
+        name=name,
+        description=description,
+    )
 
-    name = f"{mode} | {position} | {action_type} | {stack_depth} BBs | {field_info}"
-    description = f"Nesse treino, você irá aprender o range de RFI para o {position}, com {stack_depth} BBs de profundidade, no cenário de {field_info}."
 
-    try:
-        # Step 1: Create the drill
-        logger.info(f"Creating drill: {name}")
-        drill_id = creator.create_drill(name, description, answers, tags)
-        creator.drill_id = drill_id
+def scoring_order(hands: List[str], actions_data: Dict[str, Dict[str, int]]) -> List[str]:
+    """
+    Order hands for scoring: hands with score data first, each group sorted
 
-        # Step 2: Upload ALL images in parallel
-        logger.info(f"Starting parallel upload of all {num_images} images...")
+    Args:
+        hands: Hands that have an uploaded image
+        actions_data: Actions data from actions.csv
 
-        # Upload images in parallel with retry logic
-        media_map, hand_map, upload_success = upload_images_parallel(
-            creator=creator,
-            image_files=image_files,
-            max_workers=max_workers,
-            max_retries=upload_retries,
-        )
+    Returns:
+        Ordered list of hands
+    """
+    hands_with_data = sorted(hand for hand in hands if hand in actions_data)
+    hands_without_data = sorted(hand for hand in hands if hand not in actions_data)
+    return hands_with_data + hands_without_data
 
-        # Check if all uploads were successful
-        if not upload_success:
-            logger.error(
-                "Not all images were uploaded successfully after retries. Cancelling drill creation."
-            )
-            return
 
-        logger.info(f"All {len(media_map)} images uploaded successfully!")
+def score_questions(
+    creator: FlowPokerDrillCreator,
+    plan: ScenarioPlan,
+    hand_to_media_map: Dict[str, int],
+    first_question_id: int,
+    progress: ScenarioJournal,
+    limiter: AdaptiveRateLimiter,
+    score_workers: int = 4,
+    max_retries: int = 3,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Tuple[int, bool]:
+    """
+    Score every unscored question with bounded concurrency
 
-        # Create a mapping from hands to media_ids for proper scoring
-        hand_to_media_map = {}
-        for index, media_id in media_map.items():
-            hand = hand_map.get(index)
-            if hand:
-                hand_to_media_map[hand] = media_id
-                logger.debug(f"Mapped hand {hand} to media_id {media_id}")
+    Requests are paced by the shared rate limiter, which slows down when
+    responses get slow or fail. Each scored hand is recorded in the journal,
+    so a later run only scores what is left.
 
-        logger.info(f"Created hand-to-media mapping for {len(hand_to_media_map)} hands")
+    Args:
+        creator: FlowPokerDrillCreator instance
+        plan: Scenario being processed
+        hand_to_media_map: Mapping of hand to media ID
+        first_question_id: ID of the question of the first hand in scoring order
+        progress: Journal entries of the scenario
+        limiter: Rate limiter shared by all scoring requests
+        score_workers: Questions scored at the same time
+        max_retries: Attempts per question
+        executor: Worker pool shared with other drills (default: a new pool
+            of score_workers threads)
 
-        # Step 3: Finish the uploading process to prepare for scoring
-        logger.info("All images uploaded. Finishing upload phase...")
-        creator.finish_uploading()
+    Returns:
+        Tuple of (number of scored questions, whether every question was scored)
+    """
+    num_images = len(plan.image_files)
+    all_hands_to_process = scoring_order(list(hand_to_media_map), plan.actions_data)
+    pending = [
+        (i, hand)
+        for i, hand in enumerate(all_hands_to_process, start=1)
+        if not progress.is_scored(hand)
+    ]
+    already_scored = len(all_hands_to_process) - len(pending)
+    if already_scored:
+        logger.info(f"Skipping {already_scored} questions scored by a previous run")
+
+    hands_without_data = [hand for _, hand in pending if hand not in plan.actions_data]
+    logger.info(
+        f"Scoring {len(pending)} questions with {score_workers} workers "
+        f"({len(hands_without_data)} hands with default scores)"
+    )
 
-        # Step 4: Get questions from the API - note that this might only return the first question
-        logger.info("Getting questions list...")
-        questions = creator.get_questions()
+    failed = threading.Event()
 
-        if not questions:
-            logger.error("Failed to retrieve questions list from API")
-            return
+    def score(i: int, hand: str) -> bool:
+        if failed.is_set():
+            return False
 
-        logger.info(f"Retrieved {len(questions)} questions")
+        question_id = first_question_id + i - 1
+        media_id = hand_to_media_map[hand]
+        if hand in plan.actions_data:
+            answer_scores = get_answer_scores_for_hand(
+                hand, plan.actions_data, plan.available_actions
+            )
+            score_info = ", ".join(
+                [f"{score['text']}={score['points']}" for score in answer_scores]
+            )
+            logger.debug(f"Using scores for {hand}: {score_info}")
+        else:
+            answer_scores = get_answer_scores_for_hand(hand, {}, plan.available_actions)
+            logger.warning(f"No score data found for {hand}, using default scores")
 
-        # Even if API only returns one question, we need to score all images
-        # The API expects questions to be created for each image by scoring them with IDs 1, 2, 3, etc.
-        # We'll create a list of question IDs based on the number of images
-        question_ids = []
+        for attempt in range(max_retries):
+            limiter.acquire()
+            start_time = time.monotonic()
+            try:
+                creator.score_answer(
+                    question_id=question_id,
+                    media_id=media_id,
+                    answers_scores=answer_scores,
+                    tags=plan.tags,
+                    current=i,
+                    total=num_images,
+                )
+            except Exception as e:
+                # Treat any failure as a sign of overload
+                limiter.on_throttle()
+                error_msg = str(e)
+                if len(error_msg) > 100:
+                    error_msg = error_msg[:100] + "..."
 
-        # If we got at least one question, use its ID as a starting point
-        if len(questions) > 0:
-            first_question_id = questions[0].get("id")
-            logger.info(f"First question ID: {first_question_id}")
+                if attempt < max_retries - 1 and not failed.is_set():
+                    wait_time = backoff_delay(attempt, base=2.0)
+                    logger.warning(
+                        f"Scoring question {i}/{num_images} (ID {question_id}) failed, "
+                        f"retrying in {wait_time:.1f}s: {error_msg}"
+                    )
+                    time.sleep(wait_time)
+                    continue
 
-            # We'll generate question IDs for all images
-            question_ids = [first_question_id + i for i in range(num_images)]
-        else:
-            # Fallback if no questions returned
-            logger.warning(
-                "No question IDs returned, will use sequential IDs starting from 1"
+                logger.error(f"Failed to score question {i}/{num_images} for {hand}: {error_msg}")
+                failed.set()
+                return False
+
+            limiter.on_success(time.monotonic() - start_time)
+            progress.mark_scored(hand, question_id)
+            logger.info(
+                f"Scored question {i}/{num_images}, ID: {question_id}, hand: {hand} "
+                f"(rate {limiter.rate:.2f}/s)"
             )
-            question_ids = [i + 1 for i in range(num_images)]
+            return True
+        return False
 
-        logger.info(
-            f"Will score {num_images} questions with IDs: {question_ids[:5]}..."
-        )
-        if len(question_ids) > 5:
-            logger.info(f"... and {len(question_ids) - 5} more question IDs")
+    if executor is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=score_workers) as executor:
+            results = list(executor.map(lambda item: score(*item), pending))
+    else:
+        # Keep at most score_workers questions queued, so one drill does not
+        # take the whole shared pool
+        slots = threading.Semaphore(score_workers)
+        futures = []
+        for item in pending:
+            slots.acquire()
+            future = executor.submit(score, *item)
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+        results = [future.result() for future in futures]
 
-        # Step 5: Score ALL images as questions, based on hand mapping
-        logger.info("Starting to score all questions...")
+    return already_scored + sum(results), not failed.is_set()
 
-        # Keep track of successful scores
-        successful_scores = 0
 
-        # Get all hands that have actions data, in sorted order for consistent processing
-        hands_with_data = sorted(
-            [hand for hand in hand_to_media_map.keys() if hand in actions_data]
-        )
-        hands_without_data = sorted(
-            [hand for hand in hand_to_media_map.keys() if hand not in actions_data]
-        )
+def complete_drill(
+    creator: FlowPokerDrillCreator,
+    plan: ScenarioPlan,
+    progress: ScenarioJournal,
+    limiter: AdaptiveRateLimiter,
+    score_workers: int = 4,
+    executor: Optional[concurrent.futures.Executor] = None,
+    start_time: Optional[float] = None,
+) -> Optional[int]:
+    """
+    Finish, score, set the rules of and promote a drill whose images are uploaded
 
-        # Process hands with data first, then hands without data
-        all_hands_to_process = hands_with_data + hands_without_data
+    Steps recorded in the journal by an earlier run are skipped.
 
-        logger.info(
-            f"Processing {len(hands_with_data)} hands with score data and {len(hands_without_data)} hands with default scores"
-        )
+    Args:
+        creator: FlowPokerDrillCreator holding the drill ID
+        plan: Scenario of the drill
+        progress: Journal entries of the scenario, with the media ID of every image
+        limiter: Rate limiter for scoring requests
+        score_workers: Questions scored at the same time
+        executor: Worker pool for scoring, shared with the other drills in
+            flight (default: a new pool)
+        start_time: time.monotonic() when the drill was started, for the log
 
-        # Score each hand as a question
-        for i, hand in enumerate(all_hands_to_process, start=1):
-            try:
-                # Get the question ID from our generated list
-                question_id = question_ids[i - 1]
+    Returns:
+        The drill ID once the drill is promoted, or None if a step failed
+    """
+    num_images = len(plan.image_files)
+    drill_id = progress.drill_id
+    if start_time is None:
+        start_time = time.monotonic()
 
-                # Get the media_id for this hand
-                media_id = hand_to_media_map.get(hand)
-                if not media_id:
-                    logger.warning(f"No media_id found for hand {hand}, skipping")
-                    continue
+    logger.info(f"All {num_images} images uploaded successfully!")
 
-                # Get specific answer scores for this hand
-                if hand in actions_data:
-                    answer_scores = get_answer_scores_for_hand(
-                        hand, actions_data, available_actions
-                    )
-                    logger.info(
-                        f"Scoring question {i}/{num_images}, ID: {question_id}, media_id: {media_id}, hand: {hand}"
-                    )
-                    # Create dynamic score logging
-                    score_info = ", ".join(
-                        [
-                            f"{score['text']}={score['points']}"
-                            for score in answer_scores
-                        ]
-                    )
-                    logger.info(f"Using scores for {hand}: {score_info}")
-                else:
-                    # Default scores if hand not found - use available actions
-                    answer_scores = get_answer_scores_for_hand(
-                        hand, {}, available_actions
-                    )
-                    logger.warning(
-                        f"No score data found for {hand}, using default scores"
-                    )
+    # Create a mapping from hands to media_ids for proper scoring
+    hand_to_media_map = {}
+    for image_name, media_id in progress.media.items():
+        hand = parse_hand_from_filename(image_name)
+        if hand:
+            hand_to_media_map[hand] = media_id
 
-                # Score this question with retry logic
-                max_retries = 3
-                retry_delay = 30  # seconds
-                success = False
+    logger.info(f"Created hand-to-media mapping for {len(hand_to_media_map)} hands")
 
-                for retry in range(max_retries):
-                    try:
-                        if retry == 0:
-                            logger.info(
-                                f"Scoring question {i}/{num_images}, ID: {question_id}"
-                            )
-                        else:
-                            logger.info(
-                                f"Retry {retry}/{max_retries-1} for question {i}/{num_images}, ID: {question_id}"
-                            )
+    # Step 3: Finish the uploading process to prepare for scoring
+    if not progress.get("uploads_finished"):
+        logger.info("All images uploaded. Finishing upload phase...")
+        creator.finish_uploading()
+        progress.update(uploads_finished=True)
 
-                        creator.score_answer(
-                            question_id=question_id,
-                            media_id=media_id,
-                            answers_scores=answer_scores,
-                            tags=tags,
-                            current=i,
-                            total=num_images,  # Use the total number of images
-                        )
-                        success = True
-                        successful_scores += 1
-                        # Wait a bit to avoid overwhelming the server
-                        time.sleep(5)
-                        break
-                    except Exception as e:
-                        error_msg = str(e)
-                        # Truncate very long error messages
-                        if len(error_msg) > 100:
-                            error_msg = error_msg[:100] + "..."
-
-                        if retry < max_retries - 1:
-                            logger.warning(f"Retry needed: {error_msg}")
-                            logger.info(
-                                f"Waiting {retry_delay} seconds before retrying..."
-                            )
-                            time.sleep(retry_delay)
-                            from flow_auth import refresh_session
+    # Step 4: Find the first question ID. The API might only return the
+    # first question; the others follow it sequentially, one per image.
+    first_question_id = progress.get("first_question_id")
+    if first_question_id is None:
+        logger.info("Getting questions list...")
+        questions = creator.get_questions()
 
-                            refresh_session()
-                            retry_delay *= 2  # Exponential backoff
-                        else:
-                            logger.error(f"Failed to score question: {error_msg}")
+        if not questions:
+            logger.error("Failed to retrieve questions list from API")
+            return
 
-                if not success:
-                    logger.error(
-                        f"Failed to score question after {max_retries} attempts"
-                    )
-                    logger.error(
-                        "Fatal error during question scoring. Stopping drill creation."
-                    )
-                    return
-            except Exception as e:
-                logger.error(
-                    f"Failed to process question {i} for hand {hand}: {str(e)}"
-                )
+        logger.info(f"Retrieved {len(questions)} questions")
+        first_question_id = questions[0].get("id")
+        if first_question_id is None:
+            logger.warning("No question IDs returned, will use sequential IDs starting from 1")
+            first_question_id = 1
+        progress.update(first_question_id=first_question_id)
 
-        # Log summary of scoring results
-        logger.info(
-            f"Completed scoring: {successful_scores}/{num_images} questions successfully scored"
+    logger.info(
+        f"Will score {num_images} questions with IDs {first_question_id}-{first_question_id + num_images - 1}"
+    )
+
+    # Step 5: Score ALL images as questions, based on hand mapping
+    scoring_start = time.monotonic()
+    successful_scores, scoring_complete = score_questions(
+        creator,
+        plan,
+        hand_to_media_map,
+        first_question_id,
+        progress,
+        limiter,
+        score_workers=score_workers,
+        executor=executor,
+    )
+    scoring_time = time.monotonic() - scoring_start
+
+    # Log summary of scoring results
+    logger.info(
+        f"Completed scoring: {successful_scores}/{num_images} questions successfully scored "
+        f"in {scoring_time:.1f}s"
+    )
+
+    if not scoring_complete:
+        logger.error(
+            "Fatal error during question scoring. Stopping drill creation; "
+            "the next run resumes at the first unscored question."
         )
+        return
 
-        # If no questions were successfully scored, we might want to abort
-        if successful_scores == 0:
-            logger.error(
-                "No questions were successfully scored! The drill may not be usable."
-            )
+    # If no questions were successfully scored, we might want to abort
+    if successful_scores == 0:
+        logger.error(
+            "No questions were successfully scored! The drill may not be usable."
+        )
 
-        # Step 6: Set wizard rules
+    # Step 6: Set wizard rules
+    if progress.get("rules_set"):
+        logger.info("Wizard rules were already set by a previous run")
+    else:
         logger.info("Setting wizard rules...")
         max_retries = 3
         retry_delay = 2  # seconds
@@ -950,6 +865,7 @@ def process_scenario(
                 logger.info(
                     f"Successfully set wizard rules for {wizard_amount} questions"
                 )
+                progress.update(rules_set=True)
                 break
             except Exception as e:
                 error_msg = str(e)
@@ -963,56 +879,145 @@ def process_scenario(
                 else:
                     logger.error(f"Failed to set wizard rules: {error_msg}")
 
-        # Step 7: Promote the drill with retries
-        logger.info("Promoting drill...")
-        retry_delay = 2  # Reset delay
-        max_promotion_retries = 5  # Increased from 3 to 5 due to common failures
+    # Step 7: Promote the drill with retries
+    logger.info("Promoting drill...")
+    retry_delay = 2  # Reset delay
+    max_promotion_retries = 5  # Increased from 3 to 5 due to common failures
 
-        for retry in range(max_promotion_retries):
-            try:
-                creator.promote_drill()
-                logger.info(
-                    f"Successfully created and promoted drill with ID: {drill_id}"
-                )
-                break
-            except Exception as e:
-                error_msg = str(e)
-                if len(error_msg) > 100:
-                    error_msg = error_msg[:100] + "..."
+    for retry in range(max_promotion_retries):
+        try:
+            creator.promote_drill()
+            logger.info(
+                f"Successfully created and promoted drill with ID: {drill_id}"
+            )
+            progress.update(promoted=True)
+            break
+        except Exception as e:
+            error_msg = str(e)
+            if len(error_msg) > 100:
+                error_msg = error_msg[:100] + "..."
 
-                if retry < max_promotion_retries - 1:
-                    logger.warning(
-                        f"Promotion failed (attempt {retry+1}/{max_promotion_retries}), will retry: {error_msg}"
-                    )
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff with longer wait times
-                elif retry == max_promotion_retries - 1:
-                    logger.warning(
-                        f"Failed to promote drill after {max_promotion_retries} attempts, but drill was created"
-                    )
-                    logger.warning(
-                        f"Drill ID {drill_id} may need to be manually promoted in the Flow Poker interface"
-                    )
+            if retry < max_promotion_retries - 1:
+                logger.warning(
+                    f"Promotion failed (attempt {retry+1}/{max_promotion_retries}), will retry: {error_msg}"
+                )
+                time.sleep(retry_delay)
+                retry_delay *= 2  # Exponential backoff with longer wait times
+            elif retry == max_promotion_retries - 1:
+                logger.warning(
+                    f"Failed to promote drill after {max_promotion_retries} attempts, but drill was created"
+                )
+                logger.warning(
+                    f"Drill ID {drill_id} may need to be manually promoted in the Flow Poker interface; "
+                    "the next run retries the promotion"
+                )
+                return
 
-    except Exception as e:
-        logger.error(f"Failed to create drill for scenario: {str(e)}")
+    logger.info(
+        f"Drill {drill_id} finished in {time.monotonic() - start_time:.1f}s "
+        f"(scoring {scoring_time:.1f}s for {num_images} questions)"
+    )
+    return drill_id
 
 
-def find_metadata_files(base_dir: str) -> List[str]:
+def process_scenario(
+    metadata_file: str,
+    creator: FlowPokerDrillCreator,
+    max_workers: int = 5,
+    upload_retries: int = 3,
+    score_workers: int = 4,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    journal: Optional[UploadJournal] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Optional[int]:
     """
-    Find all metadata.csv files recursively
+    Process a scenario by reading metadata and creating a single drill with multiple questions
+
+    Every completed step is recorded in the upload journal: if a previous run
+    failed, the same drill is reused and only the calls that never completed
+    are sent again.
 
     Args:
-        base_dir: Base directory to start searching from
+        metadata_file: Path to metadata.csv file
+        creator: FlowPokerDrillCreator instance
+        max_workers: Maximum number of parallel workers for image uploads
+        upload_retries: Maximum retry attempts per image
+        score_workers: Questions scored at the same time
+        limiter: Rate limiter for scoring requests (default: a new one)
+        journal: Upload journal (default: one in the scenario directory)
+        executor: Worker pool for uploads and scoring, shared with the other
+            drills in flight (default: a pool per step)
 
     Returns:
-        List of paths to metadata.csv files
+        The drill ID once the drill is promoted, or None if any step failed
     """
-    metadata_files = []
-    for root, dirs, files in os.walk(base_dir):
-        if "metadata.csv" in files:
-            metadata_files.append(os.path.join(root, "metadata.csv"))
-    return metadata_files
+    plan = prepare_scenario(metadata_file)
+    if plan is None:
+        return
+
+    tags = plan.tags
+    image_files = plan.image_files
+    num_images = len(image_files)
+    answers = plan.answers
+    name, description = plan.name, plan.description
+    if journal is None:
+        journal = UploadJournal(os.path.join(plan.directory, JOURNAL_FILENAME))
+    progress = journal.scenario(plan.directory, image_files)
+    if progress.get("promoted"):
+        logger.info(f"Drill {progress.drill_id} of this scenario is already promoted, skipping")
+        return progress.drill_id
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(latency_target=DEFAULT_LATENCY_TARGET)
+
+    start_time = time.monotonic()
+    try:
+        # Step 1: Create the drill, or reuse the one of an interrupted run
+        if progress.resumed:
+            drill_id = progress.drill_id
+            logger.info(f"Reusing drill {drill_id} from journal: {name}")
+        else:
+            logger.info(f"Creating drill: {name}")
+            drill_id = creator.create_drill(name, description, answers, tags)
+            progress.update(drill_id=drill_id)
+        creator.drill_id = drill_id
+
+        # Step 2: Upload the images that are not uploaded yet, in parallel
+        missing_images = progress.missing_images(image_files)
+        if missing_images:
+            logger.info(f"Starting parallel upload of {len(missing_images)}/{num_images} images...")
+
+            # Upload images in parallel with retry logic
+            # Each media ID is journaled as soon as its upload completes, so a
+            # crash mid-batch does not upload the finished images again
+            _, _, upload_success = upload_images_parallel(
+                creator=creator,
+                image_files=missing_images,
+                max_workers=max_workers,
+                max_retries=upload_retries,
+                executor=executor,
+                on_uploaded=progress.add_media,
+            )
+
+            # Check if all uploads were successful
+            if not upload_success:
+                logger.error(
+                    "Not all images were uploaded successfully after retries. "
+                    "Stopping; the next run resumes from the journal."
+                )
+                return
+
+        return complete_drill(
+            creator,
+            plan,
+            progress,
+            limiter,
+            score_workers=score_workers,
+            executor=executor,
+            start_time=start_time,
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to create drill for scenario: {str(e)}")
 
 
 def main():
@@ -1059,6 +1064,48 @@ def main():
         default=3,
         help="Maximum number of retry attempts per image upload (default: 3)",
     )
+    parser.add_argument(
+        "--overlap-drills",
+        type=int,
+        default=1,
+        help="Drills kept in flight at once, sharing --max-workers concurrent requests (default: 1)",
+    )
+    parser.add_argument(
+        "--async-upload",
+        action="store_true",
+        help="Process scenarios concurrently with the asyncio engine and a shared adaptive rate limit",
+    )
+    parser.add_argument(
+        "--concurrent-scenarios",
+        type=int,
+        default=2,
+        help="Scenarios processed at the same time with --async-upload (default: 2)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=5.0,
+        help="Initial requests per second for scoring (all requests with --async-upload); "
+        "adapts to latency and errors (default: 5)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Highest requests per second the rate limiter may probe (default: 4 x --rate)",
+    )
+    parser.add_argument(
+        "--score-workers",
+        type=int,
+        default=4,
+        help="Questions scored at the same time per drill (default: 4)",
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        default=DEFAULT_LATENCY_TARGET,
+        help=f"Response time in seconds above which the rate limiter slows down (default: {DEFAULT_LATENCY_TARGET})",
+    )
     args = parser.parse_args()
 
     # Resolve path
@@ -1069,9 +1116,6 @@ def main():
 
     logger.info(f"Starting batch creation from directory: {visualizations_dir}")
 
-    # Create the drill creator
-    creator = FlowPokerDrillCreator()
-
     # Find all metadata files
     if args.solution:
         solution_dir = os.path.join(visualizations_dir, args.solution)
@@ -1112,6 +1156,55 @@ def main():
         logger.info(f"Limiting to {args.limit} metadata files")
         metadata_files = metadata_files[: args.limit]
 
+    # Completed steps of every scenario, so a restart only redoes what is missing
+    journal = UploadJournal.for_tree(visualizations_dir)
+
+    if args.async_upload:
+        import asyncio
+        from async_upload import run_batch_async
+
+        asyncio.run(
+            run_batch_async(
+                metadata_files,
+                max_workers=args.max_workers,
+                concurrent_scenarios=args.concurrent_scenarios,
+                rate=args.rate,
+                max_rate=args.max_rate,
+                max_retries=args.upload_retries,
+                score_workers=args.score_workers,
+                latency_target=args.latency_target,
+                journal=journal,
+            )
+        )
+        return
+
+    # Size the shared connection pool to the number of upload threads
+    configure_pool(args.max_workers)
+
+    # Create the drill creator
+    creator = FlowPokerDrillCreator()
+
+    # One scoring rate limiter for the whole run, so what it learns about the
+    # server carries over from one drill to the next
+    limiter = AdaptiveRateLimiter(
+        rate=args.rate, max_rate=args.max_rate, latency_target=args.latency_target
+    )
+
+    if args.overlap_drills > 1:
+        from drill_scheduler import run_scheduled
+
+        run_scheduled(
+            metadata_files,
+            creator,
+            drills_in_flight=args.overlap_drills,
+            budget=args.max_workers,
+            upload_retries=args.upload_retries,
+            score_workers=args.score_workers,
+            limiter=limiter,
+            journal=journal,
+        )
+        return
+
     # Create a list to track processed directories for the session
     processed_dirs = []
 
@@ -1132,6 +1225,9 @@ def main():
                 creator,
                 max_workers=args.max_workers,
                 upload_retries=args.upload_retries,
+                score_workers=args.score_workers,
+                limiter=limiter,
+                journal=journal,
             )
             processed_dirs.append(directory)
 
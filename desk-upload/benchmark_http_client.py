@@ -0,0 +1,112 @@
+"""
+Benchmark the Flow Poker HTTP client against the local mock server.
+
+Compares image uploads through the shared, pooled session of flow_auth with
+the previous behaviour of opening a new requests.Session for every call, and
+checks that an expired session is refreshed by a single login when many
+threads hit it at once.
+
+Usage:
+    python benchmark_http_client.py --requests 500 --threads 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from mock_flowpoker_server import create_self_signed_cert, start_mock_server
+
+
+def run_timed(func, count, threads):
+    """Call func(i) count times across threads and return requests per second"""
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(func, range(count)))
+    return count / (time.time() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Flow Poker HTTP client")
+    parser.add_argument("--requests", type=int, default=500, help="Uploads per run")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent upload threads")
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="Seconds the mock adds to each response"
+    )
+    parser.add_argument("--image-size", type=int, default=100_000, help="Bytes per uploaded image")
+    parser.add_argument(
+        "--no-tls", action="store_true", help="Serve plain HTTP (no TLS handshake cost)"
+    )
+    args = parser.parse_args()
+
+    cert_dir = tempfile.TemporaryDirectory()
+    certfile, keyfile = (None, None) if args.no_tls else create_self_signed_cert(cert_dir.name)
+    server = start_mock_server(latency=args.latency, certfile=certfile, keyfile=keyfile)
+    base_url = f"{server.scheme}://127.0.0.1:{server.server_port}"
+    # flow_auth reads the base URL when it is imported
+    os.environ["FLOWPOKER_BASE_URL"] = base_url
+
+    import logging
+
+    from create_drill import FlowPokerDrillCreator
+    import flow_auth
+
+    logging.getLogger("flow_auth").setLevel(logging.WARNING)
+    logging.getLogger("drill_creator").setLevel(logging.WARNING)
+
+    flow_auth.configure_pool(args.threads)
+    creator = FlowPokerDrillCreator()
+    creator.create_drill("benchmark", "benchmark", ["Fold"], {"mode": "icm"})
+    image = os.urandom(args.image_size)
+    state = server.state
+
+    def upload_new_session(i):
+        # Previous behaviour: a new session (and connection) per request
+        session = requests.Session()
+        response = session.post(
+            f"{base_url}/resource/stage-media/upload",
+            headers=flow_auth.DEFAULT_HEADERS,
+            cookies=dict(flow_auth.session_cookies),
+            files={"file": (f"{i}.png", image, "image/png")},
+            data={"trainingWizard": str(creator.drill_id)},
+            verify=False,
+            timeout=60,
+        )
+        response.raise_for_status()
+
+    def upload_pooled(i):
+        creator.upload_image_bytes(f"{i}.png", image)
+
+    results = []
+    for name, func in (("new session per request", upload_new_session), ("shared pool", upload_pooled)):
+        before = state.snapshot()
+        rate = run_timed(func, args.requests, args.threads)
+        after = state.snapshot()
+        results.append((name, rate, after["connections"] - before["connections"]))
+
+    # Expire every session and let all threads hit the 401 at the same time
+    requests.post(f"{base_url}/__expire", verify=False)
+    before = state.snapshot()
+    run_timed(upload_pooled, args.threads * 4, args.threads)
+    logins = state.snapshot()["logins"] - before["logins"]
+
+    print(
+        f"\n{args.requests} uploads of {args.image_size} bytes over {server.scheme}, "
+        f"{args.threads} threads, {args.latency * 1000:.0f} ms mock latency"
+    )
+    print(f"{'client':<26}{'req/s':>10}{'connections':>14}")
+    for name, rate, connections in results:
+        print(f"{name:<26}{rate:>10.1f}{connections:>14}")
+    print(f"\nLogins after a session expiry hit by {args.threads} threads: {logins}")
+
+    server.shutdown()
+    cert_dir.cleanup()
+    return 0 if logins == 1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark the overlapping drill scheduler against the local mock server.
+
+Builds several scenarios from an existing visualization directory and creates
+their drills with 1, 2 and 4 drills in flight, for each request budget given,
+reporting drills per minute. With one drill in flight the run matches the
+sequential loop of batch_visualizations_upload.py.
+
+Usage:
+    python benchmark_scheduler.py --scenario ../visualizations/<solution>/<depth>/preflop/pf_FF/LJ
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmark_scoring import build_scenario
+from mock_flowpoker_server import start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the overlapping drill scheduler")
+    parser.add_argument(
+        "--scenario", required=True, help="Visualization directory with metadata.csv and actions.csv"
+    )
+    parser.add_argument("--scenarios", type=int, default=6, help="Drills per run")
+    parser.add_argument("--hands", type=int, default=40, help="Questions per drill (max 169)")
+    parser.add_argument(
+        "--budgets", type=int, nargs="+", default=[4, 8], help="Concurrent request budgets to compare"
+    )
+    parser.add_argument("--score-workers", type=int, default=4, help="Questions per drill scored at once")
+    parser.add_argument(
+        "--latency", type=float, default=0.15, help="Seconds the mock adds to each response"
+    )
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency)
+    os.environ["FLOWPOKER_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    work_dir = tempfile.mkdtemp()
+    # Keep the log file of batch_visualizations_upload out of the working directory
+    os.chdir(work_dir)
+
+    from create_drill import FlowPokerDrillCreator
+    from drill_scheduler import run_scheduled
+    from rate_limit import AdaptiveRateLimiter
+
+    for name in ("batch_visualizations_upload", "drill_creator", "upload_journal", "drill_scheduler"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    source_dir = os.path.abspath(args.scenario)
+    metadata_files = [
+        build_scenario(source_dir, os.path.join(work_dir, f"scenario_{i}"), args.hands)
+        for i in range(args.scenarios)
+    ]
+    creator = FlowPokerDrillCreator()
+
+    print(
+        f"\n{args.scenarios} drills of {args.hands} questions, "
+        f"{args.latency * 1000:.0f} ms mock latency"
+    )
+    print(f"{'budget':>8}{'in flight':>11}{'seconds':>10}{'drills/min':>12}")
+    ok = True
+    for budget in args.budgets:
+        for drills_in_flight in (1, 2, 4):
+            # A high rate ceiling, so the limiter does not hide the budget
+            limiter = AdaptiveRateLimiter(rate=20.0, max_rate=1000.0)
+            summary = run_scheduled(
+                metadata_files,
+                creator,
+                drills_in_flight=drills_in_flight,
+                budget=budget,
+                score_workers=args.score_workers,
+                limiter=limiter,
+            )
+            elapsed = summary["elapsed_seconds"]
+            ok = ok and not summary["failed"]
+            print(
+                f"{budget:>8}{drills_in_flight:>11}{elapsed:>10.1f}"
+                f"{len(summary['drills']) * 60 / elapsed:>12.1f}"
+            )
+
+    server.shutdown()
+    shutil.rmtree(work_dir)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
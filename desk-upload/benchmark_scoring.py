@@ -0,0 +1,163 @@
+"""
+Benchmark question scoring of batch_visualizations_upload.py against the local
+mock server.
+
+Builds a scenario with one image per hand (169 by default) from an existing
+visualization directory, then creates its drill through process_scenario with
+concurrent, rate-limited scoring and reports the wall time per drill next to
+the previous sequential loop (one request plus a 5 second sleep per question).
+A second drill is interrupted after a number of scores and run again, to check
+that the resumed run reuses the drill and only scores the remaining questions.
+
+Usage:
+    python benchmark_scoring.py --scenario ../visualizations/<solution>/<depth>/preflop/pf_FF/LJ
+"""
+
+import argparse
+import csv
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from mock_flowpoker_server import start_mock_server
+
+RANKS = "AKQJT98765432"
+OLD_SLEEP_PER_QUESTION = 5.0
+
+
+def all_hands():
+    """The 169 starting hands (pairs, suited and offsuit)"""
+    hands = []
+    for i, high in enumerate(RANKS):
+        for j, low in enumerate(RANKS):
+            if i == j:
+                hands.append(high + low)
+            elif i < j:
+                hands.append(high + low + "s")
+                hands.append(high + low + "o")
+    return hands
+
+
+def build_scenario(source_dir, target_dir, num_hands):
+    """Copy a scenario, repeating its first image and action row for num_hands hands"""
+    os.makedirs(target_dir)
+    shutil.copy(os.path.join(source_dir, "metadata.csv"), target_dir)
+    image = sorted(f for f in os.listdir(source_dir) if f.endswith(".png"))[0]
+
+    with open(os.path.join(source_dir, "actions.csv"), newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        template_row = next(reader)
+
+    hands = all_hands()[:num_hands]
+    with open(os.path.join(target_dir, "actions.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for hand in hands:
+            writer.writerow(dict(template_row, hand=hand))
+            shutil.copy(
+                os.path.join(source_dir, image), os.path.join(target_dir, f"{hand}_F_0.000000.png")
+            )
+    return os.path.join(target_dir, "metadata.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark drill question scoring")
+    parser.add_argument(
+        "--scenario", required=True, help="Visualization directory with metadata.csv and actions.csv"
+    )
+    parser.add_argument("--hands", type=int, default=169, help="Questions per drill (max 169)")
+    parser.add_argument("--score-workers", type=int, default=4, help="Questions scored at the same time")
+    parser.add_argument("--rate", type=float, default=5.0, help="Initial scoring requests per second")
+    parser.add_argument(
+        "--latency", type=float, default=0.15, help="Seconds the mock adds to each response"
+    )
+    parser.add_argument(
+        "--crash-after", type=int, default=50, help="Scores before the resumed drill is interrupted"
+    )
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency)
+    os.environ["FLOWPOKER_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    work_dir = tempfile.mkdtemp()
+    # Keep the log file of batch_visualizations_upload out of the working directory
+    os.chdir(work_dir)
+
+    import batch_visualizations_upload as upload
+    from create_drill import FlowPokerDrillCreator
+    from rate_limit import AdaptiveRateLimiter
+
+    for name in ("batch_visualizations_upload", "drill_creator", "upload_journal"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    class InterruptedCreator(FlowPokerDrillCreator):
+        """Fails every score request after the first crash_after ones"""
+
+        scores = 0
+
+        def score_answer(self, *a, **kw):
+            InterruptedCreator.scores += 1
+            if InterruptedCreator.scores > args.crash_after:
+                raise Exception("simulated interruption")
+            return super().score_answer(*a, **kw)
+
+    def new_limiter():
+        return AdaptiveRateLimiter(
+            rate=args.rate, latency_target=upload.DEFAULT_LATENCY_TARGET
+        )
+
+    def run(metadata_file, creator):
+        start_time = time.monotonic()
+        upload.process_scenario(
+            metadata_file, creator, score_workers=args.score_workers, limiter=new_limiter()
+        )
+        return time.monotonic() - start_time
+
+    source_dir = os.path.abspath(args.scenario)
+    metadata_file = build_scenario(source_dir, os.path.join(work_dir, "full"), args.hands)
+    creator = FlowPokerDrillCreator()
+    full_time = run(metadata_file, creator)
+    full_drill = server.state.drills[creator.drill_id]
+
+    metadata_file = build_scenario(source_dir, os.path.join(work_dir, "resumed"), args.hands)
+    first_time = run(metadata_file, InterruptedCreator())
+    drills_before = server.state.snapshot()["drills"]
+    creator = FlowPokerDrillCreator()
+    resumed_time = run(metadata_file, creator)
+    resumed_drill = server.state.drills[creator.drill_id]
+    reused = server.state.snapshot()["drills"] == drills_before
+
+    old_time = args.hands * (2 * args.latency + OLD_SLEEP_PER_QUESTION)
+    print(
+        f"\n{args.hands} questions per drill, {args.score_workers} scoring workers, "
+        f"{args.latency * 1000:.0f} ms mock latency"
+    )
+    print(f"{'run':<38}{'wall time (s)':>14}")
+    print(f"{'sequential scoring loop (estimated)':<38}{old_time:>14.1f}")
+    print(f"{'concurrent scoring, full drill':<38}{full_time:>14.1f}")
+    print(f"{'interrupted after ' + str(args.crash_after) + ' scores':<38}{first_time:>14.1f}")
+    print(f"{'resumed run':<38}{resumed_time:>14.1f}")
+    print(
+        f"\nFull drill: {len(full_drill['scored'])} scored, promoted={full_drill['promoted']}"
+    )
+    print(
+        f"Resumed drill: reused={reused}, {len(resumed_drill['scored'])} score requests "
+        f"for {len(set(resumed_drill['scored']))} questions, promoted={resumed_drill['promoted']}"
+    )
+
+    server.shutdown()
+    shutil.rmtree(work_dir)
+    ok = (
+        full_drill["promoted"]
+        and resumed_drill["promoted"]
+        and reused
+        and len(resumed_drill["scored"]) == len(set(resumed_drill["scored"])) == args.hands
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Benchmark the drill uploaders against the local mock server.
+
+Builds several scenarios from an existing visualization directory and creates
+their drills with each uploader of batch_visualizations_upload.py: the
+sequential loop, the overlapping drill scheduler and the asyncio engine. The
+mock adds latency with jitter and injects 500, 429 and 401 responses at the
+given rates, so the retry, back-off and re-login paths are part of the
+measurement. Every uploader works on its own copy of the scenarios, with its
+own upload journal.
+
+Reports images per second and drills per hour for each uploader, with the
+requests, faults and logins the mock saw during the run.
+
+Usage:
+    python benchmark_upload.py --scenario ../visualizations/<solution>/<depth>/preflop/pf_FF/LJ
+    python benchmark_upload.py --scenario <dir> --error-rate 0.02 --throttle-rate 0.05 --unauthorized-rate 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmark_scoring import build_scenario
+from mock_flowpoker_server import start_mock_server
+
+UPLOADERS = ("sequential", "overlap", "async")
+STAT_KEYS = ("requests", "throttled", "errors", "unauthorized", "logins")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the drill uploaders against the mock server")
+    parser.add_argument(
+        "--scenario", required=True, help="Visualization directory with metadata.csv and actions.csv"
+    )
+    parser.add_argument("--scenarios", type=int, default=4, help="Drills per uploader")
+    parser.add_argument("--hands", type=int, default=30, help="Questions per drill (max 169)")
+    parser.add_argument(
+        "--uploaders", nargs="+", choices=UPLOADERS, default=list(UPLOADERS), help="Uploaders to run"
+    )
+    parser.add_argument("--max-workers", type=int, default=8, help="Concurrent requests per uploader")
+    parser.add_argument("--score-workers", type=int, default=4, help="Questions per drill scored at once")
+    parser.add_argument("--overlap-drills", type=int, default=3, help="Drills in flight (overlap and async)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Initial requests per second")
+    parser.add_argument("--max-rate", type=float, default=200.0, help="Highest requests per second")
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="Seconds the mock adds to each response"
+    )
+    parser.add_argument(
+        "--latency-jitter", type=float, default=0.05, help="Random extra seconds per response"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument(
+        "--unauthorized-rate", type=float, default=0.0, help="Share of requests answered with 401"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the injected faults")
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        unauthorized_rate=args.unauthorized_rate,
+        seed=args.seed,
+    )
+    os.environ["FLOWPOKER_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    work_dir = tempfile.mkdtemp()
+    # Keep the log files of the uploaders out of the working directory
+    os.chdir(work_dir)
+
+    import batch_visualizations_upload as upload
+    from async_upload import run_batch_async
+    from create_drill import FlowPokerDrillCreator
+    from drill_scheduler import run_scheduled
+    from flow_auth import configure_pool
+    from rate_limit import AdaptiveRateLimiter
+    from upload_journal import UploadJournal
+
+    for name in (
+        "batch_visualizations_upload",
+        "drill_creator",
+        "upload_journal",
+        "drill_scheduler",
+        "async_upload",
+        "flow_auth",
+    ):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    creator = FlowPokerDrillCreator()
+    logins_at_import = server.state.snapshot()["logins"]
+
+    def new_limiter():
+        return AdaptiveRateLimiter(
+            rate=args.rate, max_rate=args.max_rate, latency_target=upload.DEFAULT_LATENCY_TARGET
+        )
+
+    def run_sequential(metadata_files, journal):
+        configure_pool(args.max_workers)
+        limiter = new_limiter()
+        summary = {"drills": [], "failed": []}
+        for metadata_file in metadata_files:
+            creator.drill_id = None
+            drill_id = upload.process_scenario(
+                metadata_file,
+                creator,
+                max_workers=args.max_workers,
+                score_workers=args.score_workers,
+                limiter=limiter,
+                journal=journal,
+            )
+            summary["drills" if drill_id is not None else "failed"].append(drill_id or metadata_file)
+        return summary
+
+    def run_overlap(metadata_files, journal):
+        return run_scheduled(
+            metadata_files,
+            creator,
+            drills_in_flight=args.overlap_drills,
+            budget=args.max_workers,
+            score_workers=args.score_workers,
+            limiter=new_limiter(),
+            journal=journal,
+        )
+
+    def run_async(metadata_files, journal):
+        return asyncio.run(
+            run_batch_async(
+                metadata_files,
+                max_workers=max(1, args.max_workers // args.overlap_drills),
+                concurrent_scenarios=args.overlap_drills,
+                rate=args.rate,
+                max_rate=args.max_rate,
+                score_workers=args.score_workers,
+                latency_target=upload.DEFAULT_LATENCY_TARGET,
+                journal=journal,
+            )
+        )
+
+    runners = {"sequential": run_sequential, "overlap": run_overlap, "async": run_async}
+    source_dir = os.path.abspath(args.scenario)
+    results = []
+    for name in args.uploaders:
+        tree = os.path.join(work_dir, name)
+        metadata_files = [
+            build_scenario(source_dir, os.path.join(tree, f"scenario_{i}"), args.hands)
+            for i in range(args.scenarios)
+        ]
+        journal = UploadJournal.for_tree(tree)
+        before = server.state.snapshot()
+        start_time = time.monotonic()
+        try:
+            summary = runners[name](metadata_files, journal)
+        except Exception as e:
+            print(f"{name} uploader failed: {e}")
+            summary = {"drills": [], "failed": metadata_files}
+        elapsed = time.monotonic() - start_time
+        after = server.state.snapshot()
+        journal.close()
+        images = len(summary["drills"]) * args.hands
+        results.append(
+            (
+                name,
+                elapsed,
+                images / elapsed,
+                len(summary["drills"]) * 3600 / elapsed,
+                len(summary["failed"]),
+                {key: after[key] - before[key] for key in STAT_KEYS},
+            )
+        )
+
+    print(
+        f"\n{args.scenarios} drills of {args.hands} questions per uploader, "
+        f"{args.latency * 1000:.0f}+{args.latency_jitter * 1000:.0f} ms mock latency, "
+        f"fault rates: 500 {args.error_rate:.0%}, 429 {args.throttle_rate:.0%}, "
+        f"401 {args.unauthorized_rate:.0%}"
+    )
+    print(f"Logins before the first request: {logins_at_import}\n")
+    header = f"{'uploader':<12}{'seconds':>9}{'images/s':>10}{'drills/h':>10}{'failed':>8}" + "".join(
+        f"{key:>14}" for key in STAT_KEYS
+    )
+    print(header)
+    print("-" * len(header))
+    for name, elapsed, images_per_second, drills_per_hour, failed, stats in results:
+        print(
+            f"{name:<12}{elapsed:>9.1f}{images_per_second:>10.1f}{drills_per_hour:>10.0f}{failed:>8}"
+            + "".join(f"{stats[key]:>14}" for key in STAT_KEYS)
+        )
+
+    server.shutdown()
+    shutil.rmtree(work_dir)
+    ok = logins_at_import == 0 and all(failed == 0 for _, _, _, _, failed, _ in results)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ import json
 import time
 import logging
 from typing import List, Dict, Any, Optional, Union
-from flow_auth import make_authenticated_request, initialize_session
+from flow_auth import BASE_URL, make_authenticated_request
 
 
 # Helper function to sanitize JSON for logging
@@ -34,18 +34,137 @@ logger = logging.getLogger("drill_creator")
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
+def build_drill_payload(
+    name: str,
+    description: str,
+    answers: List[str],
+    tags: Dict[str, str],
+    max_duration: str = "5",
+) -> Dict[str, Any]:
+    """
+    Build the payload that creates a drill
+
+    Args:
+        name: The name of the drill
+        description: Description of the drill
+        answers: List of possible answers
+        tags: Dictionary of tags with key-value pairs (mode, depth, position, etc.)
+        max_duration: Maximum duration in minutes
+
+    Returns:
+        The JSON payload
+    """
+    # Format tags for the API
+    tags_input = []
+    tags_list = []
+
+    for key, value in tags.items():
+        tag_text = f"{key}:{value}"
+        tags_input.append({"text": tag_text})
+        tags_list.append(tag_text)
+
+    return {
+        "step": "INFO",
+        "answers": answers,
+        "tagsInput": tags_input,
+        "name": name,
+        "description": description,
+        "maxDuration": max_duration,
+        "tags": tags_list,
+    }
+
+
+def build_answer_payload(
+    question_id: int,
+    media_id: int,
+    answers_scores: List[Dict[str, Union[str, int]]],
+    tags: Dict[str, str],
+    current: int = 1,
+    total: int = 1,
+) -> Dict[str, Any]:
+    """
+    Build the payload that scores the answers of a question
+
+    Args:
+        question_id: ID of the question
+        media_id: ID of the media
+        answers_scores: List of answer objects with scores
+        tags: Dictionary of tags
+        current: Current question number
+        total: Total number of questions
+
+    Returns:
+        The JSON payload
+    """
+    # Format tags for the API
+    tags_input = []
+    for key, value in tags.items():
+        tags_input.append({"text": f"{key}:{value}"})
+
+    return {
+        "id": question_id,
+        "tagsInput": tags_input,
+        "answers": answers_scores,
+        "mediaId": media_id,
+        "current": current,
+        "total": total,
+        "delete": False,
+    }
+
+
+def build_wizard_rule_payload(drill_id: int, tags: List[str], amount: int) -> Dict[str, Any]:
+    """
+    Build the payload that sets the wizard rule of a drill
+
+    Args:
+        drill_id: ID of the drill
+        tags: The drill tags, as returned in the drill info
+        amount: The number of questions with these tags
+
+    Returns:
+        The JSON payload
+    """
+    return {
+        "id": drill_id,
+        "amount": 20,
+        "tags": tags,
+        "validation": f"Total de questões com essa(s) tag(s): {amount}",
+        "valid": True,
+    }
+
+
+def build_promote_payload(
+    rules: List[Dict], academy_level_id: int = 15, available: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the payload that promotes a drill
+
+    Args:
+        rules: The drill rules, as returned in the drill info
+        academy_level_id: ID of the academy level
+        available: Whether the drill should be available
+
+    Returns:
+        The JSON payload
+    """
+    return {
+        "available": available,
+        "academyLevelId": academy_level_id,
+        "rules": rules,
+    }
+
+
 class FlowPokerDrillCreator:
     """
     Class to automate the creation of drills on Flow Poker website
     """
 
-    BASE_URL = "https://www.flowpoker.com.br/resource"
+    BASE_URL = f"{BASE_URL}/resource"
 
     def __init__(self):
         """Initialize the drill creator"""
         self.drill_id = None
-        # Ensure we have a valid session
-        initialize_session()
+        # No login here: the first request logs in (flow_auth.ensure_session)
 
     def create_drill(
         self,
@@ -68,25 +187,7 @@ class FlowPokerDrillCreator:
         Returns:
             The ID of the created drill
         """
-        # Format tags for the API
-        tags_input = []
-        tags_list = []
-
-        for key, value in tags.items():
-            tag_text = f"{key}:{value}"
-            tags_input.append({"text": tag_text})
-            tags_list.append(tag_text)
-
-        # Create payload
-        payload = {
-            "step": "INFO",
-            "answers": answers,
-            "tagsInput": tags_input,
-            "name": name,
-            "description": description,
-            "maxDuration": max_duration,
-            "tags": tags_list,
-        }
+        payload = build_drill_payload(name, description, answers, tags, max_duration)
 
         # Make the request with complete endpoint path
         response = make_authenticated_request(
@@ -138,10 +239,38 @@ class FlowPokerDrillCreator:
                 logger.error(f"Cards directory not found: {cards_dir}")
                 exit(1)
 
+        with open(image_path, "rb") as image_file:
+            return self._upload_media(os.path.basename(image_path), image_file)
+
+    def upload_image_bytes(self, filename: str, image_data: bytes) -> int:
+        """
+        Upload an image that is already in memory (e.g. a freshly rendered PNG)
+
+        Args:
+            filename: File name reported to the server
+            image_data: PNG file contents
+
+        Returns:
+            The media ID
+        """
+        if not self.drill_id:
+            raise Exception("No drill ID available. Create a drill first.")
+
+        return self._upload_media(filename, image_data)
+
+    def _upload_media(self, filename: str, content) -> int:
+        """
+        Send one image to the stage-media endpoint
+
+        Args:
+            filename: File name reported to the server
+            content: Open binary file or bytes
+
+        Returns:
+            The media ID
+        """
         # Prepare multipart form data
-        files = {
-            "file": (os.path.basename(image_path), open(image_path, "rb"), "image/png")
-        }
+        files = {"file": (filename, content, "image/png")}
 
         data = {"trainingWizard": str(self.drill_id)}
 
@@ -294,21 +423,9 @@ class FlowPokerDrillCreator:
         if not self.drill_id:
             raise Exception("No drill ID available. Create a drill first.")
 
-        # Format tags for the API
-        tags_input = []
-        for key, value in tags.items():
-            tags_input.append({"text": f"{key}:{value}"})
-
-        # Create payload
-        payload = {
-            "id": question_id,
-            "tagsInput": tags_input,
-            "answers": answers_scores,
-            "mediaId": media_id,
-            "current": current,
-            "total": total,
-            "delete": False,
-        }
+        payload = build_answer_payload(
+            question_id, media_id, answers_scores, tags, current, total
+        )
 
         # Log the payload for debugging
         logger.debug(f"Score answer payload: {sanitize_for_log(payload)}")
@@ -400,12 +517,8 @@ class FlowPokerDrillCreator:
                 logger.warning(f"Failed to set wizard rules before promotion: {str(e)}")
                 # Continue with empty rules array
 
-        # Create payload with rules
-        payload = {
-            "available": available,
-            "academyLevelId": academy_level_id,
-            "rules": rules,  # Use the rules from drill_info or empty array
-        }
+        # Create payload with rules (from drill_info or empty)
+        payload = build_promote_payload(rules, academy_level_id, available)
 
         # Log the payload for debugging
         logger.debug(f"Promote drill payload: {sanitize_for_log(payload)}")
@@ -466,13 +579,7 @@ class FlowPokerDrillCreator:
         tags = drill_info.get("tags", [])
 
         # Create the rule payload
-        payload = {
-            "id": self.drill_id,
-            "amount": 20,
-            "tags": tags,
-            "validation": f"Total de questões com essa(s) tag(s): {amount}",
-            "valid": True,
-        }
+        payload = build_wizard_rule_payload(self.drill_id, tags, amount)
 
         # Log the payload for debugging
         logger.debug(f"Set wizard rules payload: {sanitize_for_log(payload)}")
@@ -0,0 +1,286 @@
+"""
+Drill content helpers shared by the upload scripts and the streaming pipeline.
+
+Everything here is pure data shaping (tags, drill names, answers and scores) or
+scenario file discovery, and does not talk to Flow Poker, so it can be imported
+without logging in.
+"""
+
+import os
+from typing import List, Dict, Union, Optional, Tuple
+
+# Actions used when a scenario does not describe its own
+DEFAULT_ACTIONS = (
+    ["Fold", "Raise 2.6BBs", "All In"],
+    {"Fold": "F", "Raise 2.6BBs": "R2.6", "All In": "RAI"},
+    "_score",
+)
+
+
+def tags_from_metadata(row: Dict[str, str]) -> Dict[str, str]:
+    """
+    Convert a metadata row (metadata.csv or scenario metadata) into drill tags
+
+    Args:
+        row: Mapping of metadata keys to values
+
+    Returns:
+        Dictionary of tags
+    """
+    tags = {}
+    for key, value in row.items():
+        if value:  # Only add non-empty values
+            value = str(value)
+            # Convert field_left format from "100%" to "100"
+            if key == "field_left" and "%" in value:
+                value = value.replace("%", "")
+            elif key == "stack_depth" and "_" in value:
+                value = value.split("_")[
+                    0
+                ]  # Handle stack depth format like "20_30" to just "20"
+            # Map CSV keys to Flow Poker tags
+            tag_key = {
+                "mode": "mode",
+                "field_size": "field_size",
+                "field_left": "field_left",
+                "position": "position",
+                "stack_depth": "stack_depth",
+                "action": "action",
+            }.get(key, key)
+            tags[tag_key] = value
+    return tags
+
+
+def drill_name_and_description(tags: Dict[str, str]) -> Tuple[str, str]:
+    """
+    Build the name and description of a scenario drill
+
+    Args:
+        tags: Dictionary of tags
+
+    Returns:
+        Tuple of (name, description)
+    """
+    position = tags.get("position", "").upper()
+    action_type = tags.get("action", "").upper()
+    field_left = tags.get("field_left", "")
+    mode = tags.get("mode", "").upper()
+    stack_depth = tags.get("stack_depth", "")
+    if stack_depth and "_" in stack_depth:
+        stack_depth = stack_depth.split("_")[0]
+
+    # Generate dynamic drill name based on field_left value
+    if field_left and field_left.lower() == "final table":
+        field_info = "Final Table"
+    elif field_left and field_left.lower() == "3 tables":
+        field_info = "3 Tables Left"
+    elif field_left and field_left.lower() == "2 tables":
+        field_info = "2 Tables Left"
+    elif field_left and field_left.lower() == "bubble":
+        field_info = "Bolha do ITM"
+    else:
+        # For numeric values, maintain the percentage format
+        field_info = f"{field_left}% Field Left"
+
+    name = f"{mode} | {position} | {action_type} | {stack_depth} BBs | {field_info}"
+    description = f"Nesse treino, você irá aprender o range de RFI para o {position}, com {stack_depth} BBs de profundidade, no cenário de {field_info}."
+    return name, description
+
+
+def parse_action_name_from_column(column_name: str) -> Optional[str]:
+    """
+    Parse action name from CSV column header
+
+    Args:
+        column_name: Column name like "F_score", "R2_score", "RAI_score", "F_ev", "R2_ev", etc.
+
+    Returns:
+        Human-readable action name or None if not an action column
+    """
+    # Support both _score and _ev column formats
+    if column_name.endswith("_score"):
+        action_code = column_name.replace("_score", "")
+    elif column_name.endswith("_ev"):
+        action_code = column_name.replace("_ev", "")
+    else:
+        return None
+
+    # Map action codes to display names
+    if action_code == "F":
+        return "Fold"
+    elif action_code == "RAI":
+        return "All In"
+    elif action_code.startswith("R"):
+        # Extract raise amount, handle various formats like R2, R2.6, R10, R15
+        raise_amount = action_code[1:]  # Remove 'R' prefix
+        if raise_amount.replace(".", "").isdigit():
+            if "." in raise_amount:
+                return f"Raise {raise_amount}BBs"
+            else:
+                return f"Raise {raise_amount}BBs"
+
+    return None
+
+
+def actions_from_columns(
+    columns: List[str],
+) -> Tuple[List[str], Dict[str, str], str]:
+    """
+    Extract the available actions from actions.csv column names
+
+    Args:
+        columns: Column names of the actions table
+
+    Returns:
+        Tuple of (action_names, column_mapping, score_suffix); action_names is
+        empty when no action column was found
+    """
+    action_names = []
+    column_mapping = {}
+    score_suffix = "_score"  # Default
+
+    # First, determine what suffix is being used - prefer _score over _ev
+    if any(col.endswith("_score") for col in columns):
+        score_suffix = "_score"
+    elif any(col.endswith("_ev") for col in columns):
+        score_suffix = "_ev"
+
+    # Only process columns with the chosen suffix to avoid duplicates
+    for column in columns:
+        if column.endswith(score_suffix):
+            action_name = parse_action_name_from_column(column)
+            if action_name and action_name not in action_names:  # Avoid duplicates
+                action_names.append(action_name)
+                # Store the column prefix for later use
+                column_prefix = column.replace(score_suffix, "")
+                column_mapping[action_name] = column_prefix
+
+    return action_names, column_mapping, score_suffix
+
+
+def scores_from_row(
+    row: Dict[str, Union[str, float]], column_mapping: Dict[str, str], score_suffix: str
+) -> Dict[str, Union[str, int]]:
+    """
+    Extract the per-action scores of one hand from an actions row
+
+    Args:
+        row: One row of the actions table
+        column_mapping: Maps action names to column prefixes
+        score_suffix: The suffix used for score columns ("_score" or "_ev")
+
+    Returns:
+        Dictionary of action name to score, plus the best action
+    """
+    hand_scores = {}
+    for action_name, column_prefix in column_mapping.items():
+        score_column = f"{column_prefix}{score_suffix}"
+        score_value = row.get(score_column, 0)
+
+        # Handle both numeric scores and strategy percentages
+        if score_suffix == "_ev":
+            # For _ev columns, use the EV value directly and scale it for scoring
+            # Convert EV to a score (multiply by 100 and round)
+            score = round(float(score_value) * 100) if score_value else 0
+        else:
+            # For _score columns, use as-is
+            score = round(float(score_value)) if score_value else 0
+
+        hand_scores[action_name] = score
+
+    # Also store best action and other metadata
+    hand_scores["best_action"] = row.get("best_action", "")
+    return hand_scores
+
+
+def get_answer_scores_for_hand(
+    hand: str, actions_data: Dict[str, Dict[str, int]], available_actions: List[str]
+) -> List[Dict[str, Union[str, int]]]:
+    """
+    Get scores for a specific hand based on actions data
+
+    Args:
+        hand: Hand identifier (e.g., "52s", "K4o")
+        actions_data: Actions data from actions.csv
+        available_actions: List of available action names
+
+    Returns:
+        List of answer score objects
+    """
+    answer_scores = []
+
+    for action_name in available_actions:
+        if hand and actions_data and hand in actions_data:
+            # Get the score for this hand and action
+            score = actions_data[hand].get(action_name, 0)
+        else:
+            # Default score if hand not found
+            score = 0
+
+        answer_scores.append({"points": str(score), "text": action_name, "weight": 0})
+
+    return answer_scores
+
+
+def get_answers_from_actions(
+    available_actions: List[str],
+) -> Tuple[List[str], List[Dict[str, Union[str, int]]]]:
+    """
+    Get answers for drill creation based on available actions
+
+    Args:
+        available_actions: List of available action names from actions.csv
+
+    Returns:
+        Tuple of (answers, answer_scores_template)
+    """
+    answers = available_actions.copy()
+    answer_scores_template = []
+
+    for action_name in available_actions:
+        answer_scores_template.append(
+            {
+                "points": "0",  # Will be overridden per hand
+                "text": action_name,
+                "weight": 0,
+            }
+        )
+
+    return answers, answer_scores_template
+
+
+def find_metadata_files(base_dir: str) -> List[str]:
+    """
+    Find all metadata.csv files recursively
+
+    Args:
+        base_dir: Base directory to start searching from
+
+    Returns:
+        List of paths to metadata.csv files
+    """
+    metadata_files = []
+    for root, dirs, files in os.walk(base_dir):
+        if "metadata.csv" in files:
+            metadata_files.append(os.path.join(root, "metadata.csv"))
+    return metadata_files
+
+
+def find_image_files(directory: str) -> List[str]:
+    """
+    Find image files in a directory
+
+    Args:
+        directory: Directory to search for images
+
+    Returns:
+        List of image file paths
+    """
+    image_files = []
+    for file in os.listdir(directory):
+        if (
+            file.lower().endswith((".png", ".jpg", ".jpeg"))
+            and "metadata" not in file.lower()
+        ):
+            image_files.append(os.path.join(directory, file))
+    return sorted(image_files)
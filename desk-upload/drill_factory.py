@@ -0,0 +1,293 @@
+"""
+Parallel drill factory for batch_create_drills.py (--parallel).
+
+Every image of a CSV file or folder becomes its own single-question drill,
+which takes eight HTTP round trips (create, upload, finish uploading, get
+questions, score, drill info, wizard rules, promote). The factory runs many of
+these pipelines at once. All of them share one blocking connection pool of
+flow_auth and one adaptive rate limiter (rate_limit.py), so the number of
+pipelines sets the concurrency while the limiter keeps the request rate at
+what the server sustains.
+
+Each finished drill is appended to a results CSV as soon as it completes. With
+resume, images that the CSV already records as created are skipped. A failed
+image whose drill was already created reuses that drill, and its image if it
+was uploaded, instead of creating a second one.
+"""
+
+import concurrent.futures
+import copy
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from create_drill import FlowPokerDrillCreator
+from flow_auth import configure_pool
+from rate_limit import AdaptiveRateLimiter, backoff_delay
+from results_log import ResumableCsvLog
+
+logger = logging.getLogger("drill_factory")
+
+
+@dataclass
+class DrillJob:
+    """One drill to create from one image"""
+
+    image_path: str
+    name: str
+    description: str
+    answers: List[str]
+    answer_scores: List[Dict[str, Union[str, int]]]
+
+
+@dataclass
+class DrillResult:
+    """Outcome of one drill pipeline"""
+
+    image_path: str
+    name: str
+    drill_id: Optional[int] = None
+    media_id: Optional[int] = None
+    success: bool = False
+    promoted: bool = False
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+class DrillResultsLog(ResumableCsvLog):
+    """
+    Drill results streamed to a CSV file
+    """
+
+    HEADER = ["Image", "Drill Name", "Drill ID", "Success", "Promoted", "Error", "Seconds", "Media ID"]
+
+    def __init__(self, output_file: str, resume: bool = False):
+        """
+        Open the results file
+
+        Args:
+            output_file: Path to the CSV file
+            resume: Keep the existing results and skip the images they record
+                as created
+        """
+        super().__init__(
+            output_file,
+            self.HEADER,
+            key_column="Image",
+            is_success=lambda row: row["Success"] == "True",
+            resume=resume,
+        )
+        if self.last_rows:
+            logger.info(f"Resuming from {output_file}: {len(self.done)} drills already created")
+
+    def is_done(self, image_path: str) -> bool:
+        return os.path.abspath(image_path) in self.done
+
+    def previous_attempt(self, image_path: str) -> Tuple[Optional[int], Optional[int]]:
+        """Drill ID and media ID that a failed earlier run left for an image"""
+        row = self.last_rows.get(os.path.abspath(image_path))
+        if row is None or row["Success"] == "True":
+            return None, None
+        drill_id, media_id = row["Drill ID"], row.get("Media ID")
+        return int(drill_id) if drill_id else None, int(media_id) if media_id else None
+
+    def write(self, result: DrillResult):
+        """Append one result and flush it to disk"""
+        self.write_row(
+            [
+                os.path.abspath(result.image_path),
+                result.name,
+                result.drill_id or "",
+                result.success,
+                result.promoted,
+                result.error or "",
+                f"{result.seconds:.2f}",
+                result.media_id or "",
+            ]
+        )
+
+
+class DrillFactory:
+    """
+    Creates single-image drills with many pipelines in flight
+    """
+
+    def __init__(
+        self,
+        parallel: int = 8,
+        rate: float = 5.0,
+        max_rate: Optional[float] = None,
+        max_retries: int = 3,
+        results_file: str = "drill_results.csv",
+        resume: bool = False,
+    ):
+        """
+        Initialize the factory
+
+        Args:
+            parallel: Drill pipelines (and HTTP connections) in flight
+            rate: Initial requests per second, shared by all pipelines
+            max_rate: Highest requests per second the limiter may probe
+            max_retries: Attempts per request (creating the drill is never retried)
+            results_file: CSV file the results are appended to
+            resume: Skip images the results file records as created
+        """
+        self.parallel = parallel
+        self.limiter = AdaptiveRateLimiter(rate=rate, max_rate=max_rate)
+        self.max_retries = max_retries
+        self.results_file = results_file
+        self.resume = resume
+
+    def _request(self, description: str, func, *args, attempts: Optional[int] = None, **kwargs):
+        """Call one creator step within the rate limit, retrying with backoff"""
+        attempts = attempts or self.max_retries
+        for attempt in range(attempts):
+            self.limiter.acquire()
+            start_time = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                # The creator only reports the status in the message, so every
+                # failure counts as a throttle
+                self.limiter.on_throttle()
+                if attempt == attempts - 1:
+                    raise
+                wait_time = backoff_delay(attempt, base=2.0)
+                logger.warning(
+                    f"{description} failed ({str(e)[:100]}), retry {attempt + 1}/{attempts - 1} in {wait_time:.1f}s"
+                )
+                time.sleep(wait_time)
+            else:
+                self.limiter.on_success(time.monotonic() - start_time)
+                return result
+
+    def create(
+        self,
+        creator: FlowPokerDrillCreator,
+        job: DrillJob,
+        tags: Dict[str, str],
+        drill_id: Optional[int] = None,
+        media_id: Optional[int] = None,
+    ) -> DrillResult:
+        """
+        Run the pipeline of FlowPokerDrillCreator.create_complete_drill for one
+        job, with every request going through the shared rate limiter
+
+        Args:
+            creator: FlowPokerDrillCreator of this job only
+            job: Drill to create
+            tags: Tags shared by all drills
+            drill_id: Drill created by a failed earlier run, reused instead of
+                creating another
+            media_id: Image uploaded to that drill by the earlier run
+
+        Returns:
+            Result of the pipeline; setting rules and promoting may fail
+            without failing the drill, as in create_complete_drill
+        """
+        result = DrillResult(image_path=job.image_path, name=job.name, drill_id=drill_id, media_id=media_id)
+        start_time = time.monotonic()
+        try:
+            if drill_id is None:
+                # A retried create could leave a duplicate drill behind
+                result.drill_id = self._request(
+                    "Create drill", creator.create_drill, job.name, job.description, job.answers, tags, attempts=1
+                )
+            else:
+                logger.info(f"Reusing drill {drill_id} of an earlier run for {job.image_path}")
+                creator.drill_id = drill_id
+            if media_id is None:
+                media_id = self._request("Upload image", creator.upload_image, job.image_path)
+                result.media_id = media_id
+            self._request("Finish uploading", creator.finish_uploading)
+            questions = self._request("Get questions", creator.get_questions) or [{"id": 1}]
+            for i, question in enumerate(questions):
+                question_id = question["id"] if isinstance(question, dict) and "id" in question else i + 1
+                self._request(
+                    f"Score question {question_id}",
+                    creator.score_answer,
+                    question_id=question_id,
+                    media_id=media_id,
+                    answers_scores=job.answer_scores,
+                    tags=tags,
+                    current=i + 1,
+                    total=len(questions),
+                )
+            self._request("Get drill info", creator.get_drill_info)
+            result.success = True
+
+            try:
+                self._request("Set wizard rules", creator.set_wizard_rules, amount=1)
+            except Exception as e:
+                logger.warning(f"Setting wizard rules failed for drill {result.drill_id}: {str(e)}")
+            try:
+                self._request("Promote drill", creator.promote_drill)
+                result.promoted = True
+            except Exception as e:
+                logger.warning(f"Drill promotion failed, but drill {result.drill_id} was created: {str(e)}")
+        except Exception as e:
+            result.error = str(e)[:200]
+            logger.error(f"Failed to create drill '{job.name}' from {job.image_path}: {result.error}")
+        result.seconds = time.monotonic() - start_time
+        return result
+
+    def run(
+        self, creator: FlowPokerDrillCreator, jobs: List[DrillJob], tags: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Create the drills of all jobs
+
+        Args:
+            creator: FlowPokerDrillCreator; each drill works on a copy
+            jobs: Drills to create
+            tags: Tags shared by all drills
+
+        Returns:
+            Summary with created drill IDs, failed images, skipped count and
+            elapsed time
+        """
+        start_time = time.time()
+        configure_pool(self.parallel)
+        log = DrillResultsLog(self.results_file, resume=self.resume)
+        pending = [job for job in jobs if not log.is_done(job.image_path)]
+        summary = {"drills": [], "failed": [], "skipped": len(jobs) - len(pending)}
+        logger.info(
+            f"Creating {len(pending)} drills with {self.parallel} pipelines "
+            f"({summary['skipped']} already created)"
+        )
+
+        def run_job(job):
+            # The creator holds the current drill ID, so every drill needs its own
+            drill_creator = copy.copy(creator)
+            drill_creator.drill_id = None
+            drill_id, media_id = log.previous_attempt(job.image_path)
+            return self.create(drill_creator, job, tags, drill_id=drill_id, media_id=media_id)
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.parallel, thread_name_prefix="drill"
+            ) as executor:
+                futures = [executor.submit(run_job, job) for job in pending]
+                for future in concurrent.futures.as_completed(futures):
+                    result = future.result()
+                    log.write(result)
+                    if result.success:
+                        summary["drills"].append(result.drill_id)
+                        print(f"Successfully created drill '{result.name}' with ID {result.drill_id}")
+                    else:
+                        summary["failed"].append(result.image_path)
+                        print(f"Failed to create drill '{result.name}'")
+        finally:
+            log.close()
+
+        summary["elapsed_seconds"] = round(time.time() - start_time, 2)
+        logger.info(
+            f"Parallel batch completed: {len(summary['drills'])} drills created, "
+            f"{len(summary['failed'])} failed, {summary['skipped']} skipped in "
+            f"{summary['elapsed_seconds']}s ({self.limiter.stats['acquired']} requests, "
+            f"{self.limiter.stats['throttled']} throttled, final rate {self.limiter.rate:.2f}/s)"
+        )
+        print(f"Results written to {self.results_file}")
+        return summary
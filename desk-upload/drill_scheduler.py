@@ -0,0 +1,107 @@
+"""
+Overlapping drill scheduler for batch_visualizations_upload.py (--overlap-drills).
+
+Several scenarios are in flight at once. Each drill still runs its steps in
+order (create, upload, finish uploading, get questions, score, set rules,
+promote), but drills do not wait for each other, so images of one scenario
+upload while another is being scored.
+
+All drills share one concurrency budget: one worker pool runs the uploads and
+scoring requests of every drill, and the shared HTTP connection pool of
+flow_auth, sized to the same budget, blocks any request beyond it. Adding
+budget therefore adds throughput, instead of being capped by one scenario.
+Each drill keeps at most its share of the budget (budget / drills in flight)
+of uploads in the pool, so one drill's images do not hold up the scoring
+requests of the others.
+"""
+
+import concurrent.futures
+import copy
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from batch_visualizations_upload import process_scenario
+from create_drill import FlowPokerDrillCreator
+from flow_auth import configure_pool
+from rate_limit import AdaptiveRateLimiter
+from upload_journal import UploadJournal
+
+logger = logging.getLogger("drill_scheduler")
+
+
+def run_scheduled(
+    metadata_files: List[str],
+    creator: FlowPokerDrillCreator,
+    drills_in_flight: int = 3,
+    budget: int = 8,
+    upload_retries: int = 3,
+    score_workers: int = 4,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    journal: Optional[UploadJournal] = None,
+) -> Dict[str, Any]:
+    """
+    Create the drills of several scenarios with overlapping steps
+
+    Args:
+        metadata_files: metadata.csv files of the scenarios
+        creator: Logged-in FlowPokerDrillCreator; each drill works on a copy
+        drills_in_flight: Scenarios processed at the same time
+        budget: Concurrent requests shared by all drills
+        upload_retries: Maximum retry attempts per image
+        score_workers: Questions of one drill scored at the same time
+        limiter: Rate limiter for scoring requests, shared by all drills
+        journal: Upload journal shared by all drills
+
+    Returns:
+        Summary with created drill IDs, failed scenarios and elapsed time
+    """
+    start_time = time.time()
+    # Requests of every drill go through the same blocking connection pool
+    configure_pool(budget)
+    summary = {"drills": [], "failed": []}
+    # Uploads of one drill may take only its share of the budget
+    upload_share = max(1, budget // drills_in_flight)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=budget, thread_name_prefix="request"
+    ) as request_pool, concurrent.futures.ThreadPoolExecutor(
+        max_workers=drills_in_flight, thread_name_prefix="drill"
+    ) as drill_pool:
+
+        def run(metadata_file):
+            # The creator holds the current drill ID, so every drill needs its
+            # own; a shallow copy shares the session without logging in again
+            drill_creator = copy.copy(creator)
+            drill_creator.drill_id = None
+            return process_scenario(
+                metadata_file,
+                drill_creator,
+                max_workers=upload_share,
+                upload_retries=upload_retries,
+                score_workers=score_workers,
+                limiter=limiter,
+                journal=journal,
+                executor=request_pool,
+            )
+
+        future_to_file = {drill_pool.submit(run, f): f for f in metadata_files}
+        for future in concurrent.futures.as_completed(future_to_file):
+            metadata_file = future_to_file[future]
+            try:
+                drill_id = future.result()
+            except Exception as e:
+                logger.error(f"Error processing scenario {metadata_file}: {str(e)}")
+                drill_id = None
+            if drill_id is None:
+                summary["failed"].append(metadata_file)
+            else:
+                summary["drills"].append(drill_id)
+
+    summary["elapsed_seconds"] = round(time.time() - start_time, 2)
+    logger.info(
+        f"Scheduled batch completed: {len(summary['drills'])} drills created, "
+        f"{len(summary['failed'])} failed in {summary['elapsed_seconds']}s "
+        f"({drills_in_flight} drills in flight, budget {budget})"
+    )
+    return summary
@@ -0,0 +1,393 @@
+"""
+Local mock of the Flow Poker endpoints used by create_drill.py and flow_auth.py.
+
+It covers login, drill creation, stage-media upload, finish uploading,
+questions, scoring, wizard rules, promotion and question deletion. It speaks
+HTTP/1.1 with keep-alive so connection reuse can be measured, and it counts
+logins, requests and TCP connections (GET /__stats). Sessions can be expired on
+demand (POST /__expire) to exercise re-authentication, and --max-rps answers
+429 above a request rate to exercise rate limiting.
+
+Faults can be injected at random on API requests: --error-rate answers 500,
+--throttle-rate answers 429 with Retry-After, and --unauthorized-rate drops the
+caller's session and answers 401. --latency-jitter adds a random delay on top
+of --latency.
+
+Usage:
+    python mock_flowpoker_server.py --port 8099 --latency 0.1 --error-rate 0.02
+    FLOWPOKER_BASE_URL=http://127.0.0.1:8099 python batch_visualizations_upload.py ...
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import ssl
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockFlowPokerState:
+    """Drills, sessions and counters shared by all request handlers"""
+
+    def __init__(
+        self,
+        latency=0.0,
+        max_rps=None,
+        latency_jitter=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        unauthorized_rate=0.0,
+        seed=None,
+    ):
+        self.latency = latency
+        self.max_rps = max_rps
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.unauthorized_rate = unauthorized_rate
+        self.random = random.Random(seed)
+        self.recent = deque()
+        self.lock = threading.Lock()
+        self.sessions = set()
+        self.drills = {}
+        self.deleted = set()
+        self.drill_ids = itertools.count(1)
+        self.media_ids = itertools.count(1)
+        self.question_ids = itertools.count(1)
+        self.stats = {
+            "connections": 0,
+            "requests": 0,
+            "logins": 0,
+            "unauthorized": 0,
+            "throttled": 0,
+            "errors": 0,
+        }
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def over_rate(self):
+        """Record a request; True if more than max_rps arrived in the last second"""
+        if not self.max_rps:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] > 1.0:
+                self.recent.popleft()
+            if len(self.recent) >= self.max_rps:
+                self.stats["throttled"] += 1
+                return True
+            self.recent.append(now)
+            return False
+
+    def roll(self, rate):
+        """True with probability rate"""
+        if not rate:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def delay(self):
+        """Seconds to wait before answering a request"""
+        if not self.latency_jitter:
+            return self.latency
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.latency_jitter)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, drills=len(self.drills))
+
+
+class MockFlowPokerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockFlowPoker/1.0"
+    # Headers and body are separate writes; without this, delayed ACKs stall
+    # every response on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.state.count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def _authenticated(self):
+        match = re.search(r"JSESSIONID=([^;\s]+)", self.headers.get("Cookie", ""))
+        with self.state.lock:
+            return bool(match) and match.group(1) in self.state.sessions
+
+    def _handle(self, method):
+        self.state.count("requests")
+        body = self._read_body()
+        delay = self.state.delay()
+        if delay:
+            time.sleep(delay)
+
+        path = self.path.split("?")[0].rstrip("/")
+
+        if path == "/__stats":
+            return self._send_json(200, self.state.snapshot())
+        if path == "/__expire":
+            with self.state.lock:
+                self.state.sessions.clear()
+            return self._send_json(200, {"expired": True})
+        if self.state.over_rate():
+            return self._send_json(429, {"error": "too many requests"})
+        if path == "/resource/login":
+            self.state.count("logins")
+            jsessionid = uuid.uuid4().hex
+            with self.state.lock:
+                self.state.sessions.add(jsessionid)
+            return self._send_json(
+                200, {"ok": True}, {"Set-Cookie": f"JSESSIONID={jsessionid}; Path=/"}
+            )
+        if path == "/desk":
+            return self._send_json(200, {"ok": True})
+
+        if not self._authenticated():
+            self.state.count("unauthorized")
+            return self._send_json(401, {"error": "unauthorized"})
+
+        # Injected faults reject the request before it changes any state
+        if self.state.roll(self.state.throttle_rate):
+            self.state.count("throttled")
+            return self._send_json(429, {"error": "too many requests"}, {"Retry-After": "1"})
+        if self.state.roll(self.state.error_rate):
+            self.state.count("errors")
+            return self._send_json(500, {"error": "internal server error"})
+        if self.state.roll(self.state.unauthorized_rate):
+            self._expire_session()
+            self.state.count("unauthorized")
+            return self._send_json(401, {"error": "session expired"})
+
+        return self._route(method, path, body)
+
+    def _expire_session(self):
+        match = re.search(r"JSESSIONID=([^;\s]+)", self.headers.get("Cookie", ""))
+        with self.state.lock:
+            self.state.sessions.discard(match.group(1))
+
+    def _route(self, method, path, body):
+        state = self.state
+
+        if method == "POST" and path == "/resource/training-wizard":
+            payload = json.loads(body or b"{}")
+            with state.lock:
+                drill_id = next(state.drill_ids)
+                state.drills[drill_id] = {
+                    "id": drill_id,
+                    "name": payload.get("name"),
+                    "media": [],
+                    "questions": [],
+                    "scored": [],
+                    "promoted": False,
+                }
+            return self._send_json(200, {"id": drill_id})
+
+        if method == "POST" and path == "/resource/stage-media/upload":
+            match = re.search(rb'name="trainingWizard"\r\n\r\n(\d+)', body)
+            with state.lock:
+                drill = state.drills.get(int(match.group(1))) if match else None
+                if drill is None:
+                    return self._send_json(404, {"error": "unknown drill"})
+                media_id = next(state.media_ids)
+                drill["media"].append(media_id)
+            return self._send_json(200, {"id": media_id})
+
+        match = re.fullmatch(r"/resource/training-wizard/(\d+)(?:/([\w-]+))?", path)
+        if match:
+            with state.lock:
+                drill = state.drills.get(int(match.group(1)))
+                if drill is None:
+                    return self._send_json(404, {"error": "unknown drill"})
+                action = match.group(2)
+                if action is None and method == "GET":
+                    return self._send_json(200, drill)
+                if action == "finish-uploading":
+                    drill["questions"] = [next(state.question_ids) for _ in drill["media"]]
+                    return self._send_json(200, {"ok": True})
+                if action == "question" and method == "GET":
+                    questions = drill["questions"][:1]
+                    return self._send_json(200, {"id": questions[0]} if questions else [])
+                if action == "promote":
+                    drill["promoted"] = True
+                    return self._send_json(200, {"ok": True})
+                if action == "answer":
+                    drill["scored"].append(json.loads(body or b"{}").get("id"))
+                    return self._send_json(200, {"ok": True})
+                if action == "wizard-rule":
+                    return self._send_json(200, {"ok": True})
+
+        match = re.fullmatch(r"/resource/question/(\d+)", path)
+        if method == "DELETE" and match:
+            with state.lock:
+                question_id = int(match.group(1))
+                if question_id in state.deleted:
+                    return self._send_json(404, {"error": "question not found"})
+                state.deleted.add(question_id)
+            return self._send_json(200, {"ok": True})
+
+        return self._send_json(404, {"error": f"no mock for {method} {path}"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def create_self_signed_cert(directory):
+    """
+    Create a throwaway self-signed certificate with the openssl CLI
+
+    Args:
+        directory: Where cert.pem and key.pem are written
+
+    Returns:
+        Tuple of (certfile, keyfile)
+    """
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", keyfile, "-out", certfile, "-days", "1", "-subj", "/CN=127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def start_mock_server(
+    host="127.0.0.1",
+    port=0,
+    latency=0.0,
+    certfile=None,
+    keyfile=None,
+    max_rps=None,
+    latency_jitter=0.0,
+    error_rate=0.0,
+    throttle_rate=0.0,
+    unauthorized_rate=0.0,
+    seed=None,
+):
+    """
+    Start the mock server in a background thread
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        latency: Seconds added to every response
+        certfile: Certificate to serve HTTPS with (plain HTTP when omitted)
+        keyfile: Private key of certfile
+        max_rps: Requests per second above which the server answers 429
+        latency_jitter: Random extra seconds (uniform, up to this) per response
+        error_rate: Share of API requests answered with 500
+        throttle_rate: Share of API requests answered with 429
+        unauthorized_rate: Share of API requests whose session is dropped (401)
+        seed: Seed of the fault injection, for repeatable runs
+
+    Returns:
+        The running server; its base URL is f"{server.scheme}://{host}:{server.server_port}"
+    """
+    server = ThreadingHTTPServer((host, port), MockFlowPokerHandler)
+    server.scheme = "http"
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        server.scheme = "https"
+    server.daemon_threads = True
+    server.state = MockFlowPokerState(
+        latency, max_rps, latency_jitter, error_rate, throttle_rate, unauthorized_rate, seed
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock of the Flow Poker API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8099, help="Port to listen on")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every response"
+    )
+    parser.add_argument(
+        "--max-rps", type=float, help="Answer 429 above this many requests per second"
+    )
+    parser.add_argument(
+        "--latency-jitter", type=float, default=0.0, help="Random extra seconds (up to this) per response"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of API requests answered with 500"
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="Share of API requests answered with 429"
+    )
+    parser.add_argument(
+        "--unauthorized-rate",
+        type=float,
+        default=0.0,
+        help="Share of API requests whose session is expired (401)",
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the fault injection")
+    parser.add_argument("--certfile", help="Serve HTTPS with this certificate")
+    parser.add_argument("--keyfile", help="Private key of --certfile")
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        args.host,
+        args.port,
+        args.latency,
+        args.certfile,
+        args.keyfile,
+        args.max_rps,
+        args.latency_jitter,
+        args.error_rate,
+        args.throttle_rate,
+        args.unauthorized_rate,
+        args.seed,
+    )
+    print(f"Mock Flow Poker API listening on {server.scheme}://{args.host}:{server.server_port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
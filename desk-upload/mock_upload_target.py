@@ -0,0 +1,172 @@
+"""
+Local stand-in for FlowPokerDrillCreator.
+
+MockDrillCreator implements the drill creation calls used by the upload scripts
+and the streaming pipeline without any network access. Uploaded images and the
+final drill (answers, scores, rules) are written under a local directory so a
+full run can be inspected and tested offline.
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Dict, Union
+
+logger = logging.getLogger("mock_upload_target")
+
+# Identifiers are unique across all mock creators of a process
+_id_lock = threading.Lock()
+_drill_ids = itertools.count(1)
+_media_ids = itertools.count(1)
+_question_ids = itertools.count(1)
+
+
+def _next_id(counter):
+    with _id_lock:
+        return next(counter)
+
+
+class MockDrillCreator:
+    """
+    Drop-in replacement for FlowPokerDrillCreator that records drills locally
+    """
+
+    def __init__(self, output_dir: str = "mock_uploads", latency: float = 0.0):
+        """
+        Initialize the mock drill creator
+
+        Args:
+            output_dir: Directory where uploaded images and drills are stored
+            latency: Seconds to sleep on every call to mimic network round trips
+        """
+        self.output_dir = output_dir
+        self.latency = latency
+        self.drill_id = None
+        self.drill = None
+        self.lock = threading.Lock()
+
+    def _call(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _require_drill(self):
+        if not self.drill_id:
+            raise Exception("No drill ID available. Create a drill first.")
+
+    @property
+    def drill_dir(self) -> str:
+        return os.path.join(self.output_dir, f"drill_{self.drill_id}")
+
+    def create_drill(
+        self,
+        name: str,
+        description: str,
+        answers: List[str],
+        tags: Dict[str, str],
+        max_duration: str = "5",
+    ) -> int:
+        """Create a new drill"""
+        self._call()
+        self.drill_id = _next_id(_drill_ids)
+        self.drill = {
+            "id": self.drill_id,
+            "name": name,
+            "description": description,
+            "answers": answers,
+            "tags": [f"{key}:{value}" for key, value in tags.items()],
+            "maxDuration": max_duration,
+            "media": [],
+            "questions": {},
+            "rules": [],
+            "promoted": False,
+        }
+        os.makedirs(self.drill_dir, exist_ok=True)
+        logger.info(f"Mock drill created with ID: {self.drill_id}")
+        return self.drill_id
+
+    def upload_image(self, image_path: str) -> int:
+        """Upload an image file"""
+        with open(image_path, "rb") as f:
+            return self.upload_image_bytes(os.path.basename(image_path), f.read())
+
+    def upload_image_bytes(self, filename: str, image_data: bytes) -> int:
+        """Upload an image that is already in memory"""
+        self._require_drill()
+        self._call()
+        media_id = _next_id(_media_ids)
+        with open(os.path.join(self.drill_dir, f"{media_id}_{filename}"), "wb") as f:
+            f.write(image_data)
+        with self.lock:
+            self.drill["media"].append({"id": media_id, "file": filename})
+        return media_id
+
+    def finish_uploading(self) -> bool:
+        """Turn every uploaded image into a question"""
+        self._require_drill()
+        self._call()
+        with self.lock:
+            # Questions get consecutive IDs in upload order, like the real API
+            with _id_lock:
+                question_ids = [next(_question_ids) for _ in self.drill["media"]]
+            for question_id, media in zip(question_ids, self.drill["media"]):
+                self.drill["questions"][question_id] = {"mediaId": media["id"]}
+        return True
+
+    def get_questions(self) -> List[Dict]:
+        """Return the first question, like the real API does"""
+        self._require_drill()
+        self._call()
+        with self.lock:
+            question_ids = sorted(self.drill["questions"])
+        return [{"id": question_ids[0]}] if question_ids else []
+
+    def score_answer(
+        self,
+        question_id: int,
+        media_id: int,
+        answers_scores: List[Dict[str, Union[str, int]]],
+        tags: Dict[str, str],
+        current: int = 1,
+        total: int = 1,
+    ) -> bool:
+        """Record the answer scores of a question"""
+        self._require_drill()
+        self._call()
+        with self.lock:
+            if question_id not in self.drill["questions"]:
+                raise Exception(f"Failed to score answers: unknown question {question_id}")
+            self.drill["questions"][question_id] = {
+                "mediaId": media_id,
+                "answers": answers_scores,
+            }
+        return True
+
+    def get_drill_info(self) -> Dict:
+        """Return the drill as recorded so far"""
+        self._require_drill()
+        self._call()
+        with self.lock:
+            return json.loads(json.dumps(self.drill))
+
+    def set_wizard_rules(self, amount: int = 20) -> bool:
+        """Record the wizard rule of the drill"""
+        self._require_drill()
+        self._call()
+        with self.lock:
+            self.drill["rules"] = [{"amount": amount, "tags": self.drill["tags"]}]
+        return True
+
+    def promote_drill(self, academy_level_id: int = 15, available: bool = False) -> bool:
+        """Mark the drill as promoted and write it to disk"""
+        self._require_drill()
+        self._call()
+        with self.lock:
+            self.drill["promoted"] = True
+            self.drill["academyLevelId"] = academy_level_id
+            with open(os.path.join(self.drill_dir, "drill.json"), "w") as f:
+                json.dump(self.drill, f, indent=2)
+        logger.info(f"Mock drill {self.drill_id} promoted")
+        return True
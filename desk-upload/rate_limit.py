@@ -0,0 +1,178 @@
+"""
+Rate limiting and retry helpers shared by the Flow Poker upload scripts.
+
+AdaptiveRateLimiter is a token bucket whose rate follows the server: it grows
+slowly while requests succeed and is halved when the server answers 429 or 5xx
+(additive increase, multiplicative decrease). With a latency target it also
+backs off gently when responses slow down, before the server starts failing
+requests. One limiter is meant to be shared
+by every scenario of a run, from threads (acquire) or asyncio tasks
+(acquire_async).
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Exponential backoff with full jitter
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay ceiling of the first retry, in seconds
+        cap: Maximum delay ceiling, in seconds
+
+    Returns:
+        Seconds to wait, uniformly drawn between 0 and min(cap, base * 2**attempt)
+    """
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (seconds or HTTP date)
+
+    Args:
+        value: Header value, or None
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttle_status(status: int) -> bool:
+    """Whether a status code means the server is overloaded"""
+    return status == 429 or status >= 500
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket with an adaptive (AIMD) refill rate
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        latency_target: Optional[float] = None,
+        latency_decrease: float = 0.8,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Initial requests per second
+            min_rate: Lowest rate after throttling
+            max_rate: Highest rate reached while probing (default: 4 x rate)
+            burst: Bucket capacity (default: one second of the initial rate)
+            increase: Requests per second added after each success
+            decrease: Factor applied to the rate when the server throttles
+            cooldown: Seconds during which further throttles do not lower the
+                rate again (one overload burst usually fails several requests)
+            latency_target: Response time, in seconds, above which a
+                successful request lowers the rate instead of raising it
+            latency_decrease: Factor applied to the rate on a slow response
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.capacity = burst or max(1.0, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.latency_target = latency_target
+        self.latency_decrease = latency_decrease
+
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.lock = threading.Lock()
+        self.stats = {"acquired": 0, "throttled": 0, "decreases": 0, "slow": 0}
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise return seconds to wait"""
+        with self.lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.stats["acquired"] += 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent"""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent"""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def on_success(self, latency: Optional[float] = None):
+        """
+        Probe for more throughput after a successful request
+
+        Args:
+            latency: Response time of the request in seconds, if measured
+        """
+        with self.lock:
+            if self.latency_target is not None and latency is not None and latency > self.latency_target:
+                self.stats["slow"] += 1
+                now = time.monotonic()
+                if now - self.last_decrease >= self.cooldown:
+                    self.rate = max(self.min_rate, self.rate * self.latency_decrease)
+                    self.last_decrease = now
+                    self.stats["decreases"] += 1
+                return
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        Slow down after a 429 or 5xx response
+
+        Args:
+            retry_after: Seconds the server asked us to wait, if any
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.stats["throttled"] += 1
+            if now - self.last_decrease >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.last_decrease = now
+                self.stats["decreases"] += 1
+            # Drop the saved-up burst so we do not hit the server again at once
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
@@ -0,0 +1,73 @@
+"""
+Resumable CSV results logs shared by the Flow Poker batch scripts.
+
+Results are appended to the CSV file as they complete and flushed at once, so
+an interrupted run loses none of them. On resume, the existing rows are read
+back: every row is keyed by one column, the last row of a key wins, and the
+keys whose last row passes the success check are done.
+"""
+
+import csv
+import logging
+import os
+import threading
+from typing import Callable, Dict, List
+
+logger = logging.getLogger("results_log")
+
+
+class ResumableCsvLog:
+    """
+    Results streamed to a CSV file, resumable by key
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        header: List[str],
+        key_column: str,
+        is_success: Callable[[Dict[str, str]], bool],
+        resume: bool = False,
+    ):
+        """
+        Open the results file
+
+        Args:
+            output_file: Path to the CSV file
+            header: Column names, written when the file is started
+            key_column: Column that identifies a row's item
+            is_success: Whether a row records its item as done
+            resume: Keep the existing results and mark the items they record
+                as done
+        """
+        self.output_file = output_file
+        self.done = set()
+        self.last_rows = {}
+        self.lock = threading.Lock()
+
+        resuming = resume and os.path.exists(output_file)
+        if resuming:
+            with open(output_file, "r", newline="") as f:
+                for row in csv.DictReader(f):
+                    key = row[key_column]
+                    # The last row of an item wins
+                    self.last_rows[key] = row
+                    if is_success(row):
+                        self.done.add(key)
+                    else:
+                        self.done.discard(key)
+
+        self.file = open(output_file, "a" if resuming else "w", newline="")
+        self.writer = csv.writer(self.file)
+        if not resuming:
+            self.writer.writerow(header)
+            self.file.flush()
+
+    def write_row(self, row: List):
+        """Append one row and flush it to disk"""
+        with self.lock:
+            self.writer.writerow(row)
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
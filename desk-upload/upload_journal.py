@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+"""
+SQLite journal of drill uploads for batch_visualizations_upload.py.
+
+For every scenario directory the journal records the drill ID, the media ID of
+every uploaded image, the question ID of every scored hand, and whether the
+upload phase was finished, the wizard rules were set and the drill was
+promoted. Every step is committed as soon as its HTTP call succeeds, so a
+restarted run repeats only the calls that never completed, and a promoted
+scenario is not created again.
+
+The journal lives at the root of the visualizations tree (.upload_journal.sqlite)
+and stores scenario paths relative to it.
+
+Usage:
+    python upload_journal.py status --visualizations-dir ../visualizations
+    python upload_journal.py reset --visualizations-dir ../visualizations <scenario directory>
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from drill_content import find_image_files, find_metadata_files
+
+logger = logging.getLogger("upload_journal")
+
+JOURNAL_FILENAME = ".upload_journal.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    directory TEXT PRIMARY KEY,
+    images TEXT NOT NULL,
+    drill_id INTEGER,
+    uploads_finished INTEGER NOT NULL DEFAULT 0,
+    first_question_id INTEGER,
+    rules_set INTEGER NOT NULL DEFAULT 0,
+    promoted INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS media (
+    directory TEXT NOT NULL,
+    image TEXT NOT NULL,
+    media_id INTEGER NOT NULL,
+    PRIMARY KEY (directory, image)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    directory TEXT NOT NULL,
+    hand TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    PRIMARY KEY (directory, hand)
+);
+"""
+
+SCENARIO_FIELDS = ("drill_id", "uploads_finished", "first_question_id", "rules_set", "promoted")
+
+
+class UploadJournal:
+    """
+    Thread-safe SQLite journal shared by all scenarios of a run
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) a journal
+
+        Args:
+            path: Journal file; scenario paths are stored relative to its directory
+        """
+        self.path = path
+        self.root = os.path.dirname(os.path.abspath(path))
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # WAL keeps every commit durable without a full sync per write
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    @classmethod
+    def for_tree(cls, visualizations_dir: str) -> "UploadJournal":
+        """Open the journal at the root of a visualizations tree"""
+        return cls(os.path.join(visualizations_dir, JOURNAL_FILENAME))
+
+    def key(self, directory: str) -> str:
+        """Journal key of a scenario directory"""
+        return os.path.relpath(os.path.abspath(directory), self.root).replace(os.sep, "/")
+
+    def execute(self, sql: str, params=()) -> List[tuple]:
+        """Run one statement in its own transaction and return its rows"""
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+            self.connection.commit()
+            return rows
+
+    def scenario(self, directory: str, image_files: List[str]) -> "ScenarioJournal":
+        """
+        Progress record of one scenario
+
+        Args:
+            directory: Scenario directory
+            image_files: Images of the scenario; progress recorded for a
+                different set of images is discarded
+        """
+        return ScenarioJournal(self, directory, image_files)
+
+    def reset(self, directory: str):
+        """Forget all progress of a scenario"""
+        key = self.key(directory)
+        with self.lock:
+            for table in ("scenarios", "media", "scores"):
+                self.connection.execute(f"DELETE FROM {table} WHERE directory = ?", (key,))
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class ScenarioJournal:
+    """
+    Journal entries of one scenario drill
+    """
+
+    def __init__(self, journal: UploadJournal, directory: str, image_files: List[str]):
+        self.journal = journal
+        self.key = journal.key(directory)
+        images = json.dumps(sorted(os.path.basename(f) for f in image_files))
+
+        rows = journal.execute(
+            f"SELECT images, {', '.join(SCENARIO_FIELDS)} FROM scenarios WHERE directory = ?",
+            (self.key,),
+        )
+        if rows and rows[0][0] != images:
+            logger.warning(f"Images of {self.key} changed since the last run, starting over")
+            journal.reset(directory)
+            rows = []
+        if not rows:
+            journal.execute(
+                "INSERT INTO scenarios (directory, images, updated_at) VALUES (?, ?, ?)",
+                (self.key, images, time.time()),
+            )
+            rows = journal.execute(
+                f"SELECT images, {', '.join(SCENARIO_FIELDS)} FROM scenarios WHERE directory = ?",
+                (self.key,),
+            )
+        self.fields = dict(zip(SCENARIO_FIELDS, rows[0][1:]))
+
+        self._media = dict(
+            journal.execute("SELECT image, media_id FROM media WHERE directory = ?", (self.key,))
+        )
+        self._scored = {
+            hand for (hand,) in journal.execute("SELECT hand FROM scores WHERE directory = ?", (self.key,))
+        }
+        if self.resumed:
+            logger.info(
+                f"Resuming drill {self.drill_id} from journal: {len(self._media)} images uploaded, "
+                f"{len(self._scored)} questions scored"
+            )
+
+    @property
+    def resumed(self) -> bool:
+        return self.fields["drill_id"] is not None
+
+    @property
+    def drill_id(self) -> Optional[int]:
+        return self.fields["drill_id"]
+
+    @property
+    def media(self) -> Dict[str, int]:
+        with self.journal.lock:
+            return dict(self._media)
+
+    def get(self, key):
+        return self.fields[key]
+
+    def update(self, **fields):
+        """Record finished steps of the scenario"""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self.journal.execute(
+            f"UPDATE scenarios SET {assignments}, updated_at = ? WHERE directory = ?",
+            (*fields.values(), time.time(), self.key),
+        )
+        self.fields.update(fields)
+
+    def add_media(self, image_file: str, media_id: int):
+        image = os.path.basename(image_file)
+        self.journal.execute(
+            "INSERT OR REPLACE INTO media (directory, image, media_id) VALUES (?, ?, ?)",
+            (self.key, image, media_id),
+        )
+        with self.journal.lock:
+            self._media[image] = media_id
+
+    def missing_images(self, image_files: List[str]) -> List[str]:
+        """Images of the scenario that have no media ID yet"""
+        media = self.media
+        return [f for f in image_files if os.path.basename(f) not in media]
+
+    def is_scored(self, hand: str) -> bool:
+        with self.journal.lock:
+            return hand in self._scored
+
+    def mark_scored(self, hand: str, question_id: int):
+        self.journal.execute(
+            "INSERT OR IGNORE INTO scores (directory, hand, question_id) VALUES (?, ?, ?)",
+            (self.key, hand, question_id),
+        )
+        with self.journal.lock:
+            self._scored.add(hand)
+
+
+def summarize(visualizations_dir: str, journal: UploadJournal) -> Dict[str, Dict[str, int]]:
+    """
+    Progress of every scenario of a visualizations tree, per solution
+
+    Args:
+        visualizations_dir: Root of the visualizations tree
+        journal: Journal of that tree
+
+    Returns:
+        Mapping of solution directory to counters
+    """
+    scenarios = {
+        row[0]: row[1:]
+        for row in journal.execute(
+            "SELECT directory, drill_id, promoted FROM scenarios"
+        )
+    }
+    media = dict(journal.execute("SELECT directory, COUNT(*) FROM media GROUP BY directory"))
+    scores = dict(journal.execute("SELECT directory, COUNT(*) FROM scores GROUP BY directory"))
+
+    summary = {}
+    for metadata_file in sorted(find_metadata_files(visualizations_dir)):
+        directory = os.path.dirname(metadata_file)
+        key = journal.key(directory)
+        solution = key.split("/", 1)[0]
+        counters = summary.setdefault(
+            solution,
+            dict.fromkeys(
+                ("scenarios", "not_started", "in_progress", "promoted", "images", "uploaded", "scored"), 0
+            ),
+        )
+        drill_id, promoted = scenarios.get(key, (None, 0))
+        counters["scenarios"] += 1
+        counters["images"] += len(find_image_files(directory))
+        counters["uploaded"] += media.get(key, 0)
+        counters["scored"] += scores.get(key, 0)
+        if promoted:
+            counters["promoted"] += 1
+        elif drill_id is None:
+            counters["not_started"] += 1
+        else:
+            counters["in_progress"] += 1
+    return summary
+
+
+def print_status(summary: Dict[str, Dict[str, int]]):
+    """Print the progress summary as a table"""
+    header = f"{'solution':<40}{'scenarios':>10}{'todo':>7}{'started':>9}{'promoted':>10}{'uploaded':>16}{'scored':>16}"
+    print(header)
+    print("-" * len(header))
+    totals = {}
+    for solution, counters in sorted(summary.items()):
+        for name, value in counters.items():
+            totals[name] = totals.get(name, 0) + value
+        print_row(solution, counters)
+    if len(summary) > 1:
+        print("-" * len(header))
+        print_row("total", totals)
+
+
+def print_row(label: str, counters: Dict[str, int]):
+    uploaded = f"{counters['uploaded']}/{counters['images']}"
+    scored = f"{counters['scored']}/{counters['images']}"
+    print(
+        f"{label[:39]:<40}{counters['scenarios']:>10}{counters['not_started']:>7}"
+        f"{counters['in_progress']:>9}{counters['promoted']:>10}{uploaded:>16}{scored:>16}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the drill upload journal")
+    parser.add_argument(
+        "--visualizations-dir",
+        default="../visualizations",
+        help="Directory containing visualizations (default: ../visualizations)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Summarize upload progress across the visualizations tree")
+    reset_parser = subparsers.add_parser("reset", help="Forget the progress of scenario directories")
+    reset_parser.add_argument("directories", nargs="+", help="Scenario directories")
+    args = parser.parse_args()
+
+    visualizations_dir = os.path.abspath(args.visualizations_dir)
+    if not os.path.isdir(visualizations_dir):
+        print(f"Visualizations directory not found: {visualizations_dir}")
+        return
+
+    journal = UploadJournal.for_tree(visualizations_dir)
+    if args.command == "status":
+        print_status(summarize(visualizations_dir, journal))
+    elif args.command == "reset":
+        for directory in args.directories:
+            journal.reset(directory)
+            print(f"Reset {journal.key(directory)}")
+    journal.close()
+
+
+if __name__ == "__main__":
+    main()
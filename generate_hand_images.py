@@ -4,8 +4,16 @@ import argparse
 from pathlib import Path
 import logging
 import random
+import time
+from collections import defaultdict
+from functools import lru_cache
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from poker_table_visualizer import PokerTableVisualizer
+from clear_spot_solution_json import clear_spot_solution_json
+from poker_viz import RENDERER_VERSION
+from build_manifest import BuildManifest, file_sha256, make_signature, params_hash
+from hand_pack import PACK_SUFFIX, hand_ref, load_hand_json, open_pack, split_hand_ref
+from solution_scanner import scan_files
 
 # Set up logging
 logging.basicConfig(
@@ -15,15 +23,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-process caches: parsed source solutions and visualizers with a warm template
+SOLUTION_CACHE_SIZE = 8
+TEMPLATE_CACHE_SIZE = 4
+
+# Default number of hands from the same source solution sent to a worker at once
+DEFAULT_CHUNK_SIZE = 32
+
+
+@lru_cache(maxsize=SOLUTION_CACHE_SIZE)
+def load_original_solution(original_file):
+    """Clean and parse a source solution once per worker process"""
+    return json.loads(clear_spot_solution_json(original_file))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_warm_visualizer(original_file):
+    """Return a visualizer for a source solution with its static template rendered"""
+    original_json = load_original_solution(original_file)
+    visualizer = PokerTableVisualizer(original_json, solution_path=original_file)
+    visualizer.create_template()
+    return visualizer
+
 
 def create_visualization_for_hand(args):
-    """Create a visualization for a single hand JSON file"""
+    """
+    Create a visualization for a single hand JSON file or packed hand reference
+
+    Returns a (message, output_path) tuple; output_path is None when the image
+    could not be created.
+    """
     hand_json_path, output_dir, hand_to_cards_map = args
 
     try:
-        # Load the hand JSON file
-        with open(hand_json_path, "r") as f:
-            hand_json = json.load(f)
+        # Load the hand JSON file (or a single record of a hand pack)
+        hand_json = load_hand_json(hand_json_path)
 
         # Extract necessary information
         hand = hand_json["metadata"]["hand"]
@@ -48,20 +82,14 @@ def create_visualization_for_hand(args):
         # Load the original solution file to get the full game structure
         original_file = hand_json["metadata"]["original_file"]
         try:
-            # Try to load the original solution to get the game structure
-            from clear_spot_solution_json import clear_spot_solution_json
-
-            json_text = clear_spot_solution_json(original_file)
-            original_json = json.loads(json_text)
-
-            # Create visualization
-            visualizer = PokerTableVisualizer(
-                original_json,
-                card1,
-                card2,
-                str(output_path),
-                solution_path=str(hand_json_path),
-            )
+            # Reuse the parsed solution and its pre-rendered template so only
+            # the cards, text and encoding are done per hand
+            original_json = load_original_solution(original_file)
+            visualizer = get_warm_visualizer(original_file)
+            visualizer.card1 = card1
+            visualizer.card2 = card2
+            visualizer.output_path = str(output_path)
+            visualizer.game_data.update_data(original_json, str(hand_json_path))
             visualizer.create_visualization()
 
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
@@ -109,13 +137,29 @@ def create_visualization_for_hand(args):
             )
             visualizer.create_visualization()
 
-        return f"Created visualization for {hand} ({card1}, {card2}) - Best action: {best_action}, EV: {best_ev:.6f}"
+        return (
+            f"Created visualization for {hand} ({card1}, {card2}) - Best action: {best_action}, EV: {best_ev:.6f}",
+            output_path,
+        )
 
     except Exception as e:
         logger.error(
             f"Error creating visualization for {hand_json_path}: {e}", exc_info=True
         )
-        return f"Error processing {hand_json_path}: {str(e)}"
+        return f"Error processing {hand_json_path}: {str(e)}", None
+
+
+def create_visualizations_for_chunk(chunk):
+    """
+    Create the visualizations of a chunk of hands sharing one source solution
+
+    Returns a list of (hand_json_path, message, output_path) tuples.
+    """
+    results = []
+    for args in chunk:
+        message, output_path = create_visualization_for_hand(args)
+        results.append((args[0], message, output_path))
+    return results
 
 
 def convert_hand_to_cards(hand):
@@ -174,6 +218,8 @@ class HandImageGenerator:
         position=None,
         max_workers=None,
         specific_hand=None,
+        force=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
     ):
         """
         Initialize the hand image generator
@@ -186,6 +232,8 @@ class HandImageGenerator:
         position (str, optional): Filter by position
         max_workers (int, optional): Maximum number of worker processes to use
         specific_hand (str, optional): Generate image for a specific hand only (e.g., 'AKs', 'TT')
+        force (bool, optional): Re-render every image even if the build manifest says it is up to date
+        chunk_size (int, optional): Maximum number of hands of one source solution per worker task
         """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
@@ -194,6 +242,8 @@ class HandImageGenerator:
         self.position = position
         self.max_workers = max_workers
         self.specific_hand = specific_hand
+        self.force = force
+        self.chunk_size = max(1, chunk_size)
 
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
@@ -201,54 +251,120 @@ class HandImageGenerator:
         # Cache for hand to cards mapping
         self.hand_to_cards_map = {}
 
+        # Build manifest used to skip images whose inputs did not change
+        self.manifest = BuildManifest(self.output_dir)
+        self.params_digest = params_hash({"scale_factor": 1})
+        self._original_hashes = {}
+
         # Stats tracking
         self.stats = {
             "total_files": 0,
             "processed_files": 0,
             "skipped_files": 0,
             "error_files": 0,
+            "removed_files": 0,
         }
 
-    def get_hand_json_files(self):
-        """Get all hand JSON files, optionally filtered by criteria"""
-        pattern = "**/*.json"
-        all_files = list(self.input_dir.glob(pattern))
+    def source_hash(self, hand_json_path, hand_json):
+        """Hash a hand JSON together with the original solution it renders from"""
+        original_file = hand_json.get("metadata", {}).get("original_file")
+        if original_file not in self._original_hashes:
+            try:
+                self._original_hashes[original_file] = file_sha256(original_file)
+            except (OSError, TypeError):
+                self._original_hashes[original_file] = None
+
+        # Packed hands are hashed by their own record, not the whole pack
+        path, hand = split_hand_ref(hand_json_path)
+        if hand is None:
+            hand_hash = file_sha256(path)
+        else:
+            hand_hash = params_hash(hand_json)
+        return params_hash([hand_hash, self._original_hashes[original_file]])
 
-        # Skip metadata.json files
-        all_files = [f for f in all_files if f.name != "metadata.json"]
+    def plan_task(self, hand_json_path):
+        """
+        Decide whether a hand JSON needs to be rendered
 
-        # Apply filters if specified
-        filtered_files = []
-        for file_path in all_files:
-            relative_path = file_path.relative_to(self.input_dir)
-            parts = relative_path.parts
+        Returns (cards, signature, original_file) for hands that must be
+        rendered, or None when the recorded image is still up to date.
+        """
+        source = hand_json_path.relative_to(self.input_dir).as_posix()
+        key, entry = self.manifest.find_by_source(source)
 
-            # Apply game type filter
-            if self.game_type and (len(parts) < 1 or parts[0] != self.game_type):
-                continue
+        hand_json = load_hand_json(hand_json_path)
+        hand = hand_json["metadata"]["hand"]
 
-            # Apply depth filter
-            if self.depth and (len(parts) < 2 or parts[1] != self.depth):
-                continue
+        # Keep the suits of a previous build so the image stays identical
+        if entry and entry.get("cards"):
+            cards = tuple(entry["cards"])
+        else:
+            cards = convert_hand_to_cards(hand)
 
-            # Apply position filter
-            if self.position:
-                position_found = False
-                for part in parts:
-                    if part == self.position:
-                        position_found = True
-                        break
-                if not position_found:
-                    continue
+        signature = make_signature(
+            self.source_hash(hand_json_path, hand_json),
+            self.params_digest,
+            cards,
+            RENDERER_VERSION,
+        )
+        if not self.force and key and self.manifest.is_current(key, signature):
+            return None
+        return {hand: cards}, signature, hand_json["metadata"].get("original_file")
+
+    def make_chunks(self, visualization_args, original_files):
+        """Group tasks by source solution and split each group into chunks"""
+        groups = defaultdict(list)
+        for args in visualization_args:
+            groups[original_files[args[0]]].append(args)
+
+        chunks = []
+        for group in groups.values():
+            for start in range(0, len(group), self.chunk_size):
+                chunks.append(group[start : start + self.chunk_size])
+        return chunks
 
-            # Apply specific hand filter if provided
-            if self.specific_hand:
-                # Check if the file is for the specific hand
-                # The filename pattern is typically [hand].json
-                if not file_path.stem == self.specific_hand:
+    def get_hand_json_files(self):
+        """
+        Get all hand JSON files, optionally filtered by criteria
+
+        Hand packs are expanded into one "hands.pack#<hand>" reference per hand.
+        """
+        # Filtered-out game types and depths are never entered; hand trees name
+        # their depth directories by the depth itself
+        files = scan_files(
+            self.input_dir,
+            suffixes=(".json", PACK_SUFFIX),
+            game_type=self.game_type,
+            depth=self.depth,
+            position=self.position,
+            depth_exact=True,
+        )
+
+        filtered_files = []
+        for file_path in files:
+            if file_path.name.endswith(PACK_SUFFIX):
+                # Expand the hands stored in packs, reading only their index
+                try:
+                    hands = open_pack(file_path).hands
+                except (OSError, ValueError) as e:
+                    logger.error(f"Error reading hand pack {file_path}: {e}")
                     continue
+                hand_files = [Path(hand_ref(file_path, hand)) for hand in hands]
+            elif file_path.name == "metadata.json":
+                continue
+            else:
+                hand_files = [file_path]
+
+            for hand_file in hand_files:
+                # Apply specific hand filter if provided
+                if self.specific_hand:
+                    # Check if the file is for the specific hand
+                    # The filename pattern is typically [hand].json or hands.pack#[hand]
+                    _, packed_hand = split_hand_ref(hand_file)
+                    if (packed_hand or hand_file.stem) != self.specific_hand:
+                        continue
 
-            filtered_files.append(file_path)
+                filtered_files.append(hand_file)
 
         return filtered_files
 
@@ -276,53 +392,113 @@ class HandImageGenerator:
             for file in hand_json_files:
                 logger.info(f"  - {file}")
 
-        # Process files in parallel (or just one file if specific_hand is set)
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Prepare arguments for visualization tasks
-            visualization_args = []
-
-            for hand_json_path in hand_json_files:
-                # Create matching output directory structure
-                relative_path = hand_json_path.relative_to(self.input_dir)
-                output_subdir = self.output_dir / relative_path.parent
-
-                # Append task arguments
-                visualization_args.append(
-                    (hand_json_path, output_subdir, self.hand_to_cards_map)
-                )
-
-            # Submit visualization tasks
-            future_to_path = {
-                executor.submit(create_visualization_for_hand, args): args[0]
-                for args in visualization_args
-            }
+        # Prepare arguments for visualization tasks, skipping up-to-date images
+        visualization_args = []
+        signatures = {}
+        original_files = {}
+
+        for hand_json_path in hand_json_files:
+            try:
+                plan = self.plan_task(hand_json_path)
+            except (OSError, json.JSONDecodeError, KeyError) as e:
+                logger.error(f"Error reading {hand_json_path}: {e}")
+                self.stats["error_files"] += 1
+                continue
 
-            # Process results as they complete
-            for i, future in enumerate(as_completed(future_to_path)):
-                try:
-                    result = future.result()
-                    logger.info(f"[{i+1}/{len(hand_json_files)}] {result}")
-                    self.stats["processed_files"] += 1
-                except Exception as e:
-                    hand_json_path = future_to_path[future]
-                    logger.error(
-                        f"Error processing {hand_json_path}: {e}", exc_info=True
-                    )
-                    self.stats["error_files"] += 1
+            if plan is None:
+                self.stats["skipped_files"] += 1
+                continue
+            hand_to_cards_map, signature, original_file = plan
+            signatures[hand_json_path] = signature
+            original_files[hand_json_path] = original_file
+
+            # Create matching output directory structure
+            relative_path = hand_json_path.relative_to(self.input_dir)
+            output_subdir = self.output_dir / relative_path.parent
+
+            # Append task arguments
+            visualization_args.append((hand_json_path, output_subdir, hand_to_cards_map))
+
+        logger.info(
+            f"{len(visualization_args)} images to render, "
+            f"{self.stats['skipped_files']} up to date"
+        )
+
+        # Process chunks in parallel; hands of the same source solution go to
+        # the same worker so its parsed solution and template are reused
+        start_time = time.perf_counter()
+        if visualization_args:
+            chunks = self.make_chunks(visualization_args, original_files)
+            logger.info(
+                f"Rendering {len(visualization_args)} hands from "
+                f"{len(set(original_files.values()))} solutions in {len(chunks)} chunks"
+            )
+            done = 0
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                # Submit visualization tasks
+                future_to_chunk = {
+                    executor.submit(create_visualizations_for_chunk, chunk): chunk
+                    for chunk in chunks
+                }
+
+                # Process results as they complete
+                for future in as_completed(future_to_chunk):
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        chunk = future_to_chunk[future]
+                        logger.error(
+                            f"Error processing chunk starting at {chunk[0][0]}: {e}",
+                            exc_info=True,
+                        )
+                        self.stats["error_files"] += len(chunk)
+                        done += len(chunk)
+                        continue
+
+                    for hand_json_path, result, output_path in results:
+                        done += 1
+                        logger.info(f"[{done}/{len(visualization_args)}] {result}")
+                        if output_path is None:
+                            self.stats["error_files"] += 1
+                        else:
+                            self.record_output(
+                                hand_json_path, output_path, signatures[hand_json_path]
+                            )
+                            self.stats["processed_files"] += 1
 
-                # Log progress every 50 files
-                if (i + 1) % 50 == 0:
                     logger.info(
-                        f"Progress: {i+1}/{len(hand_json_files)} files processed"
+                        f"Progress: {done}/{len(visualization_args)} files processed"
                     )
+        elapsed = time.perf_counter() - start_time
+
+        # Images whose hand JSON disappeared are stale
+        self.stats["removed_files"] += self.manifest.remove_orphans(self.input_dir)
+        self.manifest.save()
 
         # Print final stats
         logger.info("\nProcessing complete!")
         logger.info(f"Total files: {self.stats['total_files']}")
         logger.info(f"Processed files: {self.stats['processed_files']}")
+        logger.info(f"Up-to-date files: {self.stats['skipped_files']}")
         logger.info(f"Error files: {self.stats['error_files']}")
+        logger.info(f"Removed stale images: {self.stats['removed_files']}")
+        if self.stats["processed_files"]:
+            logger.info(
+                f"Render time: {elapsed:.1f}s "
+                f"({self.stats['processed_files'] / elapsed:.2f} hands/sec)"
+            )
         logger.info(f"Images saved to: {self.output_dir}")
 
+    def record_output(self, hand_json_path, output_path, signature):
+        """Record a rendered image, removing the previous image if its name changed"""
+        source = hand_json_path.relative_to(self.input_dir).as_posix()
+        key = self.manifest.key_for(output_path)
+        previous_key, _ = self.manifest.find_by_source(source)
+        if previous_key and previous_key != key:
+            self.manifest.remove(previous_key)
+            self.stats["removed_files"] += 1
+        self.manifest.record(key, signature, source=source)
+
 
 def main():
     # Set up argument parser
@@ -349,7 +525,19 @@ def main():
         "--hand", help="Generate image for a specific hand only (e.g., 'AKs', 'TT')"
     )
     parser.add_argument(
-        "--file", help="Generate image for a specific hand JSON file (absolute path)"
+        "--file",
+        help="Generate image for a specific hand JSON file or packed hand (path/hands.pack#AKs)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every image, ignoring the build manifest",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Maximum number of hands from one source solution sent to a worker at once",
     )
 
     args = parser.parse_args()
@@ -357,7 +545,7 @@ def main():
     # Process a single specific file if provided
     if args.file:
         file_path = Path(args.file)
-        if not file_path.exists():
+        if not split_hand_ref(file_path)[0].exists():
             logger.error(f"File not found: {file_path}")
             return
 
@@ -365,7 +553,7 @@ def main():
         os.makedirs(output_dir, exist_ok=True)
 
         hand_to_cards_map = {}
-        result = create_visualization_for_hand(
+        result, _ = create_visualization_for_hand(
             (file_path, output_dir, hand_to_cards_map)
         )
         logger.info(result)
@@ -380,6 +568,8 @@ def main():
         position=args.position,
         max_workers=args.max_workers,
         specific_hand=args.hand,
+        force=args.force,
+        chunk_size=args.chunk_size,
     )
 
     generator.run()
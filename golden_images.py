@@ -0,0 +1,384 @@
+"""
+Golden-image check of the poker_viz renderer.
+
+Renders a fixed matrix of table configurations (player count, output tier,
+anti-aliasing mode) and hands, and compares every image with the golden image
+stored for it in golden_images/. Hands are dealt with fixed suits, so the same
+case always draws the same cards. Each configuration renders its hands on one
+visualizer, releasing the canvas in between, the way the hand image server
+reuses cached visualizers, and images go through PNG encoding and decoding, so
+encoder changes are covered too.
+
+A case passes when its pixels are identical, or when the differences stay
+within the tolerances: few pixels differ by more than --pixel-tolerance in any
+channel, and PSNR and SSIM (of the luminance) stay above their minimums. For
+every failing case the rendered image and a diff image, with the changed pixels
+in red over the dimmed golden, are written to --diff-dir.
+
+Use it to check that a performance change keeps the output: run it before the
+change with --update if the goldens are stale, then after the change without.
+Text is drawn by FreeType, so goldens only compare with the Pillow version
+recorded in the manifest; regenerate them with --update after upgrading Pillow
+or after an intended visual change.
+
+Example:
+    python golden_images.py
+    python golden_images.py --update
+    python golden_images.py --cases 9p --pixel-tolerance 4 --output golden_report.json
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import PIL
+from PIL import Image, ImageOps
+
+from benchmark_render import representative_solutions, table_with_players
+from clear_spot_solution_json import clear_spot_solution_json
+from compare_antialias import psnr, ssim
+from poker_viz import RENDERER_VERSION, PokerTableVisualizer
+
+logger = logging.getLogger(__name__)
+
+GOLDEN_DIR = "golden_images"
+MANIFEST_FILENAME = "manifest.json"
+
+# (players, tier, antialias) of every table configuration
+CONFIGURATIONS = [
+    (9, "full", "supersample"),
+    (6, "full", "supersample"),
+    (2, "full", "supersample"),
+    (9, "thumbnail", "supersample"),
+    (9, "full", "native"),
+]
+
+# Hands rendered on every configuration
+HANDS = ["AKs", "T9o", "55"]
+
+SUITS = "hsdc"
+
+
+def hand_cards(hand, index):
+    """
+    Deal a hand with fixed suits
+
+    Parameters:
+    hand (str): Hand code such as "AKs", "T9o" or "55"
+    index (int): Position of the case in the matrix; rotates the suits so
+    every suit is drawn across the matrix
+
+    Returns:
+    tuple: (card1, card2)
+    """
+    suit1, suit2 = SUITS[index % 4], SUITS[(index + 1) % 4]
+    if hand.endswith("s"):
+        suit2 = suit1
+    return hand[0] + suit1, hand[1] + suit2
+
+
+def build_matrix(solution_path):
+    """
+    List the cases of the golden matrix
+
+    Parameters:
+    solution_path (str): Solution every table is built from
+
+    Returns:
+    dict: Case name -> solution, players, tier, antialias and cards
+    """
+    cases = {}
+    for config_index, (players, tier, antialias) in enumerate(CONFIGURATIONS):
+        for hand_index, hand in enumerate(HANDS):
+            cards = hand_cards(hand, config_index + hand_index)
+            name = f"{players}p_{tier}_{antialias}_{''.join(cards)}"
+            cases[name] = {
+                "solution": solution_path,
+                "players": players,
+                "tier": tier,
+                "antialias": antialias,
+                "cards": list(cards),
+                "file": f"{name}.png",
+            }
+    return cases
+
+
+def render_configuration(cases):
+    """
+    Render the cases of one table configuration on a shared visualizer
+
+    Parameters:
+    cases (dict): Case name -> case, all with the same solution, players, tier
+    and antialias
+
+    Returns:
+    dict: Case name -> PNG bytes
+    """
+    first = next(iter(cases.values()))
+    solution = json.loads(clear_spot_solution_json(first["solution"]))
+    table = table_with_players(solution, first["players"])
+    if table is None:
+        raise ValueError(f"{first['solution']} has no {first['players']}-player table")
+    visualizer = PokerTableVisualizer(
+        table,
+        *first["cards"],
+        solution_path=first["solution"],
+        scale_factor=1,
+        antialias=first["antialias"],
+        tier=first["tier"],
+    )
+    images = {}
+    for name, case in cases.items():
+        visualizer.card1, visualizer.card2 = case["cards"]
+        images[name] = visualizer.render_png_bytes()
+        visualizer.release_canvas()
+    return images
+
+
+def render_cases(cases, jobs):
+    """
+    Render every case, one configuration per process
+
+    Parameters:
+    cases (dict): Case name -> case
+    jobs (int): Worker processes
+
+    Returns:
+    dict: Case name -> PNG bytes
+    """
+    groups = {}
+    for name, case in cases.items():
+        key = (case["solution"], case["players"], case["tier"], case["antialias"])
+        groups.setdefault(key, {})[name] = case
+    images = {}
+    if jobs > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(groups))) as pool:
+            for rendered in pool.map(render_configuration, groups.values()):
+                images.update(rendered)
+    else:
+        for group in groups.values():
+            images.update(render_configuration(group))
+    return images
+
+
+def decode(png):
+    """Decode PNG bytes into an RGB image"""
+    return Image.open(io.BytesIO(png)).convert("RGB")
+
+
+def compare_images(golden, actual, pixel_tolerance):
+    """
+    Compare a rendered image with its golden image
+
+    Parameters:
+    golden (PIL.Image.Image): Golden RGB image
+    actual (PIL.Image.Image): Rendered RGB image
+    pixel_tolerance (int): Channel difference a pixel may have without counting as changed
+
+    Returns:
+    tuple: (metrics dict, per-pixel maximum channel difference array or None)
+    """
+    if golden.size != actual.size:
+        return {"identical": False, "size": list(actual.size), "golden_size": list(golden.size)}, None
+    if golden.tobytes() == actual.tobytes():
+        return {"identical": True}, None
+    golden_pixels, actual_pixels = np.asarray(golden), np.asarray(actual)
+    difference = np.abs(golden_pixels.astype(np.int16) - actual_pixels.astype(np.int16)).max(axis=2)
+    metrics = {
+        "identical": False,
+        "max_difference": int(difference.max()),
+        "changed_fraction": float((difference > pixel_tolerance).mean()),
+        "psnr_db": round(psnr(golden_pixels, actual_pixels), 2),
+        "ssim": round(ssim(np.asarray(golden.convert("L")), np.asarray(actual.convert("L"))), 5),
+    }
+    return metrics, difference
+
+
+def passes(metrics, args):
+    """True when the metrics of a case are within the tolerances"""
+    if metrics["identical"]:
+        return True
+    if "golden_size" in metrics:
+        return False
+    return (
+        metrics["changed_fraction"] <= args.max_changed
+        and metrics["psnr_db"] >= args.min_psnr
+        and metrics["ssim"] >= args.min_ssim
+    )
+
+
+def diff_image(golden, difference, pixel_tolerance):
+    """
+    Highlight the changed pixels of a failing case
+
+    Parameters:
+    golden (PIL.Image.Image): Golden RGB image
+    difference (numpy.ndarray): Per-pixel maximum channel difference
+    pixel_tolerance (int): Differences up to this are left out
+
+    Returns:
+    PIL.Image.Image: The golden in dimmed grayscale with changed pixels in red,
+    brighter for larger differences
+    """
+    base = np.asarray(ImageOps.grayscale(golden), dtype=np.float32) * 0.35
+    out = np.repeat(base[..., None], 3, axis=2)
+    changed = difference > pixel_tolerance
+    out[changed] = 0
+    out[changed, 0] = 96 + np.minimum(difference[changed], 159)
+    return Image.fromarray(out.astype(np.uint8))
+
+
+def sha256(data):
+    """Hex SHA-256 of bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def update_goldens(golden_dir, cases, images):
+    """Write the golden images and the manifest"""
+    os.makedirs(golden_dir, exist_ok=True)
+    for name, case in cases.items():
+        with open(Path(golden_dir) / case["file"], "wb") as f:
+            f.write(images[name])
+        case["sha256"] = sha256(images[name])
+    manifest = {
+        "renderer_version": RENDERER_VERSION,
+        "pillow": PIL.__version__,
+        "cases": cases,
+    }
+    with open(Path(golden_dir) / MANIFEST_FILENAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Wrote {len(cases)} golden images to {golden_dir}")
+
+
+def check_goldens(golden_dir, cases, images, args):
+    """
+    Compare rendered images with the goldens and write diffs of failing cases
+
+    Returns:
+    dict: Case name -> metrics and "passed"
+    """
+    results = {}
+    for name, case in cases.items():
+        golden_path = Path(golden_dir) / case["file"]
+        if not golden_path.exists():
+            results[name] = {"identical": False, "missing": True, "passed": False}
+            continue
+        png = images[name]
+        # Byte-identical PNGs need no decoding
+        if sha256(png) == case.get("sha256"):
+            results[name] = {"identical": True, "passed": True}
+            continue
+        golden = Image.open(golden_path).convert("RGB")
+        actual = decode(png)
+        metrics, difference = compare_images(golden, actual, args.pixel_tolerance)
+        metrics["passed"] = passes(metrics, args)
+        if not metrics["passed"]:
+            os.makedirs(args.diff_dir, exist_ok=True)
+            actual.save(Path(args.diff_dir) / f"{name}_actual.png")
+            if difference is not None:
+                diff_path = Path(args.diff_dir) / f"{name}_diff.png"
+                diff_image(golden, difference, args.pixel_tolerance).save(diff_path)
+                metrics["diff_image"] = str(diff_path)
+        results[name] = metrics
+    return results
+
+
+def print_results(results):
+    """Print the comparison of every case as a table"""
+    header = f"{'case':<40}{'max diff':>9}{'changed':>10}{'PSNR dB':>9}{'SSIM':>9}  result"
+    print(header)
+    print("-" * len(header))
+    for name, metrics in results.items():
+        if metrics.get("missing"):
+            row = f"{'':>9}{'':>10}{'':>9}{'':>9}  no golden"
+        elif metrics["identical"]:
+            row = f"{0:>9}{0:>10.3%}{'inf':>9}{1:>9.5f}  identical"
+        elif "golden_size" in metrics:
+            row = f"{'':>9}{'':>10}{'':>9}{'':>9}  FAIL size {metrics['size']} != {metrics['golden_size']}"
+        else:
+            row = (
+                f"{metrics['max_difference']:>9}{metrics['changed_fraction']:>10.3%}"
+                f"{metrics['psnr_db']:>9.2f}{metrics['ssim']:>9.5f}  {'ok' if metrics['passed'] else 'FAIL'}"
+            )
+        print(f"{name[:39]:<40}{row}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare poker_viz renders with stored golden images")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="Directory of the golden images")
+    parser.add_argument("--update", action="store_true", help="Render the matrix and store it as the goldens")
+    parser.add_argument("--solutions-dir", default="poker_solutions", help="Directory with solution JSON files")
+    parser.add_argument("--cases", nargs="+", help="Only cases whose name contains one of these")
+    parser.add_argument(
+        "--pixel-tolerance", type=int, default=2, help="Channel difference not counted as a change (default: 2)"
+    )
+    parser.add_argument(
+        "--max-changed", type=float, default=0.0005, help="Allowed fraction of changed pixels (default: 0.0005)"
+    )
+    parser.add_argument("--min-psnr", type=float, default=45.0, help="Minimum PSNR in dB (default: 45)")
+    parser.add_argument("--min-ssim", type=float, default=0.999, help="Minimum SSIM (default: 0.999)")
+    parser.add_argument("--diff-dir", default="golden_diffs", help="Where images of failing cases go")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Rendering processes")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.update and args.cases:
+        logger.error("--update rewrites the whole matrix; drop --cases")
+        return 1
+
+    manifest_path = Path(args.golden_dir) / MANIFEST_FILENAME
+    if args.update:
+        solutions = representative_solutions(args.solutions_dir, 1)
+        if not solutions:
+            logger.error(f"No solutions found in {args.solutions_dir}")
+            return 1
+        cases = build_matrix(solutions[0])
+    elif not manifest_path.exists():
+        logger.error(f"No golden images in {args.golden_dir}; create them with --update")
+        return 1
+    else:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        cases = manifest["cases"]
+        if manifest.get("pillow") != PIL.__version__:
+            logger.warning(
+                f"Goldens were rendered with Pillow {manifest.get('pillow')}, this is {PIL.__version__}; "
+                "text may differ"
+            )
+    if args.cases:
+        cases = {name: case for name, case in cases.items() if any(part in name for part in args.cases)}
+
+    start = time.perf_counter()
+    images = render_cases(cases, args.jobs)
+    logger.info(f"Rendered {len(images)} images in {time.perf_counter() - start:.1f} seconds")
+
+    if args.update:
+        update_goldens(args.golden_dir, cases, images)
+        return 0
+
+    results = check_goldens(args.golden_dir, cases, images, args)
+    print()
+    print_results(results)
+    failed = [name for name, metrics in results.items() if not metrics["passed"]]
+    if failed:
+        print(f"\n{len(failed)} of {len(results)} cases differ from the goldens; see {args.diff_dir}/")
+    else:
+        print(f"\nAll {len(results)} cases match the goldens.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"pillow": PIL.__version__, "renderer_version": RENDERER_VERSION, "cases": results}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
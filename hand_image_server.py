@@ -3,10 +3,18 @@ import os
 import tempfile
 import random
 import logging
+from functools import wraps
 from pathlib import Path
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory
 from poker_table_visualizer import PokerTableVisualizer, load_json_data
 from clear_spot_solution_json import clear_spot_solution_json
+from hand_pack import PACK_FILENAME, open_pack
+from poker_viz.assets import asset_sources
+from poker_viz.config import DEFAULT_ANTIALIAS, DEFAULT_TIER, RESOLUTION_TIERS
+from poker_viz.svg_renderer import SVG_CONTENT_TYPE, SvgTableRenderer
+from render_metrics import CONTENT_TYPE, MetricsRegistry
+from solution_scanner import scan_files
+from visualizer_cache import VisualizerCache
 
 # Set up logging
 logging.basicConfig(
@@ -16,9 +24,100 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
-# Global cache for visualizer instances
-# Keys will be (num_players, hero_position)
-visualizer_cache = {}
+# Directory holding hand packs written by separate_solutions_by_hand.py --packed
+HAND_PACKS_DIR = Path(os.environ.get("HAND_PACKS_DIR", "separated_solutions_by_hand"))
+
+# Prometheus metrics exported on /metrics; set HAND_IMAGE_METRICS=0 to turn them off.
+# With HAND_IMAGE_METRICS_DIR set, gunicorn workers share their metrics through
+# that directory, so any worker's /metrics reports the totals of all of them.
+metrics = MetricsRegistry(
+    enabled=os.environ.get("HAND_IMAGE_METRICS", "1") != "0",
+    multiprocess_dir=os.environ.get("HAND_IMAGE_METRICS_DIR") or None,
+)
+REQUEST_SECONDS = metrics.histogram(
+    "hand_image_request_seconds", "Wall time of image requests", ["endpoint"]
+)
+REQUESTS_TOTAL = metrics.counter(
+    "hand_image_requests_total", "Image requests by response status", ["endpoint", "status"]
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "hand_image_requests_in_flight", "Image requests being handled", ["endpoint"]
+)
+STAGE_SECONDS = metrics.histogram(
+    "hand_image_stage_seconds",
+    "Wall time of each step of an image request (lookup, parse, template, draw stages, encode)",
+    ["stage"],
+)
+VISUALIZER_CACHE = metrics.counter(
+    "hand_image_visualizer_cache_total", "Visualizer cache lookups", ["result"]
+)
+# Each worker has its own cache, so workers are reported separately (by pid)
+VISUALIZER_CACHE_BYTES = metrics.gauge(
+    "hand_image_visualizer_cache_bytes",
+    "Bytes of images kept by cached visualizers",
+    multiprocess_mode="liveall",
+)
+SVG_SCENE_CACHE = metrics.counter(
+    "hand_image_svg_scene_cache_total", "SVG scene cache lookups", ["result"]
+)
+# Passed to every visualizer; None when metrics are off, so rendering is not timed
+STAGE_TIMER = metrics.stage_timer(STAGE_SECONDS)
+
+
+def instrumented(endpoint):
+    """Count, time and track in-flight requests of a route."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with REQUESTS_IN_FLIGHT.track_inprogress(endpoint=endpoint), REQUEST_SECONDS.time(
+                endpoint=endpoint
+            ):
+                # Publish the in-flight request to the other workers
+                metrics.flush()
+                response = view(*args, **kwargs)
+            status = response[1] if isinstance(response, tuple) else getattr(response, "status_code", 200)
+            REQUESTS_TOTAL.inc(endpoint=endpoint, status=status)
+            metrics.flush()
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# Global cache for visualizer instances, least recently used evicted over the
+# memory budget (VISUALIZER_CACHE_MB per worker process)
+# Keys will be (num_players, hero_position, tier)
+VISUALIZER_CACHE_MB = float(os.environ.get("VISUALIZER_CACHE_MB", "256"))
+visualizer_cache = VisualizerCache(
+    int(VISUALIZER_CACHE_MB * 1024 * 1024),
+    on_evict=lambda key: VISUALIZER_CACHE.inc(result="evicted"),
+)
+
+
+# Anti-aliasing mode of the PNG renderer ("supersample" or "native")
+ANTIALIAS = os.environ.get("HAND_IMAGE_ANTIALIAS", DEFAULT_ANTIALIAS)
+
+
+# SVG scenes (everything but the hero cards) per scenario, least recently used
+# evicted over SVG_CACHE_MB per worker process
+SVG_CACHE_MB = float(os.environ.get("SVG_CACHE_MB", "32"))
+svg_scene_cache = VisualizerCache(
+    int(SVG_CACHE_MB * 1024 * 1024),
+    on_evict=lambda key: SVG_SCENE_CACHE.inc(result="evicted"),
+)
+
+# Images SVG hand images link to, served on /assets
+ASSETS_DIR = Path(__file__).resolve().parent
+SVG_ASSETS = set(asset_sources(str(ASSETS_DIR)))
+
+
+def cache_visualizer(cache_key, visualizer):
+    """Keep a visualizer with a rendered template, without its working canvas."""
+    visualizer.release_canvas()
+    visualizer_cache[cache_key] = visualizer
+    VISUALIZER_CACHE_BYTES.set(visualizer_cache.stats()["bytes"])
 
 
 def init_visualizer_cache():
@@ -44,66 +143,61 @@ def init_visualizer_cache():
     found_positions = {8: set(), 9: set()}
     sample_json = {8: None, 9: None}
 
-    # Walk through all JSON files once
-    for root, _, files in os.walk(solutions_dir):
-        for file in files:
-            if not file.endswith(".json"):
-                continue
-            json_path = os.path.join(root, file)
-            try:
-                json_text = clear_spot_solution_json(json_path)
-                json_data = json.loads(json_text)
-            except Exception:
-                continue
+    # Walk through the JSON files once, stopping as soon as every position is covered
+    for path in scan_files(solutions_dir):
+        json_path = str(path)
+        try:
+            json_text = clear_spot_solution_json(json_path)
+            json_data = json.loads(json_text)
+        except Exception:
+            continue
 
-            num_players = len(json_data.get("game", {}).get("players", []))
-            if num_players not in required_positions:
-                continue
+        num_players = len(json_data.get("game", {}).get("players", []))
+        if num_players not in required_positions:
+            continue
 
-            # Remember a sample for this player count in case some positions are missing
-            if sample_json[num_players] is None:
-                sample_json[num_players] = (json_data, json_path)
+        # Remember a sample for this player count in case some positions are missing
+        if sample_json[num_players] is None:
+            sample_json[num_players] = (json_data, json_path)
+
+        hero_position = next(
+            (
+                p.get("position")
+                for p in json_data["game"]["players"]
+                if p.get("is_hero")
+            ),
+            None,
+        )
 
-            hero_position = next(
-                (
-                    p.get("position")
-                    for p in json_data["game"]["players"]
-                    if p.get("is_hero")
-                ),
-                None,
-            )
+        if hero_position not in required_positions[num_players]:
+            continue
 
-            if hero_position not in required_positions[num_players]:
-                continue
+        cache_key = (num_players, hero_position, DEFAULT_TIER)
+        if cache_key in visualizer_cache:
+            continue
 
-            cache_key = (num_players, hero_position)
-            if cache_key in visualizer_cache:
-                continue
+        temp_output = tempfile.NamedTemporaryFile(suffix=".png", delete=False).name
 
-            temp_output = tempfile.NamedTemporaryFile(suffix=".png", delete=False).name
+        visualizer = PokerTableVisualizer(
+            json_data,
+            "Ah",  # Placeholder cards
+            "Kh",
+            temp_output,
+            solution_path=json_path,
+            scale_factor=1,
+            antialias=ANTIALIAS,
+        )
+        visualizer.create_template()
 
-            visualizer = PokerTableVisualizer(
-                json_data,
-                "Ah",  # Placeholder cards
-                "Kh",
-                temp_output,
-                solution_path=json_path,
-                scale_factor=1,
-            )
-            visualizer.create_template()
+        cache_visualizer(cache_key, visualizer)
+        found_positions[num_players].add(hero_position)
 
-            visualizer_cache[cache_key] = visualizer
-            found_positions[num_players].add(hero_position)
-
-            # Stop early if we covered everything
-            if all(
-                len(found_positions[n]) == len(required_positions[n])
-                for n in required_positions
-            ):
-                break
-        else:
-            continue
-        break
+        # Stop early if we covered everything
+        if all(
+            len(found_positions[n]) == len(required_positions[n])
+            for n in required_positions
+        ):
+            break
 
     # Create missing hero positions by modifying a sample JSON
     for num_players, positions in required_positions.items():
@@ -142,17 +236,23 @@ def init_visualizer_cache():
                 temp_output,
                 solution_path=base_path,
                 scale_factor=1,
+                antialias=ANTIALIAS,
             )
             visualizer.create_template()
-            cache_key = (num_players, hero_position)
-            visualizer_cache[cache_key] = visualizer
+            cache_key = (num_players, hero_position, DEFAULT_TIER)
+            cache_visualizer(cache_key, visualizer)
             found_positions[num_players].add(hero_position)
 
+    stats = visualizer_cache.stats()
     logger.info(
-        f"Visualizer cache initialized with {len(visualizer_cache)} configurations"
+        f"Visualizer cache initialized with {stats['entries']} configurations "
+        f"({stats['bytes'] / 2**20:.1f} MB of {stats['budget_bytes'] / 2**20:.0f} MB)"
     )
 
 init_visualizer_cache()
+# Under gunicorn --preload this runs in the master: record the preloaded cache
+# before the workers fork, as they start from empty series
+metrics.flush()
 
 def convert_hand_to_cards(hand):
     """Convert hand notation (e.g., AKs, 22) to individual cards"""
@@ -200,8 +300,146 @@ def convert_hand_to_cards(hand):
         return f"{rank1}{suit1}", f"{rank2}{suit2}"
 
 
-def create_visualization_from_json(hand_json):
-    """Create a visualization from JSON data and return the image path"""
+def find_solution_file(metadata):
+    """
+    Find a solution file of the scenario a hand belongs to
+
+    Parameters:
+    metadata (dict): Hand metadata with game_type, position, stack_depth,
+    street and action_sequence
+
+    Returns:
+    str: Path of a solution file in poker_solutions, or None
+    """
+    game_type = metadata.get("game_type")
+    position = metadata.get("position")
+    action_sequence = metadata.get("action_sequence", "no_actions")
+    stack_depth = metadata.get("stack_depth", "unknown")
+    street = metadata.get("street", "preflop")
+    if not (game_type and position):
+        return None
+
+    # Normalize stack_depth to match folder structure format
+    depth_folder = f"depth_{stack_depth}"
+
+    # Try to find the correct solution file
+    with STAGE_SECONDS.time(stage="lookup"):
+        try:
+            # Log the path we're looking for
+            potential_path = (
+                Path("poker_solutions")
+                / game_type
+                / depth_folder
+                / street
+                / action_sequence
+                / position.upper()
+            )
+
+            # Check if the directory exists
+            if potential_path.exists() and potential_path.is_dir():
+                # Find any JSON file in this directory
+                json_files = list(potential_path.glob("*.json"))
+                if json_files:
+                    logger.info(f"Found solution file: {json_files[0]}")
+                    return str(json_files[0])
+        except Exception as e:
+            logger.warning(f"Error finding solution file: {e}")
+    return None
+
+
+def create_svg_from_json(hand_json, embed_assets=False, tier=DEFAULT_TIER):
+    """
+    Render a hand as SVG from the cached scene of its scenario
+
+    Linked images use the relative /assets URL, which resolves against this
+    server wherever the SVG is shown. It is never built from the request's
+    Host header, so clients cannot put their own text into the SVG or add
+    scenes to the cache.
+
+    Parameters:
+    hand_json (dict): Hand JSON with metadata
+    embed_assets (bool): Embed the images as data URIs instead of linking them
+    tier (str): Output tier, which sets the displayed size of the SVG
+
+    Returns:
+    bytes: The SVG document, or None if the scenario has no solution file
+    """
+    card1, card2 = convert_hand_to_cards(hand_json["metadata"]["hand"])
+    original_file = find_solution_file(hand_json["metadata"])
+    if not original_file:
+        return None
+
+    cache_key = (original_file, embed_assets, tier)
+    with STAGE_SECONDS.time(stage="svg_scene"):
+        renderer = svg_scene_cache.get(cache_key)
+        if renderer is not None:
+            SVG_SCENE_CACHE.inc(result="hit")
+        else:
+            SVG_SCENE_CACHE.inc(result="miss")
+            with STAGE_SECONDS.time(stage="parse"):
+                original_json = json.loads(clear_spot_solution_json(original_file))
+            renderer = SvgTableRenderer(
+                original_json,
+                solution_path=original_file,
+                embed_assets=embed_assets,
+                tier=tier,
+            )
+            renderer.build_scene()
+            svg_scene_cache[cache_key] = renderer
+
+    with STAGE_SECONDS.time(stage="svg"):
+        return renderer.render_bytes(card1, card2)
+
+
+def prefers_svg():
+    """True when the request's Accept header rates SVG above PNG.
+
+    Browsers accept image/* for <img> requests and keep getting PNG; clients
+    opt in with an explicit "Accept: image/svg+xml".
+    """
+    accept = request.accept_mimetypes
+    return accept.quality(SVG_CONTENT_TYPE) > accept.quality("image/png")
+
+
+def image_response(hand_json):
+    """Render a hand as PNG, or as SVG when the client asks for it, at the
+    output tier of the ?tier= query parameter (full by default)"""
+    tier = request.args.get("tier", DEFAULT_TIER)
+    if tier not in RESOLUTION_TIERS:
+        return (
+            jsonify({"error": f"Unknown tier: {tier}. Use one of: {', '.join(RESOLUTION_TIERS)}"}),
+            400,
+        )
+
+    metadata = hand_json["metadata"]
+    filename = f"{metadata['hand']}_{metadata['best_action']}_{metadata['best_ev']:.6f}"
+    if tier != DEFAULT_TIER:
+        filename += f"_{tier}"
+
+    if prefers_svg():
+        svg = create_svg_from_json(
+            hand_json,
+            embed_assets=request.args.get("embed") == "1",
+            tier=tier,
+        )
+        if svg is None:
+            return jsonify({"error": "No solution file found for this scenario"}), 404
+        response = Response(svg, content_type=f"{SVG_CONTENT_TYPE}; charset=utf-8")
+        response.headers["Content-Disposition"] = f'inline; filename="{filename}.svg"'
+    else:
+        image_path = create_visualization_from_json(hand_json, tier)
+        response = send_file(
+            image_path,
+            mimetype="image/png",
+            as_attachment=False,
+            download_name=f"{filename}.png",
+        )
+    response.vary.add("Accept")
+    return response
+
+
+def create_visualization_from_json(hand_json, tier=DEFAULT_TIER):
+    """Create a visualization from JSON data at an output tier and return the image path"""
     try:
         # Extract necessary information
         hand = hand_json["metadata"]["hand"]
@@ -228,41 +466,15 @@ def create_visualization_from_json(hand_json):
         temp_file.close()
 
         # Find the original solution file in the poker_solutions directory
-        solutions_dir = Path("poker_solutions")
-        original_file = None
+        original_file = find_solution_file(hand_json["metadata"])
         original_json = None
 
-        if game_type and position:
-            # Normalize stack_depth to match folder structure format
-            depth_folder = f"depth_{stack_depth}"
-
-            # Try to find the correct solution file
-            try:
-                # Log the path we're looking for
-                potential_path = (
-                    solutions_dir
-                    / game_type
-                    / depth_folder
-                    / street
-                    / action_sequence
-                    / position
-                )
-
-                # Check if the directory exists
-                if potential_path.exists() and potential_path.is_dir():
-                    # Find any JSON file in this directory
-                    json_files = list(potential_path.glob("*.json"))
-                    if json_files:
-                        original_file = str(json_files[0])
-                        logger.info(f"Found solution file: {original_file}")
-            except Exception as e:
-                logger.warning(f"Error finding solution file: {e}")
-
         try:
             if original_file:
                 # Load the original solution to get the game structure
-                json_text = clear_spot_solution_json(original_file)
-                original_json = json.loads(json_text)
+                with STAGE_SECONDS.time(stage="parse"):
+                    json_text = clear_spot_solution_json(original_file)
+                    original_json = json.loads(json_text)
 
                 # Get the number of players and hero position
                 num_players = len(original_json["game"]["players"])
@@ -271,39 +483,50 @@ def create_visualization_from_json(hand_json):
                     None,
                 )
 
-                # Try to get a cached visualizer for this configuration
-                cache_key = (num_players, hero_position)
-
-                if cache_key in visualizer_cache:
-                    # Use the cached visualizer
-                    logger.info(
-                        f"Using cached visualizer for {num_players} players and hero {hero_position}"
-                    )
-                    visualizer = visualizer_cache[cache_key]
-
-                    # Update with the new data and output path
-                    visualizer.card1 = card1
-                    visualizer.card2 = card2
-                    visualizer.output_path = output_path
-                    visualizer.game_data.update_data(original_json, original_file)
-                else:
-                    # Create a new visualizer and add it to the cache
-                    logger.info(
-                        f"Creating new visualizer for {num_players} players and hero {hero_position}"
-                    )
-                    visualizer = PokerTableVisualizer(
-                        original_json,
-                        card1,
-                        card2,
-                        output_path,
-                        solution_path=original_file,
-                        scale_factor=1,
-                    )
-                    visualizer.create_template()
-                    visualizer_cache[cache_key] = visualizer
+                # Try to get a cached visualizer for this configuration; every
+                # tier has its own template, drawn at the tier's size
+                cache_key = (num_players, hero_position, tier)
+
+                with STAGE_SECONDS.time(stage="template"):
+                    visualizer = visualizer_cache.get(cache_key)
+                    if visualizer is not None:
+                        # Use the cached visualizer
+                        VISUALIZER_CACHE.inc(result="hit")
+                        logger.info(
+                            f"Using cached {tier} visualizer for {num_players} players and hero {hero_position}"
+                        )
+
+                        # Update with the new data and output path
+                        visualizer.card1 = card1
+                        visualizer.card2 = card2
+                        visualizer.output_path = output_path
+                        visualizer.game_data.update_data(original_json, original_file)
+                    else:
+                        # Create a new visualizer and add it to the cache
+                        VISUALIZER_CACHE.inc(result="miss")
+                        logger.info(
+                            f"Creating new {tier} visualizer for {num_players} players and hero {hero_position}"
+                        )
+                        visualizer = PokerTableVisualizer(
+                            original_json,
+                            card1,
+                            card2,
+                            output_path,
+                            solution_path=original_file,
+                            scale_factor=1,
+                            antialias=ANTIALIAS,
+                            tier=tier,
+                        )
+                        visualizer.create_template()
+                        cache_visualizer(cache_key, visualizer)
+
+                # Draw stages and encoding are timed by the visualizer itself
+                visualizer.stage_timer = STAGE_TIMER
 
                 # Generate the visualization
                 visualizer.create_visualization()
+                # The image is on disk; only the template stays in memory
+                visualizer.release_canvas()
                 logger.info(
                     f"Created visualization using solution from {original_file}"
                 )
@@ -329,6 +552,7 @@ def create_visualization_from_json(hand_json):
 
 
 @app.route("/generate_image", methods=["POST"])
+@instrumented("generate_image")
 def generate_image():
     """API endpoint to generate hand image from JSON"""
     try:
@@ -378,28 +602,56 @@ def generate_image():
                     400,
                 )
 
-        # Generate the visualization
-        image_path = create_visualization_from_json(hand_json)
+        # Generate the visualization (PNG, or SVG if the client asks for it)
+        return image_response(hand_json)
 
-        # Return the image file
-        def cleanup_file():
-            try:
-                os.unlink(image_path)
-            except:
-                pass
+    except Exception as e:
+        logger.error(f"Error in generate_image endpoint: {e}", exc_info=True)
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
-        return send_file(
-            image_path,
-            mimetype="image/png",
-            as_attachment=False,
-            download_name=f"{metadata['hand']}_{metadata['best_action']}_{metadata['best_ev']:.6f}.png",
-        )
+
+@app.route("/hand_image/<path:scenario>/<hand>", methods=["GET"])
+@instrumented("hand_image")
+def packed_hand_image(scenario, hand):
+    """API endpoint to generate the image of a hand stored in a hand pack"""
+    try:
+        pack_path = (HAND_PACKS_DIR / scenario / PACK_FILENAME).resolve()
+        if HAND_PACKS_DIR.resolve() not in pack_path.parents:
+            return jsonify({"error": "Invalid scenario path"}), 400
+        if not pack_path.exists():
+            return jsonify({"error": f"No hand pack found for scenario: {scenario}"}), 404
+
+        # Read only this hand's record from the pack
+        with STAGE_SECONDS.time(stage="pack_read"):
+            reader = open_pack(pack_path)
+            hand_json = reader.hand_json(hand) if hand in reader else None
+        if hand_json is None:
+            return jsonify({"error": f"Hand {hand} not found in scenario: {scenario}"}), 404
+
+        # Generate the visualization (PNG, or SVG if the client asks for it)
+        return image_response(hand_json)
 
     except Exception as e:
-        logger.error(f"Error in generate_image endpoint: {e}", exc_info=True)
+        logger.error(f"Error in packed_hand_image endpoint: {e}", exc_info=True)
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 
+@app.route("/assets/<path:name>", methods=["GET"])
+def asset_file(name):
+    """Card, avatar and logo images linked from SVG hand images"""
+    if name not in SVG_ASSETS:
+        return jsonify({"error": f"Unknown asset: {name}"}), 404
+    return send_from_directory(ASSETS_DIR, name, max_age=24 * 3600)
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Prometheus metrics in the text exposition format"""
+    if not metrics.enabled:
+        return jsonify({"error": "Metrics are disabled (HAND_IMAGE_METRICS=0)"}), 404
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
@@ -417,6 +669,13 @@ def home():
                 "method": "POST",
                 "content_type": "application/json",
                 "description": "Send hand JSON data to generate visualization image",
+                "formats": "PNG by default; SVG with 'Accept: image/svg+xml' (add ?embed=1 for a self-contained SVG)",
+                "tiers": "Add ?tier=thumbnail (358x212) or ?tier=preview (716x424); full (1432x849) by default",
+            },
+            "packed_usage": {
+                "endpoint": "/hand_image/<game_type>/<depth>/<street>/<action_sequence>/<position>/<hand>",
+                "method": "GET",
+                "description": "Generate the image of a hand stored in a hand pack",
             },
             "example_request": {
                 "metadata": {
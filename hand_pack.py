@@ -0,0 +1,207 @@
+"""
+Packed per-scenario hand files.
+
+A pack stores every separated hand of one solution in a single file instead of
+one JSON file per hand. The data shared by all hands (scenario metadata,
+``spot_solution``, ``game_info`` and ``node_info``) is written once, followed by
+one compact JSON record per hand and a byte-offset index, so a single hand can
+be read with one seek without parsing the rest of the file.
+
+Layout (all JSON lines are UTF-8 and newline terminated)::
+
+    <header JSON line>          shared scenario data
+    <hand record JSON line>     one per hand
+    ...
+    <index JSON line>           {"header": [offset, length], "hands": {hand: [offset, length]}}
+    HANDPACK1 <index offset>    fixed-width footer (see FOOTER_SIZE)
+
+Hands are addressed with references of the form ``path/to/hands.pack#AKs``;
+``load_hand_json`` accepts either such a reference or a plain hand JSON path and
+returns the same structure ``separate_solutions_by_hand.py`` writes per hand.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+PACK_FILENAME = "hands.pack"
+PACK_SUFFIX = ".pack"
+HAND_REF_SEPARATOR = "#"
+
+FOOTER_MAGIC = b"HANDPACK1 "
+FOOTER_DIGITS = 16
+FOOTER_SIZE = len(FOOTER_MAGIC) + FOOTER_DIGITS + 1
+
+
+def _encode(obj):
+    """Encode one JSON line."""
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class HandPackWriter:
+    """Stream hand records of one scenario into a pack file."""
+
+    def __init__(self, path, header):
+        """
+        Start a new pack
+
+        Parameters:
+        path (str): Destination pack file
+        header (dict): Data shared by every hand (metadata, spot_solution, ...)
+        """
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.index = {"header": None, "hands": {}}
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._file = open(self.tmp_path, "wb")
+        self.index["header"] = self._write(header)
+
+    def _write(self, obj):
+        data = _encode(obj)
+        offset = self._file.tell()
+        self._file.write(data)
+        return [offset, len(data)]
+
+    def add(self, hand, record):
+        """Append the record of one hand"""
+        self.index["hands"][hand] = self._write(record)
+
+    def close(self):
+        """Write the index and footer and move the pack into place"""
+        if self._file is None:
+            return
+        index_offset = self._file.tell()
+        self._file.write(_encode(self.index))
+        self._file.write(
+            FOOTER_MAGIC + str(index_offset).zfill(FOOTER_DIGITS).encode() + b"\n"
+        )
+        self._file.close()
+        self._file = None
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Discard a partially written pack"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class HandPackReader:
+    """Random access to the hands stored in a pack file."""
+
+    def __init__(self, path):
+        """
+        Open a pack and read its index
+
+        Parameters:
+        path (str): Pack file to read
+        """
+        self.path = Path(path)
+        self._header = None
+        with open(self.path, "rb") as f:
+            f.seek(-FOOTER_SIZE, os.SEEK_END)
+            footer = f.read(FOOTER_SIZE)
+            if not footer.startswith(FOOTER_MAGIC):
+                raise ValueError(f"Not a hand pack: {self.path}")
+            index_offset = int(footer[len(FOOTER_MAGIC) : -1])
+            f.seek(index_offset)
+            self.index = json.loads(f.readline())
+
+    def _read(self, location):
+        offset, length = location
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    @property
+    def hands(self):
+        """List the hands stored in the pack"""
+        return list(self.index["hands"])
+
+    @property
+    def header(self):
+        """Shared scenario data, read on first use"""
+        if self._header is None:
+            self._header = self._read(self.index["header"])
+        return self._header
+
+    def __contains__(self, hand):
+        return hand in self.index["hands"]
+
+    def read_record(self, hand):
+        """Read only the record of one hand"""
+        location = self.index["hands"].get(hand)
+        if location is None:
+            raise KeyError(f"Hand {hand} not found in {self.path}")
+        return self._read(location)
+
+    def hand_json(self, hand):
+        """Rebuild the per-hand JSON structure written by the unpacked format"""
+        record = self.read_record(hand)
+        header = self.header
+        hand_json = {
+            "metadata": dict(header.get("metadata", {})),
+            "spot_solution": header.get("spot_solution", {}),
+            "hand_data": record["hand_data"],
+        }
+        hand_json["metadata"].update(
+            {
+                "hand": hand,
+                "best_action": record["best_action"],
+                "best_ev": record["best_ev"],
+            }
+        )
+        for key in ("game_info", "node_info"):
+            if key in header:
+                hand_json[key] = header[key]
+        return hand_json
+
+
+@lru_cache(maxsize=64)
+def _cached_reader(path, mtime_ns, size):
+    return HandPackReader(path)
+
+
+def open_pack(path):
+    """Return a (cached) reader for a pack, reopened when the file changes"""
+    stat = os.stat(path)
+    return _cached_reader(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def hand_ref(pack_path, hand):
+    """Build the reference that addresses one hand inside a pack"""
+    return f"{pack_path}{HAND_REF_SEPARATOR}{hand}"
+
+
+def split_hand_ref(ref):
+    """Split a hand reference into (file path, hand); hand is None for plain JSON files"""
+    ref = str(ref)
+    path, sep, hand = ref.rpartition(HAND_REF_SEPARATOR)
+    if sep and path.endswith(PACK_SUFFIX):
+        return Path(path), hand
+    return Path(ref), None
+
+
+def load_hand_json(ref):
+    """Load a hand from a plain hand JSON file or from a pack reference"""
+    path, hand = split_hand_ref(ref)
+    if hand is None:
+        with open(path, "r") as f:
+            return json.load(f)
+    return open_pack(path).hand_json(hand)
@@ -0,0 +1,732 @@
+"""
+Load test for hand_image_server.py.
+
+Starts the server locally under gunicorn, the way the Docker image runs it,
+waits until it is healthy and sends it a request mix built from the scenarios
+in poker_solutions/: every request asks for one scenario directory, picked
+uniformly, and one starting hand, picked in proportion to its card
+combinations (pairs 6, suited hands 4, offsuit hands 12). Output tiers and
+SVG requests can be mixed in.
+
+Two load models are supported:
+
+- closed loop (--concurrency N): N clients each send a request as soon as
+  their previous one is answered
+- open loop (--rate R): requests arrive at R per second (Poisson arrivals) no
+  matter how fast the server answers; latency is measured from the scheduled
+  arrival, so a server that falls behind shows its queueing delay
+
+Every run reports throughput, p50/p95/p99 latency, the error rate and the
+resident memory (RSS, and PSS where the kernel reports it) of every gunicorn
+worker, sampled during the run. Pass several --workers and --worker-classes to
+sweep configurations; each one gets a fresh server. Results are written as JSON
+with --output, and --baseline compares a run with an earlier results file.
+
+The server builds its templates at startup (a couple of minutes), so allow
+--startup-timeout accordingly. Only local servers are load tested; --url
+targets one that is already running on this machine.
+
+Example:
+    python load_test.py --concurrency 4 --duration 60
+    python load_test.py --workers 1 2 4 --worker-classes sync gthread --threads 4 --output load.json
+    python load_test.py --rate 5 --duration 120 --tiers full=3 thumbnail=1 --svg-fraction 0.2
+    python load_test.py --concurrency 8 --baseline load.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+from poker_viz.config import DEFAULT_TIER, RESOLUTION_TIERS
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+REPO_DIR = Path(__file__).resolve().parent
+
+RANKS = "AKQJT98765432"
+
+# Requests drawn up front; longer runs cycle through them
+MIX_SIZE = 2000
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+def hand_combos():
+    """
+    List the 169 starting hands
+
+    Returns:
+    list: (hand, number of card combinations) pairs, e.g. ("AKs", 4)
+    """
+    hands = []
+    for i, high in enumerate(RANKS):
+        for j, low in enumerate(RANKS):
+            if i == j:
+                hands.append((high + low, 6))
+            elif i < j:
+                hands.append((high + low + "s", 4))
+                hands.append((high + low + "o", 12))
+    return hands
+
+
+def scenario_metadata(solutions_dir):
+    """
+    Build the request metadata of every scenario in a solutions tree
+
+    Parameters:
+    solutions_dir (str): Root of game_type/depth_*/street/action_sequence/POSITION
+
+    Returns:
+    list: Metadata dicts without the hand fields, one per scenario directory
+    """
+    scenarios = []
+    for root, _, files in sorted(os.walk(solutions_dir)):
+        if not any(f.endswith(".json") for f in files):
+            continue
+        parts = Path(os.path.relpath(root, solutions_dir)).parts
+        if len(parts) != 5 or not parts[1].startswith("depth_"):
+            continue
+        game_type, depth, street, action_sequence, position = parts
+        scenarios.append(
+            {
+                "game_type": game_type,
+                "stack_depth": depth[len("depth_"):],
+                "street": street,
+                "action_sequence": action_sequence,
+                "position": position.lower(),
+            }
+        )
+    return scenarios
+
+
+def parse_weights(specs):
+    """
+    Parse name=weight pairs; a bare name has weight 1
+
+    Parameters:
+    specs (list): Strings like "full=3" or "thumbnail"
+
+    Returns:
+    dict: Weight per name
+    """
+    weights = {}
+    for spec in specs:
+        name, _, weight = spec.partition("=")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+def build_request_mix(scenarios, tier_weights, svg_fraction, count, rng):
+    """
+    Draw the requests of a run
+
+    Parameters:
+    scenarios (list): Scenario metadata from scenario_metadata
+    tier_weights (dict): Relative frequency of each output tier
+    svg_fraction (float): Share of requests asking for SVG
+    count (int): Number of requests
+    rng (random.Random): Source of the draws
+
+    Returns:
+    list: Requests as dicts with path, body, headers and label
+    """
+    hands, combos = zip(*hand_combos())
+    tiers, weights = zip(*tier_weights.items())
+    mix = []
+    for _ in range(count):
+        metadata = dict(rng.choice(scenarios))
+        metadata.update(hand=rng.choices(hands, combos)[0], best_action="F", best_ev=0.0)
+        tier = rng.choices(tiers, weights)[0]
+        image_format = "svg" if rng.random() < svg_fraction else "png"
+        headers = {"Content-Type": "application/json"}
+        if image_format == "svg":
+            headers["Accept"] = "image/svg+xml"
+        mix.append(
+            {
+                "path": "/generate_image" + ("" if tier == DEFAULT_TIER else f"?tier={tier}"),
+                "body": json.dumps({"metadata": metadata}).encode(),
+                "headers": headers,
+                "label": f"{image_format}/{tier}",
+            }
+        )
+    return mix
+
+
+def send_request(base_url, req, timeout):
+    """
+    Send one request
+
+    Parameters:
+    base_url (str): Server URL, e.g. http://127.0.0.1:8777
+    req (dict): Request from build_request_mix
+    timeout (float): Seconds to wait for the response
+
+    Returns:
+    tuple: (HTTP status or None, response bytes, error name or None)
+    """
+    http_request = urllib.request.Request(
+        base_url + req["path"], data=req["body"], headers=req["headers"], method="POST"
+    )
+    try:
+        with urllib.request.urlopen(http_request, timeout=timeout) as response:
+            return response.status, len(response.read()), None
+    except urllib.error.HTTPError as e:
+        return e.code, len(e.read()), None
+    except (urllib.error.URLError, OSError) as e:
+        reason = getattr(e, "reason", e)
+        return None, 0, type(reason).__name__
+
+
+class RequestSource:
+    """Hand out the requests of a mix to client threads, cycling through it."""
+
+    def __init__(self, mix, max_requests=None):
+        self.mix = mix
+        self.max_requests = max_requests
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    def next(self):
+        """Next request, or None once max_requests were handed out"""
+        with self.lock:
+            if self.max_requests is not None and self.sent >= self.max_requests:
+                return None
+            req = self.mix[self.sent % len(self.mix)]
+            self.sent += 1
+            return req
+
+
+def run_closed_loop(base_url, source, concurrency, duration, timeout):
+    """
+    Send requests from concurrency clients, each waiting for its previous answer
+
+    Parameters:
+    base_url (str): Server URL
+    source (RequestSource): Requests to send
+    concurrency (int): Number of clients
+    duration (float): Seconds to keep sending
+    timeout (float): Seconds to wait for each response
+
+    Returns:
+    tuple: (samples as (label, seconds, status, bytes, error) tuples, elapsed seconds)
+    """
+    samples = []
+    samples_lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            req = source.next()
+            if req is None:
+                return
+            sent = time.perf_counter()
+            status, size, error = send_request(base_url, req, timeout)
+            with samples_lock:
+                samples.append((req["label"], time.perf_counter() - sent, status, size, error))
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def run_open_loop(base_url, source, rate, duration, timeout, max_in_flight, rng):
+    """
+    Send requests at Poisson arrival times, independently of the responses
+
+    Parameters:
+    base_url (str): Server URL
+    source (RequestSource): Requests to send
+    rate (float): Mean arrivals per second
+    duration (float): Seconds to keep scheduling arrivals
+    timeout (float): Seconds to wait for each response
+    max_in_flight (int): Client threads; arrivals beyond them wait in a queue
+    rng (random.Random): Source of the inter-arrival times
+
+    Returns:
+    tuple: (samples as (label, seconds, status, bytes, error) tuples, elapsed seconds)
+    """
+    samples = []
+    samples_lock = threading.Lock()
+
+    def send(req, scheduled):
+        status, size, error = send_request(base_url, req, timeout)
+        # Measured from the scheduled arrival, so time spent queued counts
+        with samples_lock:
+            samples.append((req["label"], time.perf_counter() - scheduled, status, size, error))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        scheduled = start
+        while True:
+            scheduled += rng.expovariate(rate)
+            if scheduled - start > duration:
+                break
+            req = source.next()
+            if req is None:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, req, scheduled)
+    return samples, time.perf_counter() - start
+
+
+def worker_pids(master_pid):
+    """PIDs of the child processes of a gunicorn master"""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name is in parentheses and may contain spaces
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def process_memory_mb(pid):
+    """
+    Resident memory of a process
+
+    Parameters:
+    pid (int): Process ID
+
+    Returns:
+    dict: "rss" and, where the kernel provides smaps_rollup, "pss" in MB; None
+    if the process is gone
+    """
+    memory = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    memory["rss"] = int(line.split()[1]) / 1024
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    memory["pss"] = int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        return memory or None
+    except OSError:
+        pass
+    return memory
+
+
+class MemorySampler:
+    """Sample the memory of a gunicorn master and its workers in the background."""
+
+    def __init__(self, master_pid, interval):
+        self.master_pid = master_pid
+        self.interval = interval
+        self.peak = defaultdict(dict)
+        self.last = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        """Record the current memory of the master and every worker"""
+        for pid in [self.master_pid] + worker_pids(self.master_pid):
+            memory = process_memory_mb(pid)
+            if not memory:
+                continue
+            self.last[pid] = memory
+            for key, value in memory.items():
+                self.peak[pid][key] = max(self.peak[pid].get(key, 0.0), value)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and return the memory report"""
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        workers = worker_pids(self.master_pid)
+
+        def report(pid):
+            return {
+                "pid": pid,
+                "final": {k: round(v, 1) for k, v in self.last.get(pid, {}).items()},
+                "peak": {k: round(v, 1) for k, v in self.peak.get(pid, {}).items()},
+            }
+
+        return {"master": report(self.master_pid), "workers": [report(pid) for pid in workers]}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def latency_summary(seconds):
+    """Latency statistics in milliseconds"""
+    values = sorted(s * 1000 for s in seconds)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values), 1),
+        "p50_ms": round(percentile(values, 0.50), 1),
+        "p95_ms": round(percentile(values, 0.95), 1),
+        "p99_ms": round(percentile(values, 0.99), 1),
+        "max_ms": round(values[-1], 1),
+    }
+
+
+def summarize(samples, elapsed):
+    """
+    Summarize the samples of a run
+
+    Parameters:
+    samples (list): (label, seconds, status, bytes, error) tuples
+    elapsed (float): Wall-clock seconds of the run
+
+    Returns:
+    dict: Throughput, latency, error counts and a breakdown per request label
+    """
+    ok = [s for s in samples if s[2] == 200]
+    statuses = Counter(str(s[2]) for s in samples if s[2] is not None)
+    errors = Counter(s[4] for s in samples if s[4] is not None)
+    by_label = defaultdict(list)
+    for label, seconds, status, _, _ in samples:
+        if status == 200:
+            by_label[label].append(seconds)
+    return {
+        "requests": len(samples),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+        "error_rate": round(1 - len(ok) / len(samples), 4) if samples else 0.0,
+        "statuses": dict(statuses),
+        "errors": dict(errors),
+        "mean_response_bytes": round(statistics.fmean(s[3] for s in ok)) if ok else 0,
+        # Latency of successful requests only
+        "latency": latency_summary(s[1] for s in ok),
+        "by_label": {label: latency_summary(seconds) for label, seconds in sorted(by_label.items())},
+    }
+
+
+def free_port():
+    """A TCP port nothing listens on at the moment"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, workers, worker_class, threads, log_file, env):
+    """
+    Start hand_image_server under gunicorn on the loopback interface
+
+    Parameters:
+    port (int): Port to bind
+    workers (int): Number of gunicorn workers
+    worker_class (str): Gunicorn worker class (sync, gthread, gevent, ...)
+    threads (int): Threads per worker of the gthread class
+    log_file (file): Where the server output goes
+    env (dict): Environment of the server
+
+    Returns:
+    subprocess.Popen: The gunicorn master process
+    """
+    command = [
+        sys.executable, "-m", "gunicorn",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+        "--worker-class", worker_class,
+        "--timeout", "120",
+        "--preload",
+    ]
+    # Gunicorn switches sync workers to gthread when given threads, so only
+    # pass them to the class that uses them
+    if worker_class == "gthread":
+        command += ["--threads", str(threads)]
+    command.append("hand_image_server:app")
+    logger.info(f"Starting server: {' '.join(command[2:])}")
+    return subprocess.Popen(command, cwd=REPO_DIR, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+
+
+def wait_until_healthy(base_url, process, timeout):
+    """
+    Poll /health until the server answers
+
+    Parameters:
+    base_url (str): Server URL
+    process (subprocess.Popen): Server process, or None for an external server
+    timeout (float): Seconds to wait
+
+    Returns:
+    float: Seconds the server took to become healthy
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode} during startup")
+        try:
+            with urllib.request.urlopen(base_url + "/health", timeout=5) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(1)
+    raise RuntimeError(f"Server not healthy after {timeout:.0f} seconds")
+
+
+def stop_server(process):
+    """Stop a gunicorn master and its workers"""
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_load(base_url, mix, args, rng):
+    """Warm up, then run the configured load model and summarize it"""
+    if args.warmup > 0:
+        logger.info(f"Warming up for {args.warmup:.0f} seconds")
+        run_closed_loop(base_url, RequestSource(mix), args.concurrency or 1, args.warmup, args.timeout)
+
+    source = RequestSource(mix, args.requests)
+    if args.rate:
+        logger.info(f"Sending {args.rate} requests per second for {args.duration:.0f} seconds")
+        samples, elapsed = run_open_loop(
+            base_url, source, args.rate, args.duration, args.timeout, args.max_in_flight, rng
+        )
+    else:
+        logger.info(f"Sending requests from {args.concurrency} clients for {args.duration:.0f} seconds")
+        samples, elapsed = run_closed_loop(base_url, source, args.concurrency, args.duration, args.timeout)
+    return summarize(samples, elapsed)
+
+
+def run_configuration(workers, worker_class, mix, args, rng, env, log_file):
+    """
+    Start a server with one gunicorn configuration, load test it and stop it
+
+    Returns:
+    dict: Configuration, startup time, summary and memory report
+    """
+    port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(port, workers, worker_class, args.threads, log_file, env)
+    try:
+        startup_s = wait_until_healthy(base_url, process, args.startup_timeout)
+        logger.info(f"Server healthy after {startup_s:.1f} seconds")
+        sampler = MemorySampler(process.pid, args.rss_interval)
+        sampler.start()
+        try:
+            summary = run_load(base_url, mix, args, rng)
+        finally:
+            memory = sampler.stop()
+    finally:
+        stop_server(process)
+    return {
+        "workers": workers,
+        "worker_class": worker_class,
+        "threads": args.threads if worker_class == "gthread" else 1,
+        "startup_s": round(startup_s, 1),
+        "summary": summary,
+        "memory_mb": memory,
+    }
+
+
+def run_key(run):
+    """Name of a run's server configuration"""
+    if run.get("external"):
+        return "external"
+    threads = f"x{run['threads']}" if run["threads"] > 1 else ""
+    return f"{run['workers']}w/{run['worker_class']}{threads}"
+
+
+def print_results(runs):
+    """Print throughput, latency, errors and worker memory of every run as a table"""
+    header = (
+        f"{'server':<18}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        f"{'worker RSS':>12}{'peak RSS':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for run in runs:
+        summary, latency = run["summary"], run["summary"]["latency"]
+        workers = (run.get("memory_mb") or {}).get("workers", [])
+        final = [w["final"]["rss"] for w in workers if "rss" in w["final"]]
+        peak = [w["peak"]["rss"] for w in workers if "rss" in w["peak"]]
+        print(
+            f"{run_key(run):<18}{summary['throughput_rps']:>8.2f}"
+            f"{latency.get('p50_ms', 0):>9.0f}{latency.get('p95_ms', 0):>9.0f}{latency.get('p99_ms', 0):>9.0f}"
+            f"{summary['error_rate']:>8.1%}"
+            f"{(statistics.fmean(final) if final else 0):>12.0f}{(max(peak) if peak else 0):>10.0f}"
+        )
+
+
+def compare_to_baseline(runs, baseline):
+    """Print throughput and p95 changes against the runs of an earlier results file"""
+    baseline_runs = {run_key(run): run for run in baseline.get("runs", [])}
+    print("\nAgainst the baseline:")
+    for run in runs:
+        before = baseline_runs.get(run_key(run))
+        if before is None:
+            print(f"{run_key(run):<18}no baseline run")
+            continue
+        rps, rps_before = run["summary"]["throughput_rps"], before["summary"]["throughput_rps"]
+        p95 = run["summary"]["latency"].get("p95_ms", 0)
+        p95_before = before["summary"]["latency"].get("p95_ms", 0)
+        rps_change = f" ({rps / rps_before - 1:+.0%})" if rps_before else ""
+        p95_change = f" ({p95 / p95_before - 1:+.0%})" if p95_before else ""
+        print(
+            f"{run_key(run):<18}{rps_before:.2f} -> {rps:.2f} req/s{rps_change}, "
+            f"p95 {p95_before:.0f} -> {p95:.0f} ms{p95_change}"
+        )
+
+
+def git_commit():
+    """Commit of the checkout under test, if it is a git repository"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the hand image server on this machine")
+    parser.add_argument("--solutions-dir", default="poker_solutions", help="Directory with solution JSON files")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, help="Closed loop: number of clients (default: 4)")
+    load.add_argument("--rate", type=float, help="Open loop: mean requests per second")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of load per configuration")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests per configuration")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds of load before measuring")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="Open loop: client threads")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for each response")
+    parser.add_argument(
+        "--tiers", nargs="+", default=[DEFAULT_TIER], help="Output tiers with weights, e.g. full=3 thumbnail=1"
+    )
+    parser.add_argument("--svg-fraction", type=float, default=0.0, help="Share of requests asking for SVG")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4], help="Gunicorn worker counts to sweep")
+    parser.add_argument(
+        "--worker-classes", nargs="+", default=["sync"], help="Gunicorn worker classes to sweep (default: sync)"
+    )
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gthread worker")
+    parser.add_argument("--port", type=int, help="Port of the started servers (default: a free port)")
+    parser.add_argument("--url", help="Load test a server already running on this machine instead")
+    parser.add_argument("--startup-timeout", type=float, default=900, help="Seconds to wait for /health")
+    parser.add_argument("--rss-interval", type=float, default=1.0, help="Seconds between memory samples")
+    parser.add_argument("--server-log", default="load_test_server.log", help="File for the server output")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the request mix")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Results file of an earlier run to compare with")
+    args = parser.parse_args()
+    if args.rate is None and args.concurrency is None:
+        args.concurrency = 4
+
+    if args.url and urlparse(args.url).hostname not in LOCAL_HOSTS:
+        logger.error(f"{args.url} is not a local server")
+        return 1
+
+    scenarios = scenario_metadata(REPO_DIR / args.solutions_dir)
+    if not scenarios:
+        logger.error(f"No scenarios found in {args.solutions_dir}")
+        return 1
+    tier_weights = parse_weights(args.tiers)
+    unknown = set(tier_weights) - set(RESOLUTION_TIERS)
+    if unknown:
+        logger.error(f"Unknown tiers: {', '.join(sorted(unknown))}. Use: {', '.join(RESOLUTION_TIERS)}")
+        return 1
+    rng = random.Random(args.seed)
+    mix = build_request_mix(scenarios, tier_weights, args.svg_fraction, MIX_SIZE, rng)
+    logger.info(f"Request mix drawn from {len(scenarios)} scenarios")
+
+    results = {
+        "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "model": "open" if args.rate else "closed",
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration_s": args.duration,
+            "requests": args.requests,
+            "warmup_s": args.warmup,
+            "tiers": tier_weights,
+            "svg_fraction": args.svg_fraction,
+            "scenarios": len(scenarios),
+            "seed": args.seed,
+            "antialias": os.environ.get("HAND_IMAGE_ANTIALIAS"),
+        },
+        "runs": [],
+    }
+
+    if args.url:
+        wait_until_healthy(args.url.rstrip("/"), None, args.startup_timeout)
+        summary = run_load(args.url.rstrip("/"), mix, args, rng)
+        results["runs"].append({"external": True, "url": args.url, "summary": summary, "memory_mb": None})
+    else:
+        env = dict(os.environ)
+        with open(args.server_log, "a") as log_file:
+            for workers in args.workers:
+                for worker_class in args.worker_classes:
+                    try:
+                        run = run_configuration(workers, worker_class, mix, args, rng, env, log_file)
+                    except RuntimeError as e:
+                        logger.error(f"{workers} {worker_class} workers: {e} (see {args.server_log})")
+                        continue
+                    results["runs"].append(run)
+                    logger.info(
+                        f"{run_key(run)}: {run['summary']['throughput_rps']} req/s, "
+                        f"p95 {run['summary']['latency'].get('p95_ms')} ms"
+                    )
+
+    print()
+    print_results(results["runs"])
+    print("\nLatency of successful requests; RSS in MB, mean of the workers at the end and peak of any worker.")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare_to_baseline(results["runs"], json.load(f))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    return 0 if results["runs"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
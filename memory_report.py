@@ -0,0 +1,136 @@
+"""
+Resident memory of one hand image server worker.
+
+Starts a fresh Python process per checkout that imports hand_image_server the
+way a gunicorn worker does (which fills the visualizer cache), then renders a
+number of images through the Flask test client. The process's resident set
+size is read from /proc after the imports, after the cache is filled and after
+the requests.
+
+Pass several checkouts to compare them, e.g. the current tree against a git
+worktree of an older commit:
+
+    git worktree add /tmp/before HEAD~1
+    python memory_report.py --repo-dir /tmp/before --repo-dir .
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+WORKER_SCRIPT = r"""
+import json, os, random, sys
+
+repo_dir, num_requests = sys.argv[1], int(sys.argv[2])
+os.chdir(repo_dir)
+sys.path.insert(0, repo_dir)
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+import flask, PIL.Image  # noqa: F401
+report = {"imports_mb": rss_mb()}
+
+import hand_image_server as server
+report["cache_filled_mb"] = rss_mb()
+cache = server.visualizer_cache
+report["cache_entries"] = len(cache)
+report["cache_stats"] = cache.stats() if hasattr(cache, "stats") else None
+
+# One payload per scenario directory of the solutions tree
+payloads = []
+for root, _, files in sorted(os.walk("poker_solutions")):
+    if not any(f.endswith(".json") for f in files):
+        continue
+    parts = os.path.relpath(root, "poker_solutions").split(os.sep)
+    if len(parts) != 5 or not parts[1].startswith("depth_"):
+        continue
+    game_type, depth, street, action_sequence, position = parts
+    payloads.append({"metadata": {
+        "hand": "AKs", "best_action": "F", "best_ev": 0.0, "game_type": game_type,
+        "position": position, "stack_depth": depth[len("depth_"):], "street": street,
+        "action_sequence": action_sequence,
+    }})
+random.Random(0).shuffle(payloads)
+
+client = server.app.test_client()
+statuses = {}
+for i in range(num_requests):
+    response = client.post("/generate_image", json=payloads[i % len(payloads)])
+    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+report["after_requests_mb"] = rss_mb()
+report["statuses"] = statuses
+print("REPORT " + json.dumps(report))
+"""
+
+
+def measure(repo_dir, num_requests, env):
+    """
+    Measure one checkout in a fresh process
+
+    Parameters:
+    repo_dir (str): Checkout to import hand_image_server from
+    num_requests (int): Images rendered after the cache is filled
+    env (dict): Environment of the worker process
+
+    Returns:
+    dict: Resident memory in MB at each step and cache details
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT, os.path.abspath(repo_dir), str(num_requests)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("REPORT "):
+            return json.loads(line[len("REPORT "):])
+    raise RuntimeError(f"Measuring {repo_dir} failed:\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report resident memory of a hand image server worker")
+    parser.add_argument(
+        "--repo-dir", action="append", help="Checkout to measure (repeatable, default: this directory)"
+    )
+    parser.add_argument("--requests", type=int, default=40, help="Images rendered after startup")
+    parser.add_argument("--cache-mb", type=float, help="VISUALIZER_CACHE_MB for the workers")
+    parser.add_argument("--output", help="Write the reports as JSON to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.cache_mb is not None:
+        env["VISUALIZER_CACHE_MB"] = str(args.cache_mb)
+
+    repo_dirs = args.repo_dir or [os.path.dirname(os.path.abspath(__file__))]
+    reports = {}
+    for repo_dir in repo_dirs:
+        print(f"Measuring {repo_dir}...", flush=True)
+        reports[repo_dir] = measure(repo_dir, args.requests, env)
+
+    print(f"\n{'checkout':<40}{'imports':>10}{'cache':>10}{'requests':>10}{'entries':>9}{'cache MB':>10}")
+    for repo_dir, report in reports.items():
+        stats = report["cache_stats"]
+        cache_mb = f"{stats['bytes'] / 2**20:.1f}" if stats else "-"
+        print(
+            f"{repo_dir[-39:]:<40}{report['imports_mb']:>10.1f}{report['cache_filled_mb']:>10.1f}"
+            f"{report['after_requests_mb']:>10.1f}{report['cache_entries']:>9}{cache_mb:>10}"
+        )
+    print("\nResident memory in MB per worker process; 'cache MB' is the image data the cache accounts for.")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
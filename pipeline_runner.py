@@ -0,0 +1,674 @@
+"""
+Streaming pipeline: HAR -> solutions -> analysis -> images -> upload.
+
+Each step runs in its own thread pool and the steps are connected by bounded
+queues, so a solution is analyzed while the previous one is still rendering and
+every image goes to upload as soon as it is rendered, as PNG bytes in memory.
+When all images of a scenario are uploaded the drill is finalized (scored,
+wizard rules set and promoted) by the same journaled steps as
+desk-upload/batch_visualizations_upload.py. Scoring requests of all drills
+share one adaptive rate limiter. With --target flowpoker, progress is kept in
+an upload journal, so a rerun reuses the drills of an interrupted run and only
+uploads and scores what is missing.
+
+Rendering runs in worker processes, each keeping warm visualizers of the
+solutions it has seen. Uploads go either to Flow Poker or to a local mock
+target (desk-upload/mock_upload_target.py) so a full run can be tested offline.
+
+Example:
+    python pipeline_runner.py --solutions-dir poker_solutions --game-type MTTGeneral_ICM8m200PTBUBBLEMID \\
+        --depth 20_125 --position CO --num-hands 10 --target mock
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from clear_spot_solution_json import clean_spot_solution_data
+from poker_table_visualizer import PokerTableVisualizer
+from solution_analysis import analyze_spot_solution, parse_solution_path, scenario_metadata
+from solution_scanner import scan_files
+
+DESK_UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "desk-upload")
+if DESK_UPLOAD_DIR not in sys.path:
+    sys.path.insert(0, DESK_UPLOAD_DIR)
+
+from drill_content import (  # noqa: E402 - lives in desk-upload
+    DEFAULT_ACTIONS,
+    actions_from_columns,
+    drill_name_and_description,
+    scores_from_row,
+    tags_from_metadata,
+)
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(threadName)s - %(levelname)s - %(message)s",
+    handlers=[logging.FileHandler("pipeline_runner.log"), logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+# Imported after the logging setup, which would otherwise be theirs
+from batch_visualizations_upload import (  # noqa: E402 - lives in desk-upload
+    DEFAULT_LATENCY_TARGET,
+    ScenarioPlan,
+    complete_drill,
+)
+from rate_limit import AdaptiveRateLimiter, backoff_delay  # noqa: E402
+from upload_journal import JOURNAL_FILENAME, UploadJournal  # noqa: E402
+
+# Marks the end of a queue; workers put it back so their siblings see it too
+STOP = object()
+
+# Visualizers with a rendered template kept per render process
+TEMPLATE_CACHE_SIZE = 4
+
+
+@dataclass
+class SolutionJob:
+    """A spot solution waiting to be analyzed"""
+
+    relative_path: Path
+    data: dict
+
+
+@dataclass
+class RenderJob:
+    """Hands of one scenario to render with the same solution"""
+
+    scenario: "ScenarioState"
+    hand_cards: list
+
+
+@dataclass
+class UploadJob:
+    """A rendered image waiting to be uploaded"""
+
+    scenario: "ScenarioState"
+    hand: str
+    filename: str
+    png: bytes
+
+
+@dataclass
+class ScenarioState:
+    """Progress of one scenario (one solution file, one drill) through the pipeline"""
+
+    key: str
+    solution_path: str
+    clean_json_text: str
+    tags: dict
+    answers: list
+    hand_scores: dict
+    expected: int
+    plan: ScenarioPlan = None
+    progress: object = None
+    done: int = 0
+    creator: object = None
+    drill_failed: bool = False
+    media: dict = field(default_factory=dict)
+    failed: list = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def hand_to_cards(hand):
+    """Convert hand notation (e.g., AKs, 22) to two cards with random suits"""
+    suits = ["h", "s", "d", "c"]
+    if len(hand) == 3 and hand[2] == "s":
+        suit = random.choice(suits)
+        return f"{hand[0]}{suit}", f"{hand[1]}{suit}"
+    suit1, suit2 = random.sample(suits, 2)
+    return f"{hand[0]}{suit1}", f"{hand[1]}{suit2}"
+
+
+# Per-process cache of visualizers with a rendered template, by solution path
+_warm_visualizers = OrderedDict()
+
+
+def image_filename(hand, hand_scores):
+    """Name of a hand's image, which is also its name in the upload journal"""
+    return f"{hand}_{hand_scores[hand]['best_action']}.png"
+
+
+def _warm_visualizer(solution_path, clean_json_text):
+    visualizer = _warm_visualizers.get(solution_path)
+    if visualizer is not None:
+        _warm_visualizers.move_to_end(solution_path)
+        return visualizer
+
+    visualizer = PokerTableVisualizer(json.loads(clean_json_text), solution_path=solution_path)
+    visualizer.create_template()
+    _warm_visualizers[solution_path] = visualizer
+    if len(_warm_visualizers) > TEMPLATE_CACHE_SIZE:
+        _warm_visualizers.popitem(last=False)
+    return visualizer
+
+
+def render_hands(solution_path, clean_json_text, hand_cards):
+    """
+    Render a list of (hand, card1, card2) to PNG bytes - runs in a render process
+
+    Returns a list of (hand, png_bytes) tuples
+    """
+    visualizer = _warm_visualizer(solution_path, clean_json_text)
+    results = []
+    for hand, card1, card2 in hand_cards:
+        visualizer.card1 = card1
+        visualizer.card2 = card2
+        results.append((hand, visualizer.render_png_bytes()))
+    return results
+
+
+def create_target(target, mock_dir, mock_latency, pool_size):
+    """
+    Return a factory of drill creators for the chosen upload target
+
+    The Flow Poker creator logs in on its first request (flow_auth.ensure_session),
+    so nothing is sent before the pipeline uploads. pool_size sizes its shared
+    HTTP connection pool.
+    """
+    if target == "mock":
+        from mock_upload_target import MockDrillCreator
+
+        return lambda: MockDrillCreator(mock_dir, latency=mock_latency)
+
+    from create_drill import FlowPokerDrillCreator
+    from flow_auth import configure_pool
+
+    configure_pool(pool_size)
+    return FlowPokerDrillCreator
+
+
+class PipelineRunner:
+    def __init__(
+        self,
+        solutions_dir="poker_solutions",
+        har_file=None,
+        game_type=None,
+        depth=None,
+        position=None,
+        min_threshold=None,
+        max_threshold=None,
+        num_hands=20,
+        exclude_poor_actions=False,
+        target="mock",
+        mock_dir="mock_uploads",
+        mock_latency=0.0,
+        queue_size=16,
+        analyze_workers=1,
+        render_workers=None,
+        upload_workers=4,
+        finalize_workers=1,
+        chunk_size=4,
+        upload_retries=3,
+        score_workers=4,
+        rate=5.0,
+        max_rate=None,
+        journal_path=None,
+    ):
+        """
+        Initialize the pipeline runner
+
+        Parameters:
+        solutions_dir (str): Directory with solution JSON files (used when no HAR file is given)
+        har_file (str, optional): HAR file to extract spot solutions from
+        game_type (str, optional): Filter by specific game type
+        depth (str, optional): Filter by specific stack depth
+        position (str, optional): Filter by specific position
+        min_threshold (float, optional): Minimum EV threshold for filtering hands
+        max_threshold (float, optional): Maximum EV threshold for filtering hands
+        num_hands (int): Number of hardest hands to upload per solution
+        exclude_poor_actions (bool): Exclude hands where all non-fold actions have EV < -0.05
+        target (str): "mock" for the local mock target or "flowpoker"
+        mock_dir (str): Output directory of the mock target
+        mock_latency (float): Simulated latency of every mock call, in seconds
+        queue_size (int): Capacity of each queue between stages
+        analyze_workers (int): Threads analyzing solutions
+        render_workers (int, optional): Render processes, defaults to the CPU count
+        upload_workers (int): Threads uploading images
+        finalize_workers (int): Threads scoring and promoting drills
+        chunk_size (int): Hands rendered per render task
+        upload_retries (int): Attempts per image upload
+        score_workers (int): Questions of one drill scored at the same time
+        rate (float): Initial scoring requests per second, shared by all drills
+        max_rate (float, optional): Highest scoring requests per second (default: 4 x rate)
+        journal_path (str, optional): Upload journal (default: the journal file in the
+            working directory for Flow Poker, an in-memory journal for the mock target,
+            whose drills do not outlive the run)
+        """
+        self.solutions_dir = Path(solutions_dir)
+        self.har_file = har_file
+        self.game_type = game_type
+        self.depth = depth
+        self.position = position
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.num_hands = num_hands
+        self.exclude_poor_actions = exclude_poor_actions
+        self.create_creator = create_target(
+            target, mock_dir, mock_latency, upload_workers + finalize_workers
+        )
+        self.queue_size = queue_size
+        self.analyze_workers = analyze_workers
+        self.render_workers = render_workers or os.cpu_count() or 1
+        self.upload_workers = upload_workers
+        self.finalize_workers = finalize_workers
+        self.chunk_size = chunk_size
+        self.upload_retries = upload_retries
+        self.score_workers = score_workers
+        self.limiter = AdaptiveRateLimiter(rate=rate, max_rate=max_rate, latency_target=DEFAULT_LATENCY_TARGET)
+        if journal_path is None:
+            journal_path = ":memory:" if target == "mock" else JOURNAL_FILENAME
+        self.journal = UploadJournal(journal_path)
+        self.finalize_queue = None
+        self.failed_scenarios = []
+
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "solutions": 0,
+            "scenarios": 0,
+            "images_rendered": 0,
+            "images_uploaded": 0,
+            "images_failed": 0,
+            "drills_created": 0,
+            "drills_finalized": 0,
+            "drills_failed": 0,
+            "errors": 0,
+        }
+
+    def count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def matches_filters(self, relative_path):
+        """Apply the game type, depth and position filters to a solution path"""
+        parts = relative_path.parts
+        if self.game_type and (len(parts) < 1 or parts[0] != self.game_type):
+            return False
+        if self.depth and (len(parts) < 2 or f"depth_{self.depth}" not in parts[1]):
+            return False
+        if self.position and self.position not in parts:
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def extract(self, output_queue):
+        """Feed spot solutions from the HAR file or the solutions directory"""
+        if self.har_file:
+            from soluction_extractor import (
+                KEY_LENGTH,
+                content_hash,
+                generate_filename,
+                get_folder_path,
+                iter_har_entries,
+                iter_spot_solutions,
+                solution_key,
+            )
+
+            for url, url_params, json_data in iter_spot_solutions(iter_har_entries(self.har_file)):
+                key = solution_key(url_params, content_hash(json_data))
+                relative_path = Path(get_folder_path(url_params, json_data, "")) / generate_filename(
+                    url_params, json_data, key[:KEY_LENGTH]
+                )
+                if self.matches_filters(relative_path):
+                    output_queue.put(SolutionJob(relative_path, json_data))
+            return
+
+        # Filtered-out game types and depths are never entered, and the first
+        # solution is queued as soon as it is found
+        files = scan_files(self.solutions_dir, game_type=self.game_type, depth=self.depth, position=self.position)
+        for file_path in files:
+            relative_path = file_path.relative_to(self.solutions_dir)
+            with open(file_path, "r", encoding="utf-8") as f:
+                output_queue.put(SolutionJob(relative_path, json.load(f)))
+
+    def analyze(self, job, output_queue):
+        """Clean and analyze a solution, then queue its hands for rendering"""
+        self.count("solutions")
+        clean_json = clean_spot_solution_data(job.data)
+        analysis = analyze_spot_solution(
+            clean_json,
+            min_threshold=self.min_threshold,
+            max_threshold=self.max_threshold,
+            num_hands=self.num_hands,
+            exclude_poor_actions=self.exclude_poor_actions,
+            verbose=False,
+        )
+        result_df = analysis.result_df
+        if result_df.empty:
+            logger.warning(f"No hands passed the filters in {job.relative_path}")
+            return
+
+        parts = parse_solution_path(job.relative_path)
+        tags = tags_from_metadata(
+            scenario_metadata(parts["game_type"], parts["depth"], parts["action_seq"], parts["position"])
+        )
+        action_names, column_mapping, score_suffix = actions_from_columns(list(result_df.columns))
+        if not action_names:
+            action_names, column_mapping, score_suffix = DEFAULT_ACTIONS
+        rows = result_df.to_dict("records")
+        hand_scores = {row["hand"]: scores_from_row(row, column_mapping, score_suffix) for row in rows}
+
+        scenario = ScenarioState(
+            key=str(job.relative_path.with_suffix("")),
+            solution_path=str(self.solutions_dir / job.relative_path),
+            clean_json_text=json.dumps(clean_json),
+            tags=tags,
+            answers=action_names,
+            hand_scores=hand_scores,
+            expected=len(rows),
+        )
+        name, description = drill_name_and_description(tags)
+        scenario.plan = ScenarioPlan(
+            # The journal keys scenarios by directory; a pipeline scenario has none
+            directory=os.path.join(self.journal.root, scenario.key),
+            tags=tags,
+            image_files=[image_filename(row["hand"], hand_scores) for row in rows],
+            actions_data=hand_scores,
+            available_actions=action_names,
+            answers=action_names,
+            name=name,
+            description=description,
+        )
+        scenario.progress = self.journal.scenario(scenario.plan.directory, scenario.plan.image_files)
+        self.count("scenarios")
+        logger.info(f"Analyzed {scenario.key}: {len(rows)}/{analysis.total_hands} hands")
+        if scenario.progress.get("promoted"):
+            logger.info(f"Drill {scenario.progress.drill_id} of {scenario.key} is already promoted, skipping")
+            return
+
+        # Images uploaded by an earlier run are neither rendered nor uploaded again
+        uploaded = scenario.progress.media
+        pending = []
+        for row in rows:
+            media_id = uploaded.get(image_filename(row["hand"], hand_scores))
+            if media_id is None:
+                pending.append(row["hand"])
+            else:
+                self.hand_done(scenario, row["hand"], media_id)
+        if len(pending) < len(rows):
+            logger.info(f"Skipping {len(rows) - len(pending)} images of {scenario.key} uploaded by an earlier run")
+
+        hand_cards = [(hand, *hand_to_cards(hand)) for hand in pending]
+        for start in range(0, len(hand_cards), self.chunk_size):
+            output_queue.put(RenderJob(scenario, hand_cards[start : start + self.chunk_size]))
+
+    def render(self, job, output_queue, executor):
+        """Render a chunk of hands in a render process"""
+        scenario = job.scenario
+        try:
+            results = executor.submit(
+                render_hands, scenario.solution_path, scenario.clean_json_text, job.hand_cards
+            ).result()
+        except Exception:
+            for hand, _, _ in job.hand_cards:
+                self.hand_done(scenario, hand, None)
+            raise
+
+        for hand, png in results:
+            self.count("images_rendered")
+            output_queue.put(UploadJob(scenario, hand, image_filename(hand, scenario.hand_scores), png))
+
+    def drill_creator(self, scenario):
+        """
+        Creator holding the scenario's drill, created on first use
+
+        A drill recorded in the journal by an earlier run is reused. Creating
+        the drill is never retried, because a retry could leave a duplicate
+        drill behind; if it fails, the whole scenario fails.
+
+        Returns:
+        object: The creator, or None if the drill could not be created
+        """
+        with scenario.lock:
+            if scenario.creator is None and not scenario.drill_failed:
+                creator = self.create_creator()
+                progress = scenario.progress
+                try:
+                    if progress.resumed:
+                        creator.drill_id = progress.drill_id
+                        logger.info(f"Reusing drill {creator.drill_id} from journal for {scenario.key}")
+                    else:
+                        plan = scenario.plan
+                        creator.drill_id = creator.create_drill(plan.name, plan.description, plan.answers, plan.tags)
+                        progress.update(drill_id=creator.drill_id)
+                        self.count("drills_created")
+                        logger.info(f"Created drill {creator.drill_id} for {scenario.key}")
+                    scenario.creator = creator
+                except Exception as e:
+                    scenario.drill_failed = True
+                    logger.error(f"Failed to create the drill of {scenario.key}: {str(e)[:100]}")
+            return scenario.creator
+
+    def upload(self, job, output_queue):
+        """Upload one image, creating the scenario drill on its first image"""
+        scenario = job.scenario
+        creator = self.drill_creator(scenario)
+
+        media_id = None
+        for attempt in range(self.upload_retries if creator else 0):
+            try:
+                media_id = creator.upload_image_bytes(job.filename, job.png)
+                scenario.progress.add_media(job.filename, media_id)
+                break
+            except Exception as e:
+                if attempt < self.upload_retries - 1:
+                    # Jittered exponential backoff, as for the other uploaders
+                    wait_time = backoff_delay(attempt, base=2.0)
+                    logger.warning(f"Upload of {job.hand} failed, retrying in {wait_time:.1f}s: {str(e)[:100]}")
+                    time.sleep(wait_time)
+                else:
+                    logger.error(f"Failed to upload {job.hand} after {self.upload_retries} attempts: {str(e)[:100]}")
+
+        self.count("images_uploaded" if media_id else "images_failed")
+        self.hand_done(scenario, job.hand, media_id)
+
+    def hand_done(self, scenario, hand, media_id):
+        """Record the outcome of one hand; a complete scenario goes to finalization"""
+        with scenario.lock:
+            if media_id:
+                scenario.media[hand] = media_id
+            else:
+                scenario.failed.append(hand)
+            scenario.done += 1
+            complete = scenario.done == scenario.expected
+        if complete:
+            self.finalize_queue.put(scenario)
+
+    def scenario_failed(self, scenario, reason):
+        self.count("drills_failed")
+        with self.stats_lock:
+            self.failed_scenarios.append(scenario.key)
+        logger.error(f"Drill of {scenario.key} failed: {reason}")
+
+    def finalize(self, scenario, output_queue):
+        """Score every question of a completed scenario and promote its drill"""
+        if scenario.failed:
+            self.scenario_failed(
+                scenario,
+                f"{len(scenario.failed)} images were not uploaded; the next run resumes from the journal",
+            )
+            return
+        creator = self.drill_creator(scenario)
+        if creator is None:
+            self.scenario_failed(scenario, "the drill could not be created")
+            return
+
+        try:
+            drill_id = complete_drill(
+                creator, scenario.plan, scenario.progress, self.limiter, score_workers=self.score_workers
+            )
+        except Exception as e:
+            drill_id = None
+            logger.error(f"Finalizing {scenario.key} failed: {str(e)[:200]}")
+        if drill_id is None:
+            self.scenario_failed(scenario, "finalization failed; the next run resumes from the journal")
+            return
+
+        self.count("drills_finalized")
+        logger.info(f"Finalized drill {drill_id} for {scenario.key} with {len(scenario.media)} questions")
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+
+    def _stage_worker(self, name, func, input_queue, output_queue, *extra):
+        while True:
+            item = input_queue.get()
+            if item is STOP:
+                input_queue.put(STOP)
+                return
+            try:
+                func(item, output_queue, *extra)
+            except Exception as e:
+                self.count("errors")
+                logger.error(f"{name} failed: {e}", exc_info=True)
+
+    def _start_stage(self, name, func, workers, input_queue, output_queue, *extra):
+        threads = []
+        for i in range(workers):
+            thread = threading.Thread(
+                target=self._stage_worker,
+                args=(name, func, input_queue, output_queue, *extra),
+                name=f"{name}-{i}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _close_stage(self, threads, output_queue):
+        for thread in threads:
+            thread.join()
+        if output_queue is not None:
+            output_queue.put(STOP)
+
+    def run(self):
+        """Run every stage until the input is exhausted and all drills are finalized"""
+        start_time = time.time()
+        solution_queue = queue.Queue(self.queue_size)
+        render_queue = queue.Queue(self.queue_size)
+        upload_queue = queue.Queue(self.queue_size)
+        finalize_queue = queue.Queue()
+        # Any stage may complete a scenario: analyze (all images uploaded by an
+        # earlier run), render (failed hands) or upload
+        self.finalize_queue = finalize_queue
+
+        with ProcessPoolExecutor(max_workers=self.render_workers) as executor:
+            finalize = self._start_stage("finalize", self.finalize, self.finalize_workers, finalize_queue, None)
+            upload = self._start_stage("upload", self.upload, self.upload_workers, upload_queue, finalize_queue)
+            render = self._start_stage(
+                "render", self.render, self.render_workers, render_queue, upload_queue, executor
+            )
+            analyze = self._start_stage("analyze", self.analyze, self.analyze_workers, solution_queue, render_queue)
+
+            try:
+                self.extract(solution_queue)
+            except Exception as e:
+                self.count("errors")
+                logger.error(f"extract failed: {e}", exc_info=True)
+            solution_queue.put(STOP)
+
+            self._close_stage(analyze, render_queue)
+            self._close_stage(render, upload_queue)
+            self._close_stage(upload, finalize_queue)
+            self._close_stage(finalize, None)
+
+        self.journal.close()
+
+        elapsed = time.time() - start_time
+        self.stats["elapsed_seconds"] = round(elapsed, 2)
+        self.stats["failed_scenarios"] = sorted(self.failed_scenarios)
+        logger.info("Pipeline completed")
+        for key, value in self.stats.items():
+            logger.info(f"  {key}: {value}")
+        if elapsed > 0 and self.stats["images_uploaded"]:
+            logger.info(f"  images/sec: {self.stats['images_uploaded'] / elapsed:.2f}")
+        return self.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream solutions through analysis, rendering and upload"
+    )
+    parser.add_argument("--solutions-dir", default="poker_solutions", help="Directory with solution JSON files")
+    parser.add_argument("--har", help="HAR file to extract spot solutions from instead of --solutions-dir")
+    parser.add_argument("--game-type", help="Filter by specific game type")
+    parser.add_argument("--depth", help="Filter by specific stack depth")
+    parser.add_argument("--position", help="Filter by specific position")
+    parser.add_argument("--min", type=float, help="Minimum EV threshold for filtering hands")
+    parser.add_argument("--max", type=float, help="Maximum EV threshold for filtering hands")
+    parser.add_argument("--num-hands", type=int, default=20, help="Number of hardest hands to upload per solution")
+    parser.add_argument(
+        "--exclude-poor-actions",
+        action="store_true",
+        help="Exclude hands where all non-fold actions have EV < -0.05",
+    )
+    parser.add_argument(
+        "--target", choices=["mock", "flowpoker"], default="mock", help="Where drills are uploaded (default: mock)"
+    )
+    parser.add_argument("--mock-dir", default="mock_uploads", help="Output directory of the mock target")
+    parser.add_argument("--mock-latency", type=float, default=0.0, help="Simulated latency per mock call in seconds")
+    parser.add_argument("--queue-size", type=int, default=16, help="Capacity of each queue between stages")
+    parser.add_argument("--analyze-workers", type=int, default=1, help="Threads analyzing solutions")
+    parser.add_argument("--render-workers", type=int, help="Render processes (default: CPU count)")
+    parser.add_argument("--upload-workers", type=int, default=4, help="Threads uploading images")
+    parser.add_argument("--finalize-workers", type=int, default=1, help="Threads scoring and promoting drills")
+    parser.add_argument("--chunk-size", type=int, default=4, help="Hands rendered per render task")
+    parser.add_argument("--upload-retries", type=int, default=3, help="Attempts per image upload")
+    parser.add_argument("--score-workers", type=int, default=4, help="Questions per drill scored at once")
+    parser.add_argument(
+        "--rate", type=float, default=5.0, help="Initial scoring requests per second, shared by all drills"
+    )
+    parser.add_argument("--max-rate", type=float, help="Highest scoring requests per second (default: 4 x --rate)")
+    parser.add_argument(
+        "--journal",
+        help=f"Upload journal (default: {JOURNAL_FILENAME} for flowpoker, none for mock)",
+    )
+
+    args = parser.parse_args()
+
+    runner = PipelineRunner(
+        solutions_dir=args.solutions_dir,
+        har_file=args.har,
+        game_type=args.game_type,
+        depth=args.depth,
+        position=args.position,
+        min_threshold=args.min,
+        max_threshold=args.max,
+        num_hands=args.num_hands,
+        exclude_poor_actions=args.exclude_poor_actions,
+        target=args.target,
+        mock_dir=args.mock_dir,
+        mock_latency=args.mock_latency,
+        queue_size=args.queue_size,
+        analyze_workers=args.analyze_workers,
+        render_workers=args.render_workers,
+        upload_workers=args.upload_workers,
+        finalize_workers=args.finalize_workers,
+        chunk_size=args.chunk_size,
+        upload_retries=args.upload_retries,
+        score_workers=args.score_workers,
+        rate=args.rate,
+        max_rate=args.max_rate,
+        journal_path=args.journal,
+    )
+    runner.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,16 @@
 Poker visualization package.
 """
 
-from .poker_table_visualizer import PokerTableVisualizer
+from .config import ANTIALIAS_MODES, DEFAULT_ANTIALIAS, DEFAULT_TIER, RESOLUTION_TIERS
+from .poker_table_visualizer import PokerTableVisualizer, RENDERER_VERSION
+from .svg_renderer import SvgTableRenderer
 
-__all__ = ["PokerTableVisualizer"]
+__all__ = [
+    "ANTIALIAS_MODES",
+    "DEFAULT_ANTIALIAS",
+    "DEFAULT_TIER",
+    "PokerTableVisualizer",
+    "RENDERER_VERSION",
+    "RESOLUTION_TIERS",
+    "SvgTableRenderer",
+]
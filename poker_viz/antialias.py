@@ -0,0 +1,98 @@
+"""
+Anti-aliased shapes for rendering at native resolution.
+
+PIL draws ellipses and rounded rectangles without anti-aliasing. The
+"supersample" mode of PokerTableConfig softens them by blurring full-size
+masks and relies on a higher scale factor plus a final downscale for clean
+edges. The "native" mode draws each shape through a coverage mask instead: the
+shape is drawn COVERAGE_SAMPLES times larger on a canvas covering only its
+bounding box, and reduced by box averaging, so every pixel holds the fraction
+of its area the shape covers. Masks are cached by geometry, so seats, borders
+and buttons of the same size are rasterized once.
+
+Text needs no mask: FreeType renders hinted, anti-aliased glyphs at the size
+the fonts are loaded at, which is the native size in this mode.
+"""
+
+import math
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+# Subsamples per pixel along each axis
+COVERAGE_SAMPLES = 4
+
+
+@lru_cache(maxsize=512)
+def _coverage(shape, size, box, radius, width, samples):
+    """Rasterize a shape on the subsample grid and reduce it to coverage."""
+    canvas = Image.new("L", (size[0] * samples, size[1] * samples), 0)
+    draw = ImageDraw.Draw(canvas)
+    # PIL boxes include their last pixel; the shape covers box[0]..box[2] - 1
+    left, top, right, bottom = box
+    box = [left, top, right - 1, bottom - 1]
+    style = {"outline": 255, "width": width} if width else {"fill": 255}
+    if shape == "ellipse":
+        draw.ellipse(box, **style)
+    else:
+        draw.rounded_rectangle(box, radius=radius, **style)
+    return canvas.reduce(samples)
+
+
+def shape_mask(shape, bbox, radius=0, width=0, samples=COVERAGE_SAMPLES):
+    """
+    Compute the coverage mask of an ellipse or a rounded rectangle.
+
+    Args:
+        shape: "ellipse" or "rounded_rectangle"
+        bbox: (left, top, right, bottom) in image pixels, may be fractional
+        radius: Corner radius of a rounded rectangle
+        width: Outline width; 0 fills the shape
+        samples: Subsamples per pixel along each axis
+
+    Returns:
+        ((x, y), mask): an "L" mask of the pixels the shape touches and the
+        image position of its top-left corner. Masks are cached and shared:
+        do not modify them.
+    """
+    left, top, right, bottom = bbox
+    x0, y0 = math.floor(left), math.floor(top)
+    size = (math.ceil(right) - x0, math.ceil(bottom) - y0)
+
+    def grid(value):
+        return round(value * samples)
+
+    box = (grid(left - x0), grid(top - y0), grid(right - x0), grid(bottom - y0))
+    return (x0, y0), _coverage(shape, size, box, grid(radius), grid(width), samples)
+
+
+def composite(img, layer, position):
+    """
+    Alpha-composite layer onto img in place at an integer position.
+
+    Unlike Image.alpha_composite, the position may be negative or put part of
+    the layer outside img.
+    """
+    x, y = position
+    img.alpha_composite(layer, dest=(max(0, x), max(0, y)), source=(max(0, -x), max(0, -y)))
+
+
+def fill_shape(img, shape, bbox, color, radius=0, width=0):
+    """
+    Draw an anti-aliased ellipse or rounded rectangle onto img in place.
+
+    Args:
+        img: RGBA image
+        shape: "ellipse" or "rounded_rectangle"
+        bbox: (left, top, right, bottom), may be fractional
+        color: RGB or RGBA fill color
+        radius: Corner radius of a rounded rectangle
+        width: Outline width; 0 fills the shape
+    """
+    position, mask = shape_mask(shape, bbox, radius=radius, width=width)
+    alpha = color[3] if len(color) > 3 else 255
+    if alpha < 255:
+        mask = mask.point(lambda value: value * alpha // 255)
+    layer = Image.new("RGBA", mask.size, tuple(color[:3]) + (0,))
+    layer.putalpha(mask)
+    composite(img, layer, position)
@@ -0,0 +1,262 @@
+"""
+Pre-decoded static image assets shared between processes.
+
+The card images, the avatar and the table logo are decoded once into an asset
+bundle: a single file with a JSON index followed by the raw pixel buffers.
+Processes memory-map the bundle read-only and wrap each buffer in a PIL image
+without copying it, so every gunicorn worker and batch process shares the same
+physical pages through the page cache, and no PNG is decoded at startup.
+
+Bundle layout:
+    8 bytes   magic (BUNDLE_MAGIC)
+    8 bytes   index length, little-endian
+    n bytes   JSON index: name -> offset, length, mode, size, palette,
+              transparency and the size and mtime of the source file
+    ...       pixel buffers, each aligned to BUNDLE_ALIGN bytes
+
+Images come from load_image(), which falls back to decoding the file when
+there is no bundle or the source file changed after the bundle was built.
+Bundled images are read-only and shared by all callers: copy them before
+drawing on them.
+
+Fonts are not bundled: FreeType parses a face per font size and keeps its own
+buffer, so bundled font bytes would be copied into every font object instead
+of being shared.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUNDLE_PATH = os.path.join(ROOT_DIR, "assets.bundle")
+
+BUNDLE_MAGIC = b"PVASSET1"
+BUNDLE_ALIGN = 64
+
+# Modes PIL can wrap around an external buffer without copying
+SHARED_MODES = ("L", "P", "RGBA", "RGBX")
+
+# Images stored converted, in the mode the renderer uses them
+ASSET_MODES = {
+    "avatar.png": "RGBA",
+    "flow_logo.png": "RGBA",
+}
+
+
+def asset_sources(root_dir=ROOT_DIR):
+    """
+    List the image files that go into the bundle.
+
+    Args:
+        root_dir: Repository root
+
+    Returns:
+        List of paths relative to root_dir, with forward slashes
+    """
+    names = []
+    cards_dir = os.path.join(root_dir, "cards-images")
+    if os.path.isdir(cards_dir):
+        names.extend(
+            f"cards-images/{name}" for name in sorted(os.listdir(cards_dir)) if name.endswith(".png")
+        )
+    names.extend(name for name in ASSET_MODES if os.path.exists(os.path.join(root_dir, name)))
+    return names
+
+
+def build_bundle(output_path=DEFAULT_BUNDLE_PATH, root_dir=ROOT_DIR):
+    """
+    Decode the static images and write them to a bundle.
+
+    Args:
+        output_path: Path of the bundle file
+        root_dir: Repository root the asset names are relative to
+
+    Returns:
+        The index written to the bundle
+    """
+    assets = {}
+    buffers = []
+    offset = 0
+    for name in asset_sources(root_dir):
+        source_path = os.path.join(root_dir, name)
+        img = Image.open(source_path)
+        mode = ASSET_MODES.get(name)
+        img = img.convert(mode) if mode and img.mode != mode else img
+        img.load()
+        if img.mode not in SHARED_MODES:
+            logger.warning(f"Skipping {name}: mode {img.mode} cannot be shared")
+            continue
+
+        data = img.tobytes()
+        stat = os.stat(source_path)
+        entry = {
+            "offset": offset,
+            "length": len(data),
+            "mode": img.mode,
+            "size": list(img.size),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+        }
+        if img.mode == "P":
+            entry["palette_mode"] = img.palette.mode
+            entry["palette"] = img.palette.tobytes().hex()
+        transparency = img.info.get("transparency")
+        if transparency is not None:
+            entry["transparency"] = transparency.hex() if isinstance(transparency, bytes) else transparency
+        assets[name] = entry
+        buffers.append(data)
+        offset += -(-len(data) // BUNDLE_ALIGN) * BUNDLE_ALIGN
+
+    index = {"assets": assets}
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    header_length = len(BUNDLE_MAGIC) + 8 + len(index_bytes)
+    data_start = -(-header_length // BUNDLE_ALIGN) * BUNDLE_ALIGN
+
+    # Write to a temporary file first so running processes never map a partial bundle
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(struct.pack("<Q", len(index_bytes)))
+        f.write(index_bytes)
+        for entry, data in zip(assets.values(), buffers):
+            f.seek(data_start + entry["offset"])
+            f.write(data)
+        f.truncate(data_start + offset)
+    os.replace(temp_path, output_path)
+    return index
+
+
+class AssetBundle:
+    """Read-only memory map of an asset bundle."""
+
+    def __init__(self, path, root_dir=ROOT_DIR):
+        """
+        Map a bundle.
+
+        Args:
+            path: Path of the bundle file
+            root_dir: Repository root the asset names are relative to
+        """
+        self.path = path
+        self.root_dir = root_dir
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[: len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not an asset bundle")
+        (index_length,) = struct.unpack_from("<Q", self.map, len(BUNDLE_MAGIC))
+        index_start = len(BUNDLE_MAGIC) + 8
+        index = json.loads(self.map[index_start : index_start + index_length])
+        self.assets = index["assets"]
+        self.data_start = -(-(index_start + index_length) // BUNDLE_ALIGN) * BUNDLE_ALIGN
+        self.images = {}
+        self.lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.assets
+
+    def _is_current(self, name):
+        """Check that the source file is the one the bundle was built from."""
+        entry = self.assets[name]
+        try:
+            stat = os.stat(os.path.join(self.root_dir, name))
+        except OSError:
+            # Without the source file the bundle is all there is
+            return True
+        return stat.st_size == entry["source_size"] and stat.st_mtime_ns == entry["source_mtime_ns"]
+
+    def image(self, name):
+        """
+        Get a bundled image backed by the memory map.
+
+        Args:
+            name: Asset name, relative to the repository root
+
+        Returns:
+            Read-only PIL image shared by all callers, or None if the asset is
+            not bundled or its source file changed since the bundle was built
+        """
+        with self.lock:
+            if name in self.images:
+                return self.images[name]
+            img = None
+            if name in self.assets:
+                if self._is_current(name):
+                    img = self._wrap(self.assets[name])
+                else:
+                    logger.warning(f"{name} changed since {self.path} was built, loading it from disk")
+            self.images[name] = img
+            return img
+
+    def _wrap(self, entry):
+        start = self.data_start + entry["offset"]
+        buffer = memoryview(self.map)[start : start + entry["length"]]
+        img = Image.frombuffer(entry["mode"], tuple(entry["size"]), buffer, "raw", entry["mode"], 0, 1)
+        if "palette" in entry:
+            img.putpalette(bytes.fromhex(entry["palette"]), entry["palette_mode"])
+        transparency = entry.get("transparency")
+        if transparency is not None:
+            img.info["transparency"] = bytes.fromhex(transparency) if isinstance(transparency, str) else transparency
+        return img
+
+
+_bundle = None
+_bundle_loaded = False
+_bundle_lock = threading.Lock()
+
+
+def get_bundle():
+    """
+    Get the asset bundle of this process, mapping it on first use.
+
+    The bundle is read from POKER_VIZ_ASSETS, or assets.bundle in the
+    repository root. Set POKER_VIZ_ASSETS=0 to always decode from disk.
+
+    Returns:
+        The AssetBundle, or None if there is none
+    """
+    global _bundle, _bundle_loaded
+    with _bundle_lock:
+        if not _bundle_loaded:
+            _bundle_loaded = True
+            path = os.environ.get("POKER_VIZ_ASSETS", DEFAULT_BUNDLE_PATH)
+            if path != "0" and os.path.exists(path):
+                try:
+                    _bundle = AssetBundle(path)
+                    logger.info(f"Mapped {len(_bundle.assets)} assets from {path}")
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not map asset bundle {path}: {e}")
+        return _bundle
+
+
+def load_image(path, mode=None):
+    """
+    Load a static image, from the asset bundle when it has it.
+
+    Args:
+        path: Path of the image file
+        mode: Mode to return the image in (e.g. "RGBA"), or None for the
+            mode of the file
+
+    Returns:
+        PIL image. Images from the bundle are shared and read-only, so copy
+        them before modifying them.
+    """
+    img = None
+    bundle = get_bundle()
+    if bundle is not None:
+        name = os.path.relpath(os.path.abspath(path), bundle.root_dir).replace(os.sep, "/")
+        img = bundle.image(name)
+    if img is None:
+        img = Image.open(path)
+    if mode and img.mode != mode:
+        img = img.convert(mode)
+    return img
@@ -6,6 +6,8 @@ import os
 import math
 from PIL import Image, ImageDraw, ImageFilter, ImageOps, ImageFont
 
+from .assets import load_image
+
 
 class CardDrawer:
     """Draws cards on the poker table."""
@@ -47,16 +49,21 @@ class CardDrawer:
         """Preload the card back image."""
         card_back_path = os.path.join(self.cards_folder, "back.png")
         if os.path.exists(card_back_path):
-            self.card_back_img = Image.open(card_back_path)
+            self.card_back_img = load_image(card_back_path)
             # Store in cache
             self.card_cache["back.png"] = self.card_back_img
         else:
             self.card_back_img = None
 
-    def draw_hero_cards(self):
-        """Draw the hero's cards."""
+    def hero_card_slots(self):
+        """Lay out the hero's cards.
+
+        Returns:
+            list: (card, x, y, width, height, rotation_angle) per card, in the
+            arguments of draw_card, or an empty list without hero or cards
+        """
         if not self.game_data.hero or not (self.card1 and self.card2):
-            return self.img, self.draw
+            return []
 
         # Hero is always at the bottom middle position
         hero_x, hero_y = (
@@ -67,8 +74,9 @@ class CardDrawer:
         )
 
         # Card dimensions - enlarged for better visibility
-        card_width = 80 * self.config.scale_factor
-        card_height = 120 * self.config.scale_factor
+        # Whole pixels, as the card images are resized to them
+        card_width = round(80 * self.config.scale_factor)
+        card_height = round(120 * self.config.scale_factor)
         card_overlap = (
             45 * self.config.scale_factor
         )  # Calculate rectangle dimensions (should match PlayerDrawer._draw_player_rectangle)
@@ -81,7 +89,7 @@ class CardDrawer:
         circle_radius = circle_diameter / 2
         circle_y_offset = rect_height * 0.4
 
-        card_offset_x = 13
+        card_offset_x = 13 * self.config.scale_factor
 
         # Position cards between the circle and rectangle
         # Cards should be visible above the rectangle but below the top of the circle
@@ -92,34 +100,26 @@ class CardDrawer:
         # First card (left card) - rotated counterclockwise
         card1_left = hero_x - card_width / 2 - card_overlap / 2 - card_offset_x
         card1_top = hero_y + card_offset_y
-        self.draw_card(
-            self.card1,
-            card1_left,
-            card1_top,
-            card_width,
-            card_height,
-            rotation_angle=5,
-        )
 
         # Second card (right card) - rotated clockwise
         card2_left = hero_x - card_width / 2 + card_overlap / 2 - card_offset_x
         card2_top = card1_top
-        self.draw_card(
-            self.card2,
-            card2_left,
-            card2_top,
-            card_width,
-            card_height,
-            rotation_angle=-5,
-        )
 
-        return self.img, self.draw
+        return [
+            (self.card1, card1_left, card1_top, card_width, card_height, 5),
+            (self.card2, card2_left, card2_top, card_width, card_height, -5),
+        ]
 
-    def draw_card(self, card, x, y, width, height, rotation_angle=0):
-        """Draw a single card using the card image from cards-images folder."""
-        if not card or len(card) < 2:
-            return
+    def draw_hero_cards(self):
+        """Draw the hero's cards."""
+        for card, x, y, width, height, rotation_angle in self.hero_card_slots():
+            self.draw_card(card, x, y, width, height, rotation_angle=rotation_angle)
+
+        return self.img, self.draw
 
+    @staticmethod
+    def card_filename(card):
+        """Return the image file name of a card, e.g. "Ah" -> "Ah.png"."""
         # Format the card name to match the image files
         # T for 10, then rank and suit
         rank = card[0].upper()
@@ -130,7 +130,14 @@ class CardDrawer:
             rank = "T"
             suit = card[2].lower()
 
-        card_filename = f"{rank}{suit}.png"
+        return f"{rank}{suit}.png"
+
+    def draw_card(self, card, x, y, width, height, rotation_angle=0):
+        """Draw a single card using the card image from cards-images folder."""
+        if not card or len(card) < 2:
+            return
+
+        card_filename = self.card_filename(card)
         card_path = os.path.join(self.cards_folder, card_filename)
 
         # Create a cache key based on card and dimensions
@@ -142,7 +149,7 @@ class CardDrawer:
         # Check if the card image exists
         elif os.path.exists(card_path):
             # Load the card image
-            card_img = Image.open(card_path)
+            card_img = load_image(card_path)
             # Resize the card image using a faster method
             card_img = card_img.resize((width, height), Image.BICUBIC)
             # Store in cache for future use
@@ -400,8 +407,15 @@ class CardDrawer:
                     [(x, i), (x + width, i)], fill=(40, 60, 160, 255), width=1
                 )
 
-    def draw_player_cards(self):
-        """Draw card backs for all active non-hero players."""
+    def villain_card_slots(self):
+        """Lay out the card backs of all active non-hero players.
+
+        Returns:
+            list: (x, y, width, height, rotation_angle) per card, in the
+            arguments of draw_card_back
+        """
+        slots = []
+
         # Get position mapping from game data
         position_to_seat = self.game_data.get_position_mapping()
 
@@ -428,8 +442,8 @@ class CardDrawer:
             player_x, player_y = self.config.seat_positions[seat_index]
 
             # Card dimensions - slightly smaller than hero cards
-            card_width = 70 * self.config.scale_factor
-            card_height = 105 * self.config.scale_factor
+            card_width = round(70 * self.config.scale_factor)
+            card_height = round(105 * self.config.scale_factor)
             card_overlap = (
                 30 * self.config.scale_factor
             )  # How much second card overlaps first card            # In the new design, cards should be between the circle and rectangle
@@ -468,23 +482,18 @@ class CardDrawer:
             # First card (left card) - rotated slightly counterclockwise
             card1_left = player_x - card_overlap / 2
             card1_top = player_y + card_offset_y
-            self.draw_card_back(
-                card1_left,
-                card1_top,
-                card_width,
-                card_height,
-                rotation_angle=5,
-            )
+            slots.append((card1_left, card1_top, card_width, card_height, 5))
 
             # Second card (right card) - rotated slightly clockwise
             card2_left = player_x + card_overlap / 2
             card2_top = card1_top
-            self.draw_card_back(
-                card2_left,
-                card2_top,
-                card_width,
-                card_height,
-                rotation_angle=-5,
-            )
+            slots.append((card2_left, card2_top, card_width, card_height, -5))
+
+        return slots
+
+    def draw_player_cards(self):
+        """Draw card backs for all active non-hero players."""
+        for x, y, width, height, rotation_angle in self.villain_card_slots():
+            self.draw_card_back(x, y, width, height, rotation_angle=rotation_angle)
 
         return self.img, self.draw
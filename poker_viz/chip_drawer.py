@@ -2,7 +2,110 @@
 Module for drawing chips on the poker table.
 """
 
-from PIL import Image, ImageDraw, ImageFilter
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
+
+from .antialias import COVERAGE_SAMPLES, composite
+
+# Chip colors mapped by denomination
+CHIP_COLORS = {
+    0.1: (200, 200, 200),  # Grey
+    0.5: (150, 75, 0),  # Brown
+    1: (220, 40, 40),  # Red
+    5: (30, 30, 180),  # Blue
+    10: (0, 130, 0),  # Green
+    50: (130, 0, 130),  # Purple
+    100: (20, 20, 20),  # Black
+}
+
+
+@lru_cache(maxsize=64)
+def chip_sprites(chip_color, scale_factor, samples=1):
+    """
+    Draw the face of a chip, flattened for perspective, and its darker edge.
+
+    Args:
+        chip_color: RGB color of the chip
+        scale_factor: Render scale factor
+        samples: Draw the face this many times larger before scaling it down,
+            which anti-aliases its shapes; 1 draws it at its final size
+
+    Returns:
+        tuple: (face, edge) RGBA images of the flattened chip. Cached and
+        shared: do not modify them.
+    """
+    chip_radius = 15 * scale_factor
+    rim_width = chip_radius * 0.2
+
+    chip_border_color = tuple(max(0, c - 40) for c in chip_color)
+    notch_color = (255, 255, 255, 255)
+    ellipse_height = int(chip_radius * 2 * 0.6)
+
+    # ------------------------------------------------------------------
+    # Base chip drawing on a separate image then scaled to ellipse
+    # ------------------------------------------------------------------
+    chip_size = int(chip_radius * 2)
+    center = chip_radius * samples
+    chip_img = Image.new("RGBA", (chip_size * samples, chip_size * samples), (0, 0, 0, 0))
+    overlay_draw = ImageDraw.Draw(chip_img, "RGBA")
+
+    outer_bbox = [0, 0, chip_size * samples, chip_size * samples]
+    overlay_draw.ellipse(
+        outer_bbox,
+        fill=chip_color,
+        outline=chip_border_color,
+        width=max(1, int(scale_factor)) * samples,
+    )
+
+    # Edge marks around the rim
+    num_notches = 8
+    notch_angle = 20
+    for i in range(num_notches):
+        start = i * (360 / num_notches) - notch_angle / 2
+        end = start + notch_angle
+        overlay_draw.pieslice(outer_bbox, start, end, fill=notch_color)
+
+    # Cover inner part of the notches to create rectangles on the rim
+    inner_rim_radius = (chip_radius - rim_width) * samples
+    inner_rim_bbox = [
+        center - inner_rim_radius,
+        center - inner_rim_radius,
+        center + inner_rim_radius,
+        center + inner_rim_radius,
+    ]
+    overlay_draw.ellipse(inner_rim_bbox, fill=chip_color)
+
+    # Inner circle for label area
+    label_radius = inner_rim_radius * 0.6
+    label_bbox = [
+        center - label_radius,
+        center - label_radius,
+        center + label_radius,
+        center + label_radius,
+    ]
+    overlay_draw.ellipse(
+        label_bbox,
+        fill=(255, 255, 255, 255),
+        outline=chip_border_color,
+        width=int(scale_factor * 0.8) * samples,
+    )
+
+    # Simple highlight arc for a touch of depth
+    overlay_draw.arc(
+        label_bbox,
+        start=20,
+        end=160,
+        fill=(220, 220, 220, 180),
+        width=max(1, int(scale_factor)) * samples,
+    )
+
+    chip_img = chip_img.resize((chip_size, ellipse_height), Image.LANCZOS)
+
+    edge_color = tuple(max(0, c - 30) for c in chip_color)
+    edge_img = Image.new("RGBA", chip_img.size, edge_color)
+    edge_img.putalpha(chip_img.split()[3])
+    return chip_img, edge_img
 
 
 class ChipDrawer:
@@ -47,7 +150,10 @@ class ChipDrawer:
         text_height = font.getbbox(text)[3]
         if radius is None:
             radius = (text_height + padding * 2) // 2
-        bbox = [x - padding - 10, y - padding, x + text_width + padding + 10, y + text_height + padding]
+        # Margin and blur scale with the rendering, like the padding callers pass
+        margin = 10 * self.config.scale_factor
+        blur = blur * self.config.scale_factor
+        bbox = [x - padding - margin, y - padding, x + text_width + padding + margin, y + text_height + padding]
         overlay = Image.new(
             "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
         )
@@ -68,12 +174,9 @@ class ChipDrawer:
     def _draw_chip(self, chip_x, chip_y, chip_color):
         """Draw a single chip with edge markings and an inner circle."""
         scale_factor = self.config.scale_factor
+        native = self.config.antialias == "native"
 
         chip_radius = 15 * scale_factor
-        rim_width = chip_radius * 0.2
-
-        chip_border_color = tuple(max(0, c - 40) for c in chip_color)
-        notch_color = (255, 255, 255, 255)
 
         # ------------------------------------------------------------------
         # Perspective setup - compress chip height so it looks flat on table
@@ -94,124 +197,62 @@ class ChipDrawer:
             (shadow_size, ellipse_height), Image.LANCZOS
         )
 
-        shadow_overlay = Image.new(
-            "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
-        )
         shadow_offset = int(scale_factor)
         shadow_top_left = (
             int(chip_x - chip_radius + shadow_offset),
             int(chip_y - ellipse_height / 2 + shadow_offset),
         )
-        shadow_overlay.paste(shadow_img, shadow_top_left, shadow_img)
-        shadow_overlay = shadow_overlay.filter(
-            ImageFilter.GaussianBlur(radius=scale_factor)
-        )
-        self.img = Image.alpha_composite(self.img, shadow_overlay)
+        if native:
+            # Blur only the shadow, with room for the blur to spread
+            pad = int(3 * scale_factor) + 1
+            shadow_img = ImageOps.expand(shadow_img, pad, (0, 0, 0, 0)).filter(
+                ImageFilter.GaussianBlur(radius=scale_factor)
+            )
+            composite(self.img, shadow_img, (shadow_top_left[0] - pad, shadow_top_left[1] - pad))
+        else:
+            shadow_overlay = Image.new(
+                "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
+            )
+            shadow_overlay.paste(shadow_img, shadow_top_left, shadow_img)
+            shadow_overlay = shadow_overlay.filter(
+                ImageFilter.GaussianBlur(radius=scale_factor)
+            )
+            self.img = Image.alpha_composite(self.img, shadow_overlay)
 
         # ------------------------------------------------------------------
-        # Base chip drawing on a separate image then scaled to ellipse
+        # Chip face and its thickness - a darker copy slightly offset downward
         # ------------------------------------------------------------------
-        chip_size = int(chip_radius * 2)
-        chip_img = Image.new("RGBA", (chip_size, chip_size), (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(chip_img, "RGBA")
-
-        outer_bbox = [0, 0, chip_size, chip_size]
-        overlay_draw.ellipse(
-            outer_bbox,
-            fill=chip_color,
-            outline=chip_border_color,
-            width=int(scale_factor),
-        )
-
-        # Edge marks around the rim
-        num_notches = 8
-        notch_angle = 20
-        for i in range(num_notches):
-            start = i * (360 / num_notches) - notch_angle / 2
-            end = start + notch_angle
-            overlay_draw.pieslice(outer_bbox, start, end, fill=notch_color)
-
-        # Cover inner part of the notches to create rectangles on the rim
-        inner_rim_radius = chip_radius - rim_width
-        inner_rim_bbox = [
-            chip_radius - inner_rim_radius,
-            chip_radius - inner_rim_radius,
-            chip_radius + inner_rim_radius,
-            chip_radius + inner_rim_radius,
-        ]
-        overlay_draw.ellipse(inner_rim_bbox, fill=chip_color)
-
-        # Inner circle for label area
-        label_radius = inner_rim_radius * 0.6
-        label_bbox = [
-            chip_radius - label_radius,
-            chip_radius - label_radius,
-            chip_radius + label_radius,
-            chip_radius + label_radius,
-        ]
-        overlay_draw.ellipse(
-            label_bbox,
-            fill=(255, 255, 255, 255),
-            outline=chip_border_color,
-            width=int(scale_factor * 0.8),
-        )
-
-        # Simple highlight arc for a touch of depth
-        overlay_draw.arc(
-            [
-                chip_radius - label_radius,
-                chip_radius - label_radius,
-                chip_radius + label_radius,
-                chip_radius + label_radius,
-            ],
-            start=20,
-            end=160,
-            fill=(220, 220, 220, 180),
-            width=int(scale_factor),
+        chip_img, edge_img = chip_sprites(
+            chip_color, scale_factor, COVERAGE_SAMPLES if native else 1
         )
-
-        chip_img = chip_img.resize((chip_size, ellipse_height), Image.LANCZOS)
-
-        # ------------------------------------------------------------------
-        # Chip thickness - draw a darker copy slightly offset downward
-        # ------------------------------------------------------------------
         thickness = int(scale_factor * 4)
-        edge_color = tuple(max(0, c - 30) for c in chip_color)
-        edge_img = Image.new("RGBA", chip_img.size, edge_color)
-        edge_img.putalpha(chip_img.split()[3])
-
-        chip_overlay = Image.new(
-            "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
-        )
         top_left = (
             int(chip_x - chip_radius),
             int(chip_y - ellipse_height / 2),
         )
-        chip_overlay.paste(edge_img, (top_left[0], top_left[1] + thickness), edge_img)
-        chip_overlay.paste(chip_img, top_left, chip_img)
-
-        self.img = Image.alpha_composite(self.img, chip_overlay)
+        if native:
+            composite(self.img, edge_img, (top_left[0], top_left[1] + thickness))
+            composite(self.img, chip_img, top_left)
+        else:
+            chip_overlay = Image.new(
+                "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
+            )
+            chip_overlay.paste(edge_img, (top_left[0], top_left[1] + thickness), edge_img)
+            chip_overlay.paste(chip_img, top_left, chip_img)
+            self.img = Image.alpha_composite(self.img, chip_overlay)
         self.draw = ImageDraw.Draw(self.img, "RGBA")
 
-    def draw_player_chips(self):
-        """Draw chips on the table representing each player's bet with realistic 3D effects."""
-        position_to_seat = self.game_data.get_position_mapping()
+    def chip_stacks(self):
+        """Lay out the chip stack of every player with chips on the table.
 
-        # Chip colors mapped by denomination
-        chip_colors = {
-            0.1: (200, 200, 200),  # Grey
-            0.5: (150, 75, 0),  # Brown
-            1: (220, 40, 40),  # Red
-            5: (30, 30, 180),  # Blue
-            10: (0, 130, 0),  # Green
-            50: (130, 0, 130),  # Purple
-            100: (20, 20, 20),  # Black
-        }
-        text_color = self.config.text_color
-        player_radius = self.config.player_radius
-        scale_factor = self.config.scale_factor
+        Returns:
+            list: One dict per stack with the player, the total ``chips``, the
+            position ``x``/``y`` of the bottom chip and the ``stack`` of
+            denominations from the bottom up
+        """
+        position_to_seat = self.game_data.get_position_mapping()
+        stacks = []
 
-        # Draw chips for each player who has chips on the table
         for player in self.game_data.players:
             chips = player.get("chips_on_table", 0)
             if chips <= 0:
@@ -263,9 +304,6 @@ class ChipDrawer:
             distance_factors = distance_maps.get(self.config.num_players, {})
             distance = distance_factors.get(seat_index, 0.6)
 
-            chip_x = x + dx * (length * distance)
-            chip_y = y + dy * (length * distance)
-
             # Break the chip value into known denominations
             denominations = [100, 50, 10, 5, 1, 0.5, 0.1]
             remaining = chips
@@ -277,15 +315,38 @@ class ChipDrawer:
                     remaining -= count * denom
                     remaining = round(remaining, 2)
 
+            stacks.append(
+                {
+                    "player": player,
+                    "chips": chips,
+                    "x": x + dx * (length * distance),
+                    "y": y + dy * (length * distance),
+                    "stack": stack,
+                }
+            )
+
+        return stacks
+
+    def chip_label(self, chips):
+        """Return the bet label shown next to a chip stack."""
+        return f"{chips:.1f} BB" if chips < 10 else f"{chips:.0f} BB"
+
+    def draw_player_chips(self):
+        """Draw chips on the table representing each player's bet with realistic 3D effects."""
+        text_color = self.config.text_color
+        scale_factor = self.config.scale_factor
+
+        # Draw chips for each player who has chips on the table
+        for chip_stack in self.chip_stacks():
+            chip_x, chip_y, stack = chip_stack["x"], chip_stack["y"], chip_stack["stack"]
+
             stack_spacing = 8 * scale_factor
             for idx, denom in enumerate(stack):
-                self._draw_chip(chip_x, chip_y - idx * stack_spacing, chip_colors[denom])
+                self._draw_chip(chip_x, chip_y - idx * stack_spacing, CHIP_COLORS[denom])
 
-            chip_text = (
-                f"{chips:.1f} BB" if chips < 10 else f"{chips:.0f} BB"
-            )
+            chip_text = self.chip_label(chip_stack["chips"])
             text_y = chip_y - (len(stack) - 1) * stack_spacing / 2 - self.player_font.getbbox(chip_text)[3] / 2
-            text_x = chip_x + 15 * scale_factor + 5 * scale_factor + 15
+            text_x = chip_x + 15 * scale_factor + 5 * scale_factor + 15 * scale_factor
             self._draw_text_with_background(
                 chip_text,
                 text_x,
@@ -5,15 +5,56 @@ Configuration settings for the poker table visualizer.
 import os
 from PIL import ImageFont
 
+# Output tiers: fraction of the base resolution each tier is delivered at.
+# Smaller tiers are drawn natively at their size, not downscaled from full.
+RESOLUTION_TIERS = {
+    "thumbnail": 0.25,
+    "preview": 0.5,
+    "full": 1.0,
+}
+DEFAULT_TIER = "full"
+
+# Anti-aliasing of shapes: "supersample" blurs their masks and relies on a
+# scale factor above 1 and a final downscale for clean edges; "native" draws
+# them through coverage masks (see antialias.py), for clean edges at 1x.
+ANTIALIAS_MODES = ("supersample", "native")
+DEFAULT_ANTIALIAS = "supersample"
+
 
 class PokerTableConfig:
-    def __init__(self, scale_factor=2, num_players=8):
+    def __init__(
+        self, scale_factor=2, num_players=8, tier=DEFAULT_TIER, antialias=DEFAULT_ANTIALIAS
+    ):
+        if tier not in RESOLUTION_TIERS:
+            raise ValueError(
+                f"Unknown tier {tier!r}, expected one of: {', '.join(RESOLUTION_TIERS)}"
+            )
+        if antialias not in ANTIALIAS_MODES:
+            raise ValueError(
+                f"Unknown antialias mode {antialias!r}, expected one of: {', '.join(ANTIALIAS_MODES)}"
+            )
+
         # Image dimensions - base dimensions
         self.base_width = 1432
         self.base_height = 849
 
-        # Scale factor for high-res rendering
-        self.scale_factor = scale_factor
+        # Output tier and the size images are delivered at
+        self.tier = tier
+        self.tier_scale = RESOLUTION_TIERS[tier]
+        self.output_width = int(self.base_width * self.tier_scale)
+        self.output_height = int(self.base_height * self.tier_scale)
+
+        # Scale factor for high-res rendering. It includes the tier, so every
+        # size below is in pixels of the tier; supersample is the factor
+        # relative to the output size.
+        self.supersample = scale_factor
+        scale = scale_factor * self.tier_scale
+        # Whole factors stay integers: drawers pass sizes derived from them
+        # to PIL as line widths
+        self.scale_factor = int(scale) if scale == int(scale) else scale
+
+        # How shapes are anti-aliased
+        self.antialias = antialias
 
         # Number of players
         self.num_players = num_players
@@ -3,7 +3,26 @@ Module for drawing players and player-related elements.
 """
 
 import os
-from PIL import Image, ImageDraw, ImageFilter
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from .antialias import composite, fill_shape, shape_mask
+from .assets import load_image
+
+AVATAR_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "avatar.png")
+
+
+@lru_cache(maxsize=16)
+def avatar_sprite(avatar_path, size):
+    """Avatar resized to size x size and cut to a circle with an anti-aliased edge.
+
+    Cached per size and shared between drawers; do not modify the result.
+    """
+    avatar = load_image(avatar_path, "RGBA").resize((size, size), Image.Resampling.LANCZOS)
+    _, mask = shape_mask("ellipse", (0, 0, size, size))
+    avatar.putalpha(ImageChops.multiply(avatar.getchannel("A"), mask))
+    return avatar
 
 
 class PlayerDrawer:
@@ -248,6 +267,14 @@ class PlayerDrawer:
     def _draw_background_circle(self, x, y, radius, player_color):
         """Draw a background circle with anti-aliasing."""
         scale_factor = self.config.scale_factor
+        if self.config.antialias == "native":
+            bbox = (x - radius, y - radius, x + radius, y + radius)
+            fill_shape(self.img, "ellipse", bbox, player_color[:3])
+            self._draw_avatar_in_circle(x, y, radius)
+            border_width = max(1, round(2 * scale_factor))
+            fill_shape(self.img, "ellipse", bbox, (0, 0, 0), width=border_width)
+            self.draw = ImageDraw.Draw(self.img, "RGBA")
+            return
 
         # Create a circular mask for the player
         circle_mask = Image.new("L", (self.config.width, self.config.height), 0)
@@ -299,7 +326,7 @@ class PlayerDrawer:
         border_mask_draw = ImageDraw.Draw(border_mask)
 
         # Draw just the outline on the border mask
-        border_width = 2 * scale_factor
+        border_width = max(1, round(2 * scale_factor))
         border_mask_draw.ellipse(
             [
                 x - radius,
@@ -356,6 +383,20 @@ class PlayerDrawer:
         text_color = self.config.text_color
         corner_radius = height * 0.3  # Rounded corners
 
+        if self.config.antialias == "native":
+            bbox = (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+            # Slightly darker than the circle
+            fill_color = tuple(max(0, int(c * 0.9)) for c in player_color[:3])
+            fill_shape(self.img, "rounded_rectangle", bbox, fill_color, radius=corner_radius)
+            border_width = max(1, round(2 * scale_factor))
+            fill_shape(
+                self.img, "rounded_rectangle", bbox, (0, 0, 0), radius=corner_radius, width=border_width
+            )
+            self.draw = ImageDraw.Draw(self.img, "RGBA")
+            if draw_info:
+                self._draw_player_info(x, y, player, height)
+            return
+
         # Create a mask for the rounded rectangle
         rect_mask = Image.new("L", (self.config.width, self.config.height), 0)
         rect_mask_draw = ImageDraw.Draw(rect_mask)
@@ -411,7 +452,7 @@ class PlayerDrawer:
         border_mask_draw = ImageDraw.Draw(border_mask)
 
         # Draw just the outline on the border mask
-        border_width = 2 * scale_factor
+        border_width = max(1, round(2 * scale_factor))
         border_mask_draw.rounded_rectangle(
             [left, top, right, bottom],
             radius=corner_radius,
@@ -488,12 +529,9 @@ class PlayerDrawer:
             font=self.player_font,
         )
 
-    def _draw_dealer_button(self, x, y, seat_index):
-        """Draw the dealer button next to a player with a simple 3D effect."""
-        dealer_radius = 12 * self.config.scale_factor
+    def dealer_button_center(self, x, y, seat_index):
+        """Return the centre of the dealer button of the player at (x, y)."""
         player_radius = self.config.player_radius
-        scale_factor = self.config.scale_factor
-        dealer_button_color = self.config.dealer_button_color
 
         # --------------------------------------------------------------
         # Custom offsets so the button does not overlap with chips
@@ -523,8 +561,14 @@ class PlayerDrawer:
         }
         offsets = offset_maps.get(self.config.num_players, {})
         dx_factor, dy_factor = offsets.get(seat_index, (0.7, -0.7))
-        button_x = x + player_radius * dx_factor
-        button_y = y + player_radius * dy_factor
+        return x + player_radius * dx_factor, y + player_radius * dy_factor
+
+    def _draw_dealer_button(self, x, y, seat_index):
+        """Draw the dealer button next to a player with a simple 3D effect."""
+        dealer_radius = 12 * self.config.scale_factor
+        scale_factor = self.config.scale_factor
+        dealer_button_color = self.config.dealer_button_color
+        button_x, button_y = self.dealer_button_center(x, y, seat_index)
 
         # Height of the button for the 3D look
         thickness = int(scale_factor * 3)
@@ -537,6 +581,9 @@ class PlayerDrawer:
         shadow_draw = ImageDraw.Draw(shadow_img)
         shadow_draw.ellipse([0, 0, shadow_size, shadow_size], fill=(0, 0, 0, 80))
         shadow_img = shadow_img.filter(ImageFilter.GaussianBlur(radius=scale_factor))
+        if self.config.antialias == "native":
+            self._draw_dealer_button_native(button_x, button_y, dealer_radius, thickness, shadow_img)
+            return
         shadow_overlay = Image.new(
             "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
         )
@@ -580,7 +627,7 @@ class PlayerDrawer:
             [0, 0, shadow_size, shadow_size],
             fill=dealer_button_color,
             outline=(0, 0, 0, 255),
-            width=max(1, scale_factor),
+            width=max(1, int(scale_factor)),
         )
         top_overlay = Image.new(
             "RGBA", (self.config.width, self.config.height), (0, 0, 0, 0)
@@ -606,6 +653,38 @@ class PlayerDrawer:
             font=self.player_font,
         )
 
+    def _draw_dealer_button_native(self, button_x, button_y, dealer_radius, thickness, shadow_img):
+        """Draw the dealer button faces with coverage masks, in place."""
+        composite(
+            self.img,
+            shadow_img,
+            (int(button_x - dealer_radius + thickness), int(button_y - dealer_radius + thickness)),
+        )
+
+        bbox = (
+            button_x - dealer_radius,
+            button_y - dealer_radius,
+            button_x + dealer_radius,
+            button_y + dealer_radius,
+        )
+        edge_bbox = (bbox[0], bbox[1] + thickness, bbox[2], bbox[3] + thickness)
+        edge_color = tuple(max(0, c - 40) for c in self.config.dealer_button_color[:3])
+        fill_shape(self.img, "ellipse", edge_bbox, edge_color)
+        fill_shape(self.img, "ellipse", bbox, self.config.dealer_button_color)
+        outline_width = max(1, int(self.config.scale_factor))
+        fill_shape(self.img, "ellipse", bbox, (0, 0, 0), width=outline_width)
+        self.draw = ImageDraw.Draw(self.img, "RGBA")
+
+        d_text = "D"
+        d_width = self.draw.textlength(d_text, font=self.player_font)
+        d_height = self.player_font.getbbox(d_text)[3]
+        self.draw.text(
+            (button_x - d_width / 2, button_y - d_height / 2),
+            d_text,
+            fill=(0, 0, 0, 255),
+            font=self.player_font,
+        )
+
     def _get_safe_seat_position(self, seat_index):
         """Safely get the seat position even if the index is out of range.
 
@@ -628,12 +707,10 @@ class PlayerDrawer:
     def _load_avatar_image(self):
         """Load and cache the avatar image."""
         if self._avatar_cache is None:
-            avatar_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), "avatar.png"
-            )
+            avatar_path = AVATAR_PATH
             if os.path.exists(avatar_path):
                 try:
-                    self._avatar_cache = Image.open(avatar_path).convert("RGBA")
+                    self._avatar_cache = load_image(avatar_path, "RGBA")
                 except Exception as e:
                     print(f"Warning: Could not load avatar image: {e}")
                     self._avatar_cache = (
@@ -656,6 +733,14 @@ class PlayerDrawer:
         avatar_radius = radius * 0.85
         avatar_size = int(avatar_radius * 2)
 
+        if self.config.antialias == "native":
+            composite(
+                self.img,
+                avatar_sprite(AVATAR_PATH, avatar_size),
+                (int(x - avatar_radius), int(y - avatar_radius - 10 * self.config.scale_factor)),
+            )
+            return
+
         # Resize avatar to fit the circle
         avatar_resized = avatar_img.resize(
             (avatar_size, avatar_size), Image.Resampling.LANCZOS
@@ -678,7 +763,7 @@ class PlayerDrawer:
 
         # Calculate position to center the avatar
         avatar_x = int(x - avatar_radius)
-        avatar_y = int(y - avatar_radius - 10)
+        avatar_y = int(y - avatar_radius - 10 * self.config.scale_factor)
 
         # Apply the circular mask to the avatar
         avatar_masked = Image.new("RGBA", (avatar_size, avatar_size), (0, 0, 0, 0))
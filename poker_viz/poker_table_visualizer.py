@@ -2,16 +2,92 @@
 Main module for poker table visualization.
 """
 
+import io
 import os
+import time
+from contextlib import contextmanager, nullcontext
 from PIL import Image, ImageDraw, ImageFilter
 
-from .config import PokerTableConfig
+from .config import DEFAULT_ANTIALIAS, DEFAULT_TIER, PokerTableConfig
 from .game_data import GameDataProcessor
 from .table_drawer import TableDrawer
 from .player_drawer import PlayerDrawer
 from .card_drawer import CardDrawer
 from .chip_drawer import ChipDrawer
 
+# Version of the rendered output. Bump it whenever a change alters how images
+# look so incremental builds (see build_manifest.py) re-render existing files.
+RENDERER_VERSION = "1"
+
+# Returned for every stage when no stage timer is set, so untimed renders pay
+# for a method call only
+_UNTIMED = nullcontext()
+
+
+# Grid cell, in base pixels, used to split overlays into their non-empty parts
+OVERLAY_TILE = 32
+
+
+def split_overlay(overlay, tile):
+    """
+    Split a mostly transparent overlay into cropped pieces.
+
+    Non-empty cells of a tile grid are grouped into connected regions (one per
+    player rectangle, typically) and each region becomes one piece holding
+    only its own cells, cropped to its bounding box. Pieces never overlap, so
+    compositing all of them at their offsets equals compositing the overlay.
+
+    Args:
+        overlay: RGBA image
+        tile: Grid cell size in pixels
+
+    Returns:
+        List of ((x, y), image) pieces
+    """
+    width, height = overlay.size
+    filled = set()
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            box = (left, top, min(left + tile, width), min(top + tile, height))
+            if overlay.crop(box).getbbox():
+                filled.add((left // tile, top // tile))
+
+    pieces = []
+    while filled:
+        # Collect one connected region of filled cells
+        stack = [filled.pop()]
+        region = []
+        while stack:
+            col, row = stack.pop()
+            region.append((col, row))
+            for dc in (-1, 0, 1):
+                for dr in (-1, 0, 1):
+                    neighbour = (col + dc, row + dr)
+                    if neighbour in filled:
+                        filled.remove(neighbour)
+                        stack.append(neighbour)
+
+        left = min(col for col, _ in region) * tile
+        top = min(row for _, row in region) * tile
+        right = min(width, (max(col for col, _ in region) + 1) * tile)
+        bottom = min(height, (max(row for _, row in region) + 1) * tile)
+        piece = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        for col, row in region:
+            box = (col * tile, row * tile, min((col + 1) * tile, width), min((row + 1) * tile, height))
+            piece.paste(overlay.crop(box), (box[0] - left, box[1] - top))
+        bbox = piece.getbbox()
+        pieces.append(((left + bbox[0], top + bbox[1]), piece.crop(bbox)))
+    return pieces
+
+
+@contextmanager
+def _timed_stage(stage_timer, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_timer(name, time.perf_counter() - start)
+
 
 class PokerTableVisualizer:
     """Main class for creating poker table visualizations."""
@@ -24,6 +100,9 @@ class PokerTableVisualizer:
         output_path="poker_table.png",
         solution_path=None,
         scale_factor=1,
+        stage_timer=None,
+        tier=DEFAULT_TIER,
+        antialias=DEFAULT_ANTIALIAS,
     ):
         """
         Initialize the poker table visualizer.
@@ -35,8 +114,16 @@ class PokerTableVisualizer:
             output_path: Path to save the output image
             solution_path: Path to the solution file (optional)
             scale_factor: Scale factor for rendering (default: 1)
+            stage_timer: Callable receiving (stage name, seconds) for every
+                render stage, for benchmarking (optional)
+            tier: Output tier ("thumbnail", "preview" or "full", see
+                RESOLUTION_TIERS). Smaller tiers are drawn at their own size.
+            antialias: "supersample" (default) or "native", which draws
+                anti-aliased shapes directly so scale_factor=1 needs no
+                supersampling (see ANTIALIAS_MODES)
         """
         self.data = json_data
+        self.stage_timer = stage_timer
         self.card1 = card1
         self.card2 = card2
         self.output_path = output_path
@@ -51,7 +138,7 @@ class PokerTableVisualizer:
 
         # Initialize configuration
         self.config = PokerTableConfig(
-            scale_factor=scale_factor, num_players=num_players
+            scale_factor=scale_factor, num_players=num_players, tier=tier, antialias=antialias
         )
 
         # Setup the image and draw objects
@@ -107,13 +194,46 @@ class PokerTableVisualizer:
         # Template images for static elements.
         # template_base contains everything except the player rectangles so
         # hero cards can be drawn underneath them. rectangles_overlay stores the
-        # pre-rendered rectangles to overlay afterwards.
+        # pre-rendered rectangles to overlay afterwards, as ((x, y), image)
+        # pieces cropped to their bounding boxes (see split_overlay).
         if not hasattr(self, "template_base"):
             self.template_base = None
         if not hasattr(self, "rectangles_overlay"):
             self.rectangles_overlay = None
-        if not hasattr(self, "template_image"):
-            self.template_image = None
+
+    @property
+    def template_image(self):
+        """Full template (base plus player rectangles), composed on demand."""
+        if self.template_base is None:
+            return None
+        template = self.template_base.copy()
+        self._composite_rectangles(template)
+        return template
+
+    def _composite_rectangles(self, img):
+        """Draw the pre-rendered rectangle pieces onto img in place."""
+        for offset, piece in self.rectangles_overlay or ():
+            img.alpha_composite(piece, dest=offset)
+
+    def release_canvas(self):
+        """Drop the working canvas (and the drawers' references to it) between renders.
+
+        render() starts again from a copy of the template, so cached visualizers
+        only need to keep the template images.
+        """
+        self.img = None
+        self.draw = None
+        for drawer in (self.table_drawer, self.player_drawer, self.card_drawer, self.chip_drawer):
+            drawer.img = None
+            drawer.draw = None
+
+    def memory_bytes(self):
+        """Approximate bytes held by the images this visualizer keeps."""
+        images = [self.img, self.template_base]
+        images.extend(piece for _, piece in self.rectangles_overlay or ())
+        return sum(
+            im.width * im.height * len(im.getbands()) for im in images if im is not None
+        )
 
     def create_template(self):
         """Create a template image with static elements pre-rendered."""
@@ -177,19 +297,25 @@ class PokerTableVisualizer:
         rect_overlay, rect_draw = overlay_player_drawer.draw_player_rectangles(
             draw_info=False
         )
-        self.rectangles_overlay = rect_overlay
+        # Most of the overlay is transparent; keep only its non-empty parts
+        self.rectangles_overlay = split_overlay(
+            rect_overlay, int(OVERLAY_TILE * self.config.scale_factor)
+        )
 
         # Store hero position for cache management
         self.hero_position = (
             self.game_data.hero.get("position") if self.game_data.hero else None
         )
 
-        # Compose a full template image for cases where no hero cards are drawn
-        template = Image.alpha_composite(self.template_base, self.rectangles_overlay)
-        template_draw = ImageDraw.Draw(template, "RGBA")
-        self.template_image = template
+        # template_image would composite a full copy; callers only need the
+        # template to be built
+        return self.template_base
 
-        return self.template_image
+    def _stage(self, name):
+        """Report the wall time of a render stage to the stage timer, if any."""
+        if self.stage_timer is None:
+            return _UNTIMED
+        return _timed_stage(self.stage_timer, name)
 
     def refresh(self):
         """Refresh the visualizer's state when reusing it for different hands."""
@@ -213,15 +339,21 @@ class PokerTableVisualizer:
         # Reinitialize all drawers with the current card values
         self._init_drawers()
 
-    def create_visualization(self):
-        """Create the poker table visualization."""
+    def render(self):
+        """
+        Render the poker table visualization without saving it.
+
+        Returns:
+            The rendered PIL image
+        """
         # Refresh the visualizer's state when reusing it
         self.refresh()
 
         # If we don't have a template yet, create one
-        if not self.template_image:
-            self.create_template()
-            self.refresh()  # Refresh again with the template as a base
+        if self.template_base is None:
+            with self._stage("template"):
+                self.create_template()
+                self.refresh()  # Refresh again with the template as a base
 
         # Update drawer objects with the current image and draw objects
         self.player_drawer.img = self.img
@@ -232,28 +364,32 @@ class PokerTableVisualizer:
         self.chip_drawer.draw = self.draw
 
         # Draw villain cards (card backs) for active players
-        cards_img, cards_draw = self.card_drawer.draw_player_cards()
+        with self._stage("villain_cards"):
+            cards_img, cards_draw = self.card_drawer.draw_player_cards()
         self.img = cards_img
         self.draw = cards_draw
 
         # Draw hero cards if provided
         if self.card1 and self.card2:
-            cards_img, cards_draw = self.card_drawer.draw_hero_cards()
+            with self._stage("hero_cards"):
+                cards_img, cards_draw = self.card_drawer.draw_hero_cards()
             self.img = cards_img
             self.draw = cards_draw
 
         # After hero cards, overlay the pre-rendered rectangles so that
         # all cards appear behind them
         if self.rectangles_overlay is not None:
-            self.img = Image.alpha_composite(self.img, self.rectangles_overlay)
-            self.draw = ImageDraw.Draw(self.img, "RGBA")
+            with self._stage("rectangles"):
+                self._composite_rectangles(self.img)
+                self.draw = ImageDraw.Draw(self.img, "RGBA")
 
         # Update player drawer with the current image after cards are drawn
         self.player_drawer.img = self.img
         self.player_drawer.draw = self.draw
 
         # Draw only the player information text
-        player_text_img, player_text_draw = self.player_drawer.draw_player_text()
+        with self._stage("player_text"):
+            player_text_img, player_text_draw = self.player_drawer.draw_player_text()
         self.img = player_text_img
         self.draw = player_text_draw
 
@@ -262,26 +398,49 @@ class PokerTableVisualizer:
         self.chip_drawer.draw = self.draw
 
         # Draw player chips
-        chips_img, chips_draw = self.chip_drawer.draw_player_chips()
+        with self._stage("chips"):
+            chips_img, chips_draw = self.chip_drawer.draw_player_chips()
         self.img = chips_img
         self.draw = chips_draw
 
         # Draw dynamic table text (scenario and pot)
         self.table_drawer.img = self.img
         self.table_drawer.draw = self.draw
-        self.table_drawer.draw_table_text()
+        with self._stage("table_text"):
+            self.table_drawer.draw_table_text()
         self.img = self.table_drawer.img
         self.draw = self.table_drawer.draw
 
         # Skip Gaussian blur for performance optimization
-        # Directly downsample to the original base resolution with a faster filter
-        if hasattr(self.config, "scale_factor") and self.config.scale_factor > 1:
-            self.img = self.img.resize(
-                (self.config.base_width, self.config.base_height), Image.BICUBIC
-            )
+        # Directly downsample supersampled renders to the tier's output size
+        # with a faster filter
+        output_size = (self.config.output_width, self.config.output_height)
+        if self.img.size != output_size:
+            with self._stage("resize"):
+                self.img = self.img.resize(output_size, Image.BICUBIC)
+
+        return self.img
+
+    def render_png_bytes(self):
+        """
+        Render the visualization and encode it as PNG in memory.
+
+        Returns:
+            The PNG file contents as bytes
+        """
+        img = self.render()
+        buffer = io.BytesIO()
+        with self._stage("encode"):
+            img.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    def create_visualization(self):
+        """Create the poker table visualization."""
+        self.render()
 
         # Save the image
-        self.img.save(self.output_path, optimize=True)
+        with self._stage("encode"):
+            self.img.save(self.output_path, optimize=True)
         print(f"Poker table visualization saved to {self.output_path}")
 
         return self.output_path
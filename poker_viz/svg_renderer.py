@@ -0,0 +1,620 @@
+"""
+SVG backend for the poker table visualization.
+
+Renders the scene of PokerTableVisualizer (table, seats, villain card backs,
+hero cards, chips and text) as an SVG document instead of a PNG. Seat
+positions, card slots, chip stacks and dealer buttons come from the PIL
+drawers, so both backends place every element in the same spot.
+
+Everything but the hero cards depends on the scenario only. A renderer builds
+the scene once, as the markup below and above the hero cards, and renders a
+hand by inserting two card references between the two.
+
+Card images, the card back, the avatar and the table logo are sprites: links
+below asset_url (the hand image server serves them at /assets), or data URIs
+with embed_assets, which makes the document self-contained. Sprites used more
+than once are defined once and placed with <use>.
+
+Blurred shadows and soft edges use SVG filters, so they come close to the PNG
+without matching it pixel for pixel. Text asks for the Inter font and falls
+back to the viewer's sans-serif.
+"""
+
+import base64
+import math
+import os
+import threading
+from xml.sax.saxutils import escape
+
+from .assets import ROOT_DIR, load_image
+from .card_drawer import CardDrawer
+from .chip_drawer import CHIP_COLORS, ChipDrawer
+from .config import DEFAULT_TIER, PokerTableConfig, RESOLUTION_TIERS
+from .game_data import GameDataProcessor
+from .player_drawer import PlayerDrawer
+
+SVG_CONTENT_TYPE = "image/svg+xml"
+
+FONT_FAMILY = "Inter, Arial, sans-serif"
+
+CARDS_FOLDER = os.path.join(ROOT_DIR, "cards-images")
+LOGO_NAME = "flow_logo.png"
+AVATAR_NAME = "avatar.png"
+
+_data_uris = {}
+_data_uris_lock = threading.Lock()
+
+
+def asset_data_uri(name):
+    """Return an asset file (relative to the repository root) as a data URI."""
+    with _data_uris_lock:
+        if name not in _data_uris:
+            with open(os.path.join(ROOT_DIR, name), "rb") as f:
+                encoded = base64.b64encode(f.read()).decode("ascii")
+            _data_uris[name] = f"data:image/png;base64,{encoded}"
+        return _data_uris[name]
+
+
+def _num(value):
+    """Format a coordinate with at most two decimals."""
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _paint(color, attribute="fill"):
+    """Return fill or stroke attributes for an RGB(A) color tuple."""
+    r, g, b = color[:3]
+    markup = f'{attribute}="#{r:02x}{g:02x}{b:02x}"'
+    alpha = color[3] if len(color) > 3 else 255
+    if alpha < 255:
+        markup += f' {attribute}-opacity="{_num(alpha / 255)}"'
+    return markup
+
+
+def _thumbnail_size(size, box):
+    """Size PIL's Image.thumbnail(box) gives an image of the given size."""
+    width, height = size
+    x, y = map(math.floor, box)
+    if x >= width and y >= height:
+        return width, height
+
+    def round_aspect(number, key):
+        return max(min(math.floor(number), math.ceil(number), key=key), 1)
+
+    aspect = width / height
+    if x / y >= aspect:
+        x = round_aspect(y * aspect, key=lambda n: abs(aspect - n / y))
+    else:
+        y = round_aspect(x / aspect, key=lambda n: 0 if n == 0 else abs(aspect - x / n))
+    return x, y
+
+
+def _arc_point(radius, degrees):
+    """Point on a circle around the origin; angles run clockwise from 3 o'clock like PIL's."""
+    angle = math.radians(degrees)
+    return _num(radius * math.cos(angle)), _num(radius * math.sin(angle))
+
+
+class SvgTableRenderer:
+    """Renders the hands of one scenario as SVG documents."""
+
+    def __init__(
+        self,
+        json_data,
+        solution_path=None,
+        asset_url="/assets",
+        embed_assets=False,
+        tier=DEFAULT_TIER,
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            json_data: JSON data containing poker game information
+            solution_path: Path to the solution file (optional)
+            asset_url: URL the card, avatar and logo images are served below
+            embed_assets: Embed the images as data URIs instead of linking them
+            tier: Output tier (see RESOLUTION_TIERS). The scene is laid out at
+                full size and only its displayed width and height change.
+        """
+        self.game_data = GameDataProcessor(json_data, solution_path)
+        self.config = PokerTableConfig(scale_factor=1, num_players=self.game_data.num_players)
+        self.title_font, self.player_font, self.card_font = self.config.load_fonts()
+        self.asset_url = asset_url.rstrip("/")
+        self.embed_assets = embed_assets
+        self.tier = tier
+        self.tier_scale = RESOLUTION_TIERS[tier]
+
+        # The PIL drawers provide the layout; they never draw here
+        self.player_drawer = PlayerDrawer(self.config, self.game_data, None, None)
+        self.card_drawer = CardDrawer(self.config, self.game_data, None, None, CARDS_FOLDER)
+        self.chip_drawer = ChipDrawer(self.config, self.game_data, None, None)
+
+        # Markup below and above the hero cards, built on first render
+        self.head = None
+        self.tail = None
+        self.hero_slots = []
+        self._lock = threading.Lock()
+        self._filters = {}
+        self._defs = {}
+
+    def memory_bytes(self):
+        """Approximate bytes held by the cached scene markup."""
+        return len(self.head or "") + len(self.tail or "")
+
+    def render(self, card1, card2):
+        """
+        Render one hand.
+
+        Args:
+            card1: First hero card (e.g., "Ah")
+            card2: Second hero card (e.g., "Kd")
+
+        Returns:
+            The SVG document as a string
+        """
+        if self.head is None:
+            self.build_scene()
+        return self.head + self._hero_cards(card1, card2) + self.tail
+
+    def render_bytes(self, card1, card2):
+        """Render one hand as UTF-8 encoded SVG."""
+        return self.render(card1, card2).encode("utf-8")
+
+    def build_scene(self):
+        """Build the scenario markup around the hero cards."""
+        with self._lock:
+            if self.head is not None:
+                return
+            self._filters = {}
+            self._defs = {}
+
+            # Positions of the seats, as PlayerDrawer lays them out
+            self.player_drawer.draw_player_circles(compute_only=True)
+            seats = self.player_drawer.player_positions
+
+            # Any two cards give the slots; render() fills in the real ones
+            self.card_drawer.card1, self.card_drawer.card2 = "As", "Ks"
+            self.hero_slots = [slot[1:] for slot in self.card_drawer.hero_card_slots()]
+
+            logo_markup, logo_height = self._logo()
+            below = [self._background(), self._table(), logo_markup]
+            below.extend(self._player_circle(seat) for seat in seats)
+            below.append(self._villain_cards())
+
+            above = [self._player_rectangle(seat) for seat in seats]
+            above.extend(self._player_text(seat) for seat in seats)
+            above.append(self._chips())
+            above.append(self._table_text(logo_height))
+
+            width, height = self.config.width, self.config.height
+            head = [
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{int(width * self.tier_scale)}" '
+                f'height="{int(height * self.tier_scale)}" '
+                f'viewBox="0 0 {width} {height}" font-family="{FONT_FAMILY}">',
+                "<defs>",
+                *self._defs.values(),
+                *(
+                    f'<filter id="{filter_id}" x="-50%" y="-50%" width="200%" height="200%">'
+                    f'<feGaussianBlur stdDeviation="{_num(deviation)}"/></filter>'
+                    for filter_id, deviation in self._filters.items()
+                ),
+                "</defs>",
+                *below,
+            ]
+            self.tail = "".join(above) + "</svg>"
+            self.head = "".join(head)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _href(self, name):
+        if self.embed_assets:
+            return asset_data_uri(name)
+        return f"{self.asset_url}/{name}"
+
+    def _define(self, def_id, markup):
+        """Add an element to <defs> once and return its id."""
+        self._defs.setdefault(def_id, markup)
+        return def_id
+
+    def _blur(self, deviation):
+        """Return the filter attribute of a Gaussian blur, defining it once."""
+        filter_id = f"blur-{_num(deviation).replace('.', '_')}"
+        self._filters[filter_id] = deviation
+        return f'filter="url(#{filter_id})"'
+
+    def _rounded_rect(self, bbox, radius, attributes, inset=0):
+        """Rounded rectangle over a PIL bbox, optionally shrunk by inset on all sides."""
+        left, top, right, bottom = (
+            bbox[0] + inset,
+            bbox[1] + inset,
+            bbox[2] - inset,
+            bbox[3] - inset,
+        )
+        width, height = right - left, bottom - top
+        radius = max(0, min(radius - inset, width / 2, height / 2))
+        return (
+            f'<rect x="{_num(left)}" y="{_num(top)}" width="{_num(width)}" height="{_num(height)}" '
+            f'rx="{_num(radius)}" {attributes}/>'
+        )
+
+    def _outline(self, bbox, radius, width, color, extra=""):
+        """PIL-style outline: a stroke of the given width inside the bbox."""
+        return self._rounded_rect(
+            bbox, radius, f'fill="none" {_paint(color, "stroke")} stroke-width="{_num(width)}" {extra}', inset=width / 2
+        )
+
+    def _text(self, text, x, y, fill, font=None):
+        """Text whose top-left is at (x, y), like ImageDraw.text."""
+        font = font or self.player_font
+        baseline = y + font.getmetrics()[0]
+        return (
+            f'<text x="{_num(x)}" y="{_num(baseline)}" font-size="{font.size}" {_paint(fill)}>'
+            f"{escape(text)}</text>"
+        )
+
+    def _text_with_background(self, text, x, y, fill, padding):
+        """Text on a soft rounded background, like TableDrawer._draw_text_with_background."""
+        text_width = self.player_font.getlength(text)
+        text_height = self.player_font.getbbox(text)[3]
+        radius = (text_height + padding * 2) // 2
+        bbox = [
+            x - padding - 10,
+            y - padding,
+            x + text_width + padding + 10,
+            y + text_height + padding,
+        ]
+        background = self._rounded_rect(bbox, radius, f"{_paint(self.config.text_bg_color)} {self._blur(2)}")
+        return background + self._text(text, x, y, fill)
+
+    # ------------------------------------------------------------------
+    # Table
+    # ------------------------------------------------------------------
+    def _table_geometry(self):
+        """The bounding boxes TableDrawer.draw_table uses."""
+        config = self.config
+        table_left = config.table_center_x - config.table_width // 2
+        table_top = config.table_center_y - config.table_height // 2
+        table_right = table_left + config.table_width
+        table_bottom = table_top + config.table_height
+        border = int(min(config.table_width, config.table_height) * 0.08)
+        depth = max(6, config.table_height // 12)
+        return {
+            "border": border,
+            "depth": depth,
+            "radius": config.table_height // 2,
+            "top": [table_left, table_top, table_right, table_bottom],
+            "bottom": [table_left, table_top + depth, table_right, table_bottom + depth],
+            "outer_top": [
+                table_left - border,
+                table_top - border,
+                table_right + border,
+                table_bottom + border,
+            ],
+            "side": [table_left - border, table_top, table_right + border, table_bottom + depth],
+        }
+
+    def _background(self):
+        """Black background with a soft grey glow around the table."""
+        config = self.config
+        extra = max(config.table_width, config.table_height)
+        # A disk of radius `extra` blurred by extra / 2: full inside, half at
+        # its edge, gone at twice the radius
+        self._define(
+            "glow",
+            f'<radialGradient id="glow" gradientUnits="userSpaceOnUse" cx="{config.table_center_x}" '
+            f'cy="{config.table_center_y}" r="{extra * 2}">'
+            '<stop offset="0" stop-color="#282828"/>'
+            '<stop offset="0.25" stop-color="#282828" stop-opacity="0.93"/>'
+            '<stop offset="0.5" stop-color="#282828" stop-opacity="0.5"/>'
+            '<stop offset="0.75" stop-color="#282828" stop-opacity="0.07"/>'
+            '<stop offset="1" stop-color="#282828" stop-opacity="0"/>'
+            "</radialGradient>"
+        )
+        return (
+            f'<rect width="{config.width}" height="{config.height}" fill="#000000"/>'
+            f'<rect width="{config.width}" height="{config.height}" fill="url(#glow)"/>'
+        )
+
+    def _table(self):
+        """Table shadow, wooden border and felt."""
+        config = self.config
+        table = self._table_geometry()
+        border, depth, radius = table["border"], table["depth"], table["radius"]
+        table_color = config.table_color
+        darker_color = tuple(max(0, c - 25) for c in table_color[:3]) + (table_color[3],)
+        wood_color = (133, 94, 66, 255)
+        wood_light = tuple(min(255, c + 20) for c in wood_color[:3]) + (120,)
+
+        shadow_offset = depth * 2
+        shadow_bbox = [
+            table["outer_top"][0] + shadow_offset,
+            table["top"][1] + depth - border + shadow_offset,
+            table["outer_top"][2] + shadow_offset,
+            table["bottom"][3] + border + shadow_offset,
+        ]
+        highlight_width = max(1, border // 2)
+        inner_width = max(1, border // 2)
+        self._define(
+            "upper-half",
+            f'<clipPath id="upper-half"><rect width="{config.width}" height="{config.table_center_y}"/></clipPath>'
+        )
+
+        # TableDrawer draws the accent line and the black outlines on an
+        # overlay it has already replaced, so the PNG shows neither
+        return "".join(
+            [
+                self._rounded_rect(shadow_bbox, radius + border, f'fill="#000000" fill-opacity="{_num(120 / 255)}" {self._blur(depth)}'),
+                self._rounded_rect(table["side"], radius + border, _paint(wood_color)),
+                self._rounded_rect(table["bottom"], radius, _paint(darker_color)),
+                self._rounded_rect(table["outer_top"], radius + border, _paint(wood_color)),
+                self._rounded_rect(table["top"], radius, _paint(table_color)),
+                self._outline(
+                    table["outer_top"],
+                    radius + border,
+                    highlight_width,
+                    wood_light,
+                    self._blur(max(1, highlight_width // 2)),
+                ),
+                # Inner shadow along the far edge: clipped first, then blurred
+                f"<g {self._blur(max(1, inner_width // 2))}>",
+                '<g clip-path="url(#upper-half)">',
+                self._outline(table["top"], radius, inner_width, (0, 0, 0, 80)),
+                "</g></g>",
+            ]
+        )
+
+    def _logo(self):
+        """Faded logo in the middle of the table, and its height."""
+        logo_path = os.path.join(ROOT_DIR, LOGO_NAME)
+        if not os.path.exists(logo_path):
+            return "", 0
+        table = self._table_geometry()
+        accent_inset = max(1, table["border"] // 3)
+        max_w = table["top"][2] - table["top"][0] - 2 * accent_inset
+        max_h = table["top"][3] - table["top"][1] - 2 * accent_inset
+        width, height = _thumbnail_size(load_image(logo_path).size, (int(max_w * 0.5), int(max_h * 0.5)))
+        x = int(self.config.table_center_x - width / 2)
+        y = int(self.config.table_center_y - height / 2)
+        markup = (
+            f'<image href="{self._href(LOGO_NAME)}" x="{x}" y="{y}" width="{width}" height="{height}" '
+            f'opacity="0.2" preserveAspectRatio="none"/>'
+        )
+        return markup, height
+
+    def _table_text(self, logo_height):
+        """Scenario and pot text, like TableDrawer.draw_table_text."""
+        config = self.config
+        padding = 4 * config.scale_factor
+
+        scenario_text = self.game_data.get_scenario_description()
+        scenario_width = self.player_font.getlength(scenario_text)
+        scenario_height = self.title_font.getbbox(scenario_text)[3]
+        scenario_y = config.table_center_y - logo_height / 4 - scenario_height - 25
+        scenario_x = config.table_center_x - scenario_width / 2
+
+        pot_text = f"Total Pot: {self.game_data.pot:.2f} BB"
+        pot_width = self.player_font.getlength(pot_text)
+        pot_y = config.table_center_y + logo_height / 4 + 30
+        pot_x = config.table_center_x - pot_width / 2
+
+        return self._text_with_background(
+            scenario_text, scenario_x, scenario_y, config.scenario_text_color, padding
+        ) + self._text_with_background(pot_text, pot_x, pot_y, config.text_color, padding)
+
+    # ------------------------------------------------------------------
+    # Players
+    # ------------------------------------------------------------------
+    def _player_circle(self, seat):
+        """Seat circle with the avatar, like PlayerDrawer._draw_background_circle."""
+        scale_factor = self.config.scale_factor
+        radius = self.config.player_radius
+        x, y = seat["x"], seat["y"] - 0.8 * radius
+        markup = [f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{_num(radius)}" {_paint(seat["color"])}/>']
+
+        if os.path.exists(os.path.join(ROOT_DIR, AVATAR_NAME)):
+            avatar_radius = radius * 0.85
+            avatar_size = int(avatar_radius * 2)
+            self._define(
+                "avatar",
+                f'<image id="avatar" href="{self._href(AVATAR_NAME)}" width="{avatar_size}" '
+                f'height="{avatar_size}" preserveAspectRatio="none"/>'
+                f'<clipPath id="avatar-clip"><circle cx="{_num(avatar_size / 2)}" '
+                f'cy="{_num(avatar_size / 2)}" r="{_num(avatar_size / 2)}"/></clipPath>',
+            )
+            avatar_x = int(x - avatar_radius)
+            avatar_y = int(y - avatar_radius - 10)
+            markup.append(
+                f'<g transform="translate({avatar_x} {avatar_y})">'
+                f'<use href="#avatar" clip-path="url(#avatar-clip)"/></g>'
+            )
+
+        border_width = 2 * scale_factor
+        markup.append(
+            f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{_num(radius - border_width / 2)}" fill="none" '
+            f'stroke="#000000" stroke-width="{_num(border_width)}"/>'
+        )
+        return "".join(markup)
+
+    def _player_rectangle(self, seat):
+        """Seat rectangle and dealer button, like PlayerDrawer._draw_player_rectangle."""
+        scale_factor = self.config.scale_factor
+        player_radius = self.config.player_radius
+        width = player_radius * 1.8
+        height = player_radius * 1.2
+        x, y = seat["x"], seat["y"]
+        bbox = [x - width / 2, y - height / 2, x + width / 2, y + height / 2]
+        color = tuple(max(0, int(c * 0.9)) for c in seat["color"][:3])
+
+        markup = self._rounded_rect(bbox, height * 0.3, _paint(color))
+        markup += self._outline(bbox, height * 0.3, 2 * scale_factor, (0, 0, 0))
+        if seat["is_dealer"]:
+            markup += self._dealer_button(x, y, seat["seat_index"])
+        return markup
+
+    def _dealer_button(self, x, y, seat_index):
+        """Dealer button with shadow and thickness, like PlayerDrawer._draw_dealer_button."""
+        scale_factor = self.config.scale_factor
+        radius = 12 * scale_factor
+        thickness = int(scale_factor * 3)
+        color = self.config.dealer_button_color
+        edge_color = tuple(max(0, c - 40) for c in color[:3])
+        button_x, button_y = self.player_drawer.dealer_button_center(x, y, seat_index)
+        outline_width = max(1, scale_factor)
+
+        d_width = self.player_font.getlength("D")
+        d_height = self.player_font.getbbox("D")[3]
+        return (
+            f'<circle cx="{_num(button_x + thickness)}" cy="{_num(button_y + thickness)}" r="{_num(radius)}" '
+            f'fill="#000000" fill-opacity="{_num(80 / 255)}" {self._blur(scale_factor)}/>'
+            f'<circle cx="{_num(button_x)}" cy="{_num(button_y + thickness)}" r="{_num(radius)}" {_paint(edge_color)}/>'
+            f'<circle cx="{_num(button_x)}" cy="{_num(button_y)}" r="{_num(radius - outline_width / 2)}" '
+            f'{_paint(color)} stroke="#000000" stroke-width="{_num(outline_width)}"/>'
+            + self._text("D", button_x - d_width / 2, button_y - d_height / 2, (0, 0, 0))
+        )
+
+    def _player_text(self, seat):
+        """Position and stack inside the seat rectangle, like PlayerDrawer._draw_player_info."""
+        rect_height = self.config.player_radius * 1.2
+        player = seat["player"]
+        x, y = seat["x"], seat["y"]
+        text_color = self.config.text_color
+
+        position_text = player.get("position", "")
+        stack_text = f"{round(float(player.get('current_stack', 0)), 2):.1f} BB"
+        markup = ""
+        for text, center_y in ((position_text, y - rect_height * 0.25), (stack_text, y + rect_height * 0.25)):
+            text_width = self.player_font.getlength(text)
+            top = center_y - self.player_font.getbbox(text)[3] / 2
+            markup += self._text(text, x - text_width / 2, top, text_color)
+        return markup
+
+    # ------------------------------------------------------------------
+    # Cards
+    # ------------------------------------------------------------------
+    def _card(self, href, x, y, width, height, rotation_angle):
+        """Card image centred on (x, y) and rotated like CardDrawer's rotated cards."""
+        return (
+            f'<image href="{href}" x="{_num(-width / 2)}" y="{_num(-height / 2)}" width="{width}" '
+            f'height="{height}" preserveAspectRatio="none" '
+            f'transform="translate({_num(x)} {_num(y)}) rotate({-rotation_angle})"/>'
+        )
+
+    def _villain_cards(self):
+        slots = self.card_drawer.villain_card_slots()
+        if not slots:
+            return ""
+        _, _, width, height, _ = slots[0]
+        self._define(
+            "card-back",
+            f'<image id="card-back" href="{self._href("cards-images/back.png")}" x="{_num(-width / 2)}" '
+            f'y="{_num(-height / 2)}" width="{width}" height="{height}" preserveAspectRatio="none"/>'
+        )
+        return "".join(
+            f'<use href="#card-back" transform="translate({_num(x)} {_num(y)}) rotate({-rotation_angle})"/>'
+            for x, y, _, _, rotation_angle in slots
+        )
+
+    def _hero_cards(self, card1, card2):
+        """The two hero cards; the only part of the document that depends on the hand."""
+        if not (card1 and card2):
+            return ""
+        markup = ""
+        for card, (x, y, width, height, rotation_angle) in zip((card1, card2), self.hero_slots):
+            if not card or len(card) < 2:
+                continue
+            filename = CardDrawer.card_filename(card)
+            if os.path.exists(os.path.join(CARDS_FOLDER, filename)):
+                markup += self._card(self._href(f"cards-images/{filename}"), x, y, width, height, rotation_angle)
+            else:
+                markup += self._fallback_card(card, x, y, width, height, rotation_angle)
+        return markup
+
+    def _fallback_card(self, card, x, y, width, height, rotation_angle):
+        """Plain white card with its rank and suit, for cards without an image."""
+        suit = card[-1].lower()
+        symbol = {"s": "♠", "h": "♥", "d": "♦", "c": "♣"}.get(suit, suit)
+        color = self.config.red_suits if suit in ("h", "d") else self.config.black_suits
+        return (
+            f'<g transform="translate({_num(x)} {_num(y)}) rotate({-rotation_angle})">'
+            f'<rect x="{_num(-width / 2)}" y="{_num(-height / 2)}" width="{width}" height="{height}" '
+            f'{_paint(self.config.card_bg)} stroke="#000000" stroke-width="2"/>'
+            f'<text x="0" y="{_num(height * 0.15)}" text-anchor="middle" font-size="{_num(height * 0.4)}" '
+            f"{_paint(color)}>{escape(card[:-1].upper() + symbol)}</text></g>"
+        )
+
+    # ------------------------------------------------------------------
+    # Chips
+    # ------------------------------------------------------------------
+    def _chip_symbol(self, chip_color):
+        """Define one chip of a color at the origin, like ChipDrawer._draw_chip."""
+        chip_id = "chip-{:02x}{:02x}{:02x}".format(*chip_color)
+        if chip_id in self._defs:
+            return chip_id
+
+        scale_factor = self.config.scale_factor
+        radius = 15 * scale_factor
+        rim_width = radius * 0.2
+        ratio = 0.6
+        ellipse_ry = int(radius * 2 * ratio) / 2
+        thickness = int(scale_factor * 4)
+        border_color = tuple(max(0, c - 40) for c in chip_color)
+        edge_color = tuple(max(0, c - 30) for c in chip_color)
+        inner_rim_radius = radius - rim_width
+        label_radius = inner_rim_radius * 0.6
+
+        notches = []
+        for i in range(8):
+            start = i * 45 - 10
+            x1, y1 = _arc_point(radius, start)
+            x2, y2 = _arc_point(radius, start + 20)
+            notches.append(f"M0 0L{x1} {y1}A{_num(radius)} {_num(radius)} 0 0 1 {x2} {y2}Z")
+        hx1, hy1 = _arc_point(label_radius, 20)
+        hx2, hy2 = _arc_point(label_radius, 160)
+
+        shadow_offset = int(scale_factor)
+        return self._define(
+            chip_id,
+            f'<g id="{chip_id}">'
+            f'<ellipse cx="{shadow_offset}" cy="{shadow_offset}" rx="{_num(radius)}" ry="{_num(ellipse_ry)}" '
+            f'fill="#000000" fill-opacity="{_num(80 / 255)}" {self._blur(scale_factor)}/>'
+            f'<ellipse cy="{thickness}" rx="{_num(radius)}" ry="{_num(ellipse_ry)}" {_paint(edge_color)}/>'
+            f'<g transform="scale(1 {_num(ellipse_ry / radius)})">'
+            f'<circle r="{_num(radius - scale_factor / 2)}" {_paint(chip_color)} {_paint(border_color, "stroke")} '
+            f'stroke-width="{_num(scale_factor)}"/>'
+            f'<path d="{"".join(notches)}" fill="#ffffff"/>'
+            f'<circle r="{_num(inner_rim_radius)}" {_paint(chip_color)}/>'
+            f'<circle r="{_num(label_radius)}" fill="#ffffff" {_paint(border_color, "stroke")} '
+            f'stroke-width="{_num(scale_factor * 0.8)}"/>'
+            f'<path d="M{hx1} {hy1}A{_num(label_radius)} {_num(label_radius)} 0 0 1 {hx2} {hy2}" fill="none" '
+            f'{_paint((220, 220, 220, 180), "stroke")} stroke-width="{_num(scale_factor)}"/>'
+            "</g></g>",
+        )
+
+    def _chips(self):
+        """Bet stacks and their labels, like ChipDrawer.draw_player_chips."""
+        scale_factor = self.config.scale_factor
+        stack_spacing = 8 * scale_factor
+        markup = []
+        for chip_stack in self.chip_drawer.chip_stacks():
+            chip_x, chip_y, stack = chip_stack["x"], chip_stack["y"], chip_stack["stack"]
+            for idx, denom in enumerate(stack):
+                chip_id = self._chip_symbol(CHIP_COLORS[denom])
+                markup.append(
+                    f'<use href="#{chip_id}" x="{_num(chip_x)}" y="{_num(chip_y - idx * stack_spacing)}"/>'
+                )
+
+            chip_text = self.chip_drawer.chip_label(chip_stack["chips"])
+            text_y = (
+                chip_y
+                - (len(stack) - 1) * stack_spacing / 2
+                - self.player_font.getbbox(chip_text)[3] / 2
+            )
+            text_x = chip_x + 15 * scale_factor + 5 * scale_factor + 15
+            markup.append(
+                self._text_with_background(
+                    chip_text, text_x, text_y, self.config.text_color, 4 * scale_factor
+                )
+            )
+        return "".join(markup)
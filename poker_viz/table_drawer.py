@@ -5,6 +5,9 @@ Module for drawing the poker table and its components.
 from PIL import Image, ImageDraw, ImageFilter
 import os
 
+from .antialias import fill_shape
+from .assets import load_image
+
 
 class TableDrawer:
     """Draws the poker table and related elements."""
@@ -68,10 +71,13 @@ class TableDrawer:
         if radius is None:
             radius = (text_height + padding * 2) // 2
 
+        # Margin and blur scale with the rendering, like the padding callers pass
+        margin = 10 * self.config.scale_factor
+        blur = blur * self.config.scale_factor
         bbox = [
-            x - padding - 10,
+            x - padding - margin,
             y - padding,
-            x + text_width + padding + 10,
+            x + text_width + padding + margin,
             y + text_height + padding,
         ]
 
@@ -214,25 +220,35 @@ class TableDrawer:
         )
         overlay_draw = ImageDraw.Draw(table_overlay, "RGBA")
 
-        # Draw the side of the table for the 3D effect
-        overlay_draw.rounded_rectangle(
-            [int(x) for x in side_bbox],
-            radius=int(radius + border_thickness),
-            fill=wood_color,
-        )
-        overlay_draw.rounded_rectangle(
-            [int(x) for x in bottom_bbox], radius=int(radius), fill=darker_color
-        )
-
-        # Draw the flat wooden border on top
-        overlay_draw.rounded_rectangle(
-            [int(x) for x in outer_top_bbox],
-            radius=int(radius + border_thickness),
-            fill=wood_color,
-        )
-        overlay_draw.rounded_rectangle(
-            [int(x) for x in top_bbox], radius=int(radius), fill=table_color
-        )
+        if self.config.antialias == "native":
+            # Side, bottom, wooden border and surface, with anti-aliased edges
+            for bbox, shape_radius, color in (
+                (side_bbox, radius + border_thickness, wood_color),
+                (bottom_bbox, radius, darker_color),
+                (outer_top_bbox, radius + border_thickness, wood_color),
+                (top_bbox, radius, table_color),
+            ):
+                fill_shape(table_overlay, "rounded_rectangle", bbox, color, radius=shape_radius)
+        else:
+            # Draw the side of the table for the 3D effect
+            overlay_draw.rounded_rectangle(
+                [int(x) for x in side_bbox],
+                radius=int(radius + border_thickness),
+                fill=wood_color,
+            )
+            overlay_draw.rounded_rectangle(
+                [int(x) for x in bottom_bbox], radius=int(radius), fill=darker_color
+            )
+
+            # Draw the flat wooden border on top
+            overlay_draw.rounded_rectangle(
+                [int(x) for x in outer_top_bbox],
+                radius=int(radius + border_thickness),
+                fill=wood_color,
+            )
+            overlay_draw.rounded_rectangle(
+                [int(x) for x in top_bbox], radius=int(radius), fill=table_color
+            )
 
         line_width = 2 * scale_factor
 
@@ -298,7 +314,8 @@ class TableDrawer:
         )
         logo_height = 0
         if os.path.exists(logo_path):
-            logo = Image.open(logo_path).convert("RGBA")
+            # The bundled logo is shared; thumbnail() below resizes in place
+            logo = load_image(logo_path, "RGBA").copy()
             max_w = accent_bbox[2] - accent_bbox[0]
             max_h = accent_bbox[3] - accent_bbox[1]
             target_size = (int(max_w * 0.5), int(max_h * 0.5))
@@ -346,7 +363,7 @@ class TableDrawer:
         scenario_text = self.game_data.get_scenario_description()
         scenario_width = self.draw.textlength(scenario_text, font=self.player_font)
         scenario_height = self.title_font.getbbox(scenario_text)[3]
-        scenario_y = table_center_y - logo_height / 4 - scenario_height - 25
+        scenario_y = table_center_y - logo_height / 4 - scenario_height - 25 * scale_factor
         scenario_x = table_center_x - scenario_width / 2
         self._draw_text_with_background(
             scenario_text,
@@ -359,7 +376,7 @@ class TableDrawer:
 
         pot_text = f"Total Pot: {self.game_data.pot:.2f} BB"
         pot_width = self.draw.textlength(pot_text, font=self.player_font)
-        pot_y = table_center_y + logo_height / 4 + 30
+        pot_y = table_center_y + logo_height / 4 + 30 * scale_factor
         pot_x = table_center_x - pot_width / 2
         self._draw_text_with_background(
             pot_text,
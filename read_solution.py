@@ -2,14 +2,25 @@ import json
 import pandas as pd
 import numpy as np
 
-def read_spot_solution(spot_solution_json):
-
+def read_spot_solution(spot_solution_json, output_csv="hand_solutions.csv", verbose=True):
+    """
+    Build a per-hand DataFrame of strategies and EVs from a spot solution.
+
+    Args:
+        spot_solution_json (dict): Parsed spot solution
+        output_csv (str, optional): CSV file to save the results to, or None to skip saving
+        verbose (bool, optional): Print the available actions and the first rows
+
+    Returns:
+        pandas.DataFrame: One row per hand
+    """
     data = spot_solution_json
 
     # Get all available action codes
     action_solutions = data["action_solutions"]
     all_actions = [a["action"]["code"] for a in action_solutions]
-    print(f"Available actions: {all_actions}")
+    if verbose:
+        print(f"Available actions: {all_actions}")
 
     # Extract hand decision mappings
     hand_solutions = []
@@ -65,12 +76,15 @@ def read_spot_solution(spot_solution_json):
     df_solutions = pd.DataFrame(hand_solutions)
 
     # Display the first few rows with all columns
-    pd.set_option("display.max_columns", None)
-    pd.set_option("display.width", 120)
-    print(df_solutions.head(40))
+    if verbose:
+        pd.set_option("display.max_columns", None)
+        pd.set_option("display.width", 120)
+        print(df_solutions.head(40))
 
     # Save the results to a CSV file
-    df_solutions.to_csv("hand_solutions.csv", index=False)
-    print("\nResults saved to hand_solutions.csv")
+    if output_csv:
+        df_solutions.to_csv(output_csv, index=False)
+        if verbose:
+            print(f"\nResults saved to {output_csv}")
 
     return df_solutions
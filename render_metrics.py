@@ -0,0 +1,390 @@
+"""
+Minimal Prometheus metrics for the hand image server.
+
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format for a /metrics endpoint. Kept dependency-free so the server
+image needs nothing beyond requirements.txt.
+
+Every metric is thread-safe. A disabled registry hands out no-op metrics and a
+None stage timer, so instrumented code costs nothing when metrics are off.
+
+Gunicorn workers are separate processes, each with its own registry. Given a
+multiprocess directory, every process writes its series to <pid>.json there
+on flush(), and render() merges the files of all processes, in the manner of
+prometheus_client's multiprocess mode: counters and histograms are summed over
+every process that ever wrote, and gauges are summed (livesum) or reported per
+process with a pid label (liveall), counting only processes still running. A
+forked worker starts from empty series, so what its parent counted before the
+fork stays in the parent's file and is not counted twice.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; render stages range from sub-millisecond overlays to multi-second templates
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger("render_metrics")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class: a named family of labelled series"""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def snapshot(self):
+        """The series as a JSON-serializable list of [label values, value]"""
+        with self.lock:
+            return [[list(key), value] for key, value in self.series.items()]
+
+    def merge(self, snapshots):
+        """
+        Combine the snapshots of several processes into one series dict
+
+        Parameters:
+        snapshots (list): (pid, alive, snapshot) of every process
+
+        Returns:
+        dict: Label values to value, summed over the processes
+        """
+        merged = {}
+        for _, _, snapshot in snapshots:
+            for key, value in snapshot:
+                key = tuple(key)
+                merged[key] = self._add(merged.get(key), value)
+        return merged
+
+    def _add(self, total, value):
+        return value if total is None else total + value
+
+    def render(self, series=None):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        if series is None:
+            with self.lock:
+                series = dict(self.series)
+        for key, value in sorted(series.items()):
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), multiprocess_mode="livesum"):
+        """
+        Initialize the gauge
+
+        Parameters:
+        name (str): Metric name
+        documentation (str): Help text
+        labelnames (tuple): Label names
+        multiprocess_mode (str): How the values of several processes are merged,
+            "livesum" (summed) or "liveall" (one series per process, labelled by pid).
+            Only running processes count in either mode.
+        """
+        super().__init__(name, documentation, labelnames)
+        if multiprocess_mode not in ("livesum", "liveall"):
+            raise ValueError(f"Unknown multiprocess mode: {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.series[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        """Count the enclosed block while it runs"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def merge(self, snapshots):
+        live = [(pid, alive, snapshot) for pid, alive, snapshot in snapshots if alive]
+        if self.multiprocess_mode == "livesum":
+            return super().merge(live)
+        merged = {}
+        for pid, _, snapshot in live:
+            for key, value in snapshot:
+                merged[tuple(key) + (str(pid),)] = value
+        return merged
+
+    def render(self, series=None):
+        if series is None or self.multiprocess_mode != "liveall":
+            return super().render(series)
+        labelnames = self.labelnames + ("pid",)
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(series.items()):
+            lines.append(f"{self.name}{_format_labels(labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return [[list(key), [list(counts), total]] for key, (counts, total) in self.series.items()]
+
+    def _add(self, total, value):
+        if total is None:
+            return [list(value[0]), value[1]]
+        total[0] = [a + b for a, b in zip(total[0], value[0])]
+        total[1] += value[1]
+        return total
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(float(bound))))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _NoopMetric:
+    """Stand-in for every metric type when metrics are disabled"""
+
+    def inc(self, amount=1, **labels):
+        pass
+
+    def dec(self, amount=1, **labels):
+        pass
+
+    def set(self, value, **labels):
+        pass
+
+    def observe(self, value, **labels):
+        pass
+
+    def time(self, **labels):
+        return _NULL_CONTEXT
+
+    def track_inprogress(self, **labels):
+        return _NULL_CONTEXT
+
+
+_NULL_CONTEXT = nullcontext()
+_NOOP = _NoopMetric()
+
+
+def _process_alive(pid):
+    """Whether a process with this PID is running"""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running, under another user
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self, enabled=True, multiprocess_dir=None):
+        """
+        Initialize the registry
+
+        Parameters:
+        enabled (bool): When False every metric is a no-op and nothing is exported
+        multiprocess_dir (str, optional): Directory shared by the processes of one
+            server, where each writes its series and from which render() merges
+            them. Files left by processes that are no longer running are removed
+            here, so create the registry once per server start, before forking
+            (gunicorn --preload).
+        """
+        self.enabled = enabled
+        self.metrics = []
+        self.multiprocess_dir = multiprocess_dir if enabled else None
+        self.flush_lock = threading.Lock()
+        if self.multiprocess_dir:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            self._remove_dead_files()
+            os.register_at_fork(after_in_child=self._reset)
+            logger.info(f"Merging the metrics of all processes through {self.multiprocess_dir}")
+
+    def _register(self, metric):
+        if not self.enabled:
+            return _NOOP
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), multiprocess_mode="livesum"):
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def stage_timer(self, histogram):
+        """
+        Callback for PokerTableVisualizer(stage_timer=...) feeding a histogram
+        labelled by stage, or None when disabled so the renderer skips timing
+        """
+        if not self.enabled:
+            return None
+        return lambda stage, seconds: histogram.observe(seconds, stage=stage)
+
+    def _reset(self):
+        """Start a forked child from empty series; its parent's stay in the parent's file"""
+        # Another thread of the parent may have held a lock at fork time
+        self.flush_lock = threading.Lock()
+        for metric in self.metrics:
+            metric.lock = threading.Lock()
+            metric.series = {}
+
+    def _remove_dead_files(self):
+        for name in os.listdir(self.multiprocess_dir):
+            try:
+                pid = int(name.split(".")[0])
+            except ValueError:
+                continue
+            if not _process_alive(pid):
+                try:
+                    os.remove(os.path.join(self.multiprocess_dir, name))
+                except OSError:
+                    pass
+
+    def flush(self):
+        """Write this process's series to the multiprocess directory, if there is one"""
+        if not self.multiprocess_dir:
+            return
+        data = {metric.name: metric.snapshot() for metric in self.metrics}
+        path = os.path.join(self.multiprocess_dir, f"{os.getpid()}.json")
+        with self.flush_lock:
+            # Replaced whole, so readers never see a partly written file
+            with open(path + ".tmp", "w") as f:
+                json.dump(data, f)
+            os.replace(path + ".tmp", path)
+
+    def _read_snapshots(self):
+        """(pid, alive, series by metric name) of every process in the directory"""
+        snapshots = []
+        for name in os.listdir(self.multiprocess_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                pid = int(name[: -len(".json")])
+                with open(os.path.join(self.multiprocess_dir, name)) as f:
+                    data = json.load(f)
+            except (ValueError, OSError):
+                continue
+            snapshots.append((pid, _process_alive(pid), data))
+        return snapshots
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        if self.multiprocess_dir:
+            self.flush()
+            snapshots = self._read_snapshots()
+            for metric in self.metrics:
+                series = metric.merge(
+                    [(pid, alive, data.get(metric.name, [])) for pid, alive, data in snapshots]
+                )
+                lines.extend(metric.render(series))
+        else:
+            for metric in self.metrics:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
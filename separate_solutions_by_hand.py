@@ -5,6 +5,8 @@ from pathlib import Path
 import argparse
 from read_solution import read_spot_solution
 from clear_spot_solution_json import clear_spot_solution_json
+from hand_pack import HandPackWriter, PACK_FILENAME
+from solution_scanner import scan_files
 import logging
 import random
 from concurrent.futures import ProcessPoolExecutor, as_completed
@@ -18,6 +20,42 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def build_scenario_metadata(original_file_path, metadata):
+    """Build the scenario part of a hand's metadata"""
+    return {
+        "original_file": str(original_file_path),
+        "mode": metadata.get("mode", ""),
+        "field_size": metadata.get("field_size", 0),
+        "field_left": metadata.get("field_left", ""),
+        "position": metadata.get("position", ""),
+        "stack_depth": metadata.get("stack_depth", ""),
+        "action": metadata.get("action", ""),
+        "game_type": metadata.get("game_type", ""),
+        "street": metadata.get("street", ""),
+        "action_sequence": metadata.get("action_sequence", ""),
+    }
+
+
+def build_hand_data(hand, row):
+    """Build the hand-specific strategy and EV data for a solution row"""
+    # Extract hand-specific data
+    action_codes = [col[:-6] for col in row.index if col.endswith("_strat")]
+
+    hand_data = {
+        "hand": hand,
+        "best_action": row["best_action"],
+        "best_ev": row["best_ev"],
+    }
+
+    # Add strategy and EV data for each action
+    for code in action_codes:
+        if f"{code}_strat" in row and f"{code}_ev" in row:
+            hand_data[f"{code}_strat"] = row[f"{code}_strat"]
+            hand_data[f"{code}_ev"] = row[f"{code}_ev"]
+
+    return hand_data
+
+
 def process_single_hand(args):
     """Process a single hand and create a separate JSON file - for multiprocessing"""
     hand_data, clean_json, output_subdir, original_file_path, metadata = args
@@ -31,20 +69,14 @@ def process_single_hand(args):
                 "hand": hand,
                 "best_action": row["best_action"],
                 "best_ev": row["best_ev"],
-                # Add scenario metadata
-                "mode": metadata.get("mode", ""),
-                "field_size": metadata.get("field_size", 0),
-                "field_left": metadata.get("field_left", ""),
-                "position": metadata.get("position", ""),
-                "stack_depth": metadata.get("stack_depth", ""),
-                "action": metadata.get("action", ""),
-                "game_type": metadata.get("game_type", ""),
-                "street": metadata.get("street", ""),
-                "action_sequence": metadata.get("action_sequence", ""),
             },
             "spot_solution": clean_json.get("spot_solution", {}),
             "hand_data": {},
         }
+        # Add scenario metadata
+        hand_json["metadata"].update(
+            build_scenario_metadata(original_file_path, metadata)
+        )
 
         # Copy essential info from original JSON that applies to this hand
         if "game_info" in clean_json:
@@ -53,21 +85,8 @@ def process_single_hand(args):
         if "node_info" in clean_json:
             hand_json["node_info"] = clean_json["node_info"]
 
-        # Extract hand-specific data
-        action_codes = [col[:-6] for col in row.index if col.endswith("_strat")]
-
         # Add hand-specific data
-        hand_json["hand_data"] = {
-            "hand": hand,
-            "best_action": row["best_action"],
-            "best_ev": row["best_ev"],
-        }
-
-        # Add strategy and EV data for each action
-        for code in action_codes:
-            if f"{code}_strat" in row and f"{code}_ev" in row:
-                hand_json["hand_data"][f"{code}_strat"] = row[f"{code}_strat"]
-                hand_json["hand_data"][f"{code}_ev"] = row[f"{code}_ev"]
+        hand_json["hand_data"] = build_hand_data(hand, row)
 
         # Create output file name
         output_path = output_subdir / f"{hand}.json"
@@ -94,6 +113,7 @@ class SolutionSeparator:
         depth=None,
         position=None,
         exclude_poor_actions=False,
+        packed=False,
     ):
         """
         Initialize the solution separator
@@ -107,6 +127,7 @@ class SolutionSeparator:
         depth (str, optional): Filter by specific stack depth
         position (str, optional): Filter by specific position
         exclude_poor_actions (bool, optional): Exclude hands where all non-fold actions have EV < -0.05
+        packed (bool, optional): Write one hand pack per solution instead of one JSON file per hand
         """
         self.solutions_dir = Path(solutions_dir)
         self.output_dir = Path(output_dir)
@@ -116,6 +137,7 @@ class SolutionSeparator:
         self.depth = depth
         self.position = position
         self.exclude_poor_actions = exclude_poor_actions
+        self.packed = packed
 
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
@@ -131,36 +153,15 @@ class SolutionSeparator:
 
     def get_solution_files(self):
         """Get all solution JSON files, optionally filtered by criteria"""
-        pattern = "**/*.json"
-        all_files = list(self.solutions_dir.glob(pattern))
-
-        # Apply filters if specified
-        filtered_files = []
-        for file_path in all_files:
-            relative_path = file_path.relative_to(self.solutions_dir)
-            parts = relative_path.parts
-
-            # Apply game type filter
-            if self.game_type and (len(parts) < 1 or parts[0] != self.game_type):
-                continue
-
-            # Apply depth filter
-            if self.depth and (len(parts) < 2 or f"depth_{self.depth}" not in parts[1]):
-                continue
-
-            # Apply position filter
-            if self.position:
-                position_found = False
-                for part in parts:
-                    if part == self.position:
-                        position_found = True
-                        break
-                if not position_found:
-                    continue
-
-            filtered_files.append(file_path)
-
-        return filtered_files
+        # Filtered-out game types and depths are never entered
+        return list(
+            scan_files(
+                self.solutions_dir,
+                game_type=self.game_type,
+                depth=self.depth,
+                position=self.position,
+            )
+        )
 
     def create_metadata_json(
         self, game_type, depth, street, action_seq, position, output_dir
@@ -335,31 +336,16 @@ class SolutionSeparator:
             # Create metadata JSON
             metadata = self.create_metadata_json(
                 game_type, depth, street, action_seq, position, output_subdir
-            )  # Process each hand in parallel
-            with ProcessPoolExecutor() as executor:
-                # Prepare arguments for each hand processing task
-                hand_args = [
-                    ((row["hand"], row), clean_json, output_subdir, file_path, metadata)
-                    for _, row in filtered_df.iterrows()
-                ]
+            )
 
-                # Submit all hand processing tasks
-                future_to_hand = {
-                    executor.submit(process_single_hand, args): args[0][0]
-                    for args in hand_args
-                }
-
-                # Process completed tasks as they finish
-                for future in as_completed(future_to_hand):
-                    try:
-                        result_message = future.result()
-                        logger.info(result_message)
-                    except Exception as e:
-                        hand = future_to_hand[future]
-                        logger.error(
-                            f"Error creating separate JSON for {hand}: {e}",
-                            exc_info=True,
-                        )
+            if self.packed:
+                self.write_hand_pack(
+                    clean_json, filtered_df, output_subdir, file_path, metadata
+                )
+            else:
+                self.write_hand_files(
+                    clean_json, filtered_df, output_subdir, file_path, metadata
+                )
 
             # Update stats
             self.stats["processed_files"] += 1
@@ -387,6 +373,58 @@ class SolutionSeparator:
             self.stats["skipped_files"] += 1
             return 0
 
+    def write_hand_pack(self, clean_json, filtered_df, output_subdir, file_path, metadata):
+        """Stream all hands of a solution into a single pack file"""
+        header = {
+            "metadata": build_scenario_metadata(file_path, metadata),
+            "spot_solution": clean_json.get("spot_solution", {}),
+        }
+        for key in ("game_info", "node_info"):
+            if key in clean_json:
+                header[key] = clean_json[key]
+
+        pack_path = output_subdir / PACK_FILENAME
+        with HandPackWriter(pack_path, header) as writer:
+            for _, row in filtered_df.iterrows():
+                hand = row["hand"]
+                writer.add(
+                    hand,
+                    {
+                        "best_action": row["best_action"],
+                        "best_ev": row["best_ev"],
+                        "hand_data": build_hand_data(hand, row),
+                    },
+                )
+        logger.info(f"Packed {len(filtered_df)} hands into {pack_path}")
+
+    def write_hand_files(self, clean_json, filtered_df, output_subdir, file_path, metadata):
+        """Write one JSON file per hand"""
+        # Process each hand in parallel
+        with ProcessPoolExecutor() as executor:
+            # Prepare arguments for each hand processing task
+            hand_args = [
+                ((row["hand"], row), clean_json, output_subdir, file_path, metadata)
+                for _, row in filtered_df.iterrows()
+            ]
+
+            # Submit all hand processing tasks
+            future_to_hand = {
+                executor.submit(process_single_hand, args): args[0][0]
+                for args in hand_args
+            }
+
+            # Process completed tasks as they finish
+            for future in as_completed(future_to_hand):
+                try:
+                    result_message = future.result()
+                    logger.info(result_message)
+                except Exception as e:
+                    hand = future_to_hand[future]
+                    logger.error(
+                        f"Error creating separate JSON for {hand}: {e}",
+                        exc_info=True,
+                    )
+
     def run(self):
         """Process all solution files"""
         # Get solution files
@@ -442,6 +480,11 @@ def main():
         action="store_true",
         help="Exclude hands where all non-fold actions have EV < -0.05",
     )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help=f"Write one {PACK_FILENAME} per solution instead of one JSON file per hand",
+    )
 
     args = parser.parse_args()
 
@@ -455,6 +498,7 @@ def main():
         depth=args.depth,
         position=args.position,
         exclude_poor_actions=args.exclude_poor_actions,
+        packed=args.packed,
     )
 
     separator.run()
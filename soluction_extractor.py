@@ -1,19 +1,149 @@
+import argparse
+import base64
+import hashlib
 import json
 import os
 import re
+import threading
+import time
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 # === CONFIGURATION ===
 HAR_FILE = "rest_symmetric.har"  # Path to your HAR file
 BASE_OUTPUT_DIR = "poker_solutions"  # Base directory to save the extracted JSONs
-
-# === CREATE BASE OUTPUT DIRECTORY ===
-os.makedirs(BASE_OUTPUT_DIR, exist_ok=True)
-
-# === LOAD HAR DATA ===
-with open(HAR_FILE, "r", encoding="utf-8") as f:
-    har_data = json.load(f)
+READ_CHUNK_SIZE = 1 << 20  # Bytes read from the HAR file at a time
+WRITE_WORKERS = 4  # Threads decoding and writing solutions
+SPOT_SOLUTION_MARKER = "spot-solution"
+# Ingest index kept in the output directory. It must not end in .json or the
+# solution walkers would pick it up as a solution.
+INGEST_INDEX_FILENAME = ".ingest_index"
+INGEST_REPORT = "ingest_report.json"
+KEY_LENGTH = 12  # Characters of the solution key used in filenames
+
+
+class HarEntryReader:
+    """
+    Incremental reader for the entries of a HAR file.
+
+    The file is read in chunks and every entry of log.entries is decoded on its
+    own, so memory is bounded by the largest single entry instead of the whole
+    capture. Other keys (pages, creator, ...) are decoded and dropped.
+    """
+
+    def __init__(self, har_file, chunk_size=READ_CHUNK_SIZE):
+        self.file = open(har_file, "r", encoding="utf-8")
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _fill(self, size):
+        """Append up to size characters to the buffer; returns False at EOF"""
+        if self.eof:
+            return False
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what was already consumed so the buffer does not grow
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                raise ValueError("Unexpected end of HAR file")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Malformed HAR file: expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def _value(self):
+        """Decode the next JSON value, reading more of the file as needed"""
+        self._peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number may continue in the next chunk
+                if end < len(self.buffer) or self.eof or not isinstance(value, (int, float)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow the read size so large values are not re-parsed many times
+            self._fill(read_size)
+            read_size *= 2
+
+    def _members(self):
+        """Yield the keys of the object starting at the current position"""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Malformed HAR file at offset {self.pos}")
+
+    def _items(self):
+        """Yield each element of the array starting at the current position"""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Malformed HAR file at offset {self.pos}")
+
+    def entries(self):
+        """Yield the entries of log.entries one at a time"""
+        for key in self._members():
+            if key != "log":
+                self._value()
+                continue
+            for log_key in self._members():
+                if log_key == "entries":
+                    yield from self._items()
+                else:
+                    self._value()
+
+
+def iter_har_entries(har_file, chunk_size=READ_CHUNK_SIZE):
+    """Yield the entries of a HAR file without loading the whole file."""
+    with HarEntryReader(har_file, chunk_size) as reader:
+        yield from reader.entries()
 
 
 def parse_url_parameters(url):
@@ -49,7 +179,7 @@ def extract_position_info(json_data):
         return {"active_position": "Unknown", "hero_position": "Unknown"}
 
 
-def get_folder_path(url_params, json_data):
+def get_folder_path(url_params, json_data, base_output_dir=BASE_OUTPUT_DIR):
     """Generate a folder path based on the parameters."""
     # Extract key parameters
     gametype = url_params.get("gametype", "unknown_game")
@@ -97,7 +227,7 @@ def get_folder_path(url_params, json_data):
 
     # Base path
     folder_path = os.path.join(
-        BASE_OUTPUT_DIR,
+        base_output_dir,
         gametype,
         f"depth_{clean_depth}",
         street_path,
@@ -108,7 +238,7 @@ def get_folder_path(url_params, json_data):
     return folder_path
 
 
-def generate_filename(url_params, json_data, count):
+def generate_filename(url_params, json_data, suffix):
     """Generate a descriptive filename for the solution."""
     # Extract key parameters
     board = url_params.get("board", "")
@@ -125,54 +255,343 @@ def generate_filename(url_params, json_data, count):
     if board:
         filename += f"_board_{board_str}"
 
-    # Add a unique counter to avoid overwriting
-    filename += f"_{count}"
+    # Add a unique suffix (the solution key) to avoid overwriting
+    filename += f"_{suffix}"
 
     return f"{filename}.json"
 
 
-# === EXTRACT JSON RESPONSES ===
-count = 0
-for entry in har_data["log"]["entries"]:
-    url = entry["request"]["url"]
-    if "spot-solution" in url:
-        response = entry.get("response", {})
-        content = response.get("content", {})
-        mime_type = content.get("mimeType", "")
-        text = content.get("text", "")
+def iter_spot_solution_contents(entries):
+    """
+    Yield (url, content) for every spot solution entry with a body.
 
-        if not text:
+    The body is left as is (possibly base64); see decode_content.
+    """
+    for entry in entries:
+        url = entry["request"]["url"]
+        if SPOT_SOLUTION_MARKER not in url:
             continue
 
+        content = entry.get("response", {}).get("content", {})
+        if content.get("text"):
+            yield url, content
+
+
+def decode_content(content):
+    """Parse the JSON body of a HAR response, decoding base64 bodies."""
+    text = content.get("text", "")
+    if content.get("encoding") == "base64":
+        text = base64.b64decode(text).decode("utf-8")
+    return json.loads(text)
+
+
+def iter_spot_solutions(entries):
+    """
+    Yield (url, url_params, json_data) for every spot solution of HAR entries.
+
+    Entries that cannot be decoded are reported and skipped.
+    """
+    for url, content in iter_spot_solution_contents(entries):
         # Try to parse JSON (some may be base64-encoded or invalid)
         try:
-            if content.get("encoding") == "base64":
-                import base64
+            json_data = decode_content(content)
+        except Exception as e:
+            print(f"⚠️  Skipped (error parsing): {url}\nReason: {e}")
+            continue
 
-                decoded = base64.b64decode(text).decode("utf-8")
-                json_data = json.loads(decoded)
-            else:
-                json_data = json.loads(text)
+        yield url, parse_url_parameters(url), json_data
 
-            # Parse URL parameters
-            url_params = parse_url_parameters(url)
 
-            # Generate folder path
-            folder_path = get_folder_path(url_params, json_data)
-            os.makedirs(folder_path, exist_ok=True)
+def canonical_json(json_data):
+    """Serialize a solution the same way whatever its key order or formatting."""
+    return json.dumps(json_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
-            # Generate filename
-            filename = generate_filename(url_params, json_data, count)
-            filepath = os.path.join(folder_path, filename)
 
-            # Save the JSON file
-            with open(filepath, "w", encoding="utf-8") as out_f:
-                json.dump(json_data, out_f, indent=2)
+def content_hash(json_data):
+    """SHA-256 of the canonical form of a solution."""
+    return hashlib.sha256(canonical_json(json_data).encode("utf-8")).hexdigest()
 
-            print(f"✅ Saved: {filepath}")
-            count += 1
 
-        except Exception as e:
-            print(f"⚠️  Skipped (error parsing): {url}\nReason: {e}")
+def solution_key(url_params, digest):
+    """
+    Identify a solution by its URL parameters and content hash.
+
+    The same spot captured twice yields the same key, so it is written once.
+    """
+    params = sorted((key, str(value)) for key, value in url_params.items())
+    return hashlib.sha256(json.dumps([params, digest]).encode("utf-8")).hexdigest()
+
+
+def save_solution(url_params, json_data, suffix, base_output_dir=BASE_OUTPUT_DIR):
+    """Atomically save one solution JSON in its scenario folder and return its path."""
+    folder_path = get_folder_path(url_params, json_data, base_output_dir)
+    os.makedirs(folder_path, exist_ok=True)
+
+    filename = generate_filename(url_params, json_data, suffix)
+    filepath = os.path.join(folder_path, filename)
+
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out_f:
+        json.dump(json_data, out_f, indent=2)
+    os.replace(tmp_path, filepath)
+
+    return filepath
+
+
+def _decode_and_save(url, content, base_output_dir, known_keys, known_contents):
+    """
+    Decode one spot solution and save it unless it is already known.
+
+    Returns a record with the status ("written", "duplicate" or "error").
+    """
+    record = {"url": url}
+    try:
+        url_params = parse_url_parameters(url)
+        json_data = decode_content(content)
+        digest = content_hash(json_data)
+        key = solution_key(url_params, digest)
+        folder = os.path.relpath(get_folder_path(url_params, json_data, base_output_dir), base_output_dir)
+        record.update(key=key, content_hash=digest)
+
+        if key in known_keys or (folder, digest) in known_contents:
+            record["status"] = "duplicate"
+            return record
+
+        filepath = save_solution(url_params, json_data, key[:KEY_LENGTH], base_output_dir)
+        record.update(status="written", path=os.path.relpath(filepath, base_output_dir))
+        print(f"✅ Saved: {filepath}")
+    except Exception as e:
+        record.update(status="error", error=str(e))
+        print(f"⚠️  Skipped (error parsing): {url}\nReason: {e}")
+    return record
+
+
+def extract_har(
+    har_file=HAR_FILE,
+    base_output_dir=BASE_OUTPUT_DIR,
+    workers=WRITE_WORKERS,
+    chunk_size=READ_CHUNK_SIZE,
+    known_keys=frozenset(),
+    known_contents=frozenset(),
+):
+    """
+    Extract every spot solution of a HAR file into base_output_dir.
+
+    The HAR is streamed entry by entry; matching bodies are decoded and written
+    by a pool of threads. At most two bodies per thread are pending at a time so
+    memory stays flat however large the capture is. Solutions whose key is in
+    known_keys, or whose (folder, content hash) is in known_contents, are skipped.
+
+    Returns the list of per-solution records.
+    """
+    os.makedirs(base_output_dir, exist_ok=True)
+
+    pending = threading.BoundedSemaphore(workers * 2)
+    futures = []
+
+    def release(_future):
+        pending.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = iter_har_entries(har_file, chunk_size)
+        for url, content in iter_spot_solution_contents(entries):
+            pending.acquire()
+            future = executor.submit(
+                _decode_and_save, url, content, base_output_dir, known_keys, known_contents
+            )
+            future.add_done_callback(release)
+            futures.append(future)
+
+    records = [future.result() for future in futures]
+    for record in records:
+        record["har"] = os.path.basename(har_file)
+    return records
+
+
+def load_ingest_index(base_output_dir):
+    """
+    Load the ingest index and bring it up to date with the solution files on disk.
+
+    Files that were not written by an ingest (e.g. older extractions) are hashed
+    once and recorded without a key; unchanged files are not hashed again.
+    """
+    index_path = os.path.join(base_output_dir, INGEST_INDEX_FILENAME)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            files = json.load(f).get("files", {})
+    except (OSError, ValueError):
+        files = {}
+
+    current = {}
+    for file_path in Path(base_output_dir).glob("**/*.json"):
+        rel_path = str(file_path.relative_to(base_output_dir))
+        stat = file_path.stat()
+        entry = files.get(rel_path)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            current[rel_path] = entry
+            continue
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                digest = content_hash(json.load(f))
+        except (OSError, ValueError):
+            continue
+        current[rel_path] = {
+            "content_hash": digest,
+            "key": entry.get("key") if entry and entry.get("content_hash") == digest else None,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+    return current
+
+
+def save_ingest_index(base_output_dir, files):
+    """Atomically write the ingest index."""
+    index_path = os.path.join(base_output_dir, INGEST_INDEX_FILENAME)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+
+def ingest_hars(
+    har_files,
+    base_output_dir=BASE_OUTPUT_DIR,
+    processes=None,
+    workers=WRITE_WORKERS,
+    chunk_size=READ_CHUNK_SIZE,
+    report_path=INGEST_REPORT,
+):
+    """
+    Ingest several HAR files in parallel, one process per file at a time.
+
+    Solutions already present in base_output_dir (or seen earlier in this run)
+    are skipped. A compact report with per-HAR counts is written to report_path.
+
+    Returns the report dictionary.
+    """
+    start_time = time.time()
+    os.makedirs(base_output_dir, exist_ok=True)
+
+    files = load_ingest_index(base_output_dir)
+    known_keys = frozenset(entry["key"] for entry in files.values() if entry.get("key"))
+    known_contents = frozenset(
+        (os.path.dirname(rel_path), entry["content_hash"])
+        for rel_path, entry in files.items()
+        if not entry.get("key")
+    )
+
+    processes = processes or min(len(har_files), os.cpu_count() or 1) or 1
+    records = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(
+                extract_har, har_file, base_output_dir, workers, chunk_size, known_keys, known_contents
+            ): har_file
+            for har_file in har_files
+        }
+        failed_hars = {}
+        for future, har_file in futures.items():
+            try:
+                records.extend(future.result())
+            except Exception as e:
+                failed_hars[os.path.basename(har_file)] = str(e)
+                print(f"⚠️  Failed to read {har_file}: {e}")
+
+    # The same solution captured in several HARs of this run is written once
+    # (its filename depends only on its key), count the repeats as duplicates
+    seen = set()
+    per_har = {}
+    for record in records:
+        if record["status"] == "written":
+            if record["key"] in seen:
+                record["status"] = "duplicate"
+            else:
+                seen.add(record["key"])
+                stat = os.stat(os.path.join(base_output_dir, record["path"]))
+                files[record["path"]] = {
+                    "content_hash": record["content_hash"],
+                    "key": record["key"],
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+        counts = per_har.setdefault(record["har"], {"written": 0, "duplicate": 0, "error": 0})
+        counts[record["status"]] += 1
+
+    save_ingest_index(base_output_dir, files)
+
+    report = {
+        "har_files": len(har_files),
+        "solutions": len(records),
+        "written": sum(c["written"] for c in per_har.values()),
+        "duplicates": sum(c["duplicate"] for c in per_har.values()),
+        "errors": sum(c["error"] for c in per_har.values()) + len(failed_hars),
+        "elapsed_seconds": round(time.time() - start_time, 2),
+        "per_har": per_har,
+        "failed_hars": failed_hars,
+        "error_urls": [r["url"] for r in records if r["status"] == "error"],
+    }
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(
+        f"\nIngested {report['har_files']} HAR file(s): {report['written']} written, "
+        f"{report['duplicates']} duplicates, {report['errors']} errors"
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract spot solutions from HAR files")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--har", help=f"HAR file to read (default: {HAR_FILE})")
+    source.add_argument("--har-dir", help="Directory whose *.har files are all ingested")
+    parser.add_argument(
+        "--output-dir",
+        default=BASE_OUTPUT_DIR,
+        help=f"Base directory for extracted solutions (default: {BASE_OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="HAR files processed in parallel (default: CPU count)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WRITE_WORKERS,
+        help=f"Threads decoding and writing solutions per HAR (default: {WRITE_WORKERS})",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=READ_CHUNK_SIZE,
+        help=f"Characters read from the HAR file at a time (default: {READ_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--report",
+        default=INGEST_REPORT,
+        help=f"Where to write the ingest report (default: {INGEST_REPORT})",
+    )
+    args = parser.parse_args()
+
+    if args.har_dir:
+        har_files = sorted(str(path) for path in Path(args.har_dir).glob("*.har"))
+        if not har_files:
+            print(f"No HAR files found in {args.har_dir}")
+            return
+    else:
+        har_files = [args.har or HAR_FILE]
+
+    ingest_hars(
+        har_files,
+        args.output_dir,
+        processes=args.processes,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        report_path=args.report,
+    )
+
 
-print(f"\nTotal saved: {count}")
+if __name__ == "__main__":
+    main()
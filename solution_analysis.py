@@ -0,0 +1,229 @@
+"""
+Hand selection and scoring for spot solutions.
+
+This is the analysis step of batch_visualizer.py, kept free of any file output
+so it can also run inside the streaming pipeline (pipeline_runner.py).
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+import pandas as pd
+
+from read_solution import read_spot_solution
+
+# Strategy percentage at which an action receives full score
+FULL_SCORE_THRESHOLD = 30.0  # percent
+
+
+@dataclass
+class SolutionAnalysis:
+    """Result of analyzing one spot solution"""
+
+    total_hands: int
+    filtered_hands: int
+    action_codes: List[str] = field(default_factory=list)
+    result_df: pd.DataFrame = None
+
+
+def parse_solution_path(relative_path):
+    """
+    Split a solution path relative to the solutions directory into its parts
+
+    Parameters:
+    relative_path (Path): e.g. GAME/depth_20_125/preflop/pf_FFFF/CO/hero_CO_0.json
+
+    Returns:
+    dict with game_type, depth, street, action_seq and position
+    """
+    path_parts = relative_path.parts
+    return {
+        "game_type": path_parts[0] if len(path_parts) > 0 else "unknown",
+        "depth": (
+            path_parts[1].replace("depth_", "") if len(path_parts) > 1 else "unknown"
+        ),
+        "street": path_parts[2] if len(path_parts) > 2 else "unknown",
+        "action_seq": path_parts[3] if len(path_parts) > 3 else "unknown",
+        "position": path_parts[4] if len(path_parts) > 4 else "unknown",
+    }
+
+
+def scenario_metadata(game_type, depth, action_seq, position):
+    """
+    Derive the drill metadata (mode, field size, field left, ...) of a scenario
+
+    Parameters:
+    game_type (str): The game type (e.g., MTTGeneral_ICM8m200PT)
+    depth (str): The stack depth
+    action_seq (str): The action sequence
+    position (str): The position
+    """
+    # Extract mode (icm or chipev)
+    mode = "icm" if "ICM" in game_type.upper() else "chipev"
+
+    # Extract field size (200 or 1000)
+    field_size = 1000
+    if "200" in game_type:
+        field_size = 200
+
+    # Extract field left
+    field_left = "100%"  # Default
+    if "START" in game_type:
+        field_left = "100%"
+    elif "PCT75" in game_type:
+        field_left = "75%"
+    elif "PCT50" in game_type:
+        field_left = "50%"
+    elif "PCT37" in game_type:
+        field_left = "37%"
+    elif "PCT25" in game_type:
+        field_left = "25%"
+    elif "BUBBLE" in game_type:
+        field_left = "bubble"
+    elif "3TL" in game_type:
+        field_left = "3 tables left"
+    elif "2TL" in game_type:
+        field_left = "2 tables left"
+    elif "FT" in game_type:
+        field_left = "final table"
+
+    # Process action (default is "rfi")
+    action = "rfi"
+    if "pf_" in action_seq.lower():
+        action = "rfi"
+    # Add more action type detections as needed
+
+    return {
+        "mode": mode,
+        "field_size": field_size,
+        "field_left": field_left,
+        "position": position.lower(),
+        "stack_depth": depth,
+        "action": action,
+    }
+
+
+def analyze_spot_solution(
+    clean_json,
+    min_threshold=None,
+    max_threshold=None,
+    num_hands=169,
+    exclude_poor_actions=False,
+    verbose=True,
+):
+    """
+    Filter, rank and score the hands of a spot solution
+
+    Parameters:
+    clean_json (dict): Cleaned spot solution
+    min_threshold (float, optional): Minimum EV threshold for filtering hands
+    max_threshold (float, optional): Maximum EV threshold for filtering hands
+    num_hands (int, optional): Number of hardest hands to keep
+    exclude_poor_actions (bool, optional): Exclude hands where all non-fold actions have EV < -0.05
+    verbose (bool, optional): Let read_spot_solution print and save hand_solutions.csv
+
+    Returns:
+    SolutionAnalysis whose result_df is empty when no hand passes the filters
+    """
+    if verbose:
+        df_solutions = read_spot_solution(clean_json)
+    else:
+        df_solutions = read_spot_solution(clean_json, output_csv=None, verbose=False)
+
+    # Dynamically gather all action codes from the dataframe columns
+    action_codes = [col[:-6] for col in df_solutions.columns if col.endswith("_strat")]
+
+    # Compute best EV for each row
+    df_solutions["best_ev"] = df_solutions.apply(
+        lambda row: row[f"{row['best_action']}_ev"], axis=1
+    )
+
+    # Optional EV filtering if thresholds are specified
+    filtered_df = df_solutions
+    if min_threshold is not None:
+        filtered_df = filtered_df[filtered_df["best_ev"] >= min_threshold]
+    if max_threshold is not None:
+        filtered_df = filtered_df[filtered_df["best_ev"] <= max_threshold]
+
+    # Filter out hands where all non-fold actions have EV < -0.05
+    if exclude_poor_actions:
+
+        def has_viable_non_fold_action(row):
+            non_fold_evs = [
+                row[f"{code}_ev"]
+                for code in action_codes
+                if code != "F" and f"{code}_ev" in row
+            ]
+
+            return any(ev >= -0.05 for ev in non_fold_evs) if non_fold_evs else True
+
+        filtered_df = filtered_df[filtered_df.apply(has_viable_non_fold_action, axis=1)]
+
+    filtered_df = filtered_df.copy()
+
+    analysis = SolutionAnalysis(
+        total_hands=len(df_solutions),
+        filtered_hands=len(filtered_df),
+        action_codes=action_codes,
+    )
+    if filtered_df.empty:
+        analysis.result_df = filtered_df
+        return analysis
+
+    # Calculate difficulty score for each hand
+    def calc_difficulty(row):
+        best_action = row["best_action"]
+        best_ev = row["best_ev"]
+        alt_evs = [
+            row[f"{code}_ev"]
+            for code in action_codes
+            if code != best_action and f"{code}_ev" in row
+        ]
+        alt_max_ev = max(alt_evs) if alt_evs else None
+
+        if best_action == "F":
+            return abs(alt_max_ev) if alt_max_ev is not None else 0
+        elif best_action.startswith("R"):
+            return best_ev
+        else:
+            if alt_max_ev is None:
+                return abs(best_ev)
+            return abs(best_ev - alt_max_ev)
+
+    filtered_df["difficulty"] = filtered_df.apply(calc_difficulty, axis=1)
+
+    # Sort by difficulty and take the hardest hands
+    filtered_df = filtered_df.sort_values("difficulty").head(num_hands)
+
+    # Compute score for each action based on its strategy percentage
+    def compute_scores(row):
+        scores = {}
+        for code in action_codes:
+            strat = row.get(f"{code}_strat", 0)
+            score = 10 * min(1.0, strat / FULL_SCORE_THRESHOLD)
+            scores[f"{code}_score"] = score
+
+        max_score = max(scores.values()) if scores else 0
+        if 0 < max_score < 10:
+            factor = 10.0 / max_score
+            scores = {c: s * factor for c, s in scores.items()}
+        elif max_score == 0 and action_codes:
+            best = row["best_action"]
+            scores = {f"{c}_score": (10 if c == best else 0) for c in action_codes}
+        return pd.Series(scores)
+
+    score_df = filtered_df.apply(compute_scores, axis=1)
+    filtered_df = pd.concat([filtered_df, score_df], axis=1)
+
+    # Prepare columns for the result dataframe
+    result_columns = ["hand"]
+    for code in action_codes:
+        result_columns.append(f"{code}_strat")
+        result_columns.append(f"{code}_ev")
+        result_columns.append(f"{code}_score")
+
+    result_columns.extend(["best_action", "best_ev", "difficulty"])
+
+    # Create the result dataframe with all strategies and EVs
+    analysis.result_df = filtered_df[result_columns].copy()
+    return analysis
@@ -2,6 +2,7 @@ import os
 import json
 import argparse
 from pathlib import Path
+from solution_scanner import scan_files
 
 
 def list_solutions(base_dir, search_term=None, list_details=False):
@@ -15,7 +16,7 @@ def list_solutions(base_dir, search_term=None, list_details=False):
     print(f"\n=== Poker Solutions ===")
 
     # Collect all solution files
-    solution_files = list(base_path.glob("**/*.json"))
+    solution_files = list(scan_files(base_path))
 
     if not solution_files:
         print(f"No solution files found in {base_dir}")
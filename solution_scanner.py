@@ -0,0 +1,136 @@
+"""
+Lazy, filtered walk of a solution tree.
+
+Solution and hand trees are laid out as ``<game type>/<depth>/<street>/...``,
+with the hero position as one of the directories below. ``scan_files`` walks
+such a tree with ``os.scandir`` and applies the game type and depth filters to
+the directory names of the first two levels, so the subtrees they exclude are
+never entered. The position filter is checked on every name along the path, as
+positions can be at any level. Paths are yielded as they are found, in sorted
+order, so a filtered run starts as soon as its first match is reached.
+
+Example:
+    for path in scan_files("poker_solutions", game_type="MTTGeneral_ICM8m200PTPCT75", depth="20"):
+        ...
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def depth_matches(name, depth, exact=False):
+    """
+    Check a depth directory name against a depth filter
+
+    Parameters:
+    name (str): Directory name, e.g. "depth_20_125" in solution trees or "20" in hand trees
+    depth (str): Depth filter, e.g. "20"
+    exact (bool): Match the name exactly instead of looking for "depth_<depth>" in it
+
+    Returns:
+    bool: True if the directory holds the requested depth
+    """
+    if exact:
+        return name == depth
+    return f"depth_{depth}" in name
+
+
+def _scan_dir(path, level, suffixes, game_type, depth, depth_exact, position, position_found):
+    """Yield the matching files below one directory, entering only directories the filters allow"""
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        # Unreadable directories are skipped, as glob and os.walk do
+        return
+
+    for entry in entries:
+        name = entry.name
+        if level == 0 and game_type and name != game_type:
+            continue
+        if level == 1 and depth and not depth_matches(name, depth, depth_exact):
+            continue
+        found = position_found or name == position
+
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            yield from _scan_dir(
+                entry.path, level + 1, suffixes, game_type, depth, depth_exact, position, found
+            )
+        elif name.endswith(suffixes) and (not position or found):
+            # With a depth filter, files need a depth directory above them
+            if not (depth and level == 0):
+                yield Path(entry.path)
+
+
+def _scan_list(*args):
+    """List the files of _scan_dir, for a worker thread"""
+    return list(_scan_dir(*args))
+
+
+def scan_files(
+    root,
+    suffixes=(".json",),
+    game_type=None,
+    depth=None,
+    position=None,
+    depth_exact=False,
+    jobs=1,
+):
+    """
+    Yield the files of a solution tree that match the filters
+
+    A file matches if its path relative to root starts with the game type
+    directory, its second directory matches the depth and one of its path
+    components is the position, as the walkers matched globbed paths before.
+
+    Parameters:
+    root (str or Path): Root of the tree
+    suffixes (tuple): File name suffixes to yield
+    game_type (str, optional): Only enter this top-level directory
+    depth (str, optional): Only enter second-level directories matching this depth
+    position (str, optional): Only yield files with this position in their path
+    depth_exact (bool): Match depth directory names exactly (hand trees) instead of as "depth_<depth>"
+    jobs (int): Scan this many top-level directories in parallel threads. Their
+        files are still yielded in order, but each directory is scanned whole
+        before its files are yielded.
+
+    Yields:
+    Path: Matching files, under root, in sorted order
+    """
+    suffixes = tuple(suffixes)
+    if jobs <= 1:
+        yield from _scan_dir(root, 0, suffixes, game_type, depth, depth_exact, position, False)
+        return
+
+    # One task per top-level directory; files directly under root are yielded in place
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        tasks = []
+        for entry in entries:
+            if game_type and entry.name != game_type:
+                continue
+            found = entry.name == position
+            if entry.is_dir(follow_symlinks=False):
+                tasks.append(
+                    pool.submit(
+                        _scan_list, entry.path, 1, suffixes, game_type, depth, depth_exact, position, found
+                    )
+                )
+            elif entry.name.endswith(suffixes) and not depth and (not position or found):
+                tasks.append(Path(entry.path))
+
+        for task in tasks:
+            if isinstance(task, Path):
+                yield task
+            else:
+                yield from task.result()
@@ -0,0 +1,499 @@
+"""
+Generate a synthetic corpus of preflop spot solutions.
+
+The files follow the schema of the solutions in poker_solutions/: the same
+top-level keys, action_solutions with 169-hand strategy and EV arrays,
+players_info with the hero's range, hand EVs and simple_hand_counters (in the
+same hand order, which read_spot_solution relies on), the bulky bucket and
+category lists that clear_spot_solution_json strips, and a game with one
+player per seat. Strategies are consistent with the EVs: every hand mixes its
+actions by a softmax of their EVs, and EVs follow a rough hand-strength
+ranking, so EV thresholds and difficulty scores behave as on real solutions.
+
+Player counts, action sets and the directory layout are configurable:
+
+- nested (default): game_type/depth_<stack>_125/preflop/<action sequence>/<POSITION>/hero_<POSITION>_<n>.json,
+  as in poker_solutions/, with the hero's position and the folds before it
+  deciding the action sequence
+- flat: every file in one directory
+
+Files are generated deterministically from --seed and their index, in
+parallel with --jobs.
+
+Example:
+    python synthetic_corpus.py --files 10000 --output-dir synthetic_solutions
+    python synthetic_corpus.py --files 100000 --players 6 9 --action-sets F,R2.1,RAI F,R2,R3,RAI --jobs 8
+    python synthetic_corpus.py --files 20000 --layout flat --compact
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmark_render import POSITIONS_BY_COUNT
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Ranks from lowest to highest, the order of simple_hand_counters
+RANKS = "23456789TJQKA"
+
+LAYOUTS = ("nested", "flat")
+
+# Tournament stages of the game type names in poker_solutions/
+STAGES = ["START", "PCT75", "PCT50", "PCT37", "PCT25", "BUBBLEMID", "FT"]
+
+STACK_DEPTHS = [15, 20, 25, 30, 35, 40, 50, 60, 70, 80, 100, 130, 160, 200]
+
+ANTE = 0.125
+
+EQUITY_BUCKETS = ["best_hands", "good_hands", "weak_hands", "trash_hands"]
+EQUITY_BUCKETS_ADVANCED = [
+    "hands_90_100", "hands_80_90", "hands_70_80", "hands_60_70", "hands_50_60", "hands_25_50", "hands_0_25",
+]
+HAND_CATEGORIES = [
+    "no_made_hand", "king_high", "ace_high", "low_pair", "third_pair", "second_pair", "underpair",
+    "top_pair", "overpair", "two_pair", "trips", "set", "straight", "flush", "fullhouse", "quads",
+    "straight_flush",
+]
+DRAW_CATEGORIES = [
+    "no_draw", "onecard_bdfd", "twocards_bdfd", "gutshot", "oesd", "flush_draw", "nut_flush_draw",
+    "combo_draw",
+]
+
+# Files per task handed to a worker process
+CHUNK_SIZE = 200
+
+
+def hand_names():
+    """
+    The 169 starting hands in the order of simple_hand_counters
+
+    Returns:
+    list: e.g. ["22", "32o", "32s", "33", "42o", ...]
+    """
+    hands = []
+    for i, high in enumerate(RANKS):
+        for low in RANKS[:i]:
+            hands.append(f"{high}{low}o")
+            hands.append(f"{high}{low}s")
+        hands.append(high + high)
+    return hands
+
+
+HANDS = hand_names()
+
+
+def hand_strength(hand):
+    """
+    Rough preflop strength of a hand between 0 and 1
+
+    Parameters:
+    hand (str): Hand code such as "AKs", "T9o" or "55"
+
+    Returns:
+    float: Higher for stronger hands
+    """
+    high, low = RANKS.index(hand[0]), RANKS.index(hand[1])
+    if high == low:
+        score = 14 + 1.6 * high
+    else:
+        score = 1.1 * high + 0.6 * low - 0.5 * (high - low - 1)
+        if hand.endswith("s"):
+            score += 2.5
+    return max(0.0, min(1.0, score / 33.2))
+
+
+HAND_STRENGTHS = [hand_strength(hand) for hand in HANDS]
+
+
+def hand_combos(hand):
+    """Card combinations of a hand: 6 for pairs, 4 suited, 12 offsuit"""
+    if len(hand) == 2:
+        return 6
+    return 4 if hand.endswith("s") else 12
+
+
+HAND_COMBOS = [hand_combos(hand) for hand in HANDS]
+
+
+def strength_threshold(open_fraction):
+    """
+    Hand strength above which a given fraction of the combinations lies
+
+    Parameters:
+    open_fraction (float): Share of the 1326 combinations to open
+
+    Returns:
+    float: Strength threshold
+    """
+    remaining = open_fraction * sum(HAND_COMBOS)
+    for strength, combos in sorted(zip(HAND_STRENGTHS, HAND_COMBOS), reverse=True):
+        remaining -= combos
+        if remaining <= 0:
+            return strength
+    return 0.0
+
+
+def action_info(code, position, next_position, stack, pot):
+    """
+    Describe an action the way solutions do
+
+    Parameters:
+    code (str): Action code: F, X, C, RAI or R<size>
+    position (str): Position of the acting player
+    next_position (str): Position that acts next
+    stack (float): Remaining stack of the acting player, in big blinds
+    pot (float): Pot before the action, in big blinds
+
+    Returns:
+    dict: The "action" of an action solution
+    """
+    if code == "F":
+        kind, betsize, display, group, advanced = "FOLD", "0", "FOLD", "FOLD", "FOLD"
+    elif code == "X":
+        kind, betsize, display, group, advanced = "CHECK", "0", "CHECK", "CHECK", "CHECK"
+    elif code == "C":
+        kind, betsize, display, group, advanced = "CALL", "1", "CALL", "CALL", "CALL"
+    elif code == "RAI":
+        kind, betsize, display, group, advanced = "RAISE", f"{stack:.3f}", "ALLIN", "RAISE", "BET_OVERBET"
+    else:
+        kind, betsize, display, group, advanced = "RAISE", code[1:], "RAISE", "RAISE", "BET_SMALL"
+    return {
+        "code": code,
+        "position": position,
+        "type": kind,
+        "betsize": betsize,
+        "allin": code == "RAI",
+        "is_hand_end": False,
+        "is_showdown": False,
+        "next_street": False,
+        "display_name": display,
+        "simple_group": group,
+        "advanced_group": advanced,
+        "betsize_by_pot": None if kind in ("FOLD", "CHECK") else str(float(betsize) / pot),
+        "next_position": next_position,
+    }
+
+
+def action_evs(code, strength, threshold, rng):
+    """EV of an action for a hand of a given strength, in big blinds"""
+    if code == "F":
+        return 0.0
+    if code == "RAI":
+        return round(8 * (strength - threshold - 0.12) + rng.gauss(0, 0.05), 5)
+    if code in ("C", "X"):
+        return round(2 * (strength - threshold + 0.05) + rng.gauss(0, 0.05), 5)
+    size = float(code[1:]) if code[1:] else 2.0
+    return round(size * (strength - threshold) + rng.gauss(0, 0.03), 5)
+
+
+def empty_buckets(names):
+    """Bucket or category lists as solutions hold them before any board is dealt"""
+    return [
+        {
+            "name": name,
+            "index": i,
+            "display_order": i,
+            "total_combos": 0.0,
+            "total_frequency": 0.0,
+            "actions_total_combos": {},
+            "actions_total_frequencies": {},
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+def table_players(positions, hero_index, stack):
+    """
+    Seat the players of a preflop spot where everyone before the hero folded
+
+    Parameters:
+    positions (list): Positions from first to act to the big blind
+    hero_index (int): Index of the hero in positions
+    stack (float): Starting stack of every player, in big blinds
+
+    Returns:
+    list: The players of the game, in seat order
+    """
+    dealer = "BTN" if "BTN" in positions else positions[0]
+    players = []
+    for i, position in enumerate(positions):
+        blind = {"SB": 0.5, "BB": 1.0}.get(position, 0.0)
+        folded = i < hero_index
+        players.append(
+            {
+                "relative_postflop_position": None if folded else ("IP" if position == dealer else "OOP"),
+                "hand": None,
+                "is_dealer": position == dealer,
+                "is_folded": folded,
+                "is_hero": i == hero_index,
+                "is_active": i == hero_index,
+                "stack": f"{stack:.3f}",
+                "current_stack": f"{stack - ANTE - blind:.3f}",
+                "chips_on_table": f"{blind:.3f}" if blind else "0",
+                "bounty": None,
+                "position": position,
+            }
+        )
+    return players
+
+
+def spot_solution(num_players, hero_index, stack, action_codes, rng):
+    """
+    Build one synthetic spot solution
+
+    Parameters:
+    num_players (int): Players at the table (2-9)
+    hero_index (int): Index of the hero among the positions, who acts after
+    hero_index folds
+    stack (float): Starting stack of every player, in big blinds
+    action_codes (list): Codes of the hero's actions
+    rng (random.Random): Source of the strategy noise
+
+    Returns:
+    dict: The solution
+    """
+    positions = POSITIONS_BY_COUNT[num_players]
+    hero = positions[hero_index]
+    next_position = positions[hero_index + 1]
+    pot = 1.5 + ANTE * num_players
+    remaining = stack - ANTE - {"SB": 0.5, "BB": 1.0}.get(hero, 0.0)
+
+    # Fewer players behind open wider: about 12% under the gun at 9 players,
+    # 45% on the button and 50% in the small blind
+    players_behind = num_players - 1 - hero_index
+    open_fraction = max(0.08, min(0.6, 0.55 - 0.052 * players_behind + rng.gauss(0, 0.03)))
+    threshold = strength_threshold(open_fraction)
+    temperature = 0.08 + rng.random() * 0.1
+
+    evs = {code: [] for code in action_codes}
+    strategy = {code: [] for code in action_codes}
+    for strength in HAND_STRENGTHS:
+        hand_evs = {code: action_evs(code, strength, threshold, rng) for code in action_codes}
+        peak = max(hand_evs.values())
+        weights = {code: math.exp((ev - peak) / temperature) for code, ev in hand_evs.items()}
+        total = sum(weights.values())
+        for code in action_codes:
+            evs[code].append(hand_evs[code])
+            # Solvers report pure strategies for most hands
+            frequency = weights[code] / total
+            strategy[code].append(round(frequency, 4) if 0.02 < frequency < 0.98 else float(frequency >= 0.98))
+        # Renormalize after rounding so every hand sums to 1
+        hand_total = sum(strategy[code][-1] for code in action_codes) or 1.0
+        for code in action_codes:
+            strategy[code][-1] = round(strategy[code][-1] / hand_total, 7)
+
+    hand_ev = [
+        round(sum(strategy[code][i] * evs[code][i] for code in action_codes), 7) for i in range(len(HANDS))
+    ]
+    total_combos = float(sum(HAND_COMBOS))
+    action_solutions = []
+    for code in action_codes:
+        combos = sum(freq * n for freq, n in zip(strategy[code], HAND_COMBOS))
+        action_solutions.append(
+            {
+                "action": action_info(code, hero, next_position, remaining, pot),
+                "total_frequency": round(combos / total_combos, 7),
+                "strategy": strategy[code],
+                "evs": evs[code],
+                "total_ev": round(sum(ev * n for ev, n in zip(hand_ev, HAND_COMBOS)) / total_combos, 9),
+                "total_combos": round(combos, 4),
+                "equity_buckets": [],
+                "equity_buckets_advanced": [],
+                "hand_categories": [],
+                "draw_categories": [],
+                "tournament_evs_converter": None,
+            }
+        )
+    total_ev = action_solutions[0]["total_ev"]
+
+    simple_hand_counters = {}
+    for i, hand in enumerate(HANDS):
+        n = float(HAND_COMBOS[i])
+        simple_hand_counters[hand] = {
+            "name": hand,
+            "total_combos_available": n,
+            "total_combos": n,
+            "total_frequency": 1.0,
+            "actions_total_combos": {code: round(strategy[code][i] * n, 4) for code in action_codes},
+            "actions_total_frequencies": {code: strategy[code][i] for code in action_codes},
+            "hand_ev": hand_ev[i],
+            "hand_eq": 0.0,
+            "hand_eqr": 0.0,
+        }
+
+    players = table_players(positions, hero_index, stack)
+    hero_player = dict(players[hero_index], name=f"B{hero_index + 5}", seat=hero_index, bounty_in_bb=None)
+    players_info = {
+        "player": hero_player,
+        "range": [1.0] * len(HANDS),
+        "hand_evs": hand_ev,
+        "hand_eqs": [0.0] * len(HANDS),
+        "hand_eqrs": [],
+        "total_ev": total_ev,
+        "total_eq": None,
+        "total_eqr": None,
+        "pot_share": 0.0,
+        "total_combos": total_combos,
+        "simple_hand_counters": simple_hand_counters,
+        "equity_buckets_range": [],
+        "equity_buckets_advanced_range": [],
+        "equity_buckets": empty_buckets(EQUITY_BUCKETS),
+        "equity_buckets_advanced": empty_buckets(EQUITY_BUCKETS_ADVANCED),
+        "hand_categories": empty_buckets(HAND_CATEGORIES),
+        "draw_categories": empty_buckets(DRAW_CATEGORIES),
+        "relative_postflop_position": hero_player["relative_postflop_position"],
+        "eq_percentile": [-1.0] * len(HANDS),
+        "tournament_evs_converter": None,
+    }
+    return {
+        "action_solutions": action_solutions,
+        "players_info": [players_info],
+        "hand_categories_range": [],
+        "draw_categories_range": [],
+        "blocker_rate": [],
+        "unblocker_rate": [],
+        "blockers_frequencies": None,
+        "game": {
+            "players": players,
+            "current_street": {"type": "PREFLOP", "start_pot": f"{pot:.3f}", "end_pot": f"{pot:.3f}"},
+            "pot": f"{pot:.3f}",
+            "pot_odds": f"{(1.0 - ANTE) / (pot + 1.0 - ANTE):.3f}",
+            "active_position": hero,
+            "board": "",
+            "bet_display_name": "RAISE",
+        },
+        "warning": None,
+        "hands_locked": None,
+    }
+
+
+def solution_path(index, num_players, hero_index, depth, stage, layout):
+    """
+    Relative path of a generated solution
+
+    Parameters:
+    index (int): Index of the file in the corpus
+    num_players (int): Players at the table
+    hero_index (int): Index of the hero among the positions
+    depth (int): Starting stack in big blinds
+    stage (str): Tournament stage of the game type
+    layout (str): "nested" or "flat"
+
+    Returns:
+    Path: Path relative to the corpus directory
+    """
+    hero = POSITIONS_BY_COUNT[num_players][hero_index]
+    game_type = f"MTTGeneral_ICM{num_players}m200PT{stage}"
+    action_sequence = "pf_" + "F" * hero_index if hero_index else "no_actions"
+    if layout == "flat":
+        return Path(f"{game_type}_depth_{depth}_125_{action_sequence}_hero_{hero}_{index}.json")
+    return Path(game_type) / f"depth_{depth}_125" / "preflop" / action_sequence / hero / f"hero_{hero}_{index}.json"
+
+
+def generate_files(task):
+    """
+    Generate and write a range of corpus files
+
+    Parameters:
+    task (tuple): (output_dir, first index, end index, settings dict)
+
+    Returns:
+    int: Bytes written
+    """
+    output_dir, start, end, settings = task
+    written = 0
+    created_dirs = set()
+    for index in range(start, end):
+        rng = random.Random(f"{settings['seed']}:{index}")
+        num_players = rng.choice(settings["players"])
+        # The big blind never opens, so every other seat can be the hero
+        hero_index = rng.randrange(num_players - 1)
+        depth = rng.choice(STACK_DEPTHS)
+        stage = rng.choice(STAGES)
+        action_codes = rng.choice(settings["action_sets"])
+        solution = spot_solution(num_players, hero_index, depth + ANTE, action_codes, rng)
+
+        path = Path(output_dir) / solution_path(index, num_players, hero_index, depth, stage, settings["layout"])
+        if path.parent not in created_dirs:
+            os.makedirs(path.parent, exist_ok=True)
+            created_dirs.add(path.parent)
+        text = json.dumps(solution, indent=None if settings["compact"] else 2)
+        with open(path, "w") as f:
+            f.write(text)
+        written += len(text)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic preflop spot solutions")
+    parser.add_argument("--output-dir", default="synthetic_solutions", help="Directory of the corpus")
+    parser.add_argument("--files", type=int, default=10000, help="Number of solution files")
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[8, 9], help="Player counts to draw from (2-9, default: 8 9)"
+    )
+    parser.add_argument(
+        "--action-sets",
+        nargs="+",
+        default=["F,R2.1,RAI", "F,R2,RAI", "F,RAI"],
+        help="Comma-separated hero action codes per set, drawn per file (F, X, C, RAI or R<size>)",
+    )
+    parser.add_argument("--layout", choices=LAYOUTS, default="nested", help="Directory layout (default: nested)")
+    parser.add_argument("--compact", action="store_true", help="Write JSON without indentation")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Generating processes")
+    args = parser.parse_args()
+
+    invalid = [n for n in args.players if n not in POSITIONS_BY_COUNT]
+    if invalid:
+        logger.error(f"Unsupported player counts: {invalid}; use 2-9")
+        return 1
+    action_sets = [codes.split(",") for codes in args.action_sets]
+    for codes in action_sets:
+        if len(set(codes)) != len(codes) or not all(c in ("F", "X", "C", "RAI") or c.startswith("R") for c in codes):
+            logger.error(f"Invalid action set: {','.join(codes)}")
+            return 1
+
+    settings = {
+        "players": args.players,
+        "action_sets": action_sets,
+        "layout": args.layout,
+        "compact": args.compact,
+        "seed": args.seed,
+    }
+    tasks = [
+        (args.output_dir, start, min(start + CHUNK_SIZE, args.files), settings)
+        for start in range(0, args.files, CHUNK_SIZE)
+    ]
+
+    start = time.perf_counter()
+    written = 0
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for done, size in enumerate(pool.map(generate_files, tasks), 1):
+                written += size
+                if done % 10 == 0 or done == len(tasks):
+                    logger.info(f"{min(done * CHUNK_SIZE, args.files)} of {args.files} files written")
+    else:
+        for done, task in enumerate(tasks, 1):
+            written += generate_files(task)
+            if done % 10 == 0 or done == len(tasks):
+                logger.info(f"{min(done * CHUNK_SIZE, args.files)} of {args.files} files written")
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Generated {args.files} solutions ({written / 2**20:.0f} MB) in {args.output_dir} "
+        f"in {elapsed:.1f} seconds"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
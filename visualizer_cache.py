@@ -0,0 +1,89 @@
+"""
+Memory-budgeted LRU cache of warm PokerTableVisualizer instances.
+
+A visualizer with a rendered template holds several canvas-sized images, so
+the cache is bounded by the bytes its visualizers keep
+(PokerTableVisualizer.memory_bytes) rather than by a count. Adding a
+visualizer evicts the least recently used ones until the cache fits its
+budget again; the newest entry is always kept.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class VisualizerCache:
+    """LRU mapping of cache keys to visualizers, bounded by memory"""
+
+    def __init__(self, budget_bytes, on_evict=None):
+        """
+        Initialize the cache
+
+        Parameters:
+        budget_bytes (int): Bytes the cached visualizers may keep in total
+        on_evict (callable, optional): Called with the key of every evicted entry
+        """
+        self.budget_bytes = budget_bytes
+        self.on_evict = on_evict
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def __getitem__(self, key):
+        """Return a visualizer and mark it as most recently used"""
+        with self.lock:
+            visualizer = self.entries[key]
+            self.entries.move_to_end(key)
+            return visualizer
+
+    def get(self, key):
+        """Return a visualizer (marking it most recently used), or None"""
+        with self.lock:
+            visualizer = self.entries.get(key)
+            if visualizer is not None:
+                self.entries.move_to_end(key)
+            return visualizer
+
+    def __setitem__(self, key, visualizer):
+        """Add a visualizer, evicting the least recently used ones over budget"""
+        size = visualizer.memory_bytes()
+        evicted = []
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.sizes[key]
+            self.entries[key] = visualizer
+            self.entries.move_to_end(key)
+            self.sizes[key] = size
+            self.total_bytes += size
+            while self.total_bytes > self.budget_bytes and len(self.entries) > 1:
+                old_key, _ = self.entries.popitem(last=False)
+                self.total_bytes -= self.sizes.pop(old_key)
+                self.evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            logger.info(f"Evicted visualizer {old_key} from the cache (budget {self.budget_bytes / 2**20:.0f} MB)")
+            if self.on_evict:
+                self.on_evict(old_key)
+
+    def stats(self):
+        """Entry count, bytes held, budget and evictions so far"""
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "budget_bytes": self.budget_bytes,
+                "evictions": self.evictions,
+            }